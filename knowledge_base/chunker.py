@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Chunker
+Streams long transcripts/articles into overlapping token windows for embedding
+"""
+
+import re
+from collections import deque
+from typing import Iterable, Iterator, List, Tuple
+
+TOKEN_RE = re.compile(r'\S+')
+
+def chunk_text(text: str, window: int = 200, overlap: int = 40) -> Iterator[str]:
+    """
+    Yield chunks of `window` whitespace tokens, each sharing `overlap`
+    tokens with the previous chunk. Tokens are read lazily, so a 2-hour
+    transcript never has to be split into one big list.
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    if not 0 <= overlap < window:
+        raise ValueError("overlap must be >= 0 and smaller than window")
+
+    step = window - overlap
+    buffer = deque()
+    fresh = 0  # tokens added since the last emitted chunk
+
+    for match in TOKEN_RE.finditer(text or ''):
+        buffer.append(match.group())
+        fresh += 1
+        if len(buffer) == window:
+            yield ' '.join(buffer)
+            for _ in range(step):
+                buffer.popleft()
+            fresh = 0
+
+    if fresh:
+        yield ' '.join(buffer)
+
+def chunk_sources(sources: Iterable[Tuple[str, str]], window: int = 200,
+                  overlap: int = 40) -> Iterator[Tuple[str, List[str]]]:
+    """Chunk (source_id, text) pairs, yielding (source_id, chunks)"""
+    for source_id, text in sources:
+        yield source_id, list(chunk_text(text, window, overlap))
+
+if __name__ == "__main__":
+    sample = ' '.join(f"word{i}" for i in range(25))
+    for chunk in chunk_text(sample, window=10, overlap=3):
+        print(chunk)
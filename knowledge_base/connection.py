@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Connection Manager
+Persistent per-thread SQLite connections in WAL mode
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict
+
+BUSY_TIMEOUT_MS = 30000
+STATEMENT_CACHE_SIZE = 256
+
+class ConnectionManager:
+    """
+    One manager per database file (see for_path). Each thread gets its own
+    long-lived connection, so concurrent ingesters can write while readers
+    query: WAL lets readers proceed during a write, and busy_timeout makes
+    writers queue instead of failing with "database is locked".
+    """
+
+    _managers: Dict[str, 'ConnectionManager'] = {}
+    _managers_lock = threading.Lock()
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    @classmethod
+    def for_path(cls, db_path: str) -> 'ConnectionManager':
+        """Return the shared manager for a database file"""
+        key = os.path.realpath(os.path.expanduser(db_path))
+        with cls._managers_lock:
+            if key not in cls._managers:
+                cls._managers[key] = cls(key)
+            return cls._managers[key]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def ensure_schema(self, init: Callable[[sqlite3.Connection], None]):
+        """Run schema setup once per database file per process"""
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                init(self.connection())
+                self._schema_ready = True
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
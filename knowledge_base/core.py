@@ -4,6 +4,7 @@ Knowledge Base RAG System
 Ingests URLs, YouTube videos, tweets, PDFs with vector embeddings
 """
 
+import os
 import sqlite3
 import json
 import hashlib
@@ -11,13 +12,28 @@ from datetime import datetime
 from typing import Optional, List, Dict
 import re
 
+from knowledge_base.connection import ConnectionManager
+from knowledge_base.embeddings import HashingEmbedder, to_blob
+from knowledge_base.fetch_cache import content_hash
+from knowledge_base.relevance import AccessRecorder, NEW_SCORE_SQL, refresh_relevance
+
 DB_PATH = "~/.openclaw/workspace/db/knowledge_base.db"
 
-def init_db():
-    """Initialize knowledge base database"""
-    conn = sqlite3.connect(os.path.expanduser(DB_PATH))
+# Bump when the DDL below changes so existing databases re-run it once
+SCHEMA_VERSION = 4
+
+def init_db(db_path: str = DB_PATH):
+    """Initialize knowledge base database (once per DB file per process)"""
+    ConnectionManager.for_path(db_path).ensure_schema(create_schema)
+
+def create_schema(conn: sqlite3.Connection):
+    """Create tables, indexes and FTS triggers unless already at SCHEMA_VERSION"""
     cursor = conn.cursor()
     
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] >= SCHEMA_VERSION:
+        return
+    
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS knowledge_sources (
             id TEXT PRIMARY KEY,
@@ -33,13 +49,38 @@ def init_db():
             access_count INTEGER DEFAULT 0,
             entities TEXT, -- JSON array of extracted entities
             tags TEXT, -- JSON array
-            vector_embedding_id TEXT -- reference to embedding storage
+            vector_embedding_id TEXT, -- reference to embedding storage
+            content_hash TEXT, -- sha256 of content, skips no-op rewrites
+            relevance_score REAL DEFAULT 0 -- materialized recency/access score
+        )
+    ''')
+    
+    # v2/v3: columns added to databases created before they existed
+    cursor.execute("PRAGMA table_info(knowledge_sources)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if 'content_hash' not in columns:
+        cursor.execute("ALTER TABLE knowledge_sources ADD COLUMN content_hash TEXT")
+    if 'relevance_score' not in columns:
+        cursor.execute("ALTER TABLE knowledge_sources ADD COLUMN relevance_score REAL DEFAULT 0")
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS kb_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
         )
     ''')
     
+    # v4: seq never reuses the rowid of a deleted chunk, so the vector index
+    # can refresh by "rowid above the last one seen" across re-embeddings
+    cursor.execute("PRAGMA table_info(knowledge_embeddings)")
+    embedding_columns = [col[1] for col in cursor.fetchall()]
+    if embedding_columns and 'seq' not in embedding_columns:
+        cursor.execute("ALTER TABLE knowledge_embeddings RENAME TO knowledge_embeddings_v3")
+    
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS knowledge_embeddings (
-            id TEXT PRIMARY KEY,
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT UNIQUE NOT NULL,
             source_id TEXT,
             chunk_text TEXT,
             chunk_index INTEGER,
@@ -48,6 +89,16 @@ def init_db():
         )
     ''')
     
+    if embedding_columns and 'seq' not in embedding_columns:
+        cursor.execute('''
+            INSERT INTO knowledge_embeddings (id, source_id, chunk_text, chunk_index, embedding)
+            SELECT id, source_id, chunk_text, chunk_index, embedding
+            FROM knowledge_embeddings_v3
+            WHERE source_id IN (SELECT id FROM knowledge_sources)
+            ORDER BY rowid
+        ''')
+        cursor.execute("DROP TABLE knowledge_embeddings_v3")
+    
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS entity_links (
             id TEXT PRIMARY KEY,
@@ -64,55 +115,240 @@ def init_db():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_url ON knowledge_sources(url)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_ingested ON knowledge_sources(ingested_at)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_entities_name ON entity_links(entity_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_embeddings_source ON knowledge_embeddings(source_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_relevance ON knowledge_sources(relevance_score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_type_relevance ON knowledge_sources(source_type, relevance_score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_access ON knowledge_sources(access_count)')
+    
+    # Full-text index over title/content, kept in sync by triggers
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'knowledge_fts'")
+    fts_exists = cursor.fetchone() is not None
+    
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+            title, content,
+            content='knowledge_sources', content_rowid='rowid',
+            tokenize='porter unicode61'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS knowledge_fts_ai AFTER INSERT ON knowledge_sources BEGIN
+            INSERT INTO knowledge_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS knowledge_fts_ad AFTER DELETE ON knowledge_sources BEGIN
+            INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS knowledge_fts_au AFTER UPDATE OF title, content ON knowledge_sources BEGIN
+            INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+            INSERT INTO knowledge_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END
+    """)
+    
+    if not fts_exists:
+        # Index rows ingested before the FTS table existed
+        cursor.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('rebuild')")
+    
+    cursor.execute("SELECT 1 FROM kb_meta WHERE key = 'relevance_as_of'")
+    if cursor.fetchone() is None:
+        # Score rows ingested before relevance_score existed
+        refresh_relevance(conn)
     
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
-    conn.close()
 
 def generate_id(url: str) -> str:
     """Generate unique ID from URL"""
     return hashlib.sha256(url.encode()).hexdigest()[:16]
 
 class KnowledgeBase:
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(self, db_path: str = DB_PATH, embedder=None):
         self.db_path = os.path.expanduser(db_path)
-        init_db()
+        self.db = ConnectionManager.for_path(self.db_path)
+        self.embedder = embedder or HashingEmbedder()
+        self._vector_index = None
+        self.access = AccessRecorder.for_db(self.db)
+        init_db(self.db_path)
     
     def add_source(self, url: str, source_type: str, title: str, content: str,
                    author: str = None, published_at: str = None, 
                    entities: List[str] = None) -> str:
         """Add a new source to the knowledge base"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self.add_sources([{
+            'url': url, 'source_type': source_type, 'title': title,
+            'content': content, 'author': author,
+            'published_at': published_at, 'entities': entities
+        }])[0][0]
+    
+    def add_sources(self, records: List[Dict]) -> List[tuple]:
+        """
+        Add or update many sources in one transaction.
+        Each record takes the same keys as add_source's arguments, plus an
+        optional 'entity_links' list from EntityExtractor.extract_mentions.
+        Returns (source_id, changed) per record; changed is False when the
+        stored content hash already matches, in which case nothing is written.
+        """
+        conn = self.db.connection()
+        results = []
         
-        source_id = generate_id(url)
-        
-        # Check if already exists
-        cursor.execute("SELECT id FROM knowledge_sources WHERE url = ?", (url,))
-        if cursor.fetchone():
-            # Update existing
-            cursor.execute('''
-                UPDATE knowledge_sources 
-                SET content = ?, title = ?, last_accessed = ?
-                WHERE url = ?
-            ''', (content, title, datetime.now().isoformat(), url))
-        else:
-            # Insert new
-            cursor.execute('''
-                INSERT INTO knowledge_sources 
-                (id, url, source_type, title, content, author, published_at, entities)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (source_id, url, source_type, title, content, author, 
-                  published_at, json.dumps(entities or [])))
-        
-        conn.commit()
-        conn.close()
-        
-        return source_id
-    
-    def search(self, query: str, source_type: str = None, 
-               time_weight: bool = True, limit: int = 10) -> List[Dict]:
-        """Search knowledge base (semantic search placeholder)"""
-        conn = sqlite3.connect(self.db_path)
+        with conn:
+            cursor = conn.cursor()
+            
+            for record in records:
+                url = record['url']
+                source_id = generate_id(url)
+                digest = content_hash(record['content'])
+                
+                # Check if already exists
+                cursor.execute("SELECT id, content_hash FROM knowledge_sources WHERE url = ?", (url,))
+                existing = cursor.fetchone()
+                if existing and existing[1] == digest:
+                    results.append((existing[0], False))
+                elif existing:
+                    # Update existing
+                    cursor.execute('''
+                        UPDATE knowledge_sources 
+                        SET content = ?, title = ?, last_accessed = ?, content_hash = ?
+                        WHERE url = ?
+                    ''', (record['content'], record['title'], datetime.now().isoformat(), digest, url))
+                    results.append((existing[0], True))
+                else:
+                    # Insert new
+                    cursor.execute(f'''
+                        INSERT INTO knowledge_sources 
+                        (id, url, source_type, title, content, author, published_at, entities,
+                         content_hash, relevance_score)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {NEW_SCORE_SQL})
+                    ''', (source_id, url, record['source_type'], record['title'],
+                          record['content'], record.get('author'), record.get('published_at'),
+                          json.dumps(record.get('entities') or []), digest))
+                    results.append((source_id, True))
+                
+                if results[-1][1] and 'entity_links' in record:
+                    self._replace_entity_links(cursor, results[-1][0], record['entity_links'])
+        
+        return results
+    
+    def _replace_entity_links(self, cursor: sqlite3.Cursor, source_id: str,
+                              mentions: List[Dict]):
+        """Bulk-replace a source's entity_links rows (inside the caller's transaction)"""
+        cursor.execute("DELETE FROM entity_links WHERE source_id = ?", (source_id,))
+        cursor.executemany('''
+            INSERT INTO entity_links (id, entity_name, entity_type, source_id, context)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (generate_id(f"{source_id}|{m['entity_type']}|{m['name']}"),
+             m['name'], m['entity_type'], source_id, m.get('context'))
+            for m in mentions
+        ])
+
+    def add_embeddings(self, source_id: str, chunks: List[str],
+                       vectors: List[List[float]] = None) -> int:
+        """Replace the embedded chunks of a source"""
+        if vectors is None:
+            vectors = self.embedder.embed_batch(chunks)
+        return self.add_embeddings_bulk([(source_id, chunks, vectors)])
+
+    def add_embeddings_bulk(self, items: List[tuple]) -> int:
+        """
+        Replace the embedded chunks of many sources in one transaction.
+        items is a list of (source_id, chunks, vectors)
+        """
+        rows = [
+            (f"{source_id}:{i}", source_id, chunk, i, to_blob(vector))
+            for source_id, chunks, vectors in items
+            for i, (chunk, vector) in enumerate(zip(chunks, vectors))
+        ]
+        source_ids = [(item[0],) for item in items]
+
+        conn = self.db.connection()
+        with conn:
+            conn.executemany("DELETE FROM knowledge_embeddings WHERE source_id = ?", source_ids)
+            conn.executemany('''
+                INSERT INTO knowledge_embeddings (id, source_id, chunk_text, chunk_index, embedding)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+
+        if self._vector_index is not None:
+            for (source_id,) in source_ids:
+                self._vector_index.discard_source(source_id)
+            self._vector_index.refresh()
+
+        return len(rows)
+
+    def iter_sources(self, source_type: str = None, batch_size: int = 500):
+        """
+        Stream (source_id, content) pairs a page at a time by rowid, so no
+        read statement stays open while the caller writes embeddings
+        """
+        sql = "SELECT rowid, id, content FROM knowledge_sources WHERE rowid > ?"
+        if source_type:
+            sql += " AND source_type = ?"
+        sql += " ORDER BY rowid LIMIT ?"
+
+        last_rowid = 0
+        while True:
+            params = [last_rowid] + ([source_type] if source_type else []) + [batch_size]
+
+            rows = self.db.connection().execute(sql, params).fetchall()
+
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            for _, source_id, content in rows:
+                yield source_id, content
+
+    def vector_index(self):
+        """Lazily build the in-memory vector index (requires numpy)"""
+        if self._vector_index is None:
+            from knowledge_base.vector_index import VectorIndex
+            self._vector_index = VectorIndex(self.db_path, self.embedder.dim)
+        self._vector_index.refresh()
+        return self._vector_index
+
+    def search(self, query: str, source_type: str = None,
+               time_weight: bool = True, limit: int = 10,
+               mode: str = 'fts') -> List[Dict]:
+        """
+        Search knowledge base
+        mode='fts' ranks keyword matches by BM25 over the full-text index,
+        mode='vector' ranks by cosine similarity of embedded chunks (falls
+        back to fts while nothing has been embedded yet), mode='keyword'
+        is the legacy substring scan.
+        Returned sources have their access counted via the write-behind
+        AccessRecorder, never inline.
+        """
+        results = None
+        if mode == 'vector':
+            index = self.vector_index()
+            if len(index):
+                results = self._vector_search(index, query, source_type, limit)
+            else:
+                mode = 'fts'
+        
+        if mode == 'fts':
+            results = self._fts_search(query, source_type, time_weight, limit)
+        elif results is None:
+            results = self._keyword_search(query, source_type, time_weight, limit)
+        
+        self.access.record(r['id'] for r in results)
+        return results
+    
+    def refresh_relevance(self) -> int:
+        """Periodic job: recompute time decay of every relevance_score"""
+        self.access.flush()
+        return refresh_relevance(self.db.connection())
+    
+    def _keyword_search(self, query: str, source_type: Optional[str],
+                        time_weight: bool, limit: int) -> List[Dict]:
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         # Simple keyword search for now (replace with vector search later)
@@ -132,7 +368,7 @@ class KnowledgeBase:
             params = [f'%{query}%', f'%{query}%']
         
         if time_weight:
-            sql += " ORDER BY (julianday('now') - julianday(ingested_at)) * -0.1 + access_count * 0.01 DESC"
+            sql += " ORDER BY relevance_score DESC"
         else:
             sql += " ORDER BY access_count DESC"
         
@@ -142,7 +378,56 @@ class KnowledgeBase:
         cursor.execute(sql, params)
         results = cursor.fetchall()
         
-        conn.close()
+        return [
+            {
+                'id': r[0],
+                'url': r[1],
+                'type': r[2],
+                'title': r[3],
+                'summary': r[4],
+                'author': r[5],
+                'ingested': r[6],
+                'relevance': r[7]
+            }
+            for r in results
+        ]
+    
+    def _fts_search(self, query: str, source_type: Optional[str],
+                    time_weight: bool, limit: int) -> List[Dict]:
+        # Quote each keyword so user input can't inject FTS5 query syntax
+        keywords = re.findall(r'\w+', query.lower())
+        if not keywords:
+            return []
+        match = ' OR '.join(f'"{k}"' for k in keywords)
+        
+        conn = self.db.connection()
+        cursor = conn.cursor()
+        
+        # bm25() is lower-is-better, so negate it to combine with the boosts
+        score = "-bm25(knowledge_fts, 2.0, 1.0)"
+        if time_weight:
+            score += " + s.relevance_score"
+        else:
+            score += " + s.access_count * 0.01"
+        
+        sql = f'''
+            SELECT s.id, s.url, s.source_type, s.title, s.content_summary,
+                   s.author, s.ingested_at, {score} AS score
+            FROM knowledge_fts
+            JOIN knowledge_sources s ON s.rowid = knowledge_fts.rowid
+            WHERE knowledge_fts MATCH ?
+        '''
+        params = [match]
+        
+        if source_type:
+            sql += " AND s.source_type = ?"
+            params.append(source_type)
+        
+        sql += " ORDER BY score DESC LIMIT ?"
+        params.append(limit)
+        
+        cursor.execute(sql, params)
+        results = cursor.fetchall()
         
         return [
             {
@@ -158,9 +443,42 @@ class KnowledgeBase:
             for r in results
         ]
     
+    def _vector_search(self, index, query: str, source_type: Optional[str],
+                       limit: int) -> List[Dict]:
+        hits = index.search(self.embedder.embed(query), k=limit, source_type=source_type)
+        if not hits:
+            return []
+
+        conn = self.db.connection()
+        cursor = conn.cursor()
+
+        placeholders = ','.join('?' * len(hits))
+        cursor.execute(f'''
+            SELECT id, url, source_type, title, content_summary, author, ingested_at
+            FROM knowledge_sources
+            WHERE id IN ({placeholders})
+        ''', [h['source_id'] for h in hits])
+        rows = {r[0]: r for r in cursor.fetchall()}
+
+        results = []
+        for hit in hits:
+            r = rows.get(hit['source_id'])
+            if r:
+                results.append({
+                    'id': r[0],
+                    'url': r[1],
+                    'type': r[2],
+                    'title': r[3],
+                    'summary': r[4],
+                    'author': r[5],
+                    'ingested': r[6],
+                    'relevance': hit['score']
+                })
+        return results
+
     def get_by_entity(self, entity_name: str) -> List[Dict]:
         """Get all sources mentioning a specific entity"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -171,8 +489,7 @@ class KnowledgeBase:
         ''', (entity_name,))
         
         results = cursor.fetchall()
-        conn.close()
-        
+
         return [
             {'id': r[0], 'url': r[1], 'type': r[2], 'title': r[3], 'context': r[4]}
             for r in results
@@ -180,7 +497,7 @@ class KnowledgeBase:
     
     def get_stats(self) -> Dict:
         """Get knowledge base statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         cursor.execute("SELECT COUNT(*) FROM knowledge_sources")
@@ -192,13 +509,9 @@ class KnowledgeBase:
         cursor.execute("SELECT COUNT(*) FROM entity_links")
         entities = cursor.fetchone()[0]
         
-        conn.close()
-        
         return {'total_sources': total, 'by_type': by_type, 'total_entities': entities}
 
 if __name__ == "__main__":
-    import os
-    
     kb = KnowledgeBase()
     
     # Test
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Embeddings
+Local text embedders and float32 blob (de)serialization for knowledge_embeddings
+"""
+
+import hashlib
+import math
+import re
+from array import array
+from typing import List
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def to_blob(vector: List[float]) -> bytes:
+    """Serialize a vector as little-endian float32 bytes"""
+    return array('f', vector).tobytes()
+
+def from_blob(blob: bytes) -> List[float]:
+    """Deserialize float32 bytes back into a list of floats"""
+    values = array('f')
+    values.frombytes(blob)
+    return values.tolist()
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing embedder (works offline, no model download).
+    Unigrams and bigrams are hashed into a fixed number of signed buckets
+    and the result is L2-normalized, so dot product == cosine similarity.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _bucket(self, feature: str):
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, 'little')
+        sign = 1.0 if value & 1 else -1.0
+        return (value >> 1) % self.dim, sign
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a single text"""
+        vector = [0.0] * self.dim
+        tokens = TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        for feature in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts"""
+        return [self.embed(text) for text in texts]
+
+class SentenceTransformerEmbedder:
+    """Embedder backed by a local sentence-transformers model (optional dependency)"""
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model: str = 'all-MiniLM-L6-v2', batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model)
+        self.batch_size = batch_size
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(texts, batch_size=self.batch_size,
+                                    normalize_embeddings=True)
+        return [v.tolist() for v in vectors]
+
+EMBEDDERS = {
+    HashingEmbedder.name: HashingEmbedder,
+    SentenceTransformerEmbedder.name: SentenceTransformerEmbedder,
+}
+
+def register_embedder(name: str, factory):
+    """Register an embedding backend (anything with dim, embed, embed_batch)"""
+    EMBEDDERS[name] = factory
+
+def get_embedder(name: str = 'hashing', **kwargs):
+    """Instantiate a registered embedding backend by name"""
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown embedder '{name}' (available: {', '.join(sorted(EMBEDDERS))})")
+    return EMBEDDERS[name](**kwargs)
+
+if __name__ == "__main__":
+    embedder = HashingEmbedder()
+    a = embedder.embed("AI is transforming how we work")
+    b = embedder.embed("How AI transforms work")
+    print("cosine:", sum(x * y for x, y in zip(a, b)))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Entity Extractor
+Single-pass gazetteer matching of companies, people and concepts
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.json')
+
+# Gazetteer section -> entity_links.entity_type
+ENTITY_TYPES = {'companies': 'company', 'people': 'person', 'concepts': 'concept'}
+
+CONTEXT_CHARS = 80
+
+class EntityExtractor:
+    """
+    Compiles every gazetteer name into one alternation regex (longest names
+    first, so "Alpha Bank" wins over a shorter overlapping name) and finds
+    all mentions in a single linear scan of the text. Build it once and
+    reuse it across sources; get_default() caches the shipped gazetteer.
+    """
+
+    def __init__(self, gazetteer: Dict[str, List[str]]):
+        self.lookup = {}
+        for section, names in gazetteer.items():
+            entity_type = ENTITY_TYPES.get(section, section)
+            for name in names:
+                self.lookup.setdefault(name.lower(), (name, section, entity_type))
+
+        names = sorted(self.lookup, key=len, reverse=True)
+        if names:
+            alternation = '|'.join(re.escape(name) for name in names)
+            self.pattern = re.compile(rf'(?<!\w)(?:{alternation})(?!\w)', re.IGNORECASE)
+        else:
+            self.pattern = None
+
+    @classmethod
+    def from_file(cls, path: str = GAZETTEER_PATH) -> 'EntityExtractor':
+        """Load a gazetteer JSON file: {"companies": [...], "people": [...], "concepts": [...]}"""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def extract_mentions(self, text: str) -> List[Dict]:
+        """
+        One entry per distinct entity: name, section, entity_type and the
+        surrounding text of its first mention
+        """
+        if not text or self.pattern is None:
+            return []
+
+        mentions = {}
+        for match in self.pattern.finditer(text):
+            name, section, entity_type = self.lookup[match.group().lower()]
+            if name in mentions:
+                continue
+            start = max(0, match.start() - CONTEXT_CHARS)
+            end = min(len(text), match.end() + CONTEXT_CHARS)
+            mentions[name] = {
+                'name': name,
+                'section': section,
+                'entity_type': entity_type,
+                'context': ' '.join(text[start:end].split())
+            }
+
+        return list(mentions.values())
+
+    def extract(self, text: str) -> Dict[str, list]:
+        """Distinct entity names grouped by gazetteer section"""
+        entities = {section: [] for section in ENTITY_TYPES}
+        for mention in self.extract_mentions(text):
+            entities.setdefault(mention['section'], []).append(mention['name'])
+        return entities
+
+_default: Optional[EntityExtractor] = None
+
+def get_default() -> EntityExtractor:
+    """Process-wide extractor over the shipped gazetteer (compiled once)"""
+    global _default
+    if _default is None:
+        _default = EntityExtractor.from_file()
+    return _default
+
+if __name__ == "__main__":
+    extractor = get_default()
+    print(json.dumps(extractor.extract_mentions(
+        "Barclays and Alpha Bank partnered with OpenAI; openai later met HSBC."
+    ), indent=2))
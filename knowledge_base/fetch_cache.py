@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Fetch Cache
+Persistent per-URL cache of validators (ETag/Last-Modified) and bodies for conditional re-fetch
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from knowledge_base.connection import ConnectionManager
+
+CACHE_PATH = "~/.openclaw/workspace/db/fetch_cache.db"
+MAX_BYTES = 256 * 1024 * 1024
+MAX_ENTRIES = 50000
+
+def content_hash(text: str) -> str:
+    """Stable hash of fetched or stored content"""
+    return hashlib.sha256((text or '').encode('utf-8', errors='ignore')).hexdigest()
+
+def _create_schema(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS fetch_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT,
+            body TEXT,
+            size INTEGER,
+            fetched_at REAL,
+            last_used REAL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_fetch_cache_used ON fetch_cache(last_used)')
+    conn.commit()
+
+class FetchCache:
+    """
+    URL -> (ETag, Last-Modified, content hash, body).
+    Extractors send the validators as If-None-Match / If-Modified-Since and
+    reuse the cached body on a 304. Entries are evicted least-recently-used
+    first once the cache exceeds max_bytes or max_entries.
+    """
+
+    def __init__(self, db_path: str = CACHE_PATH, max_bytes: int = MAX_BYTES,
+                 max_entries: int = MAX_ENTRIES):
+        self.db = ConnectionManager.for_path(db_path)
+        self.db.ensure_schema(_create_schema)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL, marking it recently used"""
+        conn = self.db.connection()
+        row = conn.execute(
+            "SELECT etag, last_modified, content_hash, body FROM fetch_cache WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if not row:
+            return None
+
+        with conn:
+            conn.execute("UPDATE fetch_cache SET last_used = ? WHERE url = ?", (time.time(), url))
+
+        return {'etag': row[0], 'last_modified': row[1], 'content_hash': row[2], 'body': row[3]}
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, body: str, etag: str = None, last_modified: str = None) -> str:
+        """Store a fresh response and return its content hash"""
+        digest = content_hash(body)
+        now = time.time()
+        size = len(body.encode('utf-8', errors='ignore'))
+
+        conn = self.db.connection()
+        with conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO fetch_cache
+                (url, etag, last_modified, content_hash, body, size, fetched_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (url, etag, last_modified, digest, body, size, now, now))
+            self._evict(conn)
+
+        return digest
+
+    def _evict(self, conn: sqlite3.Connection):
+        total_bytes, entries = conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM fetch_cache"
+        ).fetchone()
+        if total_bytes <= self.max_bytes and entries <= self.max_entries:
+            return
+
+        victims = []
+        for url, size in conn.execute("SELECT url, size FROM fetch_cache ORDER BY last_used"):
+            if total_bytes <= self.max_bytes and entries <= self.max_entries:
+                break
+            victims.append((url,))
+            total_bytes -= size or 0
+            entries -= 1
+
+        conn.executemany("DELETE FROM fetch_cache WHERE url = ?", victims)
@@ -7,22 +7,35 @@ Main handler for processing URLs from Telegram and other sources
 import sys
 import json
 import re
-from typing import Dict, Optional
+import threading
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Add knowledge_base to path
 sys.path.insert(0, '/Users/quentincasares/.openclaw/workspace')
 
 from knowledge_base.core import KnowledgeBase
+from knowledge_base.chunker import chunk_sources
+from knowledge_base.embeddings import get_embedder
+from knowledge_base.fetch_cache import FetchCache
 from knowledge_base.youtube_extractor import YouTubeExtractor
 from knowledge_base.twitter_extractor import TwitterExtractor
 from knowledge_base.web_extractor import WebExtractor
 
 class KnowledgeIngester:
-    def __init__(self):
-        self.kb = KnowledgeBase()
-        self.youtube = YouTubeExtractor()
+    def __init__(self, embedder: str = 'hashing', chunk_tokens: int = 200,
+                 chunk_overlap: int = 40, embed_batch_size: int = 256):
+        self.embedder = get_embedder(embedder)
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.embed_batch_size = embed_batch_size
+        self.kb = KnowledgeBase(embedder=self.embedder)
+        self.fetch_cache = FetchCache()
+        self.youtube = YouTubeExtractor(cache=self.fetch_cache)
         self.twitter = TwitterExtractor()
-        self.web = WebExtractor()
+        self.web = WebExtractor(cache=self.fetch_cache)
     
     def identify_source_type(self, url: str) -> str:
         """Identify what type of content a URL points to"""
@@ -40,21 +53,91 @@ class KnowledgeIngester:
         Main ingestion handler
         Processes URL based on type and stores in knowledge base
         """
+        result = self._extract(url, source_context)
+        self._store([result])
+        return result
+    
+    def ingest_many(self, urls: Iterable[str], source_context: str = "unknown",
+                    max_workers: int = 16, per_host: int = 4,
+                    write_batch_size: int = 50) -> List[Dict]:
+        """
+        Bulk ingestion handler
+        Extraction fans out over a bounded thread pool with at most
+        `per_host` requests in flight per host; the calling thread is the
+        only writer and stores finished extractions in batches.
+        """
+        host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        host_limits_lock = threading.Lock()
+        
+        def extract(url: str) -> Dict:
+            host = urllib.parse.urlparse(url).netloc.lower()
+            with host_limits_lock:
+                limit = host_limits[host]
+            with limit:
+                try:
+                    return self._extract(url, source_context)
+                except Exception as e:
+                    return {'success': False, 'error': str(e), 'url': url}
+        
+        results = []
+        pending = []
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(extract, url) for url in dict.fromkeys(urls)]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if '_record' in result:
+                    pending.append(result)
+                if len(pending) >= write_batch_size:
+                    self._store(pending)
+                    pending = []
+        
+        self._store(pending)
+        return results
+    
+    def _extract(self, url: str, context: str) -> Dict:
+        """Fetch and parse a URL; the source to store is kept under '_record'"""
         source_type = self.identify_source_type(url)
         
         print(f"📥 Ingesting {source_type}: {url}")
         
         if source_type == 'youtube':
-            return self._ingest_youtube(url, source_context)
+            return self._ingest_youtube(url, context)
         elif source_type == 'tweet':
-            return self._ingest_tweet(url, source_context)
+            return self._ingest_tweet(url, context)
         elif source_type == 'pdf':
-            return self._ingest_pdf(url, source_context)
+            return self._ingest_pdf(url, context)
         else:
-            return self._ingest_article(url, source_context)
+            return self._ingest_article(url, context)
+    
+    def _store(self, results: List[Dict]):
+        """Write extracted sources in one transaction, then embed them"""
+        stored = [r for r in results if '_record' in r]
+        if not stored:
+            return
+        
+        records = [r.pop('_record') for r in stored]
+        changed = []
+        for result, record, (source_id, is_changed) in zip(stored, records, self.kb.add_sources(records)):
+            result['source_id'] = source_id
+            result['unchanged'] = not is_changed
+            if is_changed:
+                changed.append((source_id, record['content']))
+        
+        # Identical content keeps its existing chunks and embeddings
+        self.embed_sources(changed)
+    
+    def _entity_fields(self, text: str, sections: Tuple[str, ...]) -> Dict:
+        """Tag entities in one pass: names for the source row plus entity_links rows"""
+        mentions = self.web.entities.extract_mentions(text)
+        return {
+            'entities': [m['name'] for m in mentions if m['section'] in sections],
+            'entity_links': mentions
+        }
     
     def _ingest_youtube(self, url: str, context: str) -> Dict:
-        """Ingest YouTube video with transcript"""
+        """Extract YouTube video with transcript"""
         result = self.youtube.process_url(url)
         
         if 'error' in result:
@@ -63,25 +146,23 @@ class KnowledgeIngester:
         metadata = result.get('metadata', {})
         transcript = result.get('transcript', {})
         
-        source_id = self.kb.add_source(
-            url=url,
-            source_type='youtube',
-            title=metadata.get('title', 'Unknown Video'),
-            content=transcript.get('full_text', ''),
-            author=metadata.get('author', 'Unknown'),
-            entities=self.web.extract_entities(transcript.get('full_text', '')).get('companies', [])
-        )
-        
         return {
             'success': True,
-            'source_id': source_id,
             'type': 'youtube',
             'title': metadata.get('title'),
-            'has_transcript': bool(transcript.get('full_text'))
+            'has_transcript': bool(transcript.get('full_text')),
+            '_record': {
+                'url': url,
+                'source_type': 'youtube',
+                'title': metadata.get('title', 'Unknown Video'),
+                'content': transcript.get('full_text', ''),
+                'author': metadata.get('author', 'Unknown'),
+                **self._entity_fields(transcript.get('full_text', ''), ('companies',))
+            }
         }
     
     def _ingest_tweet(self, url: str, context: str) -> Dict:
-        """Ingest tweet or thread"""
+        """Extract tweet or thread"""
         result = self.twitter.process_url(url)
         
         if 'error' in result:
@@ -97,44 +178,38 @@ class KnowledgeIngester:
             content = f"Tweet thread from {url}"
             author_id = 'unknown'
         
-        source_id = self.kb.add_source(
-            url=url,
-            source_type='tweet',
-            title=f"Tweet by @{author_id}",
-            content=content,
-            author=author_id,
-            entities=self.web.extract_entities(content).get('companies', [])
-        )
-        
         return {
             'success': True,
-            'source_id': source_id,
             'type': 'tweet',
-            'is_thread': result.get('is_thread', False)
+            'is_thread': result.get('is_thread', False),
+            '_record': {
+                'url': url,
+                'source_type': 'tweet',
+                'title': f"Tweet by @{author_id}",
+                'content': content,
+                'author': author_id,
+                **self._entity_fields(content, ('companies',))
+            }
         }
     
     def _ingest_article(self, url: str, context: str) -> Dict:
-        """Ingest web article"""
+        """Extract web article"""
         result = self.web.extract(url)
         
         if 'error' in result:
             return {'success': False, 'error': result['error'], 'url': url}
         
-        entities = self.web.extract_entities(result.get('content', ''))
-        
-        source_id = self.kb.add_source(
-            url=url,
-            source_type='article',
-            title=result.get('title', 'Unknown Article'),
-            content=result.get('content', ''),
-            entities=entities.get('companies', []) + entities.get('people', [])
-        )
-        
         return {
             'success': True,
-            'source_id': source_id,
             'type': 'article',
-            'title': result.get('title')
+            'title': result.get('title'),
+            '_record': {
+                'url': url,
+                'source_type': 'article',
+                'title': result.get('title', 'Unknown Article'),
+                'content': result.get('content', ''),
+                **self._entity_fields(result.get('content', ''), ('companies', 'people'))
+            }
         }
     
     def _ingest_pdf(self, url: str, context: str) -> Dict:
@@ -146,9 +221,46 @@ class KnowledgeIngester:
             'url': url
         }
     
+    def embed_sources(self, sources: Iterable[Tuple[str, str]]) -> Dict:
+        """
+        Chunk and embed (source_id, text) pairs.
+        Chunks from many sources are pooled so the embedder sees full
+        batches, and each batch is written in a single transaction.
+        """
+        pending = []
+        pending_chunks = 0
+        stats = {'sources': 0, 'chunks': 0}
+
+        def flush():
+            texts = [chunk for _, chunks in pending for chunk in chunks]
+            vectors = iter(self.embedder.embed_batch(texts))
+            items = [
+                (source_id, chunks, [next(vectors) for _ in chunks])
+                for source_id, chunks in pending
+            ]
+            stats['chunks'] += self.kb.add_embeddings_bulk(items)
+            stats['sources'] += len(items)
+            pending.clear()
+
+        for source_id, chunks in chunk_sources(sources, self.chunk_tokens, self.chunk_overlap):
+            pending.append((source_id, chunks))
+            pending_chunks += len(chunks)
+            if pending_chunks >= self.embed_batch_size:
+                flush()
+                pending_chunks = 0
+
+        if pending:
+            flush()
+
+        return stats
+
+    def reembed_all(self, source_type: str = None) -> Dict:
+        """Re-chunk and re-embed every stored source (e.g. after changing embedder)"""
+        return self.embed_sources(self.kb.iter_sources(source_type))
+
     def query(self, question: str, limit: int = 5) -> Dict:
         """Natural language query against knowledge base"""
-        results = self.kb.search(question, limit=limit)
+        results = self.kb.search(question, limit=limit, mode='vector')
         
         return {
             'query': question,
@@ -165,11 +277,30 @@ if __name__ == "__main__":
     ingester = KnowledgeIngester()
     
     # Test with command line argument
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == '--many':
+        # URLs from a file (one per line) or stdin
+        source = open(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2] != '-' else sys.stdin
+        urls = [line.strip() for line in source if line.strip()]
+        results = ingester.ingest_many(urls)
+        print(json.dumps({
+            'total': len(results),
+            'succeeded': sum(1 for r in results if r.get('success')),
+            'failed': [r for r in results if not r.get('success')]
+        }, indent=2))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--refresh-relevance':
+        # Periodic (e.g. nightly cron) decay recompute
+        print(json.dumps({'rescored': ingester.kb.refresh_relevance()}, indent=2))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--reembed':
+        source_type = sys.argv[2] if len(sys.argv) > 2 else None
+        print(json.dumps(ingester.reembed_all(source_type), indent=2))
+    elif len(sys.argv) > 1:
         url = sys.argv[1]
         result = ingester.ingest_url(url)
         print(json.dumps(result, indent=2))
     else:
         print("Usage: python ingester.py <url>")
+        print("       python ingester.py --many [urls.txt|-]")
+        print("       python ingester.py --reembed [source_type]")
+        print("       python ingester.py --refresh-relevance")
         print("\nKnowledge Base Stats:")
         print(json.dumps(ingester.get_stats(), indent=2))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Relevance
+Materialized recency/access relevance scores and a write-behind access recorder
+"""
+
+import atexit
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable
+
+from knowledge_base.connection import ConnectionManager
+
+RECENCY_WEIGHT = 0.1   # score lost per day of age
+ACCESS_WEIGHT = 0.01   # score gained per read
+
+# relevance_score is the old query-time formula evaluated at a shared
+# 'relevance_as_of' instant, so ordering between rows is always exact and
+# the periodic decay job only has to move that instant forward.
+AS_OF_SQL = "(SELECT value FROM kb_meta WHERE key = 'relevance_as_of')"
+SCORE_SQL = (f"(julianday(ingested_at) - julianday({AS_OF_SQL})) * {RECENCY_WEIGHT}"
+             f" + access_count * {ACCESS_WEIGHT}")
+# Score of a row being inserted now with no accesses yet
+NEW_SCORE_SQL = f"(julianday(CURRENT_TIMESTAMP) - julianday({AS_OF_SQL})) * {RECENCY_WEIGHT}"
+
+def refresh_relevance(conn: sqlite3.Connection) -> int:
+    """Periodic decay job: re-anchor every score at the current time"""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO kb_meta (key, value) VALUES ('relevance_as_of', CURRENT_TIMESTAMP)"
+        )
+        cursor = conn.execute(f"UPDATE knowledge_sources SET relevance_score = {SCORE_SQL}")
+    return cursor.rowcount
+
+class AccessRecorder:
+    """
+    Write-behind queue for access_count/last_accessed bumps.
+    Readers only increment an in-memory counter; a background thread folds
+    the pending counts into one batched UPDATE every `flush_interval`
+    seconds (or sooner once `max_pending` sources are waiting), so hot
+    reads never take the database write lock. Like ConnectionManager
+    there is one recorder per database file (see for_db), so opening many
+    KnowledgeBase objects does not pile up flush threads and exit hooks.
+    """
+
+    _recorders: Dict[str, 'AccessRecorder'] = {}
+    _recorders_lock = threading.Lock()
+
+    def __init__(self, db: ConnectionManager, flush_interval: float = 5.0,
+                 max_pending: int = 500):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def for_db(cls, db: ConnectionManager) -> 'AccessRecorder':
+        """Return the shared recorder for a database file"""
+        with cls._recorders_lock:
+            if db.db_path not in cls._recorders:
+                cls._recorders[db.db_path] = cls(db)
+            return cls._recorders[db.db_path]
+
+    @classmethod
+    def flush_all(cls):
+        """Flush every shared recorder (registered once with atexit)"""
+        with cls._recorders_lock:
+            recorders = list(cls._recorders.values())
+        for recorder in recorders:
+            try:
+                recorder.flush()
+            except sqlite3.Error as e:
+                print(f"⚠️ Access flush failed for {recorder.db.db_path}: {e}")
+
+    def record(self, source_ids: Iterable[str]):
+        """Queue one access for each source id"""
+        with self._lock:
+            self._pending.update(source_ids)
+            full = len(self._pending) >= self.max_pending
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Apply pending accesses in one transaction; returns sources updated"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+
+        now = datetime.now().isoformat()
+        conn = self.db.connection()
+        try:
+            with conn:
+                conn.executemany('''
+                    UPDATE knowledge_sources
+                    SET access_count = access_count + ?,
+                        last_accessed = ?,
+                        relevance_score = relevance_score + ?
+                    WHERE id = ?
+                ''', [(count, now, count * ACCESS_WEIGHT, source_id)
+                      for source_id, count in pending.items()])
+        except sqlite3.Error:
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                self._pending.update(pending)
+            raise
+
+        return len(pending)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"⚠️ Access flush failed, will retry: {e}")
+
+atexit.register(AccessRecorder.flush_all)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/chunker.py"""
+
+import os
+import sys
+import unittest
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.chunker import chunk_sources, chunk_text
+
+
+def words(n):
+    return ' '.join(f"w{i}" for i in range(n))
+
+
+class TestChunkText(unittest.TestCase):
+    """Tests for overlapping token windows."""
+
+    def test_windows_share_overlap(self):
+        """Test window starts, overlaps, and a short final chunk holding the leftover tokens."""
+        chunks = [chunk.split() for chunk in chunk_text(words(25), window=10, overlap=3)]
+        self.assertEqual([c[0] for c in chunks], ["w0", "w7", "w14", "w21"])
+        self.assertEqual([len(c) for c in chunks], [10, 10, 10, 4])
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertEqual(previous[-3:], chunk[:3])
+
+    def test_exact_fit_has_no_overlap_only_tail(self):
+        """Test that input ending on a window boundary emits no chunk made only of overlap."""
+        chunks = list(chunk_text(words(17), window=10, overlap=3))
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(chunks[-1].endswith("w16"))
+
+    def test_short_and_empty_text(self):
+        """Test that text under one window is one chunk, and empty text is none."""
+        self.assertEqual(list(chunk_text("a  b\nc", window=10, overlap=3)), ["a b c"])
+        self.assertEqual(list(chunk_text("", window=10, overlap=3)), [])
+        self.assertEqual(list(chunk_text(None)), [])
+
+    def test_no_overlap(self):
+        """Test that overlap=0 partitions the tokens."""
+        chunks = list(chunk_text(words(20), window=10, overlap=0))
+        self.assertEqual(' '.join(chunks), words(20))
+        self.assertEqual(len(chunks), 2)
+
+    def test_invalid_arguments(self):
+        """Test that bad window/overlap values are rejected."""
+        for window, overlap in [(0, 0), (10, 10), (10, -1)]:
+            with self.assertRaises(ValueError):
+                list(chunk_text("a b", window=window, overlap=overlap))
+
+    def test_chunk_sources(self):
+        """Test that sources keep their ids alongside their chunks."""
+        result = list(chunk_sources([("s1", words(12)), ("s2", "")], window=10, overlap=2))
+        self.assertEqual([(sid, len(chunks)) for sid, chunks in result], [("s1", 2), ("s2", 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
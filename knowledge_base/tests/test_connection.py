@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/connection.py"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.connection import ConnectionManager
+
+
+class TestConnectionManager(unittest.TestCase):
+    """Tests for shared managers and per-thread connections."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "kb.db")
+        self.db = ConnectionManager.for_path(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_one_manager_per_file(self):
+        """Test that different spellings of a path share one manager."""
+        same = ConnectionManager.for_path(os.path.join(self.temp_dir, ".", "kb.db"))
+        self.assertIs(same, self.db)
+        self.assertIsNot(ConnectionManager.for_path(os.path.join(self.temp_dir, "other.db")), self.db)
+
+    def test_connection_reused_within_thread(self):
+        """Test that a thread keeps its connection, and close() opens a fresh one next time."""
+        conn = self.db.connection()
+        self.assertIs(self.db.connection(), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        self.db.close()
+        self.assertIsNot(self.db.connection(), conn)
+
+    def test_threads_get_their_own_connection(self):
+        """Test that each thread opens a separate connection and can write concurrently."""
+        with self.db.connection() as conn:
+            conn.execute("CREATE TABLE t (thread INTEGER)")
+        seen = []
+
+        def worker(n):
+            conn = self.db.connection()
+            seen.append(conn)
+            with conn:
+                conn.executemany("INSERT INTO t VALUES (?)", [(n,)] * 50)
+            self.db.close()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(conn) for conn in seen + [self.db.connection()]}), 5)
+        self.assertEqual(self.db.connection().execute("SELECT COUNT(*) FROM t").fetchone()[0], 200)
+
+    def test_schema_runs_once(self):
+        """Test that ensure_schema only calls init the first time."""
+        calls = []
+        self.db.ensure_schema(calls.append)
+        self.db.ensure_schema(calls.append)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
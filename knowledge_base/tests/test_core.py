@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/core.py"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.core import KnowledgeBase
+
+
+class KnowledgeBaseTestCase(unittest.TestCase):
+    """KnowledgeBase on a temp database."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.kb = KnowledgeBase(os.path.join(self.temp_dir, "kb.db"))
+
+    def tearDown(self):
+        self.kb.access.flush()
+        self.kb.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fts_ids(self, query):
+        return [r['id'] for r in self.kb.search(query, time_weight=False)]
+
+
+class TestFullTextSearch(KnowledgeBaseTestCase):
+    """Tests for the FTS5 index and BM25 ranking."""
+
+    def test_bm25_ranks_denser_and_title_matches_first(self):
+        """Test that title hits and repeated terms outrank a passing mention."""
+        passing = self.kb.add_source("https://example.com/a", "article", "Gardening",
+                                     "Notes on soil, compost and one aside about kafka.")
+        dense = self.kb.add_source("https://example.com/b", "article", "Streams",
+                                   "Kafka partitions, kafka consumers and kafka offsets.")
+        titled = self.kb.add_source("https://example.com/c", "article", "Kafka",
+                                    "Kafka partitions, kafka consumers and kafka offsets.")
+        self.kb.add_source("https://example.com/d", "article", "Cooking", "Tomato soup")
+
+        self.assertEqual(self.fts_ids("kafka"), [titled, dense, passing])
+
+    def test_stemming_and_query_syntax(self):
+        """Test porter stemming, and that FTS operators in the query are treated as words."""
+        source = self.kb.add_source("https://example.com/a", "article", "Runner", "She was running daily")
+        self.assertEqual(self.fts_ids("runs"), [source])
+        self.assertEqual(self.fts_ids('running" OR NEAR(x'), [source])
+        self.assertEqual(self.fts_ids("!!"), [])
+
+    def test_triggers_follow_update_and_delete(self):
+        """Test that the FTS index tracks content updates and row deletes."""
+        url = "https://example.com/a"
+        source = self.kb.add_source(url, "article", "Post", "about postgres")
+        self.kb.add_source(url, "article", "Post", "about sqlite")
+        self.assertEqual(self.fts_ids("postgres"), [])
+        self.assertEqual(self.fts_ids("sqlite"), [source])
+
+        conn = self.kb.db.connection()
+        with conn:
+            conn.execute("DELETE FROM knowledge_sources WHERE id = ?", (source,))
+        self.assertEqual(self.fts_ids("sqlite"), [])
+        # Raises if the index no longer matches knowledge_sources
+        conn.execute("INSERT INTO knowledge_fts(knowledge_fts, rank) VALUES ('integrity-check', 1)")
+
+
+class TestContentHash(KnowledgeBaseTestCase):
+    """Tests for skipping writes of unchanged content."""
+
+    def test_unchanged_content_is_not_rewritten(self):
+        """Test that re-adding identical content changes nothing, including embeddings."""
+        record = {'url': "https://example.com/a", 'source_type': "article",
+                  'title': "Post", 'content': "same body"}
+        [(source, changed)] = self.kb.add_sources([record])
+        self.assertTrue(changed)
+        self.kb.add_embeddings(source, ["same body"])
+        conn = self.kb.db.connection()
+        before = conn.execute("SELECT last_accessed FROM knowledge_sources").fetchall()
+
+        self.assertEqual(self.kb.add_sources([record]), [(source, False)])
+        self.assertEqual(conn.execute("SELECT last_accessed FROM knowledge_sources").fetchall(), before)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM knowledge_embeddings").fetchone()[0], 1)
+
+        self.assertEqual(self.kb.add_sources([dict(record, content="new body")]), [(source, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/entity_extractor.py"""
+
+import os
+import re
+import sys
+import unittest
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.entity_extractor import EntityExtractor, get_default
+
+SAMPLES = [
+    "Barclays and Alpha Bank partnered with OpenAI; openai later met HSBC.",
+    "Posted on X.com about Tesla, SpaceX and Meta. LinkedIn reposted it.",
+    "Applesauce, Googled and Metaverse are not companies, but Apple is.",
+    "MTC, Dufrain and Volante signed with Microsoft and Amazon via Twitter",
+    "Nothing to see here.",
+    "",
+]
+
+
+def old_extract_companies(text):
+    """The hardcoded WebExtractor.extract_entities this extractor replaced"""
+    companies = []
+    company_patterns = [
+        r'\b(OpenAI|Google|Microsoft|Apple|Meta|Amazon|Twitter|X\.com|LinkedIn|Tesla|SpaceX)\b',
+        r'\b(Alpha Bank|HSBC|Barclays|Volante|MTC|Dufrain)\b'
+    ]
+    for pattern in company_patterns:
+        companies.extend(re.findall(pattern, text, re.IGNORECASE))
+    return list(set(companies))
+
+
+class TestEntityExtractor(unittest.TestCase):
+    """Tests for single-pass gazetteer matching."""
+
+    def test_parity_with_old_extractor(self):
+        """Test that the shipped gazetteer finds the same companies as the old patterns."""
+        extractor = get_default()
+        for text in SAMPLES:
+            with self.subTest(text=text):
+                expected = {name.lower() for name in old_extract_companies(text)}
+                found = extractor.extract(text)['companies']
+                self.assertEqual({name.lower() for name in found}, expected)
+                self.assertEqual(len(found), len(expected))
+
+    def test_canonical_names_and_first_context(self):
+        """Test that mentions use gazetteer spelling and keep the first mention's context."""
+        mentions = get_default().extract_mentions("openai shipped.\n\nLater   OpenAI again.")
+        self.assertEqual(len(mentions), 1)
+        self.assertEqual(mentions[0]['name'], "OpenAI")
+        self.assertEqual(mentions[0]['entity_type'], "company")
+        self.assertEqual(mentions[0]['context'], "openai shipped. Later OpenAI again.")
+
+    def test_longest_name_wins(self):
+        """Test that overlapping names match the longest one."""
+        extractor = EntityExtractor({'companies': ["Alpha", "Alpha Bank"], 'people': ["Ada"]})
+        self.assertEqual(extractor.extract("Alpha Bank hired Ada"),
+                         {'companies': ["Alpha Bank"], 'people': ["Ada"], 'concepts': []})
+        self.assertEqual(EntityExtractor({}).extract_mentions("Alpha"), [])
+
+    def test_default_compiled_once(self):
+        """Test that the default extractor is shared."""
+        self.assertIs(get_default(), get_default())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/fetch_cache.py"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.fetch_cache import FetchCache, content_hash
+from knowledge_base.web_extractor import WebExtractor
+
+PAGE = "<html><title>Cached</title><body><p>Barclays notes</p></body></html>"
+ETAG = '"v1"'
+LAST_MODIFIED = "Sun, 18 Oct 2026 10:00:00 GMT"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves PAGE, answering 304 when the request carries its validators."""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = PAGE.encode()
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchCacheTestCase(unittest.TestCase):
+    """FetchCache on a temp database."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = FetchCache(os.path.join(self.temp_dir, "fetch_cache.db"))
+
+    def tearDown(self):
+        self.cache.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestFetchCache(FetchCacheTestCase):
+    """Tests for stored validators and eviction."""
+
+    def test_validators_become_conditional_headers(self):
+        """Test that a stored entry yields If-None-Match and If-Modified-Since."""
+        digest = self.cache.put("https://example.com/a", "body", ETAG, LAST_MODIFIED)
+        entry = self.cache.get("https://example.com/a")
+        self.assertEqual(entry['content_hash'], digest)
+        self.assertEqual(digest, content_hash("body"))
+        self.assertEqual(self.cache.conditional_headers(entry),
+                         {'If-None-Match': ETAG, 'If-Modified-Since': LAST_MODIFIED})
+        self.assertEqual(self.cache.conditional_headers(None), {})
+        self.assertIsNone(self.cache.get("https://example.com/missing"))
+
+    def test_evicts_least_recently_used(self):
+        """Test that eviction keeps the entries read most recently."""
+        self.cache.max_entries = 2
+        with patch('knowledge_base.fetch_cache.time.time', side_effect=[1, 2, 3, 4, 5]):
+            self.cache.put("https://example.com/a", "a")
+            self.cache.put("https://example.com/b", "b")
+            self.cache.get("https://example.com/a")
+            self.cache.put("https://example.com/c", "c")
+
+        self.assertIsNone(self.cache.get("https://example.com/b"))
+        self.assertIsNotNone(self.cache.get("https://example.com/a"))
+        self.assertIsNotNone(self.cache.get("https://example.com/c"))
+
+
+class TestConditionalFetch(FetchCacheTestCase):
+    """Tests for WebExtractor re-fetching through the cache."""
+
+    def setUp(self):
+        super().setUp()
+        PageHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/post"
+        with patch.object(WebExtractor, '_check_firecrawl', return_value=False):
+            self.extractor = WebExtractor(cache=self.cache)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_second_fetch_reuses_cached_body(self):
+        """Test that the re-fetch sends validators and a 304 reuses the cached page."""
+        with patch.dict(os.environ, {'no_proxy': '127.0.0.1'}):
+            first = self.extractor.extract(self.url)
+            second = self.extractor.extract(self.url)
+
+        self.assertFalse(first['not_modified'])
+        self.assertTrue(second['not_modified'])
+        self.assertEqual(second['title'], "Cached")
+        self.assertEqual(second['content'], first['content'])
+
+        self.assertNotIn('If-None-Match', PageHandler.requests[0])
+        self.assertEqual(PageHandler.requests[1]['If-None-Match'], ETAG)
+        self.assertEqual(PageHandler.requests[1]['If-Modified-Since'], LAST_MODIFIED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/relevance.py"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.core import KnowledgeBase
+from knowledge_base.relevance import ACCESS_WEIGHT, RECENCY_WEIGHT, AccessRecorder
+
+
+class TestAccessRecorder(unittest.TestCase):
+    """Tests for the write-behind access recorder."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.kb = KnowledgeBase(os.path.join(self.temp_dir, "kb.db"))
+        self.rust = self.kb.add_source("https://example.com/rust", "article", "Rust", "Rust ownership")
+
+    def tearDown(self):
+        self.kb.access.flush()
+        self.kb.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def access_count(self, source_id):
+        return self.kb.db.connection().execute(
+            "SELECT access_count FROM knowledge_sources WHERE id = ?", (source_id,)
+        ).fetchone()[0]
+
+    def test_one_recorder_per_database(self):
+        """Test that reopening a database reuses its recorder and flush thread."""
+        self.kb.access.record([self.rust])
+        threads = threading.active_count()
+
+        for _ in range(5):
+            kb = KnowledgeBase(self.kb.db_path)
+            self.assertIs(kb.access, self.kb.access)
+            kb.access.record([self.rust])
+        self.assertEqual(threading.active_count(), threads)
+
+        other = KnowledgeBase(os.path.join(self.temp_dir, "other.db"))
+        self.assertIsNot(other.access, self.kb.access)
+
+    def test_flush_all_applies_pending_counts(self):
+        """Test that the exit hook writes counts queued through any KnowledgeBase."""
+        self.kb.access.record([self.rust, self.rust])
+        KnowledgeBase(self.kb.db_path).access.record([self.rust])
+        AccessRecorder.flush_all()
+        self.assertEqual(self.access_count(self.rust), 3)
+
+    def test_search_does_not_write_until_flush(self):
+        """Test that reads only queue accesses, and a flush applies them in one go."""
+        self.kb.search("rust")
+        self.kb.search("ownership")
+        self.assertEqual(self.access_count(self.rust), 0)
+        self.assertEqual(self.kb.access.flush(), 1)
+        self.assertEqual(self.access_count(self.rust), 2)
+        self.assertEqual(self.kb.access.flush(), 0)
+
+
+class TestRelevanceDecay(unittest.TestCase):
+    """Tests for the materialized relevance_score."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.kb = KnowledgeBase(os.path.join(self.temp_dir, "kb.db"))
+        self.old = self.kb.add_source("https://example.com/old", "article", "Old", "kafka")
+        self.new = self.kb.add_source("https://example.com/new", "article", "New", "kafka")
+        conn = self.kb.db.connection()
+        with conn:
+            conn.execute("UPDATE knowledge_sources SET ingested_at = datetime('now', '-10 days') WHERE id = ?",
+                         (self.old,))
+
+    def tearDown(self):
+        self.kb.access.flush()
+        self.kb.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def scores(self):
+        rows = self.kb.db.connection().execute("SELECT id, relevance_score FROM knowledge_sources")
+        return dict(rows.fetchall())
+
+    def expected_scores(self):
+        """The old query-time formula, evaluated now"""
+        rows = self.kb.db.connection().execute(f'''
+            SELECT id, (julianday(ingested_at) - julianday('now')) * {RECENCY_WEIGHT}
+                       + access_count * {ACCESS_WEIGHT}
+            FROM knowledge_sources
+        ''')
+        return dict(rows.fetchall())
+
+    def test_refresh_matches_query_time_formula(self):
+        """Test that after the decay job the stored scores equal the formula at this instant."""
+        self.kb.access.record([self.old] * 30)
+        self.assertEqual(self.kb.refresh_relevance(), 2)
+
+        scores, expected = self.scores(), self.expected_scores()
+        for source_id in (self.old, self.new):
+            self.assertAlmostEqual(scores[source_id], expected[source_id], places=3)
+        self.assertAlmostEqual(scores[self.new] - scores[self.old], 1.0 - 0.3, places=3)
+
+    def test_new_sources_and_accesses_keep_ordering(self):
+        """Test that inserts and flushed accesses are scored on the same anchor as the decay job."""
+        conn = self.kb.db.connection()
+        with conn:
+            conn.execute("UPDATE knowledge_sources SET ingested_at = datetime('now', '-1 days') WHERE id = ?",
+                         (self.new,))
+        self.kb.refresh_relevance()
+        newest = self.kb.add_source("https://example.com/newest", "article", "Newest", "kafka")
+        self.kb.access.record([self.old] * 200)
+        self.kb.access.flush()
+
+        ranked = [r['id'] for r in self.kb.search("kafka")]
+        self.assertEqual(ranked[0], self.old)
+        self.assertEqual(ranked[1:], [newest, self.new])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_base/vector_index.py"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Repository root, so the knowledge_base package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from knowledge_base.core import KnowledgeBase
+
+
+class TestVectorIndexRefresh(unittest.TestCase):
+    """Tests for keeping the vector index in step with knowledge_embeddings."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.kb = KnowledgeBase(os.path.join(self.temp_dir, "kb.db"))
+        self.rust = self.kb.add_source("https://example.com/rust", "article", "Rust", "Rust ownership")
+        self.soup = self.kb.add_source("https://example.com/soup", "article", "Soup", "Tomato soup recipe")
+
+    def tearDown(self):
+        self.kb.access.flush()
+        self.kb.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def vector_ids(self, query):
+        return [r['id'] for r in self.kb.search(query, mode='vector')]
+
+    def test_reembedding_newest_source_stays_searchable(self):
+        """Test that re-embedding the source holding the highest rowids keeps it indexed."""
+        self.kb.add_embeddings(self.rust, ["rust ownership borrow checker"])
+        self.kb.add_embeddings(self.soup, ["tomato soup recipe"])
+        self.assertEqual(len(self.kb.vector_index()), 2)
+
+        self.kb.add_embeddings(self.soup, ["tomato soup recipe with basil"])
+        self.assertEqual(len(self.kb.vector_index()), 2)
+        self.assertIn(self.soup, self.vector_ids("tomato soup basil"))
+
+    def test_upgrades_embeddings_table(self):
+        """Test that a pre-v4 knowledge_embeddings table keeps its rows."""
+        conn = self.kb.db.connection()
+        conn.executescript(f'''
+            DROP TABLE knowledge_embeddings;
+            CREATE TABLE knowledge_embeddings (
+                id TEXT PRIMARY KEY, source_id TEXT, chunk_text TEXT,
+                chunk_index INTEGER, embedding BLOB
+            );
+            INSERT INTO knowledge_embeddings VALUES ('{self.rust}:0', '{self.rust}', 'rust', 0, NULL);
+            PRAGMA user_version = 3;
+        ''')
+        self.kb.db._schema_ready = False
+
+        kb = KnowledgeBase(self.kb.db_path)
+        rows = kb.db.connection().execute("SELECT seq, id FROM knowledge_embeddings").fetchall()
+        self.assertEqual(rows, [(1, f"{self.rust}:0")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Vector Index
+In-memory cosine similarity search over knowledge_embeddings
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from knowledge_base.connection import ConnectionManager
+
+class VectorIndex:
+    """
+    Keeps every chunk embedding in one contiguous, L2-normalized float32
+    matrix so a query is a single matrix-vector product plus a partial sort.
+
+    The index is filled lazily from knowledge_embeddings and refreshed
+    incrementally: only rows with a rowid above the last one seen are read
+    (the table's AUTOINCREMENT key never hands out a rowid twice).
+    Replaced sources are tombstoned and compacted away once enough rows die.
+    """
+
+    def __init__(self, db_path: str, dim: int):
+        self.db_path = db_path
+        self.dim = dim
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._type_codes = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self._dead = 0
+        self._last_rowid = 0
+        self._chunk_ids: List[str] = []
+        self._source_ids: List[str] = []
+        self._rows_by_source: Dict[str, List[int]] = {}
+        self._type_lookup: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def _reserve(self, extra: int):
+        """Grow backing arrays geometrically so appends stay amortized O(1)"""
+        needed = self._size + extra
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        type_codes = np.zeros(capacity, dtype=np.int32)
+        type_codes[:self._size] = self._type_codes[:self._size]
+
+        self._matrix, self._alive, self._type_codes = matrix, alive, type_codes
+
+    def _append(self, rows: List[Tuple]):
+        blob_size = self.dim * 4
+        rows = [r for r in rows if r[3] is not None and len(r[3]) == blob_size]
+        if not rows:
+            return
+
+        self._reserve(len(rows))
+        vectors = np.frombuffer(b''.join(r[3] for r in rows), dtype=np.float32)
+        vectors = vectors.reshape(len(rows), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        start = self._size
+        end = start + len(rows)
+        self._matrix[start:end] = vectors / norms
+        self._alive[start:end] = True
+
+        for offset, (_, chunk_id, source_id, _, source_type) in enumerate(rows):
+            code = self._type_lookup.setdefault(source_type or '', len(self._type_lookup))
+            self._type_codes[start + offset] = code
+            self._chunk_ids.append(chunk_id)
+            self._source_ids.append(source_id)
+            self._rows_by_source.setdefault(source_id, []).append(start + offset)
+
+        self._size = end
+
+    def refresh(self):
+        """Load embedding rows written since the last refresh"""
+        cursor = ConnectionManager.for_path(self.db_path).connection().cursor()
+        cursor.execute('''
+            SELECT e.rowid, e.id, e.source_id, e.embedding, s.source_type
+            FROM knowledge_embeddings e
+            LEFT JOIN knowledge_sources s ON s.id = e.source_id
+            WHERE e.rowid > ?
+            ORDER BY e.rowid
+        ''', (self._last_rowid,))
+        rows = cursor.fetchall()
+
+        if rows:
+            self._last_rowid = rows[-1][0]
+            self._append(rows)
+
+    def discard_source(self, source_id: str):
+        """Tombstone every chunk of a source (e.g. before re-embedding it)"""
+        rows = self._rows_by_source.pop(source_id, [])
+        for row in rows:
+            if self._alive[row]:
+                self._alive[row] = False
+                self._dead += 1
+
+        if self._dead > 1024 and self._dead * 4 > self._size:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._matrix = np.ascontiguousarray(self._matrix[keep])
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._type_codes = self._type_codes[keep]
+        self._chunk_ids = [self._chunk_ids[i] for i in keep]
+        self._source_ids = [self._source_ids[i] for i in keep]
+        self._size = len(keep)
+        self._dead = 0
+
+        self._rows_by_source = {}
+        for row, source_id in enumerate(self._source_ids):
+            self._rows_by_source.setdefault(source_id, []).append(row)
+
+    def search(self, query_vector, k: int = 10,
+               source_type: Optional[str] = None) -> List[Dict]:
+        """
+        Return the top-k sources by cosine similarity of their best chunk.
+        Each hit is {'source_id', 'chunk_id', 'score'}, best first.
+        """
+        if len(self) == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        scores = self._matrix[:self._size] @ (query / norm)
+        mask = self._alive[:self._size]
+        if source_type is not None:
+            code = self._type_lookup.get(source_type)
+            if code is None:
+                return []
+            mask = mask & (self._type_codes[:self._size] == code)
+        scores = np.where(mask, scores, -np.inf)
+
+        # Over-fetch chunks so several chunks of one source still yield k sources
+        candidates = min(self._size, k * 4)
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        top = top[np.argsort(-scores[top])]
+
+        hits = []
+        seen = set()
+        for row in top:
+            if not np.isfinite(scores[row]) or scores[row] <= 0:
+                break
+            source_id = self._source_ids[row]
+            if source_id in seen:
+                continue
+            seen.add(source_id)
+            hits.append({
+                'source_id': source_id,
+                'chunk_id': self._chunk_ids[row],
+                'score': float(scores[row])
+            })
+            if len(hits) == k:
+                break
+
+        return hits
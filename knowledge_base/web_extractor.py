@@ -5,11 +5,16 @@ Uses firecrawl to extract clean content from web pages
 """
 
 import json
+import re
 from typing import Dict, Optional
 
+from knowledge_base.entity_extractor import EntityExtractor, get_default
+
 class WebExtractor:
-    def __init__(self):
+    def __init__(self, cache=None, entities: EntityExtractor = None):
         self.firecrawl_available = self._check_firecrawl()
+        self.cache = cache  # optional FetchCache for conditional requests
+        self.entities = entities or get_default()
     
     def _check_firecrawl(self) -> bool:
         """Check if firecrawl skill is available"""
@@ -59,6 +64,7 @@ class WebExtractor:
     
     def _extract_basic(self, url: str) -> Dict:
         """Basic extraction using urllib (fallback)"""
+        import urllib.error
         import urllib.request
         from html.parser import HTMLParser
         
@@ -80,31 +86,47 @@ class WebExtractor:
                 if not self.in_script:
                     self.text.append(data.strip())
         
+        cached = self.cache.get(url) if self.cache else None
+        headers = {'User-Agent': 'Mozilla/5.0 (compatible; Bot/1.0)'}
+        if cached:
+            headers.update(self.cache.conditional_headers(cached))
+        
         try:
-            req = urllib.request.Request(
-                url,
-                headers={'User-Agent': 'Mozilla/5.0 (compatible; Bot/1.0)'}
-            )
+            req = urllib.request.Request(url, headers=headers)
             
-            with urllib.request.urlopen(req, timeout=15) as response:
-                html = response.read().decode('utf-8', errors='ignore')
-                
-                # Extract title
-                title_match = html.search(r'<title>([^<]+)</title>', html, re.IGNORECASE)
-                title = title_match.group(1) if title_match else 'Unknown'
-                
-                # Extract text
-                parser = TextExtractor()
-                parser.feed(html)
-                text = '\n'.join(parser.text)
-                
-                return {
-                    'url': url,
-                    'title': title,
-                    'content': text[:10000],  # Limit size
-                    'content_type': 'article',
-                    'method': 'basic'
-                }
+            try:
+                with urllib.request.urlopen(req, timeout=15) as response:
+                    html = response.read().decode('utf-8', errors='ignore')
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                not_modified = False
+            except urllib.error.HTTPError as e:
+                if e.code != 304 or not cached:
+                    raise
+                # Unchanged since last fetch: reuse the cached page
+                html = cached['body']
+                not_modified = True
+            
+            if self.cache and not not_modified:
+                self.cache.put(url, html, etag, last_modified)
+            
+            # Extract title
+            title_match = re.search(r'<title>([^<]+)</title>', html, re.IGNORECASE)
+            title = title_match.group(1) if title_match else 'Unknown'
+            
+            # Extract text
+            parser = TextExtractor()
+            parser.feed(html)
+            text = '\n'.join(parser.text)
+            
+            return {
+                'url': url,
+                'title': title,
+                'content': text[:10000],  # Limit size
+                'content_type': 'article',
+                'method': 'basic',
+                'not_modified': not_modified
+            }
                 
         except Exception as e:
             return {
@@ -114,29 +136,8 @@ class WebExtractor:
             }
     
     def extract_entities(self, text: str) -> Dict[str, list]:
-        """Basic entity extraction from text"""
-        import re
-        
-        entities = {
-            'people': [],
-            'companies': [],
-            'concepts': []
-        }
-        
-        # Simple pattern matching for companies
-        company_patterns = [
-            r'\b(OpenAI|Google|Microsoft|Apple|Meta|Amazon|Twitter|X\.com|LinkedIn|Tesla|SpaceX)\b',
-            r'\b(Alpha Bank|HSBC|Barclays|Volante|MTC|Dufrain)\b'
-        ]
-        
-        for pattern in company_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities['companies'].extend(matches)
-        
-        # Remove duplicates
-        entities['companies'] = list(set(entities['companies']))
-        
-        return entities
+        """Entity extraction from text using the gazetteer (see entity_extractor)"""
+        return self.entities.extract(text)
 
 if __name__ == "__main__":
     extractor = WebExtractor()
@@ -7,12 +7,14 @@ Downloads transcripts and metadata from YouTube videos
 import re
 import json
 from typing import Optional, Dict
+import urllib.error
 import urllib.request
 import urllib.parse
 
 class YouTubeExtractor:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.base_url = "https://www.youtube.com/watch"
+        self.cache = cache  # optional FetchCache for conditional requests
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from various YouTube URL formats"""
@@ -61,9 +63,25 @@ class YouTubeExtractor:
             # Try oEmbed first (no API key needed)
             oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
             
-            with urllib.request.urlopen(oembed_url, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                
+            cached = self.cache.get(oembed_url) if self.cache else None
+            req = urllib.request.Request(
+                oembed_url,
+                headers=self.cache.conditional_headers(cached) if cached else {}
+            )
+            
+            try:
+                with urllib.request.urlopen(req, timeout=10) as response:
+                    body = response.read().decode()
+                    if self.cache:
+                        self.cache.put(oembed_url, body, response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified'))
+            except urllib.error.HTTPError as e:
+                if e.code != 304 or not cached:
+                    raise
+                body = cached['body']
+            
+            data = json.loads(body)
+            
             return {
                 'title': data.get('title', 'Unknown'),
                 'author': data.get('author_name', 'Unknown'),
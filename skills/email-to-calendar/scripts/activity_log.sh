@@ -6,6 +6,9 @@
 #   start-session              Start a new processing session
 #   log-skip --email-id <id> --subject <sub> --reason <reason>
 #   log-event --email-id <id> --title <title> --action <created|auto_ignored|pending>
+#   log-batch [--input <file>] Log many entries, one JSON object per line (default: stdin):
+#                                {"type": "skip", "email_id": ..., "subject": ..., "reason": ...}
+#                                {"type": "event", "email_id": ..., "title": ..., "action": ...}
 #   end-session                Finalize the current session
 #   show [--last N]            Show recent activity (default: last session)
 #
@@ -14,6 +17,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 # Parse action
 ACTION="${1:-}"
@@ -24,7 +28,7 @@ ARGS=("$ACTION")
 
 while [[ $# -gt 0 ]]; do
     case "$1" in
-        --email-id|--subject|--title|--reason|--action|--last)
+        --email-id|--subject|--title|--reason|--action|--last|--input)
             ARGS+=("$1" "$2")
             shift 2
             ;;
@@ -64,7 +68,7 @@ case "$ACTION" in
             exit 1
         fi
         ;;
-    start-session|end-session|show)
+    start-session|end-session|show|log-batch)
         # No required arguments
         ;;
     "")
@@ -74,6 +78,7 @@ case "$ACTION" in
         echo "  start-session              Start a new processing session"
         echo "  log-skip --email-id <id> --subject <sub> --reason <reason>"
         echo "  log-event --email-id <id> --title <title> --action <action> [--reason <reason>]"
+        echo "  log-batch [--input <file>] Log many entries (JSON lines, default: stdin)"
         echo "  end-session                Finalize the current session"
         echo "  show [--last N]            Show recent activity (default: last session)"
         exit 1
@@ -81,4 +86,8 @@ case "$ACTION" in
 esac
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/activity_ops.py" "${ARGS[@]}"
+if [ "$ACTION" = "log-batch" ]; then
+    run_util_stdin activity_ops "${ARGS[@]}"
+else
+    run_util activity_ops "${ARGS[@]}"
+fi
@@ -17,6 +17,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 EMAIL_ID=""
 EMAIL_SUBJECT=""
@@ -61,4 +62,4 @@ if [ -n "$EMAIL_SUBJECT" ]; then
     ARGS+=(--email-subject "$EMAIL_SUBJECT")
 fi
 
-python3 "$UTILS_DIR/pending_ops.py" "${ARGS[@]}"
+run_util pending_ops "${ARGS[@]}"
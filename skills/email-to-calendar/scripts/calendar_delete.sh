@@ -6,6 +6,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 EVENT_ID=""
 CALENDAR_ID=""
@@ -44,4 +45,4 @@ if [ -n "$PROVIDER" ]; then
     ARGS+=(--provider "$PROVIDER")
 fi
 
-python3 "$UTILS_DIR/calendar_ops.py" "${ARGS[@]}"
+run_util calendar_ops "${ARGS[@]}"
@@ -7,6 +7,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 CALENDAR_ID=""
 FROM_DT=""
@@ -51,4 +52,4 @@ if [ -n "$PROVIDER" ]; then
     ARGS+=(--provider "$PROVIDER")
 fi
 
-python3 "$UTILS_DIR/calendar_ops.py" "${ARGS[@]}"
+run_util calendar_ops "${ARGS[@]}"
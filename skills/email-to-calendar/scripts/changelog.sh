@@ -10,11 +10,12 @@
 #   get --change-id <id>       Get details of a specific change
 #   can-undo --change-id <id>  Check if a change can still be undone
 #
-# Logs to ~/.openclaw/workspace/memory/email-to-calendar/changelog.json
+# Logs to ~/.openclaw/workspace/memory/email-to-calendar/changelog.d/ (monthly segments, kept a year)
 # Changes older than 24 hours have can_undo=false
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 # Parse action
 ACTION="${1:-}"
@@ -108,4 +109,4 @@ case "$ACTION" in
 esac
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/changelog_ops.py" "${ARGS[@]}"
+run_util changelog_ops "${ARGS[@]}"
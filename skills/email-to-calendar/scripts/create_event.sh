@@ -4,11 +4,12 @@
 #
 # If event_id is provided, updates existing event. Otherwise creates new one.
 # Captures the event ID from JSON output and stores it in events.json tracking.
-# Records changes to changelog.json for undo support.
+# Records changes to the changelog for undo support.
 # Returns the event ID on success for reference.
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 CALENDAR_ID="${1:-primary}"
 TITLE="$2"
@@ -57,18 +58,20 @@ else
     DESCRIPTION="Created by $AGENT_NAME (AI assistant)"
 fi
 
-# Parse date to ISO format using shared parser
-ISO_DATE=$(python3 "$SCRIPT_DIR/utils/date_parser.py" date "$DATE" 2>/dev/null)
+# Parse date and times with one call to the shared parser (bulk mode:
+# one "kind<TAB>value" line in, one result line out)
+{
+    read -r ISO_DATE
+    read -r START_PARSED
+    read -r END_PARSED
+} < <(printf 'date\t%s\ntime\t%s\ntime\t%s\n' "$DATE" "$START_TIME" "$END_TIME" |
+    run_util_stdin date_parser bulk 2>/dev/null)
 
 if [ -z "$ISO_DATE" ]; then
     echo "Could not parse date: $DATE" >&2
     exit 1
 fi
 
-# Parse times using shared parser
-START_PARSED=$(python3 "$SCRIPT_DIR/utils/date_parser.py" time "$START_TIME" 2>/dev/null)
-END_PARSED=$(python3 "$SCRIPT_DIR/utils/date_parser.py" time "$END_TIME" 2>/dev/null)
-
 # Default times if not provided
 if [ -z "$START_PARSED" ]; then
     START_PARSED="09:00"
@@ -112,7 +115,7 @@ create_new_event() {
         CREATE_ARGS+=(--provider "$PROVIDER")
     fi
 
-    RESULT=$(python3 "$UTILS_DIR/calendar_ops.py" "${CREATE_ARGS[@]}" 2>&1)
+    RESULT=$(run_util calendar_ops "${CREATE_ARGS[@]}" 2>&1)
     # Extract event ID from JSON response (nested in data.id)
     EVENT_ID=$(echo "$RESULT" | jq -r '.data.id // empty' 2>/dev/null)
 }
@@ -137,7 +140,7 @@ if [ -n "$EXISTING_EVENT_ID" ]; then
         UPDATE_ARGS+=(--provider "$PROVIDER")
     fi
 
-    RESULT=$(python3 "$UTILS_DIR/calendar_ops.py" "${UPDATE_ARGS[@]}" 2>&1)
+    RESULT=$(run_util calendar_ops "${UPDATE_ARGS[@]}" 2>&1)
 
     # Self-healing: Check if event was deleted externally (404/410 error)
     if echo "$RESULT" | jq -e '.error_type == "not_found"' > /dev/null 2>&1 || echo "$RESULT" | grep -qiE "404|not found|410|gone|does not exist|deleted"; then
@@ -6,6 +6,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 EVENTS_FILE="$HOME/.openclaw/workspace/memory/email-to-calendar/events.json"
 
 # Parse arguments
@@ -35,4 +36,4 @@ if [ ! -f "$EVENTS_FILE" ]; then
 fi
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/event_tracking.py" delete --event-id "$EVENT_ID"
+run_util event_tracking delete --event-id "$EVENT_ID"
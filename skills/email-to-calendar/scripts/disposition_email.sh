@@ -14,6 +14,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 EMAIL_ID=""
 MARK_READ=""
@@ -78,4 +79,4 @@ if [ -n "$PROVIDER" ]; then
     ARGS+=(--provider "$PROVIDER")
 fi
 
-python3 "$UTILS_DIR/disposition_ops.py" "${ARGS[@]}"
+run_util disposition_ops "${ARGS[@]}"
@@ -6,6 +6,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 QUERY=""
 MAX="20"
@@ -50,4 +51,4 @@ if [ -n "$PROVIDER" ]; then
     ARGS+=(--provider "$PROVIDER")
 fi
 
-python3 "$UTILS_DIR/email_ops.py" "${ARGS[@]}"
+run_util email_ops "${ARGS[@]}"
@@ -17,6 +17,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 PENDING_FILE="$HOME/.openclaw/workspace/memory/email-to-calendar/pending_invites.json"
 
 # Check if file exists
@@ -33,4 +34,4 @@ if [ ! -f "$PENDING_FILE" ]; then
 fi
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/pending_ops.py" "$@"
+run_util pending_ops "$@"
@@ -9,6 +9,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 EVENTS_FILE="$HOME/.openclaw/workspace/memory/email-to-calendar/events.json"
 
 # Parse arguments
@@ -60,8 +61,7 @@ if [ ! -f "$EVENTS_FILE" ]; then
 fi
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/event_tracking.py" lookup \
+run_util event_tracking lookup \
     --type "$SEARCH_TYPE" \
     --value "$SEARCH_VALUE" \
-    --validate "$VALIDATE" \
-    --script-dir "$SCRIPT_DIR"
+    --validate "$VALIDATE"
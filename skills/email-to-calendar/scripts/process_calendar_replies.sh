@@ -18,6 +18,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 DRY_RUN=""
 PROVIDER=""
@@ -39,7 +40,7 @@ while [[ $# -gt 0 ]]; do
 done
 
 # Check if auto_dispose_calendar_replies is enabled
-SETTINGS=$(python3 "$UTILS_DIR/disposition_ops.py" settings 2>/dev/null)
+SETTINGS=$(run_util disposition_ops settings 2>/dev/null)
 AUTO_DISPOSE=$(echo "$SETTINGS" | jq -r '.auto_dispose_calendar_replies // true')
 
 if [ "$AUTO_DISPOSE" != "true" ]; then
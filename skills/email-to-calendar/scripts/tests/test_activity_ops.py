@@ -13,7 +13,7 @@ from unittest.mock import patch
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils import activity_ops
+from utils import activity_ops, session_journal
 
 
 class TestStartSession(unittest.TestCase):
@@ -22,7 +22,7 @@ class TestStartSession(unittest.TestCase):
     def setUp(self):
         """Create temp directory and patch file paths."""
         self.temp_dir = tempfile.mkdtemp()
-        self.session_file = os.path.join(self.temp_dir, ".current_session.json")
+        self.session_file = os.path.join(self.temp_dir, ".current_session.jsonl")
         self.activity_file = os.path.join(self.temp_dir, "activity.json")
         self.session_patcher = patch.object(activity_ops, 'SESSION_FILE', self.session_file)
         self.activity_patcher = patch.object(activity_ops, 'ACTIVITY_FILE', self.activity_file)
@@ -42,8 +42,7 @@ class TestStartSession(unittest.TestCase):
             activity_ops.start_session()
 
         self.assertTrue(os.path.exists(self.session_file))
-        with open(self.session_file, 'r') as f:
-            session = json.load(f)
+        session = session_journal.SessionJournal(self.session_file).fold()
 
         self.assertIn("timestamp", session)
         self.assertEqual(session["emails_scanned"], 0)
@@ -67,7 +66,7 @@ class TestLogSkip(unittest.TestCase):
     def setUp(self):
         """Create temp directory and patch file paths."""
         self.temp_dir = tempfile.mkdtemp()
-        self.session_file = os.path.join(self.temp_dir, ".current_session.json")
+        self.session_file = os.path.join(self.temp_dir, ".current_session.jsonl")
         self.session_patcher = patch.object(activity_ops, 'SESSION_FILE', self.session_file)
         self.session_patcher.start()
 
@@ -89,8 +88,7 @@ class TestLogSkip(unittest.TestCase):
             reason="No events found"
         )
 
-        with open(self.session_file, 'r') as f:
-            session = json.load(f)
+        session = session_journal.SessionJournal(self.session_file).fold()
 
         self.assertEqual(len(session["skipped"]), 1)
         self.assertEqual(session["skipped"][0]["email_id"], "email123")
@@ -123,7 +121,7 @@ class TestLogEvent(unittest.TestCase):
     def setUp(self):
         """Create temp directory and patch file paths."""
         self.temp_dir = tempfile.mkdtemp()
-        self.session_file = os.path.join(self.temp_dir, ".current_session.json")
+        self.session_file = os.path.join(self.temp_dir, ".current_session.jsonl")
         self.session_patcher = patch.object(activity_ops, 'SESSION_FILE', self.session_file)
         self.session_patcher.start()
 
@@ -145,8 +143,7 @@ class TestLogEvent(unittest.TestCase):
             reason="Extracted from invite"
         )
 
-        with open(self.session_file, 'r') as f:
-            session = json.load(f)
+        session = session_journal.SessionJournal(self.session_file).fold()
 
         self.assertEqual(len(session["events_extracted"]), 1)
         self.assertEqual(session["events_extracted"][0]["email_id"], "email123")
@@ -162,8 +159,7 @@ class TestLogEvent(unittest.TestCase):
 
         activity_ops.log_event(email_id="email1", title="Event 1")
 
-        with open(self.session_file, 'r') as f:
-            session = json.load(f)
+        session = session_journal.SessionJournal(self.session_file).fold()
         self.assertEqual(session["emails_with_events"], 1)
 
     def test_log_event_same_email_counted_once(self):
@@ -175,8 +171,7 @@ class TestLogEvent(unittest.TestCase):
         activity_ops.log_event(email_id="email1", title="Event 1")
         activity_ops.log_event(email_id="email1", title="Event 2")
 
-        with open(self.session_file, 'r') as f:
-            session = json.load(f)
+        session = session_journal.SessionJournal(self.session_file).fold()
 
         self.assertEqual(len(session["events_extracted"]), 2)
         self.assertEqual(session["emails_with_events"], 1)  # Only counted once
@@ -205,7 +200,7 @@ class TestEndSession(unittest.TestCase):
     def setUp(self):
         """Create temp directory and patch file paths."""
         self.temp_dir = tempfile.mkdtemp()
-        self.session_file = os.path.join(self.temp_dir, ".current_session.json")
+        self.session_file = os.path.join(self.temp_dir, ".current_session.jsonl")
         self.activity_file = os.path.join(self.temp_dir, "activity.json")
         self.session_patcher = patch.object(activity_ops, 'SESSION_FILE', self.session_file)
         self.activity_patcher = patch.object(activity_ops, 'ACTIVITY_FILE', self.activity_file)
@@ -249,12 +244,7 @@ class TestEndSession(unittest.TestCase):
         self.assertFalse(os.path.exists(self.session_file))
 
     def test_end_session_without_session_handles_gracefully(self):
-        """Test that end_session without active session doesn't crash.
-
-        Note: When session file doesn't exist, load_json returns {} which
-        is not None, so the function proceeds and creates an empty session
-        entry. This tests that it at least doesn't crash.
-        """
+        """Test that end_session without active session doesn't crash or log."""
         # Ensure no session file exists
         if os.path.exists(self.session_file):
             os.remove(self.session_file)
@@ -264,9 +254,8 @@ class TestEndSession(unittest.TestCase):
             activity_ops.end_session()
 
         output = captured.getvalue()
-        # The function doesn't crash - it processes the empty dict
-        # Output will show "Session ended: 0 scanned, 0 with events, 0 skipped"
-        self.assertIn("Session ended", output)
+        self.assertIn("No active session to end.", output)
+        self.assertFalse(os.path.exists(self.activity_file))
 
     def test_end_session_limits_history(self):
         """Test that end_session keeps only MAX_SESSIONS sessions."""
@@ -286,6 +275,99 @@ class TestEndSession(unittest.TestCase):
         self.assertEqual(len(activity["sessions"]), 50)  # MAX_SESSIONS
 
 
+class TestLogBatch(unittest.TestCase):
+    """Tests for the session journal and log-batch."""
+
+    def setUp(self):
+        """Create temp directory and patch file paths."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.session_file = os.path.join(self.temp_dir, ".current_session.jsonl")
+        self.activity_file = os.path.join(self.temp_dir, "activity.json")
+        self.patchers = [
+            patch.object(activity_ops, 'SESSION_FILE', self.session_file),
+            patch.object(activity_ops, 'ACTIVITY_FILE', self.activity_file),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        with patch('sys.stdout', io.StringIO()):
+            activity_ops.start_session()
+
+    def tearDown(self):
+        """Clean up temp directory and stop patchers."""
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_main(self, *argv, stdin=""):
+        captured = io.StringIO()
+        with patch.object(sys, 'argv', ["activity_ops.py", *argv]), \
+                patch('sys.stdin', io.StringIO(stdin)), patch('sys.stdout', captured):
+            activity_ops.main()
+        return captured.getvalue()
+
+    def test_log_appends_without_reading(self):
+        """Test that logging appends one line and never re-reads the journal."""
+        with patch.object(session_journal.SessionJournal, 'fold') as fold:
+            for i in range(3):
+                activity_ops.log_skip(email_id=f"e{i}", subject="S", reason="R")
+        fold.assert_not_called()
+        with open(self.session_file) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+    def test_log_batch_from_stdin(self):
+        """Test that log-batch logs every line in one invocation."""
+        lines = [json.dumps({"type": "skip", "email_id": f"s{i}", "subject": "Ad", "reason": "No events"})
+                 for i in range(500)]
+        lines += [
+            json.dumps({"type": "event", "email_id": "e1", "title": "Fair", "action": "created"}),
+            json.dumps({"type": "event", "email_id": "e1", "title": "Party", "reason": "needs RSVP"}),
+        ]
+        output = self.run_main("log-batch", stdin="\n".join(lines) + "\n")
+        self.assertIn("Logged 502 entries", output)
+
+        output = self.run_main("end-session")
+        self.assertIn("500 scanned, 1 with events, 500 skipped", output)
+        with open(self.activity_file) as f:
+            session = json.load(f)["sessions"][0]
+        self.assertEqual(session["events_extracted"][1],
+                         {"email_id": "e1", "title": "Party", "action": "pending", "reason": "needs RSVP"})
+
+    def test_log_batch_rejects_invalid_line(self):
+        """Test that an invalid line logs nothing and names the line."""
+        stdin = json.dumps({"type": "skip", "email_id": "s1", "reason": "R"}) + "\n" + \
+            json.dumps({"type": "event", "email_id": "e1"}) + "\n"
+        captured = io.StringIO()
+        with patch('sys.stderr', captured), self.assertRaises(SystemExit):
+            self.run_main("log-batch", stdin=stdin)
+        self.assertIn("line 2", captured.getvalue())
+        self.assertEqual(session_journal.SessionJournal(self.session_file).fold()["emails_scanned"], 0)
+
+    def test_log_batch_missing_input_file(self):
+        """Test that a missing --input file is reported, not raised."""
+        captured = io.StringIO()
+        with patch('sys.stderr', captured), self.assertRaises(SystemExit):
+            self.run_main("log-batch", "--input", os.path.join(self.temp_dir, "missing.jsonl"))
+        self.assertIn("Error:", captured.getvalue())
+
+    def test_legacy_session_adopted(self):
+        """Test that a session started before the journal existed is kept."""
+        os.remove(self.session_file)
+        legacy_file = os.path.join(self.temp_dir, ".current_session.json")
+        with open(legacy_file, 'w') as f:
+            json.dump({"timestamp": "2026-02-01T09:00:00", "emails_scanned": 1, "emails_with_events": 1,
+                       "skipped": [{"email_id": "s1", "subject": "Ad", "reason": "No events"}],
+                       "events_extracted": [{"email_id": "e1", "title": "Fair", "action": "created"}]}, f)
+
+        activity_ops.log_skip(email_id="s2", subject="Ad", reason="No events")
+        output = self.run_main("end-session")
+        self.assertIn("2 scanned, 1 with events, 2 skipped", output)
+        self.assertFalse(os.path.exists(legacy_file))
+        with open(self.activity_file) as f:
+            session = json.load(f)["sessions"][0]
+        self.assertEqual(session["timestamp"], "2026-02-01T09:00:00")
+        self.assertEqual(session["events_extracted"][0]["title"], "Fair")
+
+
 class TestShowActivity(unittest.TestCase):
     """Tests for show_activity function."""
 
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Tests for utils/calendar_mirror.py"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# calendar_mirror imports calendar_ops as a top-level module; share that instance
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'utils'))
+
+import calendar_mirror
+import calendar_ops
+
+DAY = (date.today() + timedelta(days=10)).isoformat()
+NEXT_DAY = (date.today() + timedelta(days=11)).isoformat()
+
+
+def gog_event(event_id, summary, day=DAY, hour="10:00:00"):
+    return {"id": event_id, "summary": summary, "start": {"dateTime": f"{day}T{hour}-05:00"}}
+
+
+class MirrorTestCase(unittest.TestCase):
+    """Temp mirror database with calendar calls mocked."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.calendar = [
+            gog_event("evt1", "Team Meeting"),
+            gog_event("evt2", "Science Fair Night", hour="18:00:00"),
+            gog_event("evt3", "Soccer Practice", day=NEXT_DAY),
+        ]
+        self.patchers = [
+            patch.object(calendar_mirror, 'MIRROR_FILE', os.path.join(self.temp_dir, "mirror.db")),
+            patch.object(calendar_ops, 'get_calendar_id', return_value="primary"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.search = patch.object(calendar_ops, 'search_events', side_effect=self.fake_search).start()
+        self.sync = patch.object(calendar_ops, 'sync_events', return_value={
+            "success": False, "error": "unsupported", "error_type": "unsupported"
+        }).start()
+
+    def tearDown(self):
+        for mirror in list(calendar_mirror._mirrors.values()):
+            mirror.close()
+        patch.stopall()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fake_search(self, calendar_id=None, from_dt=None, to_dt=None, provider=None):
+        return {"success": True, "data": [
+            e for e in self.calendar if from_dt[:10] <= e["start"]["dateTime"][:10] <= to_dt[:10]
+        ]}
+
+    def check(self, title, day=DAY):
+        return calendar_mirror.check_duplicate(title, day, "primary")
+
+
+class TestDuplicateCheck(MirrorTestCase):
+    """Tests for check_duplicate against the mirror."""
+
+    def test_checks_use_one_sync(self):
+        """Test that many checks cost one calendar search."""
+        self.assertEqual(self.check("team meeting")["id"], "evt1")
+        self.assertEqual(self.check("Science Fair")["id"], "evt2")
+        self.assertEqual(self.check("Practice", NEXT_DAY)["id"], "evt3")
+        self.assertIsNone(self.check("Team Meeting", NEXT_DAY))
+        self.assertIsNone(self.check("Board Meeting"))
+        self.assertEqual(self.search.call_count, 1)
+
+    def test_title_rules(self):
+        """Test the keyword threshold for short and long titles."""
+        # Two keywords: both must appear
+        self.assertIsNone(self.check("Team Lunch"))
+        # Keywords match inside words, like the old substring check
+        self.assertEqual(self.check("Meet")["id"], "evt1")
+        # Longer titles: half the first five keywords is enough
+        self.assertEqual(self.check("Annual Science Fair Awards")["id"], "evt2")
+        self.assertIsNone(self.check("Annual Spring Fair Awards Ceremony"))
+        # Only the first five keywords count
+        self.assertIsNone(self.check("The Annual Spring Awards Ceremony Science Fair Night"))
+        self.assertIsNone(self.check("!!!"))
+
+    def test_stale_mirror_resynced(self):
+        """Test that a mirror older than the TTL is synced again."""
+        self.check("Team Meeting")
+        self.calendar.append(gog_event("evt4", "Parent Teacher Conference"))
+        self.assertIsNone(self.check("Parent Teacher Conference"))
+
+        with patch.object(calendar_mirror.time, 'time',
+                          return_value=time.time() + calendar_mirror.MIRROR_TTL + 1):
+            self.assertEqual(self.check("Parent Teacher Conference")["id"], "evt4")
+        self.assertEqual(self.search.call_count, 2)
+
+    def test_stale_check_refetches_only_its_segment(self):
+        """Test that without a sync token only the checked date's segment is re-fetched."""
+        self.check("Team Meeting")
+        later = time.time() + calendar_mirror.MIRROR_TTL + 1
+        with patch.object(calendar_mirror.time, 'time', return_value=later):
+            self.assertEqual(self.check("Team Meeting")["id"], "evt1")
+            self.check("Team Meeting")
+        segment_from, segment_to = calendar_mirror.segment_bounds(DAY)
+        self.assertEqual(self.search.call_count, 2)
+        self.assertEqual(self.search.call_args[0][1:3],
+                         (f"{segment_from}T00:00:00", f"{segment_to}T23:59:59"))
+
+        with patch.object(calendar_mirror.time, 'time',
+                          return_value=time.time() + calendar_mirror.WINDOW_REFRESH + 1):
+            self.check("Team Meeting")
+            window_to = (date.today() + timedelta(days=calendar_mirror.WINDOW_FUTURE_DAYS)).isoformat()
+        self.assertEqual(self.search.call_count, 3)
+        self.assertEqual(self.search.call_args[0][2], f"{window_to}T23:59:59")
+
+    def test_incomplete_listing_keeps_mirror(self):
+        """Test that a paged or malformed listing never replaces mirrored events."""
+        self.check("Team Meeting")
+        mirror = calendar_mirror.open_mirror()
+        for data in ({"events": [], "nextPageToken": "p2"}, "unexpected"):
+            self.search.side_effect = None
+            self.search.return_value = {"success": True, "data": data}
+            result = mirror.sync("primary", full=True)
+            self.assertEqual(result["error_type"], "incomplete")
+        self.assertEqual(mirror.find_duplicate("primary", "Team Meeting", DAY)["id"], "evt1")
+
+    def test_outside_window_searches_directly(self):
+        """Test dates the mirror doesn't cover fall back to a search."""
+        far = (date.today() + timedelta(days=calendar_mirror.WINDOW_FUTURE_DAYS + 30)).isoformat()
+        self.calendar.append(gog_event("evt9", "Graduation", day=far))
+        self.assertEqual(self.check("Graduation", far)["id"], "evt9")
+        self.assertEqual(self.search.call_count, 2)
+
+    def test_outside_window_dict_listing(self):
+        """Test that a dict-shaped listing outside the window is read, not iterated."""
+        far = (date.today() + timedelta(days=calendar_mirror.WINDOW_FUTURE_DAYS + 30)).isoformat()
+        self.check("Team Meeting")
+        self.search.side_effect = None
+        self.search.return_value = {"success": True, "data": {
+            "events": [gog_event("evt9", "Graduation", day=far)]}}
+        self.assertEqual(self.check("Graduation", far)["id"], "evt9")
+
+    def test_own_writes_written_through(self):
+        """Test that events created through calendar_ops are mirrored at once."""
+        self.check("Team Meeting")
+        created = gog_event("new1", "Book Fair")
+        with patch.object(calendar_ops, 'get_provider', return_value="gog"), \
+                patch.object(calendar_ops, '_run_gog_command', return_value={"success": True, "data": created}):
+            calendar_ops.create_event("Book Fair", f"{DAY}T09:00:00", f"{DAY}T10:00:00", calendar_id="primary")
+        self.assertEqual(self.check("Book Fair")["id"], "new1")
+
+        with patch.object(calendar_ops, 'get_provider', return_value="gog"), \
+                patch.object(calendar_ops, '_run_gog_command', return_value={"success": True, "data": None}):
+            calendar_ops.delete_event("evt1", calendar_id="primary")
+        self.assertIsNone(self.check("Team Meeting"))
+        self.assertEqual(self.search.call_count, 1)
+
+
+class TestIncrementalSync(MirrorTestCase):
+    """Tests for sync-token based syncing."""
+
+    def test_incremental_sync(self):
+        """Test that later syncs send the cursor and apply only changes."""
+        self.sync.return_value = {"success": True, "data": {
+            "items": self.calendar, "sync_token": "t1", "full": True}}
+        mirror = calendar_mirror.open_mirror()
+        self.assertEqual(mirror.sync("primary")["mode"], "full")
+
+        self.sync.return_value = {"success": True, "data": {"items": [
+            {"id": "evt1", "status": "cancelled"},
+            gog_event("evt2", "Science Fair Rescheduled", day=NEXT_DAY),
+        ], "sync_token": "t2", "full": False}}
+        self.assertEqual(mirror.sync("primary")["mode"], "incremental")
+
+        self.assertEqual(self.sync.call_args[0][1], "t1")
+        self.assertEqual(mirror.state("primary")["sync_token"], "t2")
+        self.assertIsNone(mirror.find_duplicate("primary", "Team Meeting", DAY))
+        self.assertIsNone(mirror.find_duplicate("primary", "Science Fair", DAY))
+        self.assertEqual(mirror.find_duplicate("primary", "Science Fair", NEXT_DAY)["id"], "evt2")
+        self.search.assert_not_called()
+
+    def test_expired_cursor_starts_over(self):
+        """Test that an expired sync token triggers a full sync."""
+        mirror = calendar_mirror.open_mirror()
+        self.sync.return_value = {"success": True, "data": {
+            "items": self.calendar, "sync_token": "t1", "full": True}}
+        mirror.sync("primary")
+        self.sync.side_effect = [
+            {"success": False, "error": "Gone", "status": 410, "error_type": "sync_expired"},
+            {"success": True, "data": {"items": self.calendar[:1], "sync_token": "t9", "full": True}},
+        ]
+        mirror.sync("primary")
+        self.assertIsNone(self.sync.call_args[0][1])
+        self.assertIsNone(mirror.find_duplicate("primary", "Soccer Practice", NEXT_DAY))
+        self.assertEqual(mirror.state("primary")["sync_token"], "t9")
+
+
+if __name__ == '__main__':
+    unittest.main()
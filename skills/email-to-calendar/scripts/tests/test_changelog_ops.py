@@ -14,7 +14,7 @@ from unittest.mock import patch
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils import changelog_ops
+from utils import changelog_ops, changelog_segments
 
 
 class TestLogCreate(unittest.TestCase):
@@ -43,11 +43,10 @@ class TestLogCreate(unittest.TestCase):
             email_id="email456"
         )
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        self.assertEqual(len(data["changes"]), 1)
-        change = data["changes"][0]
+        self.assertEqual(len(changes), 1)
+        change = changes[0]
         self.assertEqual(change["action"], "create")
         self.assertEqual(change["event_id"], "evt123")
         self.assertEqual(change["calendar_id"], "primary")
@@ -96,10 +95,9 @@ class TestLogUpdate(unittest.TestCase):
             after_json=after
         )
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        change = data["changes"][0]
+        change = changes[0]
         self.assertEqual(change["action"], "update")
         self.assertEqual(change["before"]["summary"], "Old Title")
         self.assertEqual(change["after"]["summary"], "New Title")
@@ -114,10 +112,9 @@ class TestLogUpdate(unittest.TestCase):
             after_json="also not json"
         )
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        change = data["changes"][0]
+        change = changes[0]
         self.assertIsNone(change["before"])
         self.assertIsNone(change["after"])
 
@@ -147,10 +144,9 @@ class TestLogDelete(unittest.TestCase):
             before_json=before
         )
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        change = data["changes"][0]
+        change = changes[0]
         self.assertEqual(change["action"], "delete")
         self.assertEqual(change["before"]["summary"], "Deleted Event")
         self.assertIsNone(change["after"])
@@ -344,8 +340,8 @@ class TestGetChange(unittest.TestCase):
         self.assertEqual(cm.exception.code, 1)
 
 
-class TestMaxChangesLimit(unittest.TestCase):
-    """Tests for MAX_CHANGES limit enforcement."""
+class TestRetention(unittest.TestCase):
+    """Tests for segment-level retention."""
 
     def setUp(self):
         """Create temp directory and patch file path."""
@@ -359,26 +355,35 @@ class TestMaxChangesLimit(unittest.TestCase):
         self.patcher.stop()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
-    def test_limits_to_max_changes(self):
-        """Test that changelog is limited to MAX_CHANGES entries."""
-        # Create changelog with MAX_CHANGES entries
-        changes = [{"id": f"chg_{i:03d}"} for i in range(100)]
+    def test_keeps_more_than_old_limit(self):
+        """Test that the changelog is no longer capped at 100 entries."""
+        now = datetime.now().isoformat()
+        changes = [{"id": f"chg_{i:03d}", "timestamp": now} for i in range(100)]
         with open(self.changelog_file, 'w') as f:
             json.dump({"changes": changes}, f)
 
-        # Add one more
-        changelog_ops.log_create(
-            event_id="evt_new",
-            calendar_id="primary",
-            summary="New Event"
-        )
+        changelog_ops.log_create(event_id="evt_new", calendar_id="primary", summary="New Event")
+
+        changes = changelog_segments.read_changes(self.changelog_file)
+        self.assertEqual(len(changes), 101)
+        self.assertEqual(changes[0]["id"], "chg_000")
+
+    def test_drops_segments_past_retention(self):
+        """Test that whole months older than a year are dropped."""
+        now = datetime.now()
+        changes = [
+            {"id": "chg_old", "timestamp": (now - timedelta(days=400)).isoformat()},
+            {"id": "chg_recent", "timestamp": (now - timedelta(days=40)).isoformat()},
+        ]
+        with open(self.changelog_file, 'w') as f:
+            json.dump({"changes": changes}, f)
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        new_id = changelog_ops.log_create(event_id="evt_new", calendar_id="primary", summary="New Event")
 
-        self.assertEqual(len(data["changes"]), 100)
-        # Oldest should be removed
-        self.assertNotEqual(data["changes"][0]["id"], "chg_000")
+        ids = [change["id"] for change in changelog_segments.read_changes(self.changelog_file)]
+        self.assertEqual(ids, ["chg_recent", new_id])
+        segments = os.listdir(os.path.join(self.temp_dir, "changelog.d"))
+        self.assertNotIn(changelog_segments.segment_name(changes[0]["timestamp"]), segments)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Tests for utils/changelog_segments.py"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import changelog_segments
+
+
+class SegmentsTestCase(unittest.TestCase):
+    """Temp directory holding a changelog.json path."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.changelog_file = os.path.join(self.temp_dir, "changelog.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_legacy(self, changes):
+        with open(self.changelog_file, 'w') as f:
+            json.dump({"changes": changes}, f)
+
+    def segment_bytes(self):
+        directory = changelog_segments.segments_dir_for(self.changelog_file)
+        segments = {}
+        for name in os.listdir(directory):
+            if name.endswith(".jsonl") and name != changelog_segments.INDEX_NAME:
+                with open(os.path.join(directory, name), 'rb') as f:
+                    segments[name] = f.read()
+        return segments
+
+
+class TestAppendAndRead(SegmentsTestCase):
+    """Tests for appending, reading and undoing changes."""
+
+    def test_append_and_get(self):
+        """Test that appended changes can be read back by ID and in order."""
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+        now = datetime.now().isoformat()
+        ids = [changelog.append({"timestamp": now, "action": "create", "event_id": f"evt{i}",
+                                 "summary": "Réunion", "can_undo": True}) for i in range(3)]
+
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(changelog.get(ids[1])["event_id"], "evt1")
+        self.assertEqual(changelog.get(ids[1])["summary"], "Réunion")
+        self.assertEqual([c["id"] for c in changelog.recent(2)], ids[1:])
+        self.assertIsNone(changelog.get("chg_missing"))
+
+    def test_undo_appends_to_index_only(self):
+        """Test that marking a change undone leaves the segments untouched."""
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+        now = datetime.now().isoformat()
+        first = changelog.append({"timestamp": now, "action": "create", "can_undo": True})
+        second = changelog.append({"timestamp": now, "action": "delete", "can_undo": True})
+        before = self.segment_bytes()
+
+        self.assertTrue(changelog.mark_undone(second, now))
+        self.assertFalse(changelog.mark_undone("chg_missing", now))
+
+        self.assertEqual(self.segment_bytes(), before)
+        change = changelog.get(second)
+        self.assertFalse(change["can_undo"])
+        self.assertEqual(change["undone_at"], now)
+        since = (datetime.now() - timedelta(hours=24)).isoformat()
+        self.assertEqual([e["id"] for e in changelog.undoable(since)], [first])
+
+    def test_torn_last_line_skipped(self):
+        """Test that a partial line left by a crash doesn't break reads."""
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+        change_id = changelog.append({"timestamp": datetime.now().isoformat(), "can_undo": True})
+        with open(changelog.index_file, 'a') as f:
+            f.write('{"seq": 2, "id": "chg_')
+
+        self.assertEqual(changelog.get(change_id)["id"], change_id)
+        next_id = changelog.append({"timestamp": datetime.now().isoformat()})
+        self.assertEqual(changelog.get(next_id)["id"], next_id)
+        self.assertEqual([c["id"] for c in changelog.recent(5)], [change_id, next_id])
+
+
+class TestUndoableFromTail(SegmentsTestCase):
+    """Tests for answering undo queries from the end of the index."""
+
+    def test_stops_at_undo_window(self):
+        """Test that history older than the window is never parsed."""
+        old = (datetime.now() - timedelta(days=3)).isoformat()
+        self.write_legacy([{"id": f"chg_{i:04d}", "timestamp": old, "can_undo": True}
+                           for i in range(2000)])
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+        recent = changelog.append({"timestamp": datetime.now().isoformat(), "can_undo": True})
+
+        since = (datetime.now() - timedelta(hours=24)).isoformat()
+        with patch.object(changelog_segments, '_parse', wraps=changelog_segments._parse) as parse:
+            self.assertEqual([e["id"] for e in changelog.undoable(since)], [recent])
+        self.assertLessEqual(parse.call_count, 2)
+
+
+class TestLegacyImport(SegmentsTestCase):
+    """Tests for importing changelog.json."""
+
+    def test_imported_once_into_monthly_segments(self):
+        """Test that the legacy file is split by month and renamed."""
+        self.write_legacy([
+            {"id": "chg_1", "timestamp": "2026-01-15T10:00:00", "can_undo": False},
+            {"id": "chg_2", "timestamp": "2026-02-01T09:00:00", "can_undo": True},
+            {"id": "chg_3"},
+        ])
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+
+        self.assertFalse(os.path.exists(self.changelog_file))
+        self.assertTrue(os.path.exists(self.changelog_file + ".migrated"))
+        self.assertIn("2026-01.jsonl", self.segment_bytes())
+        self.assertEqual(changelog.get("chg_2")["timestamp"], "2026-02-01T09:00:00")
+        self.assertEqual([c["id"] for c in changelog.all_changes()], ["chg_1", "chg_2", "chg_3"])
+
+        changelog_segments.open_changelog(self.changelog_file)
+        self.assertEqual(len(changelog_segments.read_changes(self.changelog_file)), 3)
+
+    def test_import_after_crash_skips_imported_changes(self):
+        """Test that an import interrupted before the rename isn't duplicated."""
+        self.write_legacy([{"id": "chg_1"}, {"id": "chg_2"}])
+        with patch.object(changelog_segments.os, 'replace', side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                changelog_segments.open_changelog(self.changelog_file)
+        self.assertTrue(os.path.exists(self.changelog_file))
+
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+        self.assertEqual([c["id"] for c in changelog.all_changes()], ["chg_1", "chg_2"])
+        self.assertFalse(os.path.exists(self.changelog_file))
+
+    def test_import_legacy_after_another_caller(self):
+        """Test that a caller losing the race finds the file gone and imports nothing."""
+        self.write_legacy([{"id": "chg_1"}])
+        changelog = changelog_segments.open_changelog(self.changelog_file)
+        self.assertEqual(changelog.import_legacy(self.changelog_file), 0)
+        self.assertEqual(len(changelog.all_changes()), 1)
+
+    def test_read_changes_does_not_write(self):
+        """Test that read_changes leaves a legacy file in place."""
+        self.write_legacy([{"id": "chg_1"}])
+        self.assertEqual(changelog_segments.read_changes(self.changelog_file), [{"id": "chg_1"}])
+        self.assertTrue(os.path.exists(self.changelog_file))
+        self.assertFalse(os.path.exists(changelog_segments.segments_dir_for(self.changelog_file)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,12 @@
 import unittest
 import sys
 import os
+import io
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.date_parser import parse_date, parse_time
+from utils.date_parser import parse_date, parse_time, parse_stream
 
 
 class TestParseDate(unittest.TestCase):
@@ -66,6 +67,29 @@ class TestParseDate(unittest.TestCase):
         """Test that leading/trailing whitespace is handled."""
         self.assertEqual(parse_date("  February 11, 2026  "), "2026-02-11")
 
+    def test_day_first_numeric_when_month_invalid(self):
+        """Test that '13/02/2026' falls back to day/month order."""
+        self.assertEqual(parse_date("13/02/2026"), "2026-02-13")
+
+    def test_year_first_slashes(self):
+        """Test parsing '2026/02/11' format."""
+        self.assertEqual(parse_date("2026/02/11"), "2026-02-11")
+
+    def test_date_inside_text(self):
+        """Test that a 'Month DD, YYYY' date is found inside other text."""
+        self.assertEqual(parse_date("Friday, February 13, 2026"), "2026-02-13")
+
+    def test_invalid_calendar_date(self):
+        """Test that an impossible numeric date returns empty."""
+        self.assertEqual(parse_date("2026-02-30"), "")
+
+    def test_results_cached(self):
+        """Test that repeated inputs are answered from the cache."""
+        parse_date.cache_clear()
+        parse_date("March 3, 2026")
+        parse_date("March 3, 2026")
+        self.assertEqual(parse_date.cache_info().hits, 1)
+
 
 class TestParseTime(unittest.TestCase):
     """Tests for parse_time function."""
@@ -127,5 +151,23 @@ class TestParseTime(unittest.TestCase):
         self.assertEqual(parse_time("  2:30 PM  "), "14:30")
 
 
+
+class TestParseStream(unittest.TestCase):
+    """Tests for the bulk stdin mode."""
+
+    def test_mixed_lines(self):
+        """Test one result line per input line, in order."""
+        lines = io.StringIO(
+            "date\tFebruary 5, 2026\n"
+            "time\t3:00 PM\n"
+            "time\t\n"
+            "2026-02-11\r\n"
+            "date\tnot a date\n"
+        )
+        out = io.StringIO()
+        parse_stream(lines, out)
+        self.assertEqual(out.getvalue().split("\n"), ["2026-02-05", "15:00", "", "2026-02-11", "", ""])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -270,6 +270,124 @@ class TestLookupEvents(unittest.TestCase):
         results = json.loads(output)
         self.assertEqual(len(results), 0)
 
+    def lookup(self, search_type, search_value=""):
+        import io
+        captured = io.StringIO()
+        with patch('sys.stdout', captured):
+            event_tracking.lookup_events(search_type=search_type, search_value=search_value)
+        return json.loads(captured.getvalue())
+
+    def test_lookups_follow_track_and_delete(self):
+        """Test lookups after tracked events are added, renamed and removed."""
+        with patch('sys.stdout'):
+            event_tracking.delete_tracked_event("evt1")
+            event_tracking.track_event(event_id="evt4", email_id="email1", summary="Board Meeting")
+            event_tracking.track_event(event_id="evt2", summary="Project Kickoff")
+
+        self.assertEqual([e["event_id"] for e in self.lookup("email_id", "email1")], ["evt3", "evt4"])
+        self.assertEqual([e["event_id"] for e in self.lookup("summary", "meeting")], ["evt3", "evt4"])
+        self.assertEqual([e["event_id"] for e in self.lookup("summary", "kickoff")], ["evt2"])
+        self.assertEqual(self.lookup("summary", "review"), [])
+        self.assertEqual(self.lookup("event_id", "evt4")[0]["summary"], "Board Meeting")
+
+    def test_short_summary_query(self):
+        """Test that short summary queries match substrings."""
+        self.assertEqual(len(self.lookup("summary", "ee")), 2)
+
+
+
+class TestLookupValidate(unittest.TestCase):
+    """Tests for lookup_events with validate=True."""
+
+    def setUp(self):
+        """Create temp directory and patch file path."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.events_file = os.path.join(self.temp_dir, "events.json")
+        self.patcher = patch.object(event_tracking, 'EVENTS_FILE', self.events_file)
+        self.patcher.start()
+
+        test_data = {
+            "events": [
+                {"event_id": "evt1", "calendar_id": "primary", "summary": "A", "start": "2026-02-11T10:00:00"},
+                {"event_id": "evt2", "calendar_id": "primary", "summary": "B", "start": "2026-02-13T14:00:00"},
+                {"event_id": "evt3", "calendar_id": "primary", "summary": "C", "start": "2026-02-20T09:00:00"},
+                {"event_id": "evt4", "calendar_id": "primary", "summary": "D", "start": "2026-05-01T09:00:00"},
+                {"event_id": "evt5", "calendar_id": "family", "summary": "E", "start": "2026-02-11T09:00:00"},
+                {"event_id": "evt6", "calendar_id": "primary", "summary": "F", "start": ""}
+            ]
+        }
+        with open(self.events_file, 'w') as f:
+            json.dump(test_data, f)
+
+    def tearDown(self):
+        """Clean up temp directory and stop patcher."""
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def validate(self, search_results):
+        """Run lookup --validate with calendar searches answered from search_results."""
+        import io
+        calls = []
+
+        def fake_search(calendar_id=None, from_dt=None, to_dt=None, provider=None):
+            calls.append((calendar_id, from_dt, to_dt))
+            return search_results(calendar_id, from_dt)
+
+        captured = io.StringIO()
+        with patch('calendar_ops.search_events', side_effect=fake_search), \
+                patch('sys.stdout', captured), patch('sys.stderr'):
+            event_tracking.lookup_events(search_type="list", validate=True)
+        return json.loads(captured.getvalue()), sorted(calls)
+
+    def test_searches_grouped_by_calendar_and_window(self):
+        """Test that nearby dates on one calendar share a single search."""
+        found = {"evt1", "evt2", "evt3", "evt4", "evt5"}
+        results, calls = self.validate(
+            lambda cal, start: {"success": True, "data": [{"id": i} for i in found]}
+        )
+
+        self.assertEqual(calls, [
+            ("family", "2026-02-11T00:00:00", "2026-02-11T23:59:59"),
+            ("primary", "2026-02-11T00:00:00", "2026-02-20T23:59:59"),
+            ("primary", "2026-05-01T00:00:00", "2026-05-01T23:59:59"),
+        ])
+        self.assertEqual(len(results), 6)
+
+    def test_orphans_removed_in_one_write(self):
+        """Test that events missing from their calendar are dropped together."""
+        with patch.object(event_tracking, 'save_json', wraps=event_tracking.save_json) as save:
+            results, _ = self.validate(
+                lambda cal, start: {"success": True, "data": [{"id": "evt1"}, {"id": "evt4"}]}
+            )
+
+        self.assertEqual([e["event_id"] for e in results], ["evt1", "evt4", "evt6"])
+        save.assert_called_once()
+        with open(self.events_file) as f:
+            remaining = [e["event_id"] for e in json.load(f)["events"]]
+        self.assertEqual(remaining, ["evt1", "evt4", "evt6"])
+
+    def test_failed_search_keeps_events(self):
+        """Test that a failed search assumes its events still exist."""
+        def search_results(cal, start):
+            if cal == "family":
+                return {"success": False, "error": "Command timed out"}
+            return {"success": True, "data": [{"id": "evt1"}, {"id": "evt2"}, {"id": "evt3"}]}
+
+        results, _ = self.validate(search_results)
+        self.assertEqual([e["event_id"] for e in results], ["evt1", "evt2", "evt3", "evt5", "evt6"])
+
+    def test_paged_listing_keeps_events(self):
+        """Test that a paged listing is not read as events missing from the calendar."""
+        def search_results(cal, start):
+            if cal == "primary" and start.startswith("2026-02"):
+                return {"success": True, "data": {"events": [{"id": "evt1"}], "nextPageToken": "x"}}
+            return {"success": True, "data": {"events": [{"id": "evt4"}, {"id": "evt5"}]}}
+
+        with patch.object(event_tracking, 'save_json') as save:
+            results, _ = self.validate(search_results)
+        self.assertEqual(len(results), 6)
+        save.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
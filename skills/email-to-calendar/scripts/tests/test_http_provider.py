@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Tests for utils/http_provider.py against a local mock Google API server"""
+
+import unittest
+import sys
+import os
+import json
+import email
+import tempfile
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import http_provider, calendar_ops, email_ops
+
+TOKEN = "tok-1"
+PAGE_SIZE = 2
+
+
+class MockGoogleApi:
+    """In-memory calendar and mailbox answering like the REST APIs."""
+
+    def __init__(self):
+        self.events = {}
+        self.messages = {
+            f"m{i}": {"id": f"m{i}", "labelIds": ["INBOX", "UNREAD"]} for i in range(5)
+        }
+        self.next_id = 1
+        self.requests = []
+        self.connections = set()
+        self.token_requests = 0
+        self.drop_next = False  # process the next call, then close without replying
+
+    def route(self, method, target, body):
+        """Answer one API call: returns (status, JSON-able body or None)."""
+        parts = urlsplit(target)
+        path = [unquote(p) for p in parts.path.strip("/").split("/")]
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+        if path[:3] == ["calendar", "v3", "calendars"] and path[4:5] == ["events"]:
+            if len(path) == 5 and method == "GET":
+                items = sorted(self.events.values(), key=lambda e: e["id"])
+                start = int(query.get("pageToken", 0))
+                page = {"items": items[start:start + PAGE_SIZE]}
+                if start + PAGE_SIZE < len(items):
+                    page["nextPageToken"] = str(start + PAGE_SIZE)
+                return 200, page
+            if len(path) == 5 and method == "POST":
+                event = dict(body, id=f"evt{self.next_id}", sendUpdates=query.get("sendUpdates"))
+                self.next_id += 1
+                self.events[event["id"]] = event
+                return 200, event
+            event = self.events.get(path[5]) if len(path) == 6 else None
+            if event is None:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            if method == "GET":
+                return 200, event
+            if method == "PATCH":
+                event.update(body)
+                return 200, event
+            if method == "DELETE":
+                del self.events[event["id"]]
+                return 204, None
+
+        if path[:4] == ["gmail", "v1", "users", "me"] and path[4:5] == ["messages"]:
+            if len(path) == 5 and method == "GET":
+                ids = sorted(self.messages)[:int(query.get("maxResults", 100))]
+                return 200, {"messages": [{"id": i} for i in ids]}
+            if path[5:] == ["batchModify"]:
+                for message_id in body["ids"]:
+                    self._relabel(self.messages[message_id], body)
+                return 204, None
+            message = self.messages.get(path[5])
+            if message is None:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            if path[6:] == ["modify"]:
+                self._relabel(message, body)
+                return 200, message
+            return 200, dict(message, format=query.get("format"))
+
+        return 404, {"error": {"code": 404, "message": f"No route {method} {target}"}}
+
+    @staticmethod
+    def _relabel(message, body):
+        labels = [l for l in message["labelIds"] if l not in body.get("removeLabelIds", [])]
+        message["labelIds"] = labels + body.get("addLabelIds", [])
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch()
+
+    do_POST = do_PATCH = do_DELETE = do_GET
+
+    def dispatch(self):
+        api = self.server.api
+        api.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        api.requests.append((self.command, self.path))
+
+        if self.path == "/token":
+            api.token_requests += 1
+            return self.reply(200, {"access_token": TOKEN, "expires_in": 3600})
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            return self.reply(401, {"error": {"code": 401, "message": "Invalid Credentials"}})
+        if self.path.startswith("/batch/"):
+            return self.batch(raw)
+        status, body = api.route(self.command, self.path, json.loads(raw) if raw else None)
+        if api.drop_next:
+            api.drop_next = False
+            self.close_connection = True
+            return
+        self.reply(status, body)
+
+    def batch(self, raw):
+        """Answer a multipart/mixed batch by routing each part."""
+        message = email.message_from_bytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + raw
+        )
+        boundary = "batch_response"
+        out = []
+        for part in message.get_payload():
+            inner = part.get_payload()
+            request_line, _, rest = inner.partition("\r\n")
+            method, target, _ = request_line.split(" ")
+            _, _, body = rest.partition("\r\n\r\n")
+            status, result = self.server.api.route(
+                method, target, json.loads(body) if body.strip() else None
+            )
+            content_id = part["Content-ID"].strip("<>")
+            payload = json.dumps(result) if result is not None else ""
+            out.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n{payload}\r\n"
+            )
+        data = ("".join(out) + f"--{boundary}--\r\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/mixed; boundary={boundary}")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class HttpProviderTestCase(unittest.TestCase):
+    """Mock API server plus a client configured for the refresh flow."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.server.api = MockGoogleApi()
+        self.api = self.server.api
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.token_file = os.path.join(self.temp_dir, "token.json")
+        self.patcher = patch.object(http_provider, 'TOKEN_FILE', self.token_file)
+        self.patcher.start()
+        self.settings = {
+            "api_base": base,
+            "token_uri": f"{base}/token",
+            "client_id": "client",
+            "client_secret": "secret",
+            "refresh_token": "refresh",
+        }
+        self.client = http_provider.ApiClient(self.settings)
+
+    def tearDown(self):
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create(self, summary, **kwargs):
+        return http_provider.create_event(
+            self.client, "primary", summary=summary,
+            from_dt="2026-03-01T10:00:00", to_dt="2026-03-01T11:00:00", **kwargs
+        )
+
+
+class TestCalendar(HttpProviderTestCase):
+    """Tests for the calendar functions."""
+
+    def test_create_search_update_delete(self):
+        """Test the event lifecycle over one keep-alive connection."""
+        created = self.create("Team Meeting", attendees=["a@example.com"], reminders=["popup:1h"])
+        self.assertTrue(created["success"])
+        event_id = created["data"]["id"]
+        self.assertEqual(created["data"]["sendUpdates"], "all")
+        self.assertEqual(created["data"]["reminders"]["overrides"], [{"method": "popup", "minutes": 60}])
+        self.assertIn("dateTime", created["data"]["start"])
+
+        result = http_provider.update_event(
+            self.client, "primary", event_id, summary="Renamed", add_attendees=["b@example.com"]
+        )
+        self.assertTrue(result["success"])
+        self.assertEqual(result["data"]["summary"], "Renamed")
+        self.assertEqual([a["email"] for a in result["data"]["attendees"]], ["a@example.com", "b@example.com"])
+
+        self.assertTrue(http_provider.delete_event(self.client, "primary", event_id)["success"])
+        missing = http_provider.delete_event(self.client, "primary", event_id)
+        self.assertFalse(missing["success"])
+        self.assertEqual(missing["error_type"], "not_found")
+
+        self.assertEqual(len(self.api.connections), 1)
+        self.assertEqual(self.api.token_requests, 1)
+
+    def test_search_follows_pages(self):
+        """Test that paged event lists are returned as one list."""
+        for i in range(5):
+            self.create(f"Event {i}")
+        result = http_provider.search_events(self.client, "primary", "2026-03-01", "2026-03-02")
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["data"]), 5)
+
+    def test_dropped_post_not_resent(self):
+        """Test that a create the server may have processed is not sent again."""
+        self.create("First")
+        self.api.drop_next = True
+        result = self.create("Second")
+        self.assertFalse(result["success"])
+        self.assertEqual(len(self.api.events), 2)
+
+        self.assertTrue(self.create("Third")["success"])
+        self.assertEqual(len(self.api.events), 3)
+
+    def test_dropped_get_resent(self):
+        """Test that an idempotent call is retried on a new connection."""
+        self.create("First")
+        self.api.drop_next = True
+        result = http_provider.search_events(self.client, "primary", "2026-03-01", "2026-03-02")
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["data"]), 1)
+
+    def test_unparseable_date_is_a_failed_result(self):
+        """Test that a bad date is reported like the gog provider does, not raised."""
+        result = http_provider.create_event(
+            self.client, "primary", summary="X", from_dt="tomorrow 10am", to_dt="2026-03-01T11:00:00")
+        self.assertFalse(result["success"])
+        self.assertIn("Invalid date", result["error"])
+        self.assertFalse(http_provider.search_events(self.client, "primary", "soon")["success"])
+        self.assertEqual(self.api.requests, [])
+
+    def test_batch_one_round_trip(self):
+        """Test that many operations share a single batch request."""
+        self.create("Existing")
+        self.api.requests.clear()
+        ops = [
+            {"action": "create", "summary": f"Event {i}",
+             "from_dt": "2026-03-02", "to_dt": "2026-03-03"} for i in range(10)
+        ]
+        ops += [
+            {"action": "update", "event_id": "evt1", "summary": "Updated"},
+            {"action": "delete", "event_id": "missing"},
+            {"action": "bogus"},
+        ]
+        results = http_provider.batch_calendar(self.client, "primary", ops)
+
+        self.assertEqual(self.api.requests, [("POST", "/batch/calendar/v3")])
+        self.assertTrue(all(r["success"] for r in results[:11]))
+        self.assertEqual(results[0]["data"]["start"], {"date": "2026-03-02"})
+        self.assertEqual(results[10]["data"]["summary"], "Updated")
+        self.assertEqual(results[11]["error_type"], "not_found")
+        self.assertFalse(results[12]["success"])
+        self.assertEqual(len(self.api.events), 11)
+
+    def test_batch_split_at_limit(self):
+        """Test that batches larger than BATCH_LIMIT are split."""
+        ops = [{"action": "create", "summary": "E", "from_dt": "2026-03-02", "to_dt": "2026-03-03"}] * 5
+        with patch.object(http_provider, 'BATCH_LIMIT', 2):
+            results = http_provider.batch_calendar(self.client, "primary", ops)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(sum(1 for r in self.api.requests if r[1].startswith("/batch/")), 2)
+
+
+class TestTokens(HttpProviderTestCase):
+    """Tests for token caching."""
+
+    def test_token_cached_on_disk(self):
+        """Test that a second client reuses the cached token."""
+        self.create("One")
+        other = http_provider.ApiClient(self.settings)
+        try:
+            self.assertTrue(http_provider.search_events(other, "primary")["success"])
+        finally:
+            other.session.close()
+        self.assertEqual(self.api.token_requests, 1)
+        self.assertEqual(os.stat(self.token_file).st_mode & 0o777, 0o600)
+
+    def test_rejected_token_refreshed(self):
+        """Test that a 401 drops the cached token and retries once."""
+        client = http_provider.ApiClient(self.settings)
+        with open(self.token_file, 'w') as f:
+            json.dump({client.tokens.key: {"access_token": "revoked",
+                                           "expires_at": time.time() + 3600}}, f)
+        try:
+            self.assertTrue(http_provider.search_events(client, "primary")["success"])
+        finally:
+            client.session.close()
+        self.assertEqual(self.api.token_requests, 1)
+
+    def test_missing_credentials(self):
+        """Test that missing OAuth settings give an error result."""
+        client = http_provider.ApiClient({"api_base": self.settings["api_base"]})
+        result = http_provider.search_events(client, "primary")
+        self.assertFalse(result["success"])
+        self.assertIn("refresh_token", result["error"])
+
+
+class TestGmail(HttpProviderTestCase):
+    """Tests for the Gmail functions."""
+
+    def test_search_fetches_messages_in_batch(self):
+        """Test that search lists ids then fetches messages in one request."""
+        result = http_provider.search_emails(self.client, "in:inbox", max_results=3)
+        self.assertTrue(result["success"])
+        self.assertEqual([m["id"] for m in result["data"]], ["m0", "m1", "m2"])
+        self.assertEqual(result["data"][0]["format"], "metadata")
+        paths = [p for _, p in self.api.requests if p != "/token"]
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(paths[1], "/batch/gmail/v1")
+
+    def test_modify_many_messages(self):
+        """Test that labels on many messages change with one call."""
+        result = http_provider.modify_emails(
+            self.client, ["m0", "m1", "m2"], remove_labels=["UNREAD", "INBOX"]
+        )
+        self.assertTrue(result["success"])
+        self.assertEqual(self.api.messages["m1"]["labelIds"], [])
+        self.assertEqual(self.api.messages["m3"]["labelIds"], ["INBOX", "UNREAD"])
+
+        single = http_provider.modify_emails(self.client, ["m4"], add_labels=["Processed"])
+        self.assertEqual(single["data"]["labelIds"], ["INBOX", "UNREAD", "Processed"])
+
+
+
+class TestProviderDispatch(HttpProviderTestCase):
+    """Tests for calendar_ops/email_ops with "provider": "http"."""
+
+    def setUp(self):
+        super().setUp()
+        config_file = os.path.join(self.temp_dir, "config.json")
+        with open(config_file, 'w') as f:
+            json.dump({"provider": "http", "calendar_id": "primary",
+                       "http": {"api_base": self.settings["api_base"], "access_token": TOKEN}}, f)
+        self.config_patchers = [
+            patch.object(calendar_ops, 'CONFIG_FILE', config_file),
+            patch.object(email_ops, 'CONFIG_FILE', config_file),
+        ]
+        for patcher in self.config_patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.config_patchers:
+            patcher.stop()
+        super().tearDown()
+
+    def test_calendar_ops_batch(self):
+        """Test that batch_events goes through the http provider."""
+        results = calendar_ops.batch_events([
+            {"action": "create", "summary": "A", "from_dt": "2026-03-02", "to_dt": "2026-03-03"},
+            {"action": "create", "summary": "B", "from_dt": "2026-03-04", "to_dt": "2026-03-05"},
+            {"action": "search", "from_dt": "2026-03-01", "to_dt": "2026-03-31"},
+        ])
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(self.api.requests, [("POST", "/batch/calendar/v3")])
+        self.assertEqual(len(calendar_ops.search_events()["data"]), 2)
+
+    def test_email_ops_modify_emails(self):
+        """Test that modify_emails is one request with the http provider."""
+        result = email_ops.modify_emails(["m0", "m1"], remove_labels=["UNREAD"])
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertEqual(self.api.messages["m0"]["labelIds"], ["INBOX"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -179,6 +179,17 @@ class TestSaveJson(unittest.TestCase):
             loaded = json.load(f)
         self.assertEqual(loaded, test_data)
 
+    def test_failed_write_keeps_original(self):
+        """Test that a write failing mid-way leaves the old file intact."""
+        filepath = os.path.join(self.temp_dir, "events.json")
+        save_json(filepath, {"events": [1, 2, 3]})
+
+        with self.assertRaises(TypeError):
+            save_json(filepath, {"events": [object()]})
+
+        self.assertEqual(load_json(filepath), {"events": [1, 2, 3]})
+        self.assertEqual(os.listdir(self.temp_dir), ["events.json"])
+
     def test_roundtrip(self):
         """Test that save followed by load returns same data."""
         filepath = os.path.join(self.temp_dir, "roundtrip.json")
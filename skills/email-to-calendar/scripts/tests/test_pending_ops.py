@@ -9,7 +9,7 @@ import tempfile
 import shutil
 import io
 from unittest.mock import patch
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -412,5 +412,138 @@ class TestAddPendingInvite(unittest.TestCase):
         self.assertEqual(len(data["invites"]), 1)
 
 
+def days_from_now(days):
+    return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestArchiveAndIndex(unittest.TestCase):
+    """Tests for archiving past invites and the date/status index."""
+
+    def setUp(self):
+        """Create temp directory with a past and an upcoming invite."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pending_file = os.path.join(self.temp_dir, "pending_invites.json")
+        self.patcher = patch.object(pending_ops, 'PENDING_FILE', self.pending_file)
+        self.patcher.start()
+        with open(self.pending_file, 'w') as f:
+            json.dump({"invites": [
+                {"id": "inv1", "email_id": "email1", "email_subject": "Old",
+                 "events": [{"title": "Last Month", "date": days_from_now(-30), "status": "pending"}]},
+                {"id": "inv2", "email_id": "email2", "email_subject": "School",
+                 "reminder_count": 0,
+                 "events": [
+                     {"title": "Fair Day 2", "date": days_from_now(9), "status": "pending"},
+                     {"title": "Fair Day 1", "date": days_from_now(8), "status": "pending"}
+                 ]}
+            ]}, f)
+
+    def tearDown(self):
+        """Clean up temp directory and stop patcher."""
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def list_json(self, today=None, **kwargs):
+        captured = io.StringIO()
+        with patch('sys.stdout', captured):
+            pending_ops.list_pending_json(today=today, **kwargs)
+        return json.loads(captured.getvalue())
+
+    def invite_ids(self):
+        with open(self.pending_file, 'r') as f:
+            return [inv["id"] for inv in json.load(f)["invites"]]
+
+    def test_past_invites_archived(self):
+        """Test that invites with only past events move to the archive."""
+        self.assertEqual([e["title"] for e in self.list_json()], ["Fair Day 2", "Fair Day 1"])
+
+        self.assertEqual(self.invite_ids(), ["inv2"])
+        archive_file = os.path.join(self.temp_dir, "pending_invites.archive.jsonl")
+        with open(archive_file, 'r') as f:
+            archived = [json.loads(line) for line in f]
+        self.assertEqual(archived[0]["id"], "inv1")
+        self.assertIn("archived_at", archived[0])
+
+    def test_today_override_does_not_archive(self):
+        """Test that listing for a --today date only previews, never archives."""
+        self.assertEqual(self.list_json(today=days_from_now(10)), [])
+        self.assertEqual(self.invite_ids(), ["inv1", "inv2"])
+        self.assertFalse(os.path.exists(
+            os.path.join(self.temp_dir, "pending_invites.archive.jsonl")))
+
+        titles = [e["title"] for e in self.list_json(today=days_from_now(-60))]
+        self.assertEqual(titles, ["Last Month", "Fair Day 2", "Fair Day 1"])
+
+    def test_undated_invites_not_archived(self):
+        """Test that invites with an undated event, or no events, are kept."""
+        pending_ops.add_pending_invite("email3", "TBD", [
+            {"title": "Date TBD", "status": "pending"},
+            {"title": "Last Week", "date": days_from_now(-7), "status": "pending"}])
+        pending_ops.add_pending_invite("email4", "Empty", [])
+        self.list_json()
+
+        with open(self.pending_file, 'r') as f:
+            kept = [inv["email_id"] for inv in json.load(f)["invites"]]
+        self.assertEqual(kept, ["email2", "email3", "email4"])
+
+    def test_index_persisted_and_reused(self):
+        """Test that the index is written next to the file and reused."""
+        self.list_json()
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "pending_invites.index.json")))
+
+        with patch('pending_index.PendingIndex.build') as build:
+            self.assertEqual(len(self.list_json()), 2)
+        build.assert_not_called()
+
+    def test_index_follows_add_and_status_changes(self):
+        """Test listing after invites are replaced and events change status."""
+        from utils import invite_ops
+        self.list_json()
+        pending_ops.add_pending_invite("email3", "Club", [
+            {"title": "Meetup", "date": days_from_now(1), "status": "pending"}])
+        pending_ops.add_pending_invite("email2", "School", [
+            {"title": "Fair", "date": days_from_now(8), "status": "pending"}])
+        with patch.object(invite_ops, 'PENDING_FILE', self.pending_file), patch('sys.stdout'):
+            invite_ops.update_invite_status(email_id="email3", event_title="meetup",
+                                            new_status="created")
+        self.assertEqual([e["title"] for e in self.list_json()], ["Fair"])
+
+        with patch.object(invite_ops, 'PENDING_FILE', self.pending_file), patch('sys.stdout'):
+            invite_ops.update_invite_status(email_id="email3", event_title="meetup",
+                                            new_status="pending")
+        self.assertEqual([e["title"] for e in self.list_json()], ["Fair", "Meetup"])
+
+    def test_reminders_bumped_once_per_invite(self):
+        """Test that an invite with several listed events is reminded once."""
+        self.list_json(update_reminded=True)
+        self.list_json(update_reminded=True)
+        with open(self.pending_file, 'r') as f:
+            self.assertEqual(json.load(f)["invites"][0]["reminder_count"], 2)
+
+        pending = self.list_json(update_reminded=True, auto_dismiss=True)
+        self.assertEqual(pending[0]["reminder_count"], 2)
+        self.assertEqual(self.list_json(auto_dismiss=True), [])
+        with open(self.pending_file, 'r') as f:
+            statuses = [e["status"] for e in json.load(f)["invites"][0]["events"]]
+        self.assertEqual(statuses, ["auto_dismissed", "auto_dismissed"])
+
+    def test_auto_dismiss_covers_past_and_undated_events(self):
+        """Test that every pending event of a maxed-out invite is dismissed."""
+        pending_ops.add_pending_invite("email3", "TBD", [
+            {"title": "Date TBD", "status": "pending"},
+            {"title": "Last Week", "date": days_from_now(-7), "status": "pending"},
+            {"title": "Next Week", "date": days_from_now(7), "status": "pending"}])
+        with open(self.pending_file, 'r') as f:
+            data = json.load(f)
+        data["invites"][-1]["reminder_count"] = pending_ops.MAX_REMINDERS
+        with open(self.pending_file, 'w') as f:
+            json.dump(data, f)
+
+        titles = [e["title"] for e in self.list_json(auto_dismiss=True)]
+        self.assertEqual(titles, ["Fair Day 2", "Fair Day 1"])
+        with open(self.pending_file, 'r') as f:
+            statuses = [e["status"] for e in json.load(f)["invites"][-1]["events"]]
+        self.assertEqual(statuses, ["auto_dismissed"] * 3)
+
+
 if __name__ == '__main__':
     unittest.main()
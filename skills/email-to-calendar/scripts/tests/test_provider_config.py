@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Tests for utils/provider_config.py"""
+
+import unittest
+import sys
+import os
+import json
+import time
+import tempfile
+import shutil
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import provider_config
+
+
+class TestLoadConfig(unittest.TestCase):
+    """Tests for load_config function."""
+
+    def setUp(self):
+        """Create temp directory with a config file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.temp_dir, "config.json")
+        self.write_config({"provider": "gog", "calendar_id": "primary"})
+
+    def tearDown(self):
+        """Clean up temp directory and cached configs."""
+        provider_config._configs.clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_config(self, config):
+        with open(self.config_file, 'w') as f:
+            json.dump(config, f)
+
+    def test_parsed_once_while_unchanged(self):
+        """Test that repeated loads reuse the parsed config."""
+        with patch.object(provider_config, 'load_json', wraps=provider_config.load_json) as load:
+            for _ in range(5):
+                config = provider_config.load_config(self.config_file)
+        self.assertEqual(config["calendar_id"], "primary")
+        load.assert_called_once()
+
+    def test_reloaded_after_change(self):
+        """Test that a modified config file is re-read."""
+        provider_config.load_config(self.config_file)
+        self.write_config({"provider": "gog", "calendar_id": "family@group.calendar.google.com"})
+        config = provider_config.load_config(self.config_file)
+        self.assertEqual(config["calendar_id"], "family@group.calendar.google.com")
+
+    def test_missing_file_returns_empty(self):
+        """Test that a missing config file gives an empty dict."""
+        os.remove(self.config_file)
+        self.assertEqual(provider_config.load_config(self.config_file), {})
+
+
+class TestGogSupports(unittest.TestCase):
+    """Tests for gog_supports function."""
+
+    def setUp(self):
+        """Put a fake gog on PATH that counts its invocations."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.calls_file = os.path.join(self.temp_dir, "calls")
+        self.gog = os.path.join(self.temp_dir, "gog")
+        self.write_gog("--send-updates string")
+        self.patchers = [
+            patch.dict(os.environ, {"PATH": self.temp_dir}),
+            patch.object(provider_config, 'CAPABILITIES_FILE',
+                         os.path.join(self.temp_dir, "cache", "capabilities.json")),
+            patch.object(provider_config, '_capabilities', None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        """Clean up temp directory and stop patchers."""
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_gog(self, help_text):
+        with open(self.gog, 'w') as f:
+            f.write(f"#!/bin/sh\necho x >> '{self.calls_file}'\necho '{help_text}'\n")
+        os.chmod(self.gog, 0o755)
+
+    def probe_count(self):
+        if not os.path.exists(self.calls_file):
+            return 0
+        with open(self.calls_file) as f:
+            return len(f.readlines())
+
+    def new_process(self):
+        """Forget the in-memory cache, as a fresh CLI invocation would."""
+        provider_config._capabilities = None
+
+    def test_probe_cached_on_disk(self):
+        """Test that gog is probed once across processes."""
+        self.assertTrue(provider_config.gog_supports("send_updates"))
+        self.new_process()
+        self.assertTrue(provider_config.gog_supports("send_updates"))
+        self.assertEqual(self.probe_count(), 1)
+
+    def test_binary_change_invalidates(self):
+        """Test that replacing the gog binary triggers a new probe."""
+        self.assertTrue(provider_config.gog_supports("send_updates"))
+        self.write_gog("no such flag")
+        stat = os.stat(self.gog)
+        os.utime(self.gog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.new_process()
+        self.assertFalse(provider_config.gog_supports("send_updates"))
+        self.assertEqual(self.probe_count(), 2)
+
+    def test_expired_entry_reprobed(self):
+        """Test that entries older than the TTL are probed again."""
+        provider_config.gog_supports("send_updates")
+        with patch.object(provider_config.time, 'time',
+                          return_value=time.time() + provider_config.CAPABILITY_TTL + 1):
+            provider_config.gog_supports("send_updates")
+        self.assertEqual(self.probe_count(), 2)
+
+    def test_gog_not_installed(self):
+        """Test that a missing gog binary means unsupported."""
+        os.remove(self.gog)
+        self.assertFalse(provider_config.gog_supports("send_updates"))
+
+    def test_unknown_capability(self):
+        """Test that capabilities without a probe are unsupported."""
+        self.assertFalse(provider_config.gog_supports("time_travel"))
+        self.assertEqual(self.probe_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Tests for utils/state_store.py and the SQLite paths of the *_ops modules"""
+
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import shutil
+import io
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# The ops modules import the store as a top-level module; share that instance
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'utils'))
+
+import state_store
+from utils import (
+    event_tracking, pending_ops, invite_ops, changelog_ops, undo_ops, activity_ops
+)
+
+
+class StateStoreTestCase(unittest.TestCase):
+    """Temp state directory with every ops module pointed at it."""
+
+    def setUp(self):
+        """Create temp directory and patch every file path."""
+        self.temp_dir = tempfile.mkdtemp()
+        path = lambda name: os.path.join(self.temp_dir, name)
+        self.patchers = [
+            patch.object(event_tracking, 'EVENTS_FILE', path("events.json")),
+            patch.object(pending_ops, 'PENDING_FILE', path("pending_invites.json")),
+            patch.object(invite_ops, 'PENDING_FILE', path("pending_invites.json")),
+            patch.object(changelog_ops, 'CHANGELOG_FILE', path("changelog.json")),
+            patch.object(undo_ops, 'CHANGELOG_FILE', path("changelog.json")),
+            patch.object(activity_ops, 'ACTIVITY_FILE', path("activity.json")),
+            patch.object(activity_ops, 'SESSION_FILE', path(".current_session.jsonl")),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        """Close stores, clean up temp directory and stop patchers."""
+        for store in list(state_store._stores.values()):
+            store.close()
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_json(self, name, data):
+        with open(os.path.join(self.temp_dir, name), 'w') as f:
+            json.dump(data, f)
+
+    def capture(self, func, *args, **kwargs):
+        captured = io.StringIO()
+        with patch('sys.stdout', captured):
+            func(*args, **kwargs)
+        return captured.getvalue()
+
+
+class TestMigrate(StateStoreTestCase):
+    """Tests for the JSON -> SQLite migrator."""
+
+    def test_migrate_imports_all_files(self):
+        """Test that every JSON state file is imported."""
+        self.write_json("events.json", {"events": [
+            {"event_id": "evt1", "calendar_id": "primary", "email_id": "email1",
+             "summary": "Team Meeting", "start": "2026-02-11T10:00:00",
+             "created_at": "2026-02-01T00:00:00", "updated_at": None}
+        ]})
+        self.write_json("pending_invites.json", {"invites": [
+            {"id": "inv_1", "email_id": "email1", "email_subject": "Party",
+             "events": [{"title": "Party", "date": "2099-01-01", "status": "pending"}],
+             "created_at": "2026-02-01T00:00:00", "reminder_count": 1, "last_reminded": None}
+        ]})
+        self.write_json("changelog.json", {"changes": [
+            {"id": "chg_1", "timestamp": datetime.now().isoformat(), "action": "create",
+             "event_id": "evt1", "after": {"summary": "Team Meeting"}, "can_undo": True}
+        ]})
+        self.write_json("activity.json", {"sessions": [
+            {"timestamp": "2026-02-01T00:00:00", "emails_scanned": 1, "emails_with_events": 0,
+             "skipped": [{"email_id": "e9", "subject": "Spam", "reason": "No events"}],
+             "events_extracted": []}
+        ]})
+
+        counts = state_store.migrate(self.temp_dir)
+
+        self.assertEqual(counts, {"events": 1, "invites": 1, "changes": 1, "sessions": 1})
+        store = state_store.open_state_store(event_tracking.EVENTS_FILE)
+        self.assertEqual(store.find_events("list")[0]["summary"], "Team Meeting")
+        self.assertEqual(store.list_invites()[0]["events"][0]["title"], "Party")
+        self.assertEqual(store.get_change("chg_1")["event_id"], "evt1")
+        self.assertEqual(store.recent_sessions(5)[0]["skipped"][0]["reason"], "No events")
+
+    def test_migrate_reids_duplicate_changes(self):
+        """Test that changes sharing an id (full old changelogs) are all imported."""
+        now = datetime.now().isoformat()
+        self.write_json("changelog.json", {"changes": [
+            {"id": "chg_20260201_101", "timestamp": now, "action": "create", "event_id": "evt1"},
+            {"id": "chg_20260201_101", "timestamp": now, "action": "delete", "event_id": "evt2"},
+        ]})
+
+        self.assertEqual(state_store.migrate(self.temp_dir)["changes"], 2)
+        store = state_store.open_state_store(event_tracking.EVENTS_FILE)
+        self.assertEqual(store.get_change("chg_20260201_101")["event_id"], "evt1")
+        self.assertEqual(store.get_change("chg_20260201_101-2")["event_id"], "evt2")
+
+    def test_migrate_refuses_existing_db(self):
+        """Test that migrating twice raises instead of overwriting."""
+        state_store.migrate(self.temp_dir)
+        with self.assertRaises(FileExistsError):
+            state_store.migrate(self.temp_dir)
+
+    def test_uses_wal_mode(self):
+        """Test that the database is in WAL mode."""
+        state_store.migrate(self.temp_dir)
+        conn = sqlite3.connect(os.path.join(self.temp_dir, "state.db"))
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        conn.close()
+
+    def test_json_used_until_migrated(self):
+        """Test that ops keep using the JSON files without state.db."""
+        self.assertIsNone(state_store.open_state_store(event_tracking.EVENTS_FILE))
+        self.capture(event_tracking.track_event, event_id="evt1", summary="Test")
+        self.assertTrue(os.path.exists(event_tracking.EVENTS_FILE))
+
+
+class TestEventTrackingSqlite(StateStoreTestCase):
+    """Tests for event tracking on the SQLite store."""
+
+    def setUp(self):
+        super().setUp()
+        state_store.migrate(self.temp_dir)
+
+    def lookup(self, search_type, value=""):
+        return json.loads(self.capture(event_tracking.lookup_events, search_type, value))
+
+    def test_track_update_delete(self):
+        """Test the tracked event lifecycle."""
+        self.capture(event_tracking.track_event, event_id="evt1", email_id="email1",
+                     summary="Original", start="2026-02-11T14:00:00")
+        self.capture(event_tracking.track_event, event_id="evt2", email_id="email1",
+                     summary="Other Meeting")
+        self.capture(event_tracking.update_tracked_event, event_id="evt1", summary="Team Meeting")
+
+        events = self.lookup("email_id", "email1")
+        self.assertEqual([e["event_id"] for e in events], ["evt1", "evt2"])
+        self.assertEqual(events[0]["summary"], "Team Meeting")
+        self.assertEqual(events[0]["start"], "2026-02-11T14:00:00")
+        self.assertIsNotNone(events[0]["updated_at"])
+        self.assertIsNone(events[1]["updated_at"])
+        self.assertEqual(len(self.lookup("summary", "MEETING")), 2)
+
+        self.capture(event_tracking.delete_tracked_event, "evt1")
+        self.assertEqual([e["event_id"] for e in self.lookup("list")], ["evt2"])
+        self.assertFalse(os.path.exists(event_tracking.EVENTS_FILE))
+
+    def test_summary_search_uses_trigram_index(self):
+        """Test summary substring search through events_fts."""
+        store = state_store.open_state_store(event_tracking.EVENTS_FILE)
+        if not store.has_summary_index:
+            self.skipTest("SQLite built without FTS5 trigram tokenizer")
+        self.capture(event_tracking.track_event, event_id="evt1", summary="Team Meeting")
+        self.capture(event_tracking.track_event, event_id="evt2", summary="Project Review")
+        self.capture(event_tracking.update_tracked_event, event_id="evt2", summary="Sprint Meeting")
+
+        self.assertEqual([e["event_id"] for e in self.lookup("summary", "meeting")], ["evt1", "evt2"])
+        self.assertEqual(self.lookup("summary", "review"), [])
+        self.assertEqual([e["event_id"] for e in self.lookup("summary", "t meet")], ["evt2"])
+        self.capture(event_tracking.delete_tracked_event, "evt1")
+        self.assertEqual([e["event_id"] for e in self.lookup("summary", "MEET")], ["evt2"])
+
+    def test_delete_tracked_events_batch(self):
+        """Test deleting several tracked events at once."""
+        for event_id in ("evt1", "evt2", "evt3"):
+            self.capture(event_tracking.track_event, event_id=event_id)
+        self.assertEqual(event_tracking.delete_tracked_events(["evt1", "evt3", "missing"]), 2)
+        self.assertEqual([e["event_id"] for e in self.lookup("list")], ["evt2"])
+
+    def test_track_existing_keeps_email_when_not_given(self):
+        """Test that re-tracking without an email keeps the stored one."""
+        self.capture(event_tracking.track_event, event_id="evt1", email_id="email1")
+        self.capture(event_tracking.track_event, event_id="evt1", summary="New")
+        self.assertEqual(self.lookup("event_id", "evt1")[0]["email_id"], "email1")
+
+    def test_update_nonexistent_event_exits(self):
+        """Test that updating an untracked event exits with 1."""
+        with self.assertRaises(SystemExit) as cm:
+            event_tracking.update_tracked_event(event_id="missing", summary="X")
+        self.assertEqual(cm.exception.code, 1)
+
+
+class TestPendingSqlite(StateStoreTestCase):
+    """Tests for pending invites on the SQLite store."""
+
+    def setUp(self):
+        super().setUp()
+        state_store.migrate(self.temp_dir)
+
+    def list_json(self, **kwargs):
+        return json.loads(self.capture(pending_ops.list_pending_json, "2026-02-01", **kwargs))
+
+    def test_add_and_list(self):
+        """Test that added invites are listed, past events excluded."""
+        invite_id = pending_ops.add_pending_invite("email1", "School", [
+            {"title": "Past", "date": "2026-01-01", "status": "pending"},
+            {"title": "Fair", "date": "2026-03-01", "time": "10:00", "status": "pending"},
+            {"title": "Done", "date": "2026-03-02", "status": "created"},
+        ])
+        pending = self.list_json()
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[0]["invite_id"], invite_id)
+        self.assertEqual(pending[0]["title"], "Fair")
+        self.assertEqual(pending[0]["day_of_week"], "Sunday")
+
+    def test_add_existing_replaces_events(self):
+        """Test that re-adding the same email replaces its events."""
+        first = pending_ops.add_pending_invite("email1", "School", [
+            {"title": "Old", "date": "2026-03-01", "status": "pending"}])
+        second = pending_ops.add_pending_invite("email1", "School", [
+            {"title": "New", "date": "2026-03-01", "status": "pending"}])
+        self.assertEqual(first, second)
+        self.assertEqual([e["title"] for e in self.list_json()], ["New"])
+
+    def test_reminders_and_auto_dismiss(self):
+        """Test reminder counting and auto-dismissal after MAX_REMINDERS."""
+        pending_ops.add_pending_invite("email1", "School", [
+            {"title": "Fair", "date": "2026-03-01", "status": "pending"},
+            {"title": "Last Month", "date": "2026-01-01", "status": "pending"},
+            {"title": "Date TBD", "status": "pending"}])
+        for expected in range(pending_ops.MAX_REMINDERS):
+            pending = self.list_json(update_reminded=True, auto_dismiss=True)
+            self.assertEqual(pending[0]["reminder_count"], expected)
+
+        output = self.capture(pending_ops.list_pending_summary, "2026-02-01",
+                              auto_dismiss=True)
+        self.assertIn("3 event(s) auto-dismissed", output)
+        self.assertIn("No pending invites found.", output)
+        store = state_store.open_state_store(pending_ops.PENDING_FILE)
+        events = store.list_invites()[0]["events"]
+        self.assertEqual({e["status"] for e in events}, {"auto_dismissed"})
+        self.assertIn("auto_dismissed_at", events[0])
+
+    def test_past_invites_archived(self):
+        """Test that invites with only past events move to invite_archive."""
+        past = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        future = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+        pending_ops.add_pending_invite("email1", "Old", [
+            {"title": "Last Year", "date": past, "status": "pending"}])
+        pending_ops.add_pending_invite("email2", "School", [
+            {"title": "Fair", "date": future, "status": "created"}])
+        pending_ops.add_pending_invite("email3", "TBD", [
+            {"title": "Date TBD", "status": "pending"},
+            {"title": "Last Week", "date": past, "status": "pending"}])
+        store = state_store.open_state_store(pending_ops.PENDING_FILE)
+
+        self.list_json()  # a --today listing never archives
+        self.assertEqual(store.archived_invites(), [])
+
+        self.capture(pending_ops.list_pending_json)
+        self.assertEqual([inv["email_id"] for inv in store.list_invites()], ["email2", "email3"])
+        archived = store.archived_invites()
+        self.assertEqual(archived[0]["events"][0]["title"], "Last Year")
+        self.assertIn("archived_at", archived[0])
+
+    def test_update_invite_status(self):
+        """Test that invite_ops updates the matching event."""
+        pending_ops.add_pending_invite("email1", "School", [
+            {"title": "Science Fair", "date": "2026-03-01", "status": "pending"}])
+        self.capture(invite_ops.update_invite_status, email_id="email1",
+                     event_title="science", new_status="created", calendar_event_id="evt9")
+
+        self.assertEqual(self.list_json(), [])
+        store = state_store.open_state_store(pending_ops.PENDING_FILE)
+        event = store.list_invites()[0]["events"][0]
+        self.assertEqual(event["status"], "created")
+        self.assertEqual(event["event_id"], "evt9")
+
+        with self.assertRaises(SystemExit):
+            invite_ops.update_invite_status(email_id="email1", event_title="nope",
+                                            new_status="created")
+
+
+class TestChangelogSqlite(StateStoreTestCase):
+    """Tests for the changelog and undo on the SQLite store."""
+
+    def setUp(self):
+        super().setUp()
+        state_store.migrate(self.temp_dir)
+
+    def test_log_get_and_undo(self):
+        """Test logging changes, finding the last undoable and marking it undone."""
+        first = changelog_ops.log_create("evt1", "primary", "Meeting", "2026-02-11T10:00:00")
+        second = changelog_ops.log_delete("evt2", "primary", '{"summary": "Lunch"}')
+        self.assertNotEqual(first, second)
+
+        change = json.loads(self.capture(changelog_ops.get_change, first))
+        self.assertEqual(change["after"]["summary"], "Meeting")
+        self.assertEqual(self.capture(undo_ops.find_last_undoable).strip(), second)
+
+        undo_ops.mark_undone(second)
+        self.assertEqual(self.capture(changelog_ops.can_undo, first).strip(), "true")
+        self.assertEqual(self.capture(undo_ops.find_last_undoable).strip(), first)
+        change = json.loads(self.capture(changelog_ops.get_change, second))
+        self.assertFalse(change["can_undo"])
+        self.assertIn("undone_at", change)
+
+    def test_drops_changes_past_retention(self):
+        """Test that changes older than RETENTION_DAYS are dropped."""
+        store = state_store.open_state_store(changelog_ops.CHANGELOG_FILE)
+        old_id = store.add_change({
+            "timestamp": (datetime.now() - timedelta(days=400)).isoformat(),
+            "action": "create", "event_id": "evt0", "can_undo": True
+        }, "")
+        ids = [changelog_ops.log_create(f"evt{i}", "primary", f"E{i}") for i in range(3)]
+        self.assertEqual(len(set(ids)), 3)
+        output = self.capture(changelog_ops.list_changes, 10)
+        self.assertIn("Recent changes (last 3)", output)
+        self.assertNotIn(old_id, output)
+
+    def test_old_changes_not_undoable(self):
+        """Test that changes outside the undo window are skipped."""
+        store = state_store.open_state_store(changelog_ops.CHANGELOG_FILE)
+        store.add_change({
+            "timestamp": (datetime.now() - timedelta(hours=25)).isoformat(),
+            "action": "create", "event_id": "evt1", "can_undo": True
+        }, "")
+        with self.assertRaises(SystemExit):
+            self.capture(undo_ops.find_last_undoable)
+
+
+class TestActivitySqlite(StateStoreTestCase):
+    """Tests for activity sessions on the SQLite store."""
+
+    def setUp(self):
+        super().setUp()
+        state_store.migrate(self.temp_dir)
+
+    def test_session_lifecycle(self):
+        """Test start, log and end of a session."""
+        self.capture(activity_ops.start_session)
+        activity_ops.log_skip("email1", "Newsletter", "No events")
+        activity_ops.log_event("email2", "Fair", "created")
+        activity_ops.log_event("email2", "Party", "pending", "needs RSVP")
+
+        output = self.capture(activity_ops.end_session)
+        self.assertIn("1 scanned, 1 with events, 1 skipped", output)
+
+        output = self.capture(activity_ops.show_activity, 1)
+        self.assertIn("Newsletter", output)
+        self.assertIn("Action: pending (needs RSVP)", output)
+
+    def test_log_entries_batch(self):
+        """Test that a batch is counted like the same entries logged one by one."""
+        self.capture(activity_ops.start_session)
+        activity_ops.log_event("email1", "Fair", "created")
+        activity_ops.log_entries([
+            ("event", {"email_id": "email1", "title": "Party", "action": "pending"}),
+            ("event", {"email_id": "email2", "title": "Game", "action": "pending"}),
+            ("event", {"email_id": "email2", "title": "Picnic", "action": "pending"}),
+            ("skip", {"email_id": "email3", "subject": "Ad", "reason": "No events"}),
+        ])
+
+        output = self.capture(activity_ops.end_session)
+        self.assertIn("1 scanned, 2 with events, 1 skipped", output)
+
+    def test_migrate_imports_session_journal(self):
+        """Test that a session started before migrating is carried over."""
+        shutil.rmtree(self.temp_dir)
+        os.makedirs(self.temp_dir)
+        self.capture(activity_ops.start_session)
+        activity_ops.log_event("email1", "Fair", "created")
+        state_store.migrate(self.temp_dir)
+
+        activity_ops.log_event("email1", "Party", "pending")
+        output = self.capture(activity_ops.end_session)
+        self.assertIn("0 scanned, 1 with events, 0 skipped", output)
+
+    def test_log_without_session_exits(self):
+        """Test that logging without an active session exits with 1."""
+        with self.assertRaises(SystemExit):
+            activity_ops.log_skip("email1", "Subject", "reason")
+        self.assertIn("No active session to end.", self.capture(activity_ops.end_session))
+
+    def test_end_session_limits_history(self):
+        """Test that only MAX_SESSIONS finished sessions are kept."""
+        with patch.object(activity_ops, 'MAX_SESSIONS', 2):
+            for i in range(4):
+                self.capture(activity_ops.start_session)
+                activity_ops.log_skip(f"email{i}", f"Subject {i}", "reason")
+                self.capture(activity_ops.end_session)
+
+        store = state_store.open_state_store(activity_ops.ACTIVITY_FILE)
+        sessions = store.recent_sessions(10)
+        self.assertEqual([s["skipped"][0]["email_id"] for s in sessions], ["email2", "email3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,7 +14,7 @@ from unittest.mock import patch
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils import undo_ops
+from utils import undo_ops, changelog_segments
 
 
 class TestFindLastUndoable(unittest.TestCase):
@@ -216,10 +216,9 @@ class TestMarkUndone(unittest.TestCase):
 
         undo_ops.mark_undone("chg_001")
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        self.assertFalse(data["changes"][0]["can_undo"])
+        self.assertFalse(changes[0]["can_undo"])
 
     def test_sets_undone_at_timestamp(self):
         """Test that mark_undone sets undone_at timestamp."""
@@ -233,10 +232,9 @@ class TestMarkUndone(unittest.TestCase):
 
         undo_ops.mark_undone("chg_001")
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        self.assertIn("undone_at", data["changes"][0])
+        self.assertIn("undone_at", changes[0])
 
     def test_nonexistent_change_no_error(self):
         """Test that marking nonexistent change doesn't crash."""
@@ -261,12 +259,11 @@ class TestMarkUndone(unittest.TestCase):
 
         undo_ops.mark_undone("chg_002")
 
-        with open(self.changelog_file, 'r') as f:
-            data = json.load(f)
+        changes = changelog_segments.read_changes(self.changelog_file)
 
-        self.assertTrue(data["changes"][0]["can_undo"])
-        self.assertFalse(data["changes"][1]["can_undo"])
-        self.assertTrue(data["changes"][2]["can_undo"])
+        self.assertTrue(changes[0]["can_undo"])
+        self.assertFalse(changes[1]["can_undo"])
+        self.assertTrue(changes[2]["can_undo"])
 
 
 if __name__ == '__main__':
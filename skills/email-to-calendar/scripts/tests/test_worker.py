@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Tests for utils/worker.py and utils/worker_client.sh"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import socket
+import subprocess
+import tempfile
+import shutil
+import threading
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# The worker imports the ops modules as top-level modules; share those instances
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'utils'))
+
+import worker
+import event_tracking
+import changelog_ops
+import activity_ops
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Stands in for socat in the shell client tests
+FAKE_SOCAT = f"""#!{sys.executable}
+import socket, sys
+client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+client.connect(sys.argv[-1].split(":", 1)[1])
+client.sendall(sys.stdin.buffer.read())
+client.shutdown(socket.SHUT_WR)
+while True:
+    chunk = client.recv(65536)
+    if not chunk:
+        break
+    sys.stdout.buffer.write(chunk)
+"""
+
+
+class WorkerTestCase(unittest.TestCase):
+    """Temp state directory with the ops modules pointed at it."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.events_file = os.path.join(self.temp_dir, "events.json")
+        self.patchers = [
+            patch.object(event_tracking, 'EVENTS_FILE', self.events_file),
+            patch.object(changelog_ops, 'CHANGELOG_FILE', os.path.join(self.temp_dir, "changelog.json")),
+            patch.object(activity_ops, 'SESSION_FILE', os.path.join(self.temp_dir, ".current_session.jsonl")),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestRunCommands(WorkerTestCase):
+    """Tests for running module commands in-process."""
+
+    def test_run_module_captures_output_and_exit(self):
+        """Test that stdout, stderr and exit codes match a separate process."""
+        code, out, err = worker.run_module("changelog_ops", ["log-create", "--event-id", "evt1",
+                                                             "--summary", "Fair"])
+        self.assertEqual(code, 0)
+        self.assertTrue(out.startswith("chg_"))
+
+        code, out, err = worker.run_module("changelog_ops", ["get", "--change-id", "nope"])
+        self.assertEqual(code, 1)
+        self.assertIn("not found", err)
+
+        code, out, err = worker.run_module("os", [])
+        self.assertEqual(code, 2)
+
+    def test_named_commands_with_args(self):
+        """Test that cmd/args requests map onto the module command lines."""
+        reply = worker.handle_request({"id": 7, "cmd": "track", "args": {
+            "event_id": "evt1", "calendar_id": "primary", "email_id": "email1",
+            "summary": "Science Fair", "start": "2026-03-01T18:00:00"}})
+        self.assertEqual((reply["id"], reply["exit"]), (7, 0))
+
+        reply = worker.handle_request({"cmd": "lookup", "args": {"email_id": "email1"}})
+        self.assertEqual(json.loads(reply["stdout"])[0]["event_id"], "evt1")
+
+        reply = worker.handle_request({"cmd": "fly"})
+        self.assertEqual(reply["exit"], 2)
+
+    def test_args_to_argv(self):
+        """Test flag conversion for strings, booleans and JSON values."""
+        self.assertEqual(
+            worker.args_to_argv({"email_id": "e1", "summary": True, "skip": False,
+                                 "events_json": [{"title": "Fair"}], "reason": None}),
+            ["--email-id", "e1", "--summary", "--events-json", '[{"title": "Fair"}]'])
+
+    def test_stdin_mode(self):
+        """Test JSON lines in, one reply line per command out."""
+        requests = "\n".join([
+            json.dumps({"id": 1, "cmd": "ping"}),
+            "not json",
+            json.dumps({"id": 2, "module": "date_parser", "argv": ["bulk"],
+                        "stdin": "date\tFeb 11, 2026\ntime\t2:30 PM\n"}),
+            json.dumps({"cmd": "shutdown"}),
+            json.dumps({"id": 3, "cmd": "ping"}),
+        ]) + "\n"
+        captured = io.StringIO()
+        with patch('sys.stdin', io.StringIO(requests)), patch('sys.stdout', captured):
+            worker.serve_stdin()
+
+        replies = [json.loads(line) for line in captured.getvalue().splitlines()]
+        self.assertEqual([r["id"] for r in replies], [1, None, 2])
+        self.assertEqual(replies[1]["exit"], 2)
+        self.assertEqual(replies[2]["stdout"], "2026-02-11\n14:30\n")
+
+
+class TestSocketServer(WorkerTestCase):
+    """Tests for the Unix socket server and the shell client."""
+
+    def setUp(self):
+        super().setUp()
+        self.socket_path = os.path.join(self.temp_dir, "worker.sock")
+        self.thread = threading.Thread(target=worker.serve, args=(self.socket_path, 30), daemon=True)
+        self.thread.start()
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.01)
+
+    def tearDown(self):
+        worker.send_request({"cmd": "shutdown"}, self.socket_path)
+        self.thread.join(5)
+        super().tearDown()
+
+    def raw_request(self, data):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(self.socket_path)
+        with client:
+            client.sendall(data)
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+
+    def test_json_request(self):
+        """Test a JSON command over the socket."""
+        self.assertEqual(worker.send_request({"id": 1, "cmd": "ping"}, self.socket_path)["stdout"], "pong\n")
+
+    def test_argv_frame_keeps_empty_args(self):
+        """Test the NUL-framed shell protocol, including empty arguments."""
+        reply = self.raw_request(b"\0".join([
+            b"12", b"event_tracking", b"track", b"--event-id", b"evt1", b"--calendar-id", b"primary",
+            b"--email-id", b"", b"--summary", b"Fair", b"--start", b"2026-03-01T18:00:00", b""]))
+        self.assertEqual(reply[:1], b"+")
+        code, err, out = reply[1:].split(b"\0", 2)
+        self.assertEqual(code, b"0")
+        with open(self.events_file) as f:
+            self.assertEqual(json.load(f)["events"][0]["summary"], "Fair")
+
+    def test_second_worker_refused(self):
+        """Test that serve exits if a worker already owns the socket."""
+        with patch('sys.stderr', io.StringIO()), self.assertRaises(SystemExit):
+            worker.serve(self.socket_path, 1)
+        self.assertEqual(worker.send_request({"cmd": "ping"}, self.socket_path)["exit"], 0)
+
+    def script(self, name, *args, stdin=None, socket_path=None):
+        """Run a shell script with the fake socat on PATH and a temp HOME."""
+        bin_dir = os.path.join(self.temp_dir, "bin")
+        if not os.path.exists(bin_dir):
+            os.makedirs(bin_dir)
+            with open(os.path.join(bin_dir, "socat"), 'w') as f:
+                f.write(FAKE_SOCAT)
+            os.chmod(os.path.join(bin_dir, "socat"), 0o755)
+        env = dict(os.environ, HOME=os.path.join(self.temp_dir, "home"),
+                   PATH=bin_dir + os.pathsep + os.environ["PATH"],
+                   EMAIL_TO_CALENDAR_WORKER_SOCKET=socket_path or self.socket_path)
+        return subprocess.run(["bash", os.path.join(SCRIPTS_DIR, name), *args], env=env,
+                              input=stdin, capture_output=True, text=True)
+
+    def home_events_file(self):
+        return os.path.join(self.temp_dir, "home", ".openclaw", "workspace", "memory",
+                            "email-to-calendar", "events.json")
+
+    def test_shell_scripts_use_worker(self):
+        """Test that a script's command runs in the worker, not a new python3."""
+        script = self.script
+
+        result = script("track_event.sh", "--event-id", "evt1", "--summary", "Fair",
+                        "--start", "2026-03-01T18:00:00")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        # Written by the worker (patched path), not a python3 using $HOME
+        with open(self.events_file) as f:
+            self.assertEqual(json.load(f)["events"][0]["event_id"], "evt1")
+
+        self.assertEqual(script("activity_log.sh", "start-session").returncode, 0)
+        result = script("activity_log.sh", "log-batch", stdin=json.dumps(
+            {"type": "skip", "email_id": "e1", "reason": "No events"}) + "\n")
+        self.assertEqual(result.stdout, "Logged 1 entries\n")
+
+        result = script("changelog.sh", "get", "--change-id", "nope")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("not found", result.stderr)
+
+        # Without a worker the scripts fall back to python3 directly
+        worker.send_request({"cmd": "shutdown"}, self.socket_path)
+        self.thread.join(5)
+        result = script("track_event.sh", "--event-id", "evt2")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(os.path.exists(self.home_events_file()))
+
+    def test_exit_255_not_rerun(self):
+        """Test that a command exiting 255 in the worker is not re-run with python3."""
+        with patch.object(worker, 'run_module', return_value=(255, "", "boom\n")):
+            result = self.script("track_event.sh", "--event-id", "evt1")
+        self.assertEqual(result.returncode, 255)
+        self.assertEqual(result.stderr, "boom\n")
+        self.assertFalse(os.path.exists(self.home_events_file()))
+
+    def test_worker_dying_mid_command_not_rerun(self):
+        """Test that a command the worker accepted is not re-run when the reply is lost."""
+        dying_path = os.path.join(self.temp_dir, "dying.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(dying_path)
+        server.listen(1)
+
+        def accept_then_die():
+            conn, _ = server.accept()
+            with conn, conn.makefile("rb") as reader:
+                reader.read()
+                conn.sendall(b"+")
+
+        thread = threading.Thread(target=accept_then_die, daemon=True)
+        thread.start()
+        try:
+            result = self.script("track_event.sh", "--event-id", "evt1", socket_path=dying_path)
+        finally:
+            thread.join(5)
+            server.close()
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("not retried", result.stderr)
+        self.assertFalse(os.path.exists(self.home_events_file()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 # Parse arguments
 EVENT_ID=""
@@ -52,7 +53,7 @@ if [ -z "$EVENT_ID" ]; then
 fi
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/event_tracking.py" track \
+run_util event_tracking track \
     --event-id "$EVENT_ID" \
     --calendar-id "$CALENDAR_ID" \
     --email-id "$EMAIL_ID" \
@@ -17,6 +17,7 @@
 
 SCRIPTS_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPTS_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 # Parse action
 ACTION="${1:-}"
@@ -46,7 +47,7 @@ done
 case "$ACTION" in
     last)
         # Find most recent undoable change
-        CHANGE_ID=$(python3 "$UTILS_DIR/undo_ops.py" find-last 2>/dev/null)
+        CHANGE_ID=$(run_util undo_ops find-last 2>/dev/null)
         if [ -z "$CHANGE_ID" ]; then
             echo "No undoable changes found." >&2
             exit 1
@@ -55,7 +56,7 @@ case "$ACTION" in
         ;;
 
     list)
-        python3 "$UTILS_DIR/undo_ops.py" list
+        run_util undo_ops list
         exit 0
         ;;
 
@@ -117,7 +118,7 @@ case "$ACTION_TYPE" in
         if [ -n "$PROVIDER" ]; then
             DELETE_ARGS+=(--provider "$PROVIDER")
         fi
-        RESULT=$(python3 "$UTILS_DIR/calendar_ops.py" "${DELETE_ARGS[@]}" 2>&1)
+        RESULT=$(run_util calendar_ops "${DELETE_ARGS[@]}" 2>&1)
 
         if echo "$RESULT" | jq -e '.success == false' > /dev/null 2>&1; then
             echo "Warning: Event may already be deleted: $(echo "$RESULT" | jq -r '.error')" >&2
@@ -153,7 +154,7 @@ case "$ACTION_TYPE" in
             UPDATE_ARGS+=(--provider "$PROVIDER")
         fi
 
-        RESULT=$(python3 "$UTILS_DIR/calendar_ops.py" "${UPDATE_ARGS[@]}" 2>&1)
+        RESULT=$(run_util calendar_ops "${UPDATE_ARGS[@]}" 2>&1)
 
         if echo "$RESULT" | jq -e '.success == false' > /dev/null 2>&1; then
             echo "Error restoring event: $(echo "$RESULT" | jq -r '.error')" >&2
@@ -183,7 +184,7 @@ case "$ACTION_TYPE" in
         if [ -n "$PROVIDER" ]; then
             CREATE_ARGS+=(--provider "$PROVIDER")
         fi
-        RESULT=$(python3 "$UTILS_DIR/calendar_ops.py" "${CREATE_ARGS[@]}" 2>&1)
+        RESULT=$(run_util calendar_ops "${CREATE_ARGS[@]}" 2>&1)
 
         NEW_EVENT_ID=$(echo "$RESULT" | jq -r '.data.id // empty' 2>/dev/null)
 
@@ -209,6 +210,6 @@ case "$ACTION_TYPE" in
 esac
 
 # Mark the change as undone
-python3 "$UTILS_DIR/undo_ops.py" mark-undone --change-id "$CHANGE_ID"
+run_util undo_ops mark-undone --change-id "$CHANGE_ID"
 
 echo "Undo complete. Change $CHANGE_ID has been reversed."
@@ -12,6 +12,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 PENDING_FILE="$HOME/.openclaw/workspace/memory/email-to-calendar/pending_invites.json"
 
 INVITE_ID=""
@@ -78,7 +79,7 @@ if [ ! -f "$PENDING_FILE" ]; then
 fi
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/invite_ops.py" \
+run_util invite_ops \
     --invite-id "$INVITE_ID" \
     --email-id "$EMAIL_ID" \
     --event-title "$EVENT_TITLE" \
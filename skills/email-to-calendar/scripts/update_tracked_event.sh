@@ -6,6 +6,7 @@
 
 SCRIPT_DIR="$(dirname "$0")"
 UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
 
 # Parse arguments
 EVENT_ID=""
@@ -39,7 +40,7 @@ if [ -z "$EVENT_ID" ]; then
 fi
 
 # Delegate to Python implementation
-python3 "$UTILS_DIR/event_tracking.py" update \
+run_util event_tracking update \
     --event-id "$EVENT_ID" \
     --summary "$NEW_SUMMARY" \
     --start "$NEW_START"
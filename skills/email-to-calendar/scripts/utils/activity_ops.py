@@ -8,49 +8,61 @@ Manages the silent audit trail for email processing sessions.
 import sys
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Any, List, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 from json_store import load_json, save_json
 from common import format_timestamp
+from state_store import open_state_store
+from session_journal import SessionJournal, parse_entries
 
 ACTIVITY_FILE = os.path.expanduser(
     "~/.openclaw/workspace/memory/email-to-calendar/activity.json"
 )
 SESSION_FILE = os.path.expanduser(
-    "~/.openclaw/workspace/memory/email-to-calendar/.current_session.json"
+    "~/.openclaw/workspace/memory/email-to-calendar/.current_session.jsonl"
 )
 MAX_SESSIONS = 50
 
 
+def _journal() -> SessionJournal:
+    """
+    The current session journal, picking up a session started before the
+    upgrade (.current_session.json next to it).
+    """
+    journal = SessionJournal(SESSION_FILE)
+    journal.adopt_legacy(os.path.splitext(SESSION_FILE)[0] + ".json")
+    return journal
+
+
 def start_session() -> None:
     """Start a new processing session."""
-    session = {
-        "timestamp": datetime.now().isoformat(),
-        "emails_scanned": 0,
-        "emails_with_events": 0,
-        "skipped": [],
-        "events_extracted": []
-    }
-    save_json(SESSION_FILE, session)
+    store = open_state_store(SESSION_FILE)
+    if store is not None:
+        store.start_session(datetime.now().isoformat())
+        print("Session started")
+        return
+
+    _journal().start(datetime.now().isoformat())
     print("Session started")
 
 
-def log_skip(email_id: str, subject: str, reason: str) -> None:
-    """Log a skipped email."""
-    session = load_json(SESSION_FILE, None)
-    if session is None:
+def log_entries(records: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """Log ("skip" | "event", entry) records to the active session in one write."""
+    store = open_state_store(SESSION_FILE)
+    if store is not None:
+        logged = store.log_entries(records)
+    else:
+        logged = _journal().append(records)
+    if not logged:
         print("No active session. Call start-session first.", file=sys.stderr)
         sys.exit(1)
 
-    session["emails_scanned"] = session.get("emails_scanned", 0) + 1
-    session["skipped"].append({
-        "email_id": email_id,
-        "subject": subject,
-        "reason": reason
-    })
-    save_json(SESSION_FILE, session)
+
+def log_skip(email_id: str, subject: str, reason: str) -> None:
+    """Log a skipped email."""
+    log_entries([("skip", {"email_id": email_id, "subject": subject, "reason": reason})])
 
 
 def log_event(
@@ -60,18 +72,6 @@ def log_event(
     reason: str = ""
 ) -> None:
     """Log an extracted event."""
-    session = load_json(SESSION_FILE, None)
-    if session is None:
-        print("No active session. Call start-session first.", file=sys.stderr)
-        sys.exit(1)
-
-    # Only increment emails_with_events once per email
-    existing_emails = set(
-        e.get("email_id") for e in session.get("events_extracted", [])
-    )
-    if email_id not in existing_emails:
-        session["emails_with_events"] = session.get("emails_with_events", 0) + 1
-
     entry = {
         "email_id": email_id,
         "title": title,
@@ -80,34 +80,35 @@ def log_event(
     if reason:
         entry["reason"] = reason
 
-    session["events_extracted"].append(entry)
-    save_json(SESSION_FILE, session)
+    log_entries([("event", entry)])
 
 
 def end_session() -> None:
     """Finalize the current session and append to activity log."""
-    session = load_json(SESSION_FILE, None)
+    store = open_state_store(SESSION_FILE)
+    if store is not None:
+        session = store.end_session(MAX_SESSIONS)
+    else:
+        session = _journal().fold()
     if session is None:
         print("No active session to end.")
         return
 
-    # Load existing activity log
-    activity = load_json(ACTIVITY_FILE, {"sessions": []})
+    if store is None:
+        # Load existing activity log
+        activity = load_json(ACTIVITY_FILE, {"sessions": []})
 
-    # Add session to log
-    activity["sessions"].append(session)
+        # Add session to log
+        activity["sessions"].append(session)
 
-    # Keep only last N sessions
-    activity["sessions"] = activity["sessions"][-MAX_SESSIONS:]
+        # Keep only last N sessions
+        activity["sessions"] = activity["sessions"][-MAX_SESSIONS:]
 
-    # Save activity log
-    save_json(ACTIVITY_FILE, activity)
+        # Save activity log
+        save_json(ACTIVITY_FILE, activity)
 
-    # Remove current session file
-    try:
-        os.remove(os.path.expanduser(SESSION_FILE))
-    except OSError:
-        pass
+        # Remove current session journal
+        SessionJournal(SESSION_FILE).remove()
 
     emails_scanned = session.get("emails_scanned", 0)
     emails_with_events = session.get("emails_with_events", 0)
@@ -117,8 +118,12 @@ def end_session() -> None:
 
 def show_activity(last_n: int = 1) -> None:
     """Show recent activity sessions."""
-    activity = load_json(ACTIVITY_FILE, {"sessions": []})
-    sessions = activity.get("sessions", [])
+    store = open_state_store(ACTIVITY_FILE)
+    if store is not None:
+        sessions = store.recent_sessions(last_n)
+    else:
+        activity = load_json(ACTIVITY_FILE, {"sessions": []})
+        sessions = activity.get("sessions", [])
 
     if not sessions:
         print("No activity recorded yet.")
@@ -202,6 +207,21 @@ def main():
             reason=args.get("reason", "")
         )
 
+    elif action == "log-batch":
+        # JSON lines (see session_journal.parse_entries) from --input <file> or stdin
+        source = args.get("input", "-")
+        try:
+            if source == "-" or source is True:
+                records = parse_entries(sys.stdin)
+            else:
+                with open(source) as f:
+                    records = parse_entries(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        log_entries(records)
+        print(f"Logged {len(records)} entries")
+
     elif action == "end-session":
         end_session()
 
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Local calendar mirror for email-to-calendar skill.
+
+Keeps a SQLite copy of each calendar's events so duplicate checks run
+locally instead of searching the calendar for every candidate event.
+
+Freshness: a calendar is re-synced when its last sync is older than
+MIRROR_TTL. The http provider syncs incrementally with the API's sync
+token. gog has no sync token or updated-since filter, so for it the
+mirrored window (WINDOW_PAST_DAYS back to WINDOW_FUTURE_DAYS ahead) is
+fetched at most once per WINDOW_REFRESH; in between, a stale check
+re-fetches only the SEGMENT_DAYS segment holding the date being checked.
+A listing that looks paged or malformed never replaces mirrored rows.
+Events created, updated or deleted through calendar_ops are written
+through immediately.
+
+Usage:
+    calendar_mirror.py check --title <title> --date <date> [--calendar-id <id>] [--provider <p>]
+    calendar_mirror.py check-batch [--input <file>|-] [--calendar-id <id>] [--provider <p>]
+    calendar_mirror.py sync [--calendar-id <id>] [--full] [--provider <p>]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+import calendar_ops
+from date_parser import parse_date
+
+MIRROR_FILE = os.path.expanduser(
+    "~/.openclaw/workspace/memory/email-to-calendar/calendar_mirror.db"
+)
+MIRROR_TTL = 15 * 60  # seconds
+WINDOW_REFRESH = 24 * 60 * 60  # seconds between full-window fetches without a sync token
+SEGMENT_DAYS = 30
+WINDOW_PAST_DAYS = 7
+WINDOW_FUTURE_DAYS = 365
+TITLE_KEYWORDS = 5  # leading title words compared by the duplicate check
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirror_state (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    window_from TEXT,
+    window_to TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS mirror_events (
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    start TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_mirror_events_date ON mirror_events(calendar_id, start_date, start);
+CREATE TABLE IF NOT EXISTS mirror_segments (
+    calendar_id TEXT NOT NULL,
+    segment_from TEXT NOT NULL,
+    synced_at REAL,
+    PRIMARY KEY (calendar_id, segment_from)
+);
+CREATE TABLE IF NOT EXISTS title_tokens (
+    calendar_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    token TEXT NOT NULL,
+    event_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_title_tokens ON title_tokens(calendar_id, start_date, token);
+CREATE INDEX IF NOT EXISTS idx_title_tokens_event ON title_tokens(calendar_id, event_id);
+"""
+
+_mirrors: Dict[str, "CalendarMirror"] = {}
+
+
+def title_words(title: str) -> List[str]:
+    """Lowercased alphanumeric words of a title."""
+    return "".join(c if c.isalnum() else " " for c in (title or "").lower()).split()
+
+
+def event_start(event: Dict[str, Any]) -> str:
+    start = event.get("start") or {}
+    if isinstance(start, str):
+        return start
+    return start.get("dateTime", start.get("date", ""))
+
+
+def segment_bounds(day: str) -> Tuple[str, str]:
+    """First and last day of the SEGMENT_DAYS segment holding day."""
+    ordinal = date.fromisoformat(day).toordinal()
+    start = date.fromordinal(ordinal - ordinal % SEGMENT_DAYS)
+    return start.isoformat(), (start + timedelta(days=SEGMENT_DAYS - 1)).isoformat()
+
+
+def listed_events(data: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    Events of a complete search_events listing, or None if it has a next
+    page or isn't a list of events (so it can't safely replace a window).
+    """
+    if data is None:
+        return []
+    if isinstance(data, dict):
+        if data.get("nextPageToken"):
+            return None
+        data = data.get("events", data.get("items"))
+    if not isinstance(data, list):
+        return None
+    return [e for e in data if isinstance(e, dict)]
+
+
+def is_duplicate_title(keywords: List[str], title: str) -> bool:
+    """
+    Title similarity rule: titles of one or two keywords need all of them,
+    longer ones at least half. A keyword matches anywhere in the title.
+    """
+    if not keywords:
+        return False
+    title = (title or "").lower()
+    matches = sum(1 for kw in keywords if kw in title)
+    if len(keywords) <= 2:
+        return matches == len(keywords)
+    return matches >= (len(keywords) + 1) // 2
+
+
+class CalendarMirror:
+    """SQLite mirror of calendar events with a title token index."""
+
+    def __init__(self, db_path: str = MIRROR_FILE):
+        self.db_path = os.path.expanduser(db_path)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+        _mirrors.pop(self.db_path, None)
+
+    # -- state -----------------------------------------------------------
+
+    def state(self, calendar_id: str) -> Optional[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM mirror_state WHERE calendar_id = ?", (calendar_id,)
+        ).fetchone()
+
+    def is_fresh(self, calendar_id: str, day: Optional[str] = None) -> bool:
+        """
+        True if the calendar was synced within MIRROR_TTL (and covers day).
+        Without a sync token, a re-fetch of day's segment also counts.
+        """
+        state = self.state(calendar_id)
+        if state is None:
+            return False
+        synced_at = state["synced_at"] or 0
+        if day is not None and state["window_to"] is not None:
+            row = self.conn.execute(
+                "SELECT synced_at FROM mirror_segments WHERE calendar_id = ? AND segment_from = ?",
+                (calendar_id, segment_bounds(day)[0])
+            ).fetchone()
+            if row is not None:
+                synced_at = max(synced_at, row["synced_at"] or 0)
+        if time.time() - synced_at >= MIRROR_TTL:
+            return False
+        return day is None or self.covers(calendar_id, day)
+
+    def covers(self, calendar_id: str, day: str) -> bool:
+        state = self.state(calendar_id)
+        if state is None:
+            return False
+        return (state["window_from"] or "") <= day and (
+            state["window_to"] is None or day <= state["window_to"]
+        )
+
+    def invalidate(self, calendar_id: str) -> None:
+        """Force a sync before the next check (keeps the sync cursor)."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE mirror_state SET synced_at = 0 WHERE calendar_id = ?", (calendar_id,)
+            )
+            self.conn.execute(
+                "DELETE FROM mirror_segments WHERE calendar_id = ?", (calendar_id,)
+            )
+
+    # -- events ----------------------------------------------------------
+
+    def upsert(self, calendar_id: str, events: List[Dict[str, Any]]) -> None:
+        """Add or replace events; cancelled ones are removed."""
+        with self.conn:
+            for event in events:
+                self._remove(calendar_id, event.get("id"))
+                start = event_start(event)
+                if event.get("status") == "cancelled" or not event.get("id") or not start:
+                    continue
+                start_date = start[:10]
+                self.conn.execute(
+                    "INSERT INTO mirror_events VALUES (?, ?, ?, ?, ?)",
+                    (calendar_id, event["id"], start_date, start, json.dumps(event))
+                )
+                self.conn.executemany(
+                    "INSERT INTO title_tokens VALUES (?, ?, ?, ?)",
+                    [(calendar_id, start_date, token, event["id"])
+                     for token in set(title_words(event.get("summary", "")))]
+                )
+
+    def remove(self, calendar_id: str, event_ids: List[str]) -> None:
+        with self.conn:
+            for event_id in event_ids:
+                self._remove(calendar_id, event_id)
+
+    def _remove(self, calendar_id: str, event_id: Optional[str]) -> None:
+        self.conn.execute(
+            "DELETE FROM mirror_events WHERE calendar_id = ? AND event_id = ?", (calendar_id, event_id)
+        )
+        self.conn.execute(
+            "DELETE FROM title_tokens WHERE calendar_id = ? AND event_id = ?", (calendar_id, event_id)
+        )
+
+    def replace_window(self, calendar_id: str, window_from: str, window_to: str,
+                       events: List[Dict[str, Any]]) -> None:
+        """Replace everything starting inside [window_from, window_to]."""
+        with self.conn:
+            for table in ("mirror_events", "title_tokens"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE calendar_id = ? AND start_date BETWEEN ? AND ?",
+                    (calendar_id, window_from, window_to)
+                )
+        self.upsert(calendar_id, events)
+
+    def _save_state(self, calendar_id: str, sync_token: Optional[str],
+                    window_from: str, window_to: Optional[str]) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO mirror_state VALUES (?, ?, ?, ?, ?)",
+                (calendar_id, sync_token, window_from, window_to, time.time())
+            )
+            self.conn.execute(
+                "DELETE FROM mirror_segments WHERE calendar_id = ?", (calendar_id,)
+            )
+
+    def _save_segment(self, calendar_id: str, segment_from: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO mirror_segments VALUES (?, ?, ?)",
+                (calendar_id, segment_from, time.time())
+            )
+
+    # -- sync ------------------------------------------------------------
+
+    def sync(self, calendar_id: str, provider: Optional[str] = None, full: bool = False,
+             day: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Bring the mirror up to date: incrementally from the stored sync token
+        where the provider supports it, otherwise by re-fetching the window,
+        or only day's segment if the window was fetched within WINDOW_REFRESH.
+
+        Returns:
+            Dict with success status, mode ('incremental', 'full', 'window'
+            or 'segment') and number of events received, or error
+        """
+        state = self.state(calendar_id)
+        today = date.today()
+        window_from = (today - timedelta(days=WINDOW_PAST_DAYS)).isoformat()
+        window_to = (today + timedelta(days=WINDOW_FUTURE_DAYS)).isoformat()
+
+        token = None if full or state is None else state["sync_token"]
+        if token:
+            # Keep the window the token was started from
+            window_from = state["window_from"]
+        result = calendar_ops.sync_events(calendar_id, token, window_from, provider)
+        if result.get("error_type") == "sync_expired":
+            token = None
+            result = calendar_ops.sync_events(calendar_id, None, window_from, provider)
+
+        if result.get("success"):
+            data = result.get("data") or {}
+            items = data.get("items", [])
+            if data.get("full"):
+                self.replace_window(calendar_id, window_from, "9999-12-31", items)
+            else:
+                self.upsert(calendar_id, items)
+            # An incremental cursor covers everything from window_from on
+            self._save_state(calendar_id, data.get("sync_token"), window_from, None)
+            return {"success": True, "mode": "full" if data.get("full") else "incremental",
+                    "events": len(items)}
+        if result.get("error_type") != "unsupported":
+            return result
+
+        mode = "window"
+        if (day and not full and state is not None and state["window_to"] is not None
+                and time.time() - (state["synced_at"] or 0) < WINDOW_REFRESH
+                and self.covers(calendar_id, day)):
+            mode = "segment"
+            window_from, window_to = segment_bounds(day)
+
+        result = calendar_ops.search_events(
+            calendar_id, f"{window_from}T00:00:00", f"{window_to}T23:59:59", provider
+        )
+        if not result.get("success"):
+            return result
+        items = listed_events(result.get("data"))
+        if items is None:
+            # Replacing the window with a partial listing would drop events
+            return {"success": False, "error_type": "incomplete",
+                    "error": f"Calendar listing for {window_from}..{window_to} is paged or unrecognised"}
+        self.replace_window(calendar_id, window_from, window_to, items)
+        if mode == "segment":
+            self._save_segment(calendar_id, window_from)
+        else:
+            self._save_state(calendar_id, None, window_from, window_to)
+        return {"success": True, "mode": mode, "events": len(items)}
+
+    # -- duplicate detection ---------------------------------------------
+
+    def find_duplicate(self, calendar_id: str, title: str, day: str) -> Optional[Dict[str, Any]]:
+        """
+        First mirrored event starting on day whose title matches (see
+        is_duplicate_title). Keywords are looked up in the title token
+        index for that day, so only events sharing a keyword are loaded.
+        """
+        keywords = title_words(title)[:TITLE_KEYWORDS]
+        if not keywords:
+            return None
+        # A keyword occurs in a title iff it occurs inside one of its words
+        hits: Dict[str, int] = {}
+        for kw in keywords:
+            for row in self.conn.execute(
+                "SELECT DISTINCT event_id FROM title_tokens"
+                " WHERE calendar_id = ? AND start_date = ? AND instr(token, ?) > 0",
+                (calendar_id, day, kw)
+            ):
+                hits[row["event_id"]] = hits.get(row["event_id"], 0) + 1
+        needed = len(keywords) if len(keywords) <= 2 else (len(keywords) + 1) // 2
+        candidates = [event_id for event_id, count in hits.items() if count >= needed]
+        if not candidates:
+            return None
+        row = self.conn.execute(
+            f"SELECT data FROM mirror_events WHERE calendar_id = ? AND event_id IN"
+            f" ({', '.join('?' * len(candidates))}) ORDER BY start, rowid LIMIT 1",
+            [calendar_id, *candidates]
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+
+def open_mirror(create: bool = True) -> Optional[CalendarMirror]:
+    """The process-wide mirror, or None if it doesn't exist and create is False."""
+    db_path = os.path.expanduser(MIRROR_FILE)
+    if db_path not in _mirrors:
+        if not create and not os.path.exists(db_path):
+            return None
+        _mirrors[db_path] = CalendarMirror(db_path)
+    return _mirrors[db_path]
+
+
+def record_change(calendar_id: str, action: str, event_id: str, result: Dict[str, Any]) -> None:
+    """
+    Write a successful create/update/delete through to the mirror (if one
+    exists), or mark the calendar stale when the result has no event.
+    """
+    mirror = open_mirror(create=False)
+    if mirror is None or not result.get("success"):
+        return
+    if action == "delete":
+        mirror.remove(calendar_id, [event_id])
+        return
+    event = result.get("data")
+    if isinstance(event, dict) and isinstance(event.get("event"), dict):
+        event = event["event"]
+    if isinstance(event, dict) and event.get("id") and event_start(event):
+        mirror.upsert(calendar_id, [event])
+    else:
+        mirror.invalidate(calendar_id)
+
+
+def check_duplicate(
+    title: str,
+    event_date: str,
+    calendar_id: Optional[str] = None,
+    provider: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Find an existing calendar event that duplicates a candidate event.
+
+    Args:
+        title: Candidate event title
+        event_date: Candidate date (YYYY-MM-DD)
+        calendar_id: Calendar ID (default: from config)
+        provider: Provider to use (default: from config)
+
+    Returns:
+        The matching calendar event, or None
+    """
+    calendar_id = calendar_id or calendar_ops.get_calendar_id()
+    mirror = open_mirror()
+    if not mirror.is_fresh(calendar_id, event_date):
+        result = mirror.sync(calendar_id, provider, day=event_date)
+        if not result.get("success"):
+            print(f"Warning: mirror sync failed: {result.get('error')}", file=sys.stderr)
+
+    if mirror.covers(calendar_id, event_date):
+        return mirror.find_duplicate(calendar_id, title, event_date)
+
+    # Outside the mirrored window: search around that day directly
+    day = datetime.strptime(event_date, "%Y-%m-%d").date()
+    result = calendar_ops.search_events(
+        calendar_id,
+        f"{(day - timedelta(days=1)).isoformat()}T00:00:00",
+        f"{(day + timedelta(days=2)).isoformat()}T00:00:00",
+        provider
+    )
+    keywords = title_words(title)[:TITLE_KEYWORDS]
+    listed = listed_events(result.get("data")) if result.get("success") else None
+    for event in listed or []:
+        if event_date in event_start(event) and is_duplicate_title(keywords, event.get("summary", "")):
+            return event
+    return None
+
+
+def _iso_date(value: str) -> str:
+    return value if len(value) == 10 and value[4] == "-" else parse_date(value)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: calendar_mirror.py <check|check-batch|sync> [options]", file=sys.stderr)
+        sys.exit(1)
+
+    action = sys.argv[1]
+
+    # Parse keyword arguments
+    args = {}
+    i = 2
+    while i < len(sys.argv):
+        if sys.argv[i].startswith("--"):
+            key = sys.argv[i][2:].replace("-", "_")
+            if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith("--"):
+                args[key] = sys.argv[i + 1]
+                i += 2
+            else:
+                args[key] = True
+                i += 1
+        else:
+            i += 1
+
+    calendar_id = args.get("calendar_id") or None
+    provider = args.get("provider") or None
+
+    if action == "check":
+        title = args.get("title", "")
+        iso_date = _iso_date(args.get("date", ""))
+        if not title or not iso_date:
+            print(f"Could not parse date: {args.get('date', '')}" if title else
+                  "Error: --title and --date required", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(check_duplicate(title, iso_date, calendar_id, provider)))
+
+    elif action == "check-batch":
+        # JSON list of {"title": ..., "date": ...}; prints one result per item
+        source = args.get("input", "-")
+        if source == "-" or source is True:
+            candidates = json.load(sys.stdin)
+        else:
+            with open(source) as f:
+                candidates = json.load(f)
+        results = []
+        for candidate in candidates:
+            iso_date = _iso_date(candidate.get("date", ""))
+            results.append(
+                check_duplicate(candidate.get("title", ""), iso_date, calendar_id, provider)
+                if iso_date else None
+            )
+        print(json.dumps(results, indent=2))
+
+    elif action == "sync":
+        calendar_id = calendar_id or calendar_ops.get_calendar_id()
+        result = open_mirror().sync(calendar_id, provider, full=args.get("full") is True)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result.get("success") else 1)
+
+    else:
+        print(f"Unknown action: {action}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@
 Provider-agnostic calendar operations for email-to-calendar skill.
 
 Provides a consistent interface for calendar operations across different providers.
-Currently supports: gog (Google Calendar via gog CLI)
+Currently supports: gog (Google Calendar via gog CLI) and http (Google
+Calendar REST API directly, see http_provider.py)
 """
 
 import json
@@ -14,7 +15,8 @@ from typing import Optional, List, Dict, Any
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
-from json_store import load_json
+from provider_config import load_config, gog_supports
+import http_provider
 
 CONFIG_FILE = os.path.expanduser("~/.config/email-to-calendar/config.json")
 
@@ -23,28 +25,29 @@ def get_provider(provider: Optional[str] = None) -> str:
     """Get the provider to use, from parameter or config."""
     if provider:
         return provider
-    config = load_json(CONFIG_FILE, {})
+    config = load_config(CONFIG_FILE)
     return config.get("provider", "gog")
 
 
 def get_calendar_id() -> str:
     """Get the default calendar ID from config."""
-    config = load_json(CONFIG_FILE, {})
+    config = load_config(CONFIG_FILE)
     return config.get("calendar_id", "primary")
 
 
-def _check_send_updates_support() -> bool:
-    """Check if gog supports --send-updates flag (tonimelisma fork)."""
+def _http_client() -> "http_provider.ApiClient":
+    """Shared HTTP client built from the config's "http" section."""
+    return http_provider.get_client(load_config(CONFIG_FILE).get("http", {}))
+
+
+def _record_change(calendar_id: str, action: str, event_id: Optional[str],
+                   result: Dict[str, Any]) -> None:
+    """Keep the local calendar mirror (if any) in step with our own writes."""
+    from calendar_mirror import record_change
     try:
-        result = subprocess.run(
-            ["gog", "calendar", "create", "--help"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        return "--send-updates" in result.stdout or "--send-updates" in result.stderr
-    except Exception:
-        return False
+        record_change(calendar_id, action, event_id, result)
+    except Exception as e:
+        print(f"Warning: calendar mirror not updated: {e}", file=sys.stderr)
 
 
 def _run_gog_command(args: List[str]) -> Dict[str, Any]:
@@ -115,6 +118,8 @@ def search_events(
         if to_dt:
             args.extend(["--to", to_dt])
         return _run_gog_command(args)
+    elif provider == "http":
+        return http_provider.search_events(_http_client(), calendar_id, from_dt, to_dt)
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
@@ -163,7 +168,7 @@ def create_event(
         if attendees:
             args.extend(["--attendees", ",".join(attendees)])
             # Add send-updates if supported
-            if _check_send_updates_support():
+            if gog_supports("send_updates"):
                 args.extend(["--send-updates", "all"])
 
         if reminders:
@@ -173,10 +178,18 @@ def create_event(
         if rrule:
             args.extend(["--rrule", rrule])
 
-        return _run_gog_command(args)
+        result = _run_gog_command(args)
+    elif provider == "http":
+        result = http_provider.create_event(
+            _http_client(), calendar_id, summary=summary, from_dt=from_dt, to_dt=to_dt,
+            description=description, attendees=attendees, reminders=reminders, rrule=rrule
+        )
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
+    _record_change(calendar_id, "create", None, result)
+    return result
+
 
 def update_event(
     event_id: str,
@@ -220,14 +233,22 @@ def update_event(
             args.extend(["--description", description])
         if add_attendees:
             args.extend(["--add-attendee", ",".join(add_attendees)])
-            if _check_send_updates_support():
+            if gog_supports("send_updates"):
                 args.extend(["--send-updates", "all"])
 
         args.append("--json")
-        return _run_gog_command(args)
+        result = _run_gog_command(args)
+    elif provider == "http":
+        result = http_provider.update_event(
+            _http_client(), calendar_id, event_id, add_attendees=add_attendees,
+            summary=summary, from_dt=from_dt, to_dt=to_dt, description=description
+        )
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
+    _record_change(calendar_id, "update", event_id, result)
+    return result
+
 
 def delete_event(
     event_id: str,
@@ -250,16 +271,100 @@ def delete_event(
 
     if provider == "gog":
         args = ["calendar", "delete", calendar_id, event_id]
-        return _run_gog_command(args)
+        result = _run_gog_command(args)
+    elif provider == "http":
+        result = http_provider.delete_event(_http_client(), calendar_id, event_id)
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
+    _record_change(calendar_id, "delete", event_id, result)
+    return result
+
+
+def sync_events(
+    calendar_id: Optional[str] = None,
+    sync_token: Optional[str] = None,
+    time_min: Optional[str] = None,
+    provider: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Fetch events changed since sync_token (incremental sync). Only the http
+    provider supports this; callers fall back to search_events otherwise.
+
+    Args:
+        calendar_id: Calendar ID (default: from config)
+        sync_token: Cursor from the previous sync (None for a full listing)
+        time_min: Start of the full listing (ISO format)
+        provider: Provider to use (default: from config)
+
+    Returns:
+        Dict with success status and {"items", "sync_token", "full"} or error
+    """
+    provider = get_provider(provider)
+    calendar_id = calendar_id or get_calendar_id()
+
+    if provider == "http":
+        return http_provider.sync_events(_http_client(), calendar_id, sync_token, time_min)
+    return {"success": False, "error": f"Incremental sync not supported by provider: {provider}",
+            "error_type": "unsupported"}
+
+
+def batch_events(
+    ops: List[Dict[str, Any]],
+    calendar_id: Optional[str] = None,
+    provider: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run several calendar operations. With the http provider they share
+    multipart batch requests; with gog they run one after another.
+
+    Args:
+        ops: Dicts with "action" ('search', 'create', 'update' or 'delete')
+             plus the keyword arguments of that function, e.g.
+             {"action": "create", "summary": "...", "from_dt": "...", "to_dt": "..."}
+        calendar_id: Calendar for ops without their own (default: from config)
+        provider: Provider to use (default: from config)
+
+    Returns:
+        One result dict per op, in order
+    """
+    provider = get_provider(provider)
+    calendar_id = calendar_id or get_calendar_id()
+
+    if provider == "http":
+        results = http_provider.batch_calendar(_http_client(), calendar_id, ops)
+        for op, result in zip(ops, results):
+            if op.get("action") in ("create", "update", "delete"):
+                _record_change(op.get("calendar_id") or calendar_id, op["action"],
+                               op.get("event_id"), result)
+        return results
+
+    actions = {
+        "search": search_events,
+        "create": create_event,
+        "update": update_event,
+        "delete": delete_event,
+    }
+    results = []
+    for op in ops:
+        func = actions.get(op.get("action"))
+        if func is None:
+            results.append({"success": False, "error": f"Unknown action: {op.get('action')}"})
+            continue
+        kwargs = {k: v for k, v in op.items() if k != "action"}
+        kwargs.setdefault("calendar_id", calendar_id)
+        try:
+            results.append(func(provider=provider, **kwargs))
+        except TypeError as e:
+            results.append({"success": False, "error": f"Invalid {op['action']} op: {e}"})
+    return results
+
 
 def main():
     """CLI interface for calendar operations."""
     if len(sys.argv) < 2:
         print("Usage: calendar_ops.py <action> [options]", file=sys.stderr)
-        print("Actions: search, create, update, delete", file=sys.stderr)
+        print("Actions: search, create, update, delete, batch", file=sys.stderr)
         sys.exit(1)
 
     action = sys.argv[1]
@@ -321,6 +426,17 @@ def main():
             sys.exit(1)
         result = delete_event(event_id, calendar_id, provider)
 
+    elif action == "batch":
+        # JSON list of ops (see batch_events) from --input <file> or stdin
+        source = args.get("input", "-")
+        if source == "-" or source is True:
+            ops = json.load(sys.stdin)
+        else:
+            with open(source) as f:
+                ops = json.load(f)
+        results = batch_events(ops, calendar_id, provider)
+        result = {"success": all(r.get("success") for r in results), "data": results}
+
     else:
         print(f"Unknown action: {action}", file=sys.stderr)
         sys.exit(1)
@@ -13,14 +13,31 @@ from typing import Optional, Dict, Any, List
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
-from json_store import load_json, save_json
-from common import generate_indexed_id, format_timestamp, time_ago
+from common import format_timestamp, time_ago
+from state_store import open_state_store
+from changelog_segments import open_changelog, RETENTION_DAYS
 
 CHANGELOG_FILE = os.path.expanduser(
     "~/.openclaw/workspace/memory/email-to-calendar/changelog.json"
 )
 UNDO_WINDOW_HOURS = 24
-MAX_CHANGES = 100
+
+
+def _append_change(change: Dict[str, Any]) -> str:
+    """Append a change (without 'id') to the changelog. Returns the change ID."""
+    store = open_state_store(CHANGELOG_FILE)
+    if store is not None:
+        keep_since = (datetime.now() - timedelta(days=RETENTION_DAYS)).isoformat()
+        return store.add_change(change, keep_since)
+
+    return open_changelog(CHANGELOG_FILE).append(change)
+
+
+def _find_change(change_id: str) -> Optional[Dict[str, Any]]:
+    store = open_state_store(CHANGELOG_FILE)
+    if store is not None:
+        return store.get_change(change_id)
+    return open_changelog(CHANGELOG_FILE).get(change_id)
 
 
 def log_create(
@@ -32,12 +49,7 @@ def log_create(
     email_id: str = ""
 ) -> str:
     """Log a create action. Returns the change ID."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-
-    change_id = generate_indexed_id("chg", len(changelog["changes"]) + 1)
-
     change = {
-        "id": change_id,
         "timestamp": datetime.now().isoformat(),
         "action": "create",
         "event_id": event_id,
@@ -52,11 +64,7 @@ def log_create(
         "can_undo": True
     }
 
-    changelog["changes"].append(change)
-    changelog["changes"] = changelog["changes"][-MAX_CHANGES:]
-    save_json(CHANGELOG_FILE, changelog)
-
-    return change_id
+    return _append_change(change)
 
 
 def log_update(
@@ -67,8 +75,6 @@ def log_update(
     email_id: str = ""
 ) -> str:
     """Log an update action. Returns the change ID."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-
     # Parse before/after JSON
     try:
         before = json.loads(before_json) if before_json else None
@@ -80,10 +86,7 @@ def log_update(
     except json.JSONDecodeError:
         after = None
 
-    change_id = generate_indexed_id("chg", len(changelog["changes"]) + 1)
-
     change = {
-        "id": change_id,
         "timestamp": datetime.now().isoformat(),
         "action": "update",
         "event_id": event_id,
@@ -94,11 +97,7 @@ def log_update(
         "can_undo": True
     }
 
-    changelog["changes"].append(change)
-    changelog["changes"] = changelog["changes"][-MAX_CHANGES:]
-    save_json(CHANGELOG_FILE, changelog)
-
-    return change_id
+    return _append_change(change)
 
 
 def log_delete(
@@ -107,17 +106,12 @@ def log_delete(
     before_json: str = ""
 ) -> str:
     """Log a delete action. Returns the change ID."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-
     try:
         before = json.loads(before_json) if before_json else None
     except json.JSONDecodeError:
         before = None
 
-    change_id = generate_indexed_id("chg", len(changelog["changes"]) + 1)
-
     change = {
-        "id": change_id,
         "timestamp": datetime.now().isoformat(),
         "action": "delete",
         "event_id": event_id,
@@ -128,17 +122,16 @@ def log_delete(
         "can_undo": True
     }
 
-    changelog["changes"].append(change)
-    changelog["changes"] = changelog["changes"][-MAX_CHANGES:]
-    save_json(CHANGELOG_FILE, changelog)
-
-    return change_id
+    return _append_change(change)
 
 
 def list_changes(last_n: int = 10) -> None:
     """Print recent changes to stdout."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-    changes = changelog.get("changes", [])
+    store = open_state_store(CHANGELOG_FILE)
+    if store is not None:
+        changes = store.recent_changes(last_n)
+    else:
+        changes = open_changelog(CHANGELOG_FILE).recent(last_n)
 
     if not changes:
         print("No changes recorded yet.")
@@ -201,12 +194,10 @@ def list_changes(last_n: int = 10) -> None:
 
 def get_change(change_id: str) -> None:
     """Print a specific change as JSON."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-
-    for change in changelog.get("changes", []):
-        if change.get("id") == change_id:
-            print(json.dumps(change, indent=2))
-            return
+    change = _find_change(change_id)
+    if change is not None:
+        print(json.dumps(change, indent=2))
+        return
 
     print(f"Change {change_id} not found", file=sys.stderr)
     sys.exit(1)
@@ -214,29 +205,25 @@ def get_change(change_id: str) -> None:
 
 def can_undo(change_id: str) -> None:
     """Check if a change can be undone. Prints 'true' or 'false'."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-    undo_window = timedelta(hours=UNDO_WINDOW_HOURS)
-    now = datetime.now()
+    change = _find_change(change_id)
+    if change is None:
+        print("false")
+        sys.exit(1)
+
+    if not change.get("can_undo", False):
+        print("false")
+        return
 
-    for change in changelog.get("changes", []):
-        if change.get("id") == change_id:
-            if not change.get("can_undo", False):
-                print("false")
-                return
-
-            try:
-                change_time = datetime.fromisoformat(change.get("timestamp", ""))
-                if (now - change_time) < undo_window:
-                    print("true")
-                    return
-            except (ValueError, TypeError):
-                pass
-
-            print("false")
+    undo_window = timedelta(hours=UNDO_WINDOW_HOURS)
+    try:
+        change_time = datetime.fromisoformat(change.get("timestamp", ""))
+        if (datetime.now() - change_time) < undo_window:
+            print("true")
             return
+    except (ValueError, TypeError):
+        pass
 
     print("false")
-    sys.exit(1)
 
 
 def main():
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Segmented changelog storage for email-to-calendar skill.
+
+Changes are appended to monthly JSONL segments (changelog.d/2026-10.jsonl)
+and never rewritten. A compact sidecar, changelog.d/index.jsonl, gets one
+line per change (seq, id, segment, byte offset, timestamp, can_undo) and
+one line per undo, so:
+
+- logging a change is two appends, however long the history is
+- "last undoable" reads the index backwards and stops at the first entry
+  older than the undo window, without touching the segments
+- retention deletes whole segments older than RETENTION_DAYS
+
+A legacy changelog.json is imported on first use and renamed to
+changelog.json.migrated.
+"""
+
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterator
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import load_json
+from common import generate_indexed_id
+
+RETENTION_DAYS = 365
+INDEX_NAME = "index.jsonl"
+LOCK_NAME = ".lock"
+BLOCK_SIZE = 8192
+
+
+def segments_dir_for(changelog_file: str) -> str:
+    """Segment directory next to the legacy file (changelog.json -> changelog.d)."""
+    root, _ = os.path.splitext(os.path.expanduser(changelog_file))
+    return f"{root}.d"
+
+
+def segment_name(timestamp: Optional[str]) -> str:
+    """Monthly segment a change belongs to, from its ISO timestamp."""
+    month = (timestamp or "")[:7]
+    if len(month) != 7 or not month.replace("-", "").isdigit():
+        month = datetime.now().strftime("%Y-%m")
+    return f"{month}.jsonl"
+
+
+def _lines_newest_first(filepath: str) -> Iterator[bytes]:
+    """Non-empty lines of a file, last line first, reading blocks from the end."""
+    try:
+        f = open(filepath, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            step = min(BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    """Decode one JSONL line; a torn last line from a crash is skipped."""
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+class SegmentedChangelog:
+    """Append-only changelog segments plus their index."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_file = os.path.join(directory, INDEX_NAME)
+
+    @contextmanager
+    def _locked(self):
+        """Serialize writers; readers never block."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, LOCK_NAME), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _append_lines(self, filepath: str, lines: List[Dict[str, Any]]) -> int:
+        """Append JSON lines in one write and fsync. Returns the offset of the first."""
+        data = "".join(json.dumps(line) + "\n" for line in lines).encode()
+        with open(filepath, "a+b") as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset:
+                # Terminate a torn line left by a crash so it can't swallow ours
+                f.seek(offset - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+                    offset += 1
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    # -- reading ----------------------------------------------------------
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Index entries newest first, with later undos applied (lazy)."""
+        undone: Dict[str, str] = {}
+        for line in _lines_newest_first(self.index_file):
+            entry = _parse(line)
+            if entry is None:
+                continue
+            if "seg" not in entry:
+                undone[entry.get("id")] = entry.get("undone_at")
+                continue
+            if entry.get("id") in undone:
+                entry["undo"] = False
+                entry["undone_at"] = undone.pop(entry["id"])
+            yield entry
+
+    def read(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The full change record an index entry points at."""
+        try:
+            with open(os.path.join(self.directory, entry["seg"]), "rb") as f:
+                f.seek(entry["off"])
+                change = _parse(f.readline())
+        except FileNotFoundError:
+            return None
+        if change is not None and "undone_at" in entry:
+            change["can_undo"] = False
+            change["undone_at"] = entry["undone_at"]
+        return change
+
+    def find(self, change_id: str) -> Optional[Dict[str, Any]]:
+        """Index entry for a change ID, searching from the newest."""
+        for entry in self.entries():
+            if entry.get("id") == change_id:
+                return entry
+        return None
+
+    def get(self, change_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.find(change_id)
+        return self.read(entry) if entry else None
+
+    def recent(self, last_n: int) -> List[Dict[str, Any]]:
+        """The newest last_n changes, oldest first."""
+        changes = []
+        for entry in self.entries():
+            if len(changes) >= last_n:
+                break
+            change = self.read(entry)
+            if change is not None:
+                changes.append(change)
+        return list(reversed(changes))
+
+    def undoable(self, since: str) -> Iterator[Dict[str, Any]]:
+        """
+        Index entries still flagged can_undo with a timestamp at or after
+        since, newest first. Stops at the first older entry.
+        """
+        for entry in self.entries():
+            timestamp = entry.get("ts") or ""
+            if not timestamp:
+                continue
+            if timestamp < since:
+                return
+            if entry.get("undo"):
+                yield entry
+
+    def all_changes(self) -> List[Dict[str, Any]]:
+        """Every retained change, oldest first."""
+        changes = [self.read(entry) for entry in self.entries()]
+        return [change for change in reversed(changes) if change is not None]
+
+    # -- writing ----------------------------------------------------------
+
+    def append(self, change: Dict[str, Any]) -> str:
+        """Append a change (without 'id'). Returns the change ID."""
+        with self._locked():
+            last = next(self.entries(), None)
+            seq = (last or {}).get("seq", 0) + 1
+            change_id = generate_indexed_id("chg", seq)
+            record = {"id": change_id, **change}
+            segment = segment_name(record.get("timestamp"))
+            segment_path = os.path.join(self.directory, segment)
+            if not os.path.exists(segment_path):
+                self._expire()
+            offset = self._append_lines(segment_path, [record])
+            self._append_lines(self.index_file, [self._index_entry(seq, record, segment, offset)])
+        return change_id
+
+    def mark_undone(self, change_id: str, now: str) -> bool:
+        with self._locked():
+            if self.find(change_id) is None:
+                return False
+            self._append_lines(self.index_file, [{"id": change_id, "undone_at": now}])
+        return True
+
+    def import_changes(self, changes: List[Dict[str, Any]]) -> int:
+        """
+        Append existing change records (with IDs), keeping their order.
+        Changes whose ID is already indexed are skipped.
+
+        Returns:
+            Number of changes appended
+        """
+        with self._locked():
+            return self._import(changes)
+
+    def import_legacy(self, changelog_file: str) -> int:
+        """
+        Import a legacy changelog.json and rename it to .migrated, under the
+        lock so concurrent first callers import it once. Re-running after a
+        crash between the import and the rename skips what was imported.
+        """
+        with self._locked():
+            if not os.path.exists(changelog_file):
+                return 0
+            changes = load_json(changelog_file, {"changes": []}).get("changes", [])
+            imported = self._import(changes)
+            os.replace(changelog_file, changelog_file + ".migrated")
+        return imported
+
+    def _import(self, changes: List[Dict[str, Any]]) -> int:
+        known = {entry.get("id") for entry in self.entries()}
+        changes = [change for change in changes if change.get("id") not in known]
+        last = next(self.entries(), None)
+        seq = (last or {}).get("seq", 0)
+        by_segment: Dict[str, List[int]] = {}
+        for position, change in enumerate(changes):
+            by_segment.setdefault(segment_name(change.get("timestamp")), []).append(position)
+
+        index: List[Optional[Dict[str, Any]]] = [None] * len(changes)
+        for segment, positions in by_segment.items():
+            records = [changes[position] for position in positions]
+            offset = self._append_lines(os.path.join(self.directory, segment), records)
+            for position, record in zip(positions, records):
+                index[position] = self._index_entry(seq + position + 1, record, segment, offset)
+                offset += len((json.dumps(record) + "\n").encode())
+
+        if index:
+            self._append_lines(self.index_file, index)
+        return len(changes)
+
+    @staticmethod
+    def _index_entry(seq: int, change: Dict[str, Any], segment: str, offset: int) -> Dict[str, Any]:
+        return {
+            "seq": seq,
+            "id": change.get("id"),
+            "seg": segment,
+            "off": offset,
+            "ts": change.get("timestamp"),
+            "undo": bool(change.get("can_undo", False)),
+        }
+
+    def _expire(self) -> None:
+        """Drop segments whose month is entirely older than RETENTION_DAYS."""
+        cutoff = segment_name((datetime.now() - timedelta(days=RETENTION_DAYS)).isoformat())
+        expired = {
+            name for name in os.listdir(self.directory)
+            if name.endswith(".jsonl") and name != INDEX_NAME and name < cutoff
+        }
+        if not expired:
+            return
+
+        kept, dropped = [], set()
+        with open(self.index_file, "rb") as f:
+            for line in f:
+                entry = _parse(line)
+                if entry is None:
+                    continue
+                if entry.get("seg") in expired:
+                    dropped.add(entry.get("id"))
+                elif entry.get("id") not in dropped:
+                    kept.append(line.rstrip(b"\n"))
+
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(line + b"\n" for line in kept))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_file)
+        for name in expired:
+            os.remove(os.path.join(self.directory, name))
+
+
+def open_changelog(changelog_file: str) -> SegmentedChangelog:
+    """
+    Segmented changelog for a changelog.json path, importing (and renaming)
+    the legacy file if it is still there.
+    """
+    changelog_file = os.path.expanduser(changelog_file)
+    changelog = SegmentedChangelog(segments_dir_for(changelog_file))
+    if os.path.exists(changelog_file):
+        changelog.import_legacy(changelog_file)
+    return changelog
+
+
+def read_changes(changelog_file: str) -> List[Dict[str, Any]]:
+    """All changes, oldest first, from the segments and any legacy file, without writing."""
+    changelog_file = os.path.expanduser(changelog_file)
+    changes = SegmentedChangelog(segments_dir_for(changelog_file)).all_changes()
+    legacy = load_json(changelog_file, {"changes": []}).get("changes", [])
+    return changes + legacy
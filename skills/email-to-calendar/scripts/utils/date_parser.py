@@ -5,13 +5,18 @@ Shared date and time parsing utilities for email-to-calendar skill.
 Usage:
     python3 date_parser.py date "February 11, 2026"
     python3 date_parser.py time "2:30 PM"
+    printf 'date\tFeb 11, 2026\ntime\t2:30 PM\n' | python3 date_parser.py bulk
 
-Returns ISO format or empty string if parsing fails.
+Returns ISO format or empty string if parsing fails. In bulk mode each
+stdin line is "date<TAB>value" or "time<TAB>value" (a line without a
+prefix is a date) and one result line is written, and flushed, per input
+line, so a shell script can parse all its values with one interpreter.
 """
 
 import sys
 import re
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 
 MONTH_MAP = {
     'january': 1, 'february': 2, 'march': 3, 'april': 4,
@@ -22,6 +27,9 @@ MONTH_MAP = {
     'nov': 11, 'dec': 12
 }
 
+# Month names strptime's %B/%b accept (day-first dates only take these)
+STRPTIME_MONTHS = {name: num for name, num in MONTH_MAP.items() if name != 'sept'}
+
 DATE_FORMATS = [
     '%B %d, %Y', '%b %d, %Y',
     '%d %B %Y', '%d %b %Y',
@@ -29,12 +37,60 @@ DATE_FORMATS = [
     '%Y-%m-%d', '%Y/%m/%d'
 ]
 
+CACHE_SIZE = 1024
+
+# Date shapes, tried by their first character. Each yields
+# (year, month, day) candidates in DATE_FORMATS order; the first valid
+# calendar date wins.
+_NUMERIC_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})', re.A)
+_YEAR_FIRST_DATE = re.compile(r'(\d{4})([-/])(\d{1,2})\2(\d{1,2})', re.A)
+_DAY_FIRST_DATE = re.compile(r'(\d{1,2})\s+([a-z]+)\s+(\d{4})', re.A | re.I)
+_MONTH_FIRST_DATE = re.compile(r'([a-z]+)\s+(\d{1,2}),?\s+(\d{4})', re.A | re.I)
+_FALLBACK_DATE = re.compile(r'(\w+)\s+(\d{1,2}),?\s+(\d{4})', re.I)
+
+_TIME_HH_MM = re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)?', re.I)
+_TIME_HH = re.compile(r'(\d{1,2})\s*(am|pm)', re.I)
+
+
+def _valid_date(year: int, month: int, day: int) -> bool:
+    try:
+        date(year, month, day)
+    except ValueError:
+        return False
+    return True
+
+
+def _date_candidates(date_str: str):
+    """(year, month, day) readings of date_str by shape, most likely first."""
+    first = date_str[:1]
+    if first.isdigit():
+        match = _NUMERIC_DATE.fullmatch(date_str)
+        if match:
+            a, b, year = (int(g) for g in match.groups())
+            yield year, a, b  # US month/day first
+            yield year, b, a
+            return
+        match = _YEAR_FIRST_DATE.fullmatch(date_str)
+        if match:
+            yield int(match.group(1)), int(match.group(3)), int(match.group(4))
+            return
+        match = _DAY_FIRST_DATE.fullmatch(date_str)
+        if match:
+            month = STRPTIME_MONTHS.get(match.group(2).lower())
+            if month:
+                yield int(match.group(3)), month, int(match.group(1))
+    elif first.isalpha():
+        match = _MONTH_FIRST_DATE.fullmatch(date_str)
+        if match:
+            month = MONTH_MAP.get(match.group(1).lower())
+            if month:
+                yield int(match.group(3)), month, int(match.group(2))
+
+
+def _parse_date_slow(date_str: str) -> str:
+    """Format-by-format parse, used when no shape gives a valid date."""
+    from datetime import datetime
 
-def parse_date(date_str: str) -> str:
-    """Parse various date formats to ISO format (YYYY-MM-DD)."""
-    date_str = date_str.strip()
-
-    # Try standard formats
     for fmt in DATE_FORMATS:
         try:
             dt = datetime.strptime(date_str, fmt)
@@ -42,9 +98,8 @@ def parse_date(date_str: str) -> str:
         except ValueError:
             pass
 
-    # Try regex pattern for "Month DD, YYYY" variations
-    pattern = r'(\w+)\s+(\d{1,2}),?\s+(\d{4})'
-    match = re.search(pattern, date_str, re.I)
+    # Regex pattern for "Month DD, YYYY" variations
+    match = _FALLBACK_DATE.search(date_str)
     if match:
         month_name, day, year = match.groups()
         month_num = MONTH_MAP.get(month_name.lower())
@@ -54,6 +109,28 @@ def parse_date(date_str: str) -> str:
     return ''
 
 
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date(date_str: str) -> str:
+    """Parse various date formats to ISO format (YYYY-MM-DD)."""
+    date_str = date_str.strip()
+
+    for year, month, day in _date_candidates(date_str):
+        if _valid_date(year, month, day):
+            return f'{year:04d}-{month:02d}-{day:02d}'
+
+    return _parse_date_slow(date_str)
+
+
+def _to_24h(hour: int, ampm: str) -> int:
+    ampm = ampm.lower()
+    if ampm == 'pm' and hour != 12:
+        return hour + 12
+    if ampm == 'am' and hour == 12:
+        return 0
+    return hour
+
+
+@lru_cache(maxsize=CACHE_SIZE)
 def parse_time(time_str: str) -> str:
     """Parse various time formats to HH:MM format."""
     if not time_str:
@@ -62,35 +139,50 @@ def parse_time(time_str: str) -> str:
     time_str = time_str.strip()
 
     # Pattern: HH:MM AM/PM or HH:MM
-    pattern1 = r'(\d{1,2}):(\d{2})\s*(am|pm)?'
-    match = re.search(pattern1, time_str, re.I)
+    match = _TIME_HH_MM.search(time_str)
     if match:
         hour, minute, ampm = int(match.group(1)), int(match.group(2)), match.group(3)
         if ampm:
-            ampm = ampm.lower()
-            if ampm == 'pm' and hour != 12:
-                hour += 12
-            elif ampm == 'am' and hour == 12:
-                hour = 0
+            hour = _to_24h(hour, ampm)
         return f'{hour:02d}:{minute:02d}'
 
     # Pattern: H AM/PM (no minutes)
-    pattern2 = r'(\d{1,2})\s*(am|pm)'
-    match = re.search(pattern2, time_str, re.I)
+    match = _TIME_HH.search(time_str)
     if match:
-        hour, ampm = int(match.group(1)), match.group(2).lower()
-        if ampm == 'pm' and hour != 12:
-            hour += 12
-        elif ampm == 'am' and hour == 12:
-            hour = 0
+        hour = _to_24h(int(match.group(1)), match.group(2))
         return f'{hour:02d}:00'
 
     return ''
 
 
+PARSERS = {'date': parse_date, 'time': parse_time}
+
+
+def parse_stream(lines, out) -> None:
+    """
+    Bulk mode: parse "kind<TAB>value" lines, writing one result per line.
+
+    Args:
+        lines: Iterable of input lines
+        out: Writable text stream (flushed after every result)
+    """
+    for line in lines:
+        line = line.rstrip('\r\n')
+        kind, sep, value = line.partition('\t')
+        parser = PARSERS.get(kind) if sep else None
+        if parser is None:
+            parser, value = parse_date, line
+        out.write(parser(value) + '\n')
+        out.flush()
+
+
 def main():
+    if len(sys.argv) == 2 and sys.argv[1] == 'bulk':
+        parse_stream(sys.stdin, sys.stdout)
+        return
+
     if len(sys.argv) < 3:
-        print("Usage: date_parser.py <date|time> <value>", file=sys.stderr)
+        print("Usage: date_parser.py <date|time> <value> | date_parser.py bulk", file=sys.stderr)
         sys.exit(1)
 
     mode = sys.argv[1]
@@ -3,7 +3,8 @@
 Provider-agnostic email operations for email-to-calendar skill.
 
 Provides a consistent interface for email operations across different providers.
-Currently supports: gog (Gmail via gog CLI)
+Currently supports: gog (Gmail via gog CLI) and http (Gmail REST API
+directly, see http_provider.py)
 """
 
 import json
@@ -14,7 +15,8 @@ from typing import Optional, List, Dict, Any
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
-from json_store import load_json
+from provider_config import load_config
+import http_provider
 
 CONFIG_FILE = os.path.expanduser("~/.config/email-to-calendar/config.json")
 
@@ -23,16 +25,21 @@ def get_provider(provider: Optional[str] = None) -> str:
     """Get the provider to use, from parameter or config."""
     if provider:
         return provider
-    config = load_json(CONFIG_FILE, {})
+    config = load_config(CONFIG_FILE)
     return config.get("provider", "gog")
 
 
 def get_gmail_account() -> str:
     """Get the Gmail account from config."""
-    config = load_json(CONFIG_FILE, {})
+    config = load_config(CONFIG_FILE)
     return config.get("gmail_account", "")
 
 
+def _http_client() -> "http_provider.ApiClient":
+    """Shared HTTP client built from the config's "http" section."""
+    return http_provider.get_client(load_config(CONFIG_FILE).get("http", {}))
+
+
 def _run_gog_command(args: List[str]) -> Dict[str, Any]:
     """Run a gog command and return structured result."""
     try:
@@ -83,6 +90,8 @@ def read_email(email_id: str, provider: Optional[str] = None) -> Dict[str, Any]:
         if account:
             args.extend(["--account", account])
         return _run_gog_command(args)
+    elif provider == "http":
+        return http_provider.read_email(_http_client(), email_id)
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
@@ -115,6 +124,8 @@ def search_emails(
         if account:
             args.extend(["--account", account])
         return _run_gog_command(args)
+    elif provider == "http":
+        return http_provider.search_emails(_http_client(), query, max_results, include_body)
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
@@ -151,10 +162,49 @@ def modify_email(
             args.extend(["--account", account])
 
         return _run_gog_command(args)
+    elif provider == "http":
+        return http_provider.modify_emails(_http_client(), [email_id], remove_labels, add_labels)
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
 
+def modify_emails(
+    email_ids: List[str],
+    remove_labels: Optional[List[str]] = None,
+    add_labels: Optional[List[str]] = None,
+    provider: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Apply the same label changes to several emails. The http provider does
+    this in one request; gog runs one command per email.
+
+    Args:
+        email_ids: The email message IDs
+        remove_labels: Labels to remove (e.g., ["UNREAD", "INBOX"])
+        add_labels: Labels to add
+        provider: Provider to use (default: from config)
+
+    Returns:
+        Dict with success status, or error and the IDs that failed
+    """
+    provider = get_provider(provider)
+    if not email_ids:
+        return {"success": True}
+
+    if provider == "http":
+        return http_provider.modify_emails(_http_client(), email_ids, remove_labels, add_labels)
+
+    failed, errors = [], []
+    for email_id in email_ids:
+        result = modify_email(email_id, remove_labels, add_labels, provider)
+        if not result.get("success"):
+            failed.append(email_id)
+            errors.append(result.get("error", "Unknown error"))
+    if failed:
+        return {"success": False, "error": "; ".join(errors), "failed": failed}
+    return {"success": True}
+
+
 def send_email(
     to: str,
     subject: str,
@@ -181,6 +231,8 @@ def send_email(
         if account:
             args.extend(["--account", account])
         return _run_gog_command(args)
+    elif provider == "http":
+        return http_provider.send_email(_http_client(), to, subject, body)
     else:
         return {"success": False, "error": f"Unknown provider: {provider}"}
 
@@ -234,7 +286,10 @@ def main():
             sys.exit(1)
         remove_labels = args.get("remove_labels", "").split(",") if args.get("remove_labels") else None
         add_labels = args.get("add_labels", "").split(",") if args.get("add_labels") else None
-        result = modify_email(email_id, remove_labels, add_labels, provider)
+        if "," in email_id:
+            result = modify_emails(email_id.split(","), remove_labels, add_labels, provider)
+        else:
+            result = modify_email(email_id, remove_labels, add_labels, provider)
 
     elif action == "send":
         to = args.get("to", "")
@@ -8,17 +8,24 @@ Manages tracking of calendar events for duplicate detection and updates.
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 from json_store import load_json, save_json
+from state_store import open_state_store
 
 EVENTS_FILE = os.path.expanduser(
     "~/.openclaw/workspace/memory/email-to-calendar/events.json"
 )
 
+# lookup --validate: calendar searches run in parallel, each covering up to
+# this many days of tracked events
+VALIDATE_WORKERS = 4
+VALIDATE_WINDOW_DAYS = 14
+
 
 def track_event(
     event_id: str,
@@ -28,9 +35,16 @@ def track_event(
     start: str = ""
 ) -> None:
     """Track a new or updated event."""
-    data = load_json(EVENTS_FILE, {"events": []})
     created_at = datetime.now().isoformat()
 
+    store = open_state_store(EVENTS_FILE)
+    if store is not None:
+        store.upsert_event(event_id, calendar_id, email_id, summary, start, created_at)
+        print(f"Tracked event: {event_id}")
+        return
+
+    data = load_json(EVENTS_FILE, {"events": []})
+
     # Check if event already tracked
     existing = next(
         (e for e in data["events"] if e["event_id"] == event_id),
@@ -67,29 +81,42 @@ def update_tracked_event(
     start: str = ""
 ) -> None:
     """Update a tracked event's metadata."""
-    data = load_json(EVENTS_FILE, {"events": []})
+    store = open_state_store(EVENTS_FILE)
+    if store is not None:
+        found = store.update_event(event_id, summary, start, datetime.now().isoformat())
+    else:
+        data = load_json(EVENTS_FILE, {"events": []})
 
-    found = False
-    for event in data.get("events", []):
-        if event.get("event_id") == event_id:
-            if summary:
-                event["summary"] = summary
-            if start:
-                event["start"] = start
-            event["updated_at"] = datetime.now().isoformat()
-            found = True
-            break
+        found = False
+        for event in data.get("events", []):
+            if event.get("event_id") == event_id:
+                if summary:
+                    event["summary"] = summary
+                if start:
+                    event["start"] = start
+                event["updated_at"] = datetime.now().isoformat()
+                found = True
+                break
 
     if not found:
         print(f"Warning: Event {event_id} not found in tracking", file=sys.stderr)
         sys.exit(1)
 
-    save_json(EVENTS_FILE, data)
+    if store is None:
+        save_json(EVENTS_FILE, data)
     print(f"Updated tracked event: {event_id}")
 
 
 def delete_tracked_event(event_id: str) -> None:
     """Delete an event from tracking."""
+    store = open_state_store(EVENTS_FILE)
+    if store is not None:
+        if store.delete_event(event_id):
+            print(f"Deleted tracked event: {event_id}")
+        else:
+            print(f"Warning: Event {event_id} not found in tracking", file=sys.stderr)
+        return
+
     data = load_json(EVENTS_FILE, {"events": []})
 
     original_count = len(data.get("events", []))
@@ -106,80 +133,136 @@ def delete_tracked_event(event_id: str) -> None:
         print(f"Deleted tracked event: {event_id}")
 
 
+def delete_tracked_events(event_ids: List[str]) -> int:
+    """
+    Delete several events from tracking with a single write.
+
+    Returns:
+        Number of events removed
+    """
+    if not event_ids:
+        return 0
+
+    store = open_state_store(EVENTS_FILE)
+    if store is not None:
+        return store.delete_events(event_ids)
+
+    data = load_json(EVENTS_FILE, {"events": []})
+    doomed = set(event_ids)
+    kept = [e for e in data.get("events", []) if e.get("event_id") not in doomed]
+    removed = len(data.get("events", [])) - len(kept)
+    if removed:
+        data["events"] = kept
+        save_json(EVENTS_FILE, data)
+    return removed
+
+
+def _validation_windows(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group events by calendar, then merge their start dates into windows of
+    at most VALIDATE_WINDOW_DAYS so one calendar search covers many events.
+    """
+    by_calendar: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for event in events:
+        date_part = event["start"].split("T")[0]
+        calendar_id = event.get("calendar_id") or "primary"
+        by_calendar.setdefault(calendar_id, {}).setdefault(date_part, []).append(event)
+
+    windows = []
+    for calendar_id, by_date in by_calendar.items():
+        window = None
+        for date_part in sorted(by_date):
+            day = datetime.strptime(date_part, "%Y-%m-%d").date()
+            if window is None or (day - window["first"]).days >= VALIDATE_WINDOW_DAYS:
+                window = {"calendar_id": calendar_id, "first": day, "from": date_part, "events": []}
+                windows.append(window)
+            window["to"] = date_part
+            window["events"].extend(by_date[date_part])
+    return windows
+
+
+def _find_orphans(events: List[Dict[str, Any]], provider: str = "") -> List[str]:
+    """
+    Return the ids of tracked events that no longer exist in their calendar.
+    Events whose window search fails or returns a paged or unrecognised
+    listing, or without a parseable start date, are assumed to still exist.
+    """
+    from calendar_ops import search_events
+    from calendar_mirror import listed_events
+
+    dated = []
+    for event in events:
+        try:
+            if event.get("start"):
+                datetime.strptime(event["start"].split("T")[0], "%Y-%m-%d")
+                dated.append(event)
+        except ValueError:
+            pass
+    windows = _validation_windows(dated)
+    if not windows:
+        return []
+
+    def search(window):
+        return search_events(
+            calendar_id=window["calendar_id"],
+            from_dt=f"{window['from']}T00:00:00",
+            to_dt=f"{window['to']}T23:59:59",
+            provider=provider if provider else None
+        )
+
+    orphans = []
+    with ThreadPoolExecutor(max_workers=min(VALIDATE_WORKERS, len(windows))) as pool:
+        for window, result in zip(windows, pool.map(search, windows)):
+            if not result.get("success"):
+                continue
+            cal_events = listed_events(result.get("data"))
+            if cal_events is None:
+                continue
+            found = {e.get("id") for e in cal_events}
+            orphans.extend(
+                event["event_id"] for event in window["events"]
+                if event["event_id"] not in found
+            )
+    return orphans
+
+
 def lookup_events(
     search_type: str,
     search_value: str = "",
     validate: bool = False,
-    script_dir: str = "",
     provider: str = ""
 ) -> None:
     """Look up tracked events and print as JSON."""
-    import subprocess
-
-    # Import calendar_ops for validation
-    from calendar_ops import search_events
-
-    data = load_json(EVENTS_FILE, {"events": []})
-    events = data.get("events", [])
-
-    if search_type == "list":
-        results = events
-    elif search_type == "email_id":
-        results = [e for e in events if e.get("email_id") == search_value]
-    elif search_type == "event_id":
-        results = [e for e in events if e.get("event_id") == search_value]
-    elif search_type == "summary":
-        search_lower = search_value.lower()
-        results = [
-            e for e in events
-            if search_lower in e.get("summary", "").lower()
-        ]
+    store = open_state_store(EVENTS_FILE)
+    if store is not None:
+        results = store.find_events(search_type, search_value)
     else:
-        results = []
+        data = load_json(EVENTS_FILE, {"events": []})
+        events = data.get("events", [])
+
+        if search_type == "list":
+            results = events
+        elif search_type == "email_id":
+            results = [e for e in events if e.get("email_id") == search_value]
+        elif search_type == "event_id":
+            results = [e for e in events if e.get("event_id") == search_value]
+        elif search_type == "summary":
+            search_lower = search_value.lower()
+            results = [
+                e for e in events
+                if search_lower in (e.get("summary") or "").lower()
+            ]
+        else:
+            results = []
 
-    # If validation requested, check each result and remove orphans
+    # If validation requested, check results against the calendar and remove orphans
     if validate and results:
-        valid_results = []
-        for event in results:
-            event_id = event.get("event_id")
-            calendar_id = event.get("calendar_id", "primary")
-
-            try:
-                start = event.get("start", "")
-                if start:
-                    date_part = start.split("T")[0]
-                    from_dt = f"{date_part}T00:00:00"
-                    to_dt = f"{date_part}T23:59:59"
-
-                    # Use calendar_ops.search_events instead of direct gog call
-                    search_result = search_events(
-                        calendar_id=calendar_id,
-                        from_dt=from_dt,
-                        to_dt=to_dt,
-                        provider=provider if provider else None
-                    )
-
-                    if search_result.get("success"):
-                        cal_events = search_result.get("data", []) or []
-                        found = any(e.get("id") == event_id for e in cal_events)
-                        if found:
-                            valid_results.append(event)
-                        else:
-                            print(f"Orphaned event detected: {event_id} - removing from tracking", file=sys.stderr)
-                            if script_dir:
-                                subprocess.run(
-                                    f'{script_dir}/delete_tracked_event.sh --event-id "{event_id}"',
-                                    shell=True, capture_output=True
-                                )
-                    else:
-                        # On error, assume event still exists
-                        valid_results.append(event)
-                else:
-                    valid_results.append(event)
-            except Exception:
-                valid_results.append(event)
-
-        results = valid_results
+        orphans = set(_find_orphans(results, provider))
+        if orphans:
+            for event_id in sorted(orphans):
+                print(f"Orphaned event detected: {event_id} - removing from tracking", file=sys.stderr)
+            delete_tracked_events(sorted(orphans))
+            results = [e for e in results if e.get("event_id") not in orphans]
 
     print(json.dumps(results, indent=2))
 
@@ -230,7 +313,6 @@ def main():
             search_type=args.get("type", "list"),
             search_value=args.get("value", ""),
             validate=args.get("validate", False) == True or args.get("validate", "") == "true",
-            script_dir=args.get("script_dir", ""),
             provider=args.get("provider", "")
         )
 
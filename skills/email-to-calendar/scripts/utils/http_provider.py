@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+"""
+Direct HTTP provider for email-to-calendar skill.
+
+Talks to the Google Calendar v3 and Gmail v1 REST APIs without forking a
+CLI. Selected with "provider": "http" in config.json; calendar_ops and
+email_ops dispatch here from the same functions that run gog.
+
+- One keep-alive connection per host is reused for every call in a process.
+- OAuth access tokens are cached on disk (mode 0600) until shortly before
+  they expire, then refreshed with the configured refresh token.
+- batch() sends up to BATCH_LIMIT calls in one multipart/mixed request,
+  so many creates, updates, searches or message reads cost one round trip.
+
+Results use the same shape as the gog provider:
+    {"success": True, "data": <API resource>}
+    {"success": False, "error": "...", "error_type": "not_found"?, "status": 404}
+
+Config ("http" section of config.json):
+    access_token                 Static token (skips the refresh flow)
+    client_id, client_secret,
+    refresh_token                OAuth credentials for the refresh flow
+    token_uri                    Default: https://oauth2.googleapis.com/token
+    api_base                     Default: https://www.googleapis.com
+    user_id                      Gmail user (default: "me")
+"""
+
+import base64
+import functools
+import hashlib
+import http.client
+import json
+import os
+import re
+import sys
+import time
+import uuid
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import load_json, save_json
+
+DEFAULT_API_BASE = "https://www.googleapis.com"
+DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
+TOKEN_FILE = os.path.expanduser("~/.cache/email-to-calendar/token.json")
+TOKEN_EXPIRY_MARGIN = 60  # seconds before expiry a token is refreshed
+REQUEST_TIMEOUT = 60
+BATCH_LIMIT = 50  # calls per batch request (Gmail's recommended maximum)
+# Methods safe to re-send if a reused connection drops before the response
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+CALENDAR_API = "calendar/v3"
+GMAIL_API = "gmail/v1"
+
+# One call: (method, path relative to api_base, query params, JSON body)
+Call = Tuple[str, str, Optional[Dict[str, Any]], Optional[Any]]
+
+
+class HttpSession:
+    """Keep-alive HTTP(S) connections, one per scheme and host."""
+
+    def __init__(self, timeout: float = REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self._conns: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send one request, reusing an open connection to the host. If a
+        reused connection turns out to be closed, the request is re-sent on
+        a new one only when it can't have reached the server (sending
+        failed) or its method is idempotent: a POST the server may have
+        processed is never sent twice.
+
+        Returns:
+            (status, lowercased headers, body)
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        while True:
+            reused = key in self._conns
+            conn = self._conns.get(key) or self._connect(parts.scheme, parts.netloc)
+            self._conns[key] = conn
+            try:
+                conn.request(method, target, body=body, headers=headers or {})
+            except ConnectionError:
+                self._drop(key)
+                if reused:
+                    continue  # server closed an idle keep-alive connection
+                raise
+            except Exception:
+                self._drop(key)
+                raise
+            try:
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                self._drop(key)
+                if reused and method in IDEMPOTENT_METHODS:
+                    continue
+                raise
+            except Exception:
+                self._drop(key)
+                raise
+            if resp.will_close:
+                self._drop(key)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        conn = self._conns.pop(key, None)
+        if conn is not None:
+            conn.close()
+
+    def close(self) -> None:
+        for key in list(self._conns):
+            self._drop(key)
+
+
+class TokenCache:
+    """OAuth access token, cached in memory and in TOKEN_FILE."""
+
+    def __init__(self, settings: Dict[str, Any], session: HttpSession):
+        self.settings = settings
+        self.session = session
+        self.token_uri = settings.get("token_uri", DEFAULT_TOKEN_URI)
+        credentials = f"{settings.get('client_id', '')}:{settings.get('refresh_token', '')}"
+        self.key = hashlib.sha256(credentials.encode()).hexdigest()[:16]
+        self._token: Optional[Dict[str, Any]] = None
+
+    def get(self) -> str:
+        """Return a valid access token, refreshing it if needed."""
+        if self.settings.get("access_token"):
+            return self.settings["access_token"]
+        if not self._valid(self._token):
+            cached = load_json(TOKEN_FILE, {}).get(self.key)
+            self._token = cached if self._valid(cached) else self._refresh()
+        return self._token["access_token"]
+
+    def invalidate(self) -> None:
+        """Forget the current token (e.g. after a 401)."""
+        self._token = None
+        cache = load_json(TOKEN_FILE, {})
+        if cache.pop(self.key, None) is not None:
+            self._save(cache)
+
+    @staticmethod
+    def _valid(token: Optional[Dict[str, Any]]) -> bool:
+        return bool(token) and token.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN > time.time()
+
+    def _refresh(self) -> Dict[str, Any]:
+        missing = [k for k in ("client_id", "client_secret", "refresh_token") if not self.settings.get(k)]
+        if missing:
+            raise RuntimeError(f"http provider: missing {', '.join(missing)} in config")
+        status, _, data = self.session.request(
+            "POST", self.token_uri,
+            body=urlencode({
+                "grant_type": "refresh_token",
+                "client_id": self.settings["client_id"],
+                "client_secret": self.settings["client_secret"],
+                "refresh_token": self.settings["refresh_token"],
+            }).encode(),
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        if status != 200:
+            raise RuntimeError(f"http provider: token refresh failed ({status}): {data.decode(errors='replace')}")
+        payload = json.loads(data)
+        token = {
+            "access_token": payload["access_token"],
+            "expires_at": time.time() + int(payload.get("expires_in", 3600)),
+        }
+        cache = load_json(TOKEN_FILE, {})
+        cache[self.key] = token
+        self._save(cache)
+        return token
+
+    @staticmethod
+    def _save(cache: Dict[str, Any]) -> None:
+        if not os.path.exists(TOKEN_FILE):
+            # Create it private first; save_json keeps the existing mode
+            os.makedirs(os.path.dirname(TOKEN_FILE), exist_ok=True)
+            os.close(os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT, 0o600))
+        save_json(TOKEN_FILE, cache)
+
+
+class ApiClient:
+    """Authenticated JSON calls and batches against one API base URL."""
+
+    def __init__(self, settings: Dict[str, Any], session: Optional[HttpSession] = None):
+        self.settings = settings
+        self.api_base = settings.get("api_base", DEFAULT_API_BASE).rstrip("/")
+        self.session = session or HttpSession()
+        self.tokens = TokenCache(settings, self.session)
+
+    def call(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Make one API call.
+
+        Args:
+            method: HTTP method
+            path: Path below api_base (e.g. '/calendar/v3/calendars/primary/events')
+            query: Query parameters
+            body: JSON-serializable request body
+
+        Returns:
+            Result dict (see module docstring)
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        for attempt in range(2):
+            try:
+                headers = {"Authorization": f"Bearer {self._token()}", "Accept": "application/json"}
+                if payload is not None:
+                    headers["Content-Type"] = "application/json"
+                status, _, data = self.session.request(
+                    method, self.api_base + _target(path, query), payload, headers
+                )
+            except (OSError, http.client.HTTPException, RuntimeError) as e:
+                return {"success": False, "error": str(e)}
+            if status == 401 and attempt == 0:
+                self.tokens.invalidate()
+                continue
+            return _result(status, data)
+
+    def batch(self, api: str, calls: List[Call]) -> List[Dict[str, Any]]:
+        """
+        Make many calls with one multipart request per BATCH_LIMIT calls.
+
+        Args:
+            api: API the calls belong to (CALENDAR_API or GMAIL_API)
+            calls: (method, path, query, body) tuples
+
+        Returns:
+            One result dict per call, in order
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(calls), BATCH_LIMIT):
+            results.extend(self._batch_chunk(api, calls[start:start + BATCH_LIMIT]))
+        return results
+
+    def _batch_chunk(self, api: str, calls: List[Call]) -> List[Dict[str, Any]]:
+        if len(calls) == 1:
+            return [self.call(*calls[0])]
+        boundary = f"batch_{uuid.uuid4().hex}"
+        prefix = urlsplit(self.api_base).path
+        parts = []
+        for i, (method, path, query, body) in enumerate(calls):
+            part = (
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item-{i}>\r\n\r\n"
+                f"{method} {prefix}{_target(path, query)} HTTP/1.1\r\n"
+            )
+            if body is not None:
+                part += f"Content-Type: application/json\r\n\r\n{json.dumps(body)}\r\n"
+            else:
+                part += "\r\n"
+            parts.append(part)
+        payload = ("".join(parts) + f"--{boundary}--\r\n").encode()
+
+        for attempt in range(2):
+            try:
+                headers = {
+                    "Authorization": f"Bearer {self._token()}",
+                    "Content-Type": f"multipart/mixed; boundary={boundary}",
+                }
+                status, resp_headers, data = self.session.request(
+                    "POST", f"{self.api_base}/batch/{api}", payload, headers
+                )
+            except (OSError, http.client.HTTPException, RuntimeError) as e:
+                return [{"success": False, "error": str(e)} for _ in calls]
+            if status == 401 and attempt == 0:
+                self.tokens.invalidate()
+                continue
+            if status != 200:
+                return [_result(status, data) for _ in calls]
+            return _parse_batch(resp_headers.get("content-type", ""), data, len(calls))
+
+    def _token(self) -> str:
+        return self.tokens.get()
+
+
+_clients: Dict[str, ApiClient] = {}
+
+
+def get_client(settings: Dict[str, Any]) -> ApiClient:
+    """Shared client for a settings dict, so connections and tokens are reused."""
+    key = json.dumps(settings, sort_keys=True)
+    if key not in _clients:
+        _clients[key] = ApiClient(settings)
+    return _clients[key]
+
+
+# -- wire helpers ---------------------------------------------------------
+
+def _target(path: str, query: Optional[Dict[str, Any]] = None) -> str:
+    if not query:
+        return path
+    params = [(k, v) for k, v in query.items() if v is not None]
+    return f"{path}?{urlencode(params, doseq=True)}"
+
+
+def _result(status: int, data: bytes) -> Dict[str, Any]:
+    """Turn an HTTP status and body into a result dict."""
+    try:
+        parsed = json.loads(data) if data.strip() else None
+    except ValueError:
+        parsed = None
+    if 200 <= status < 300:
+        return {"success": True, "data": parsed}
+    error = data.decode(errors="replace")
+    if isinstance(parsed, dict) and isinstance(parsed.get("error"), dict):
+        error = parsed["error"].get("message", error)
+    result = {"success": False, "error": error or f"HTTP {status}", "status": status}
+    if status in (404, 410):
+        result["error_type"] = "not_found"
+    return result
+
+
+def _split_message(raw: bytes) -> Tuple[Dict[str, str], bytes]:
+    """Split 'headers CRLF CRLF body' into (lowercased headers, body)."""
+    blank = re.match(rb"\r?\n", raw)
+    if blank:  # no headers at all
+        return {}, raw[blank.end():]
+    match = re.search(rb"\r?\n\r?\n", raw)
+    head, body = (raw[:match.start()], raw[match.end():]) if match else (raw, b"")
+    headers = {}
+    for line in head.decode(errors="replace").splitlines():
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers, body
+
+
+def _parse_batch(content_type: str, data: bytes, count: int) -> List[Dict[str, Any]]:
+    """Results of a multipart/mixed batch response, in request order."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    missing = {"success": False, "error": "missing from batch response"}
+    if not match:
+        return [dict(missing) for _ in range(count)]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    unlabeled = iter(range(count))
+    for part in data.split(b"--" + match.group(1).encode())[1:]:
+        if part.startswith(b"--"):
+            break
+        part_headers, inner = _split_message(part.lstrip(b"\r\n"))
+        status_line, _, rest = inner.lstrip(b"\r\n").partition(b"\n")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            continue
+        _, body = _split_message(rest)
+        content_id = re.search(r"item-(\d+)", part_headers.get("content-id", ""))
+        index = int(content_id.group(1)) if content_id else next(unlabeled, None)
+        if index is not None and 0 <= index < count:
+            results[index] = _result(status, body.rstrip(b"\r\n"))
+    return [r if r is not None else dict(missing) for r in results]
+
+
+def _date_errors(func):
+    """Report unparseable dates as a failed result, as the gog provider does."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid date: {e}"}
+    return wrapper
+
+
+def _rfc3339(value: str) -> str:
+    """Naive ISO datetimes/dates are taken as local time and given an offset."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return dt.isoformat()
+
+
+# -- calendar -------------------------------------------------------------
+
+def _events_path(calendar_id: str, event_id: Optional[str] = None) -> str:
+    path = f"/{CALENDAR_API}/calendars/{quote(calendar_id, safe='')}/events"
+    return f"{path}/{quote(event_id, safe='')}" if event_id else path
+
+
+def _event_time(value: str) -> Dict[str, str]:
+    if len(value) == 10:  # YYYY-MM-DD: all-day
+        return {"date": value}
+    return {"dateTime": _rfc3339(value)}
+
+
+def _reminders(reminders: List[str]) -> Dict[str, Any]:
+    """['email:1d', 'popup:30m'] -> API reminder overrides."""
+    units = {"m": 1, "h": 60, "d": 1440, "w": 10080}
+    overrides = []
+    for reminder in reminders:
+        method, _, amount = reminder.partition(":")
+        match = re.fullmatch(r"(\d+)([mhdw]?)", amount.strip())
+        if not match:
+            continue
+        overrides.append({
+            "method": method.strip() or "popup",
+            "minutes": int(match.group(1)) * units[match.group(2) or "m"],
+        })
+    return {"useDefault": False, "overrides": overrides}
+
+
+def search_call(calendar_id: str, from_dt: Optional[str], to_dt: Optional[str],
+                page_token: Optional[str] = None) -> Call:
+    return ("GET", _events_path(calendar_id), {
+        "singleEvents": "true",
+        "orderBy": "startTime",
+        "maxResults": 2500,
+        "timeMin": _rfc3339(from_dt) if from_dt else None,
+        "timeMax": _rfc3339(to_dt) if to_dt else None,
+        "pageToken": page_token,
+    }, None)
+
+
+def create_call(
+    calendar_id: str,
+    summary: str,
+    from_dt: str,
+    to_dt: str,
+    description: Optional[str] = None,
+    attendees: Optional[List[str]] = None,
+    reminders: Optional[List[str]] = None,
+    rrule: Optional[str] = None
+) -> Call:
+    body: Dict[str, Any] = {
+        "summary": summary,
+        "start": _event_time(from_dt),
+        "end": _event_time(to_dt),
+    }
+    if description:
+        body["description"] = description
+    if attendees:
+        body["attendees"] = [{"email": email} for email in attendees]
+    if reminders:
+        body["reminders"] = _reminders(reminders)
+    if rrule:
+        body["recurrence"] = [rrule if rrule.startswith("RRULE:") else f"RRULE:{rrule}"]
+    query = {"sendUpdates": "all"} if attendees else None
+    return ("POST", _events_path(calendar_id), query, body)
+
+
+def update_call(
+    calendar_id: str,
+    event_id: str,
+    summary: Optional[str] = None,
+    from_dt: Optional[str] = None,
+    to_dt: Optional[str] = None,
+    description: Optional[str] = None,
+    attendees: Optional[List[Dict[str, Any]]] = None
+) -> Call:
+    """PATCH call; attendees is the complete new attendee list."""
+    body: Dict[str, Any] = {}
+    if summary:
+        body["summary"] = summary
+    if from_dt:
+        body["start"] = _event_time(from_dt)
+    if to_dt:
+        body["end"] = _event_time(to_dt)
+    if description:
+        body["description"] = description
+    if attendees is not None:
+        body["attendees"] = attendees
+    query = {"sendUpdates": "all"} if attendees else None
+    return ("PATCH", _events_path(calendar_id, event_id), query, body)
+
+
+def delete_call(calendar_id: str, event_id: str) -> Call:
+    return ("DELETE", _events_path(calendar_id, event_id), None, None)
+
+
+def _items(client: ApiClient, call: Call, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Collapse a paged events list into {"success", "data": [items]}."""
+    if not result.get("success"):
+        return result
+    page = result.get("data") or {}
+    items = list(page.get("items", []))
+    while page.get("nextPageToken"):
+        method, path, query, body = call
+        more = client.call(method, path, dict(query or {}, pageToken=page["nextPageToken"]), body)
+        if not more.get("success"):
+            return more
+        page = more.get("data") or {}
+        items.extend(page.get("items", []))
+    return {"success": True, "data": items}
+
+
+@_date_errors
+def search_events(client: ApiClient, calendar_id: str, from_dt: Optional[str] = None,
+                  to_dt: Optional[str] = None) -> Dict[str, Any]:
+    call = search_call(calendar_id, from_dt, to_dt)
+    return _items(client, call, client.call(*call))
+
+
+@_date_errors
+def create_event(client: ApiClient, calendar_id: str, **kwargs) -> Dict[str, Any]:
+    return client.call(*create_call(calendar_id, **kwargs))
+
+
+@_date_errors
+def update_event(
+    client: ApiClient,
+    calendar_id: str,
+    event_id: str,
+    add_attendees: Optional[List[str]] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    attendees = None
+    if add_attendees:
+        # The API replaces the attendee list, so merge with the current one
+        current = client.call("GET", _events_path(calendar_id, event_id))
+        if not current.get("success"):
+            return current
+        attendees = list((current.get("data") or {}).get("attendees", []))
+        known = {a.get("email") for a in attendees}
+        attendees.extend({"email": email} for email in add_attendees if email not in known)
+    return client.call(*update_call(calendar_id, event_id, attendees=attendees, **kwargs))
+
+
+def delete_event(client: ApiClient, calendar_id: str, event_id: str) -> Dict[str, Any]:
+    return client.call(*delete_call(calendar_id, event_id))
+
+
+@_date_errors
+def sync_events(client: ApiClient, calendar_id: str, sync_token: Optional[str] = None,
+                time_min: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Incremental sync: events changed since sync_token (cancelled ones have
+    status 'cancelled'), or a full listing from time_min if no token.
+
+    Returns:
+        {"success": True, "data": {"items": [...], "sync_token": "...", "full": bool}}
+        or an error; error_type 'sync_expired' means start over without a token
+    """
+    query: Dict[str, Any] = {"singleEvents": "true", "maxResults": 2500}
+    if sync_token:
+        query["syncToken"] = sync_token
+    elif time_min:
+        query["timeMin"] = _rfc3339(time_min)
+
+    items: List[Dict[str, Any]] = []
+    while True:
+        result = client.call("GET", _events_path(calendar_id), query)
+        if not result.get("success"):
+            if result.get("status") == 410:
+                result["error_type"] = "sync_expired"
+            return result
+        page = result.get("data") or {}
+        items.extend(page.get("items", []))
+        if not page.get("nextPageToken"):
+            break
+        query = dict(query, pageToken=page["nextPageToken"])
+    return {"success": True, "data": {
+        "items": items,
+        "sync_token": page.get("nextSyncToken"),
+        "full": not sync_token,
+    }}
+
+
+def batch_calendar(client: ApiClient, calendar_id: str, ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run many calendar operations in as few requests as possible.
+
+    Args:
+        client: ApiClient
+        calendar_id: Default calendar for ops without their own calendar_id
+        ops: Dicts with "action" ('search', 'create', 'update' or 'delete')
+             plus that action's arguments
+
+    Returns:
+        One result dict per op, in order
+    """
+    calls: List[Optional[Call]] = []
+    results: Dict[int, Dict[str, Any]] = {}
+    for i, op in enumerate(ops):
+        args = {k: v for k, v in op.items() if k not in ("action", "calendar_id")}
+        cal = op.get("calendar_id") or calendar_id
+        action = op.get("action")
+        try:
+            if action == "search":
+                call = search_call(cal, args.get("from_dt"), args.get("to_dt"))
+            elif action == "create":
+                call = create_call(cal, **args)
+            elif action == "update" and not args.get("add_attendees"):
+                args.pop("add_attendees", None)
+                call = update_call(cal, **args)
+            elif action == "update":
+                # Needs the current attendee list first; not batchable
+                results[i] = update_event(client, cal, **args)
+                call = None
+            elif action == "delete":
+                call = delete_call(cal, args["event_id"])
+            else:
+                results[i] = {"success": False, "error": f"Unknown action: {action}"}
+                call = None
+        except (TypeError, KeyError, ValueError) as e:
+            results[i] = {"success": False, "error": f"Invalid {action} op: {e}"}
+            call = None
+        calls.append(call)
+
+    pending = [i for i, call in enumerate(calls) if call is not None]
+    for i, result in zip(pending, client.batch(CALENDAR_API, [calls[i] for i in pending])):
+        results[i] = _items(client, calls[i], result) if ops[i].get("action") == "search" else result
+    return [results[i] for i in range(len(ops))]
+
+
+# -- gmail ----------------------------------------------------------------
+
+def _messages_path(client: ApiClient, suffix: str = "") -> str:
+    user = quote(client.settings.get("user_id", "me"), safe="")
+    return f"/{GMAIL_API}/users/{user}/messages{suffix}"
+
+
+def read_email(client: ApiClient, email_id: str) -> Dict[str, Any]:
+    return client.call("GET", _messages_path(client, f"/{quote(email_id, safe='')}"), {"format": "full"})
+
+
+def search_emails(client: ApiClient, query: str, max_results: int = 20,
+                  include_body: bool = False) -> Dict[str, Any]:
+    """List matching messages, then fetch them all in one batch."""
+    listed = client.call("GET", _messages_path(client), {"q": query, "maxResults": max_results})
+    if not listed.get("success"):
+        return listed
+    ids = [m["id"] for m in (listed.get("data") or {}).get("messages", [])][:max_results]
+    fmt = {"format": "full"} if include_body else {"format": "metadata"}
+    fetched = client.batch(GMAIL_API, [
+        ("GET", _messages_path(client, f"/{quote(i, safe='')}"), fmt, None) for i in ids
+    ])
+    failed = next((r for r in fetched if not r.get("success")), None)
+    if failed:
+        return failed
+    return {"success": True, "data": [r.get("data") for r in fetched]}
+
+
+def modify_emails(client: ApiClient, email_ids: List[str],
+                  remove_labels: Optional[List[str]] = None,
+                  add_labels: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Change labels on many messages with one batchModify call."""
+    if len(email_ids) == 1:
+        return client.call("POST", _messages_path(client, f"/{quote(email_ids[0], safe='')}/modify"), None, {
+            "addLabelIds": add_labels or [],
+            "removeLabelIds": remove_labels or [],
+        })
+    return client.call("POST", _messages_path(client, "/batchModify"), None, {
+        "ids": email_ids,
+        "addLabelIds": add_labels or [],
+        "removeLabelIds": remove_labels or [],
+    })
+
+
+def send_email(client: ApiClient, to: str, subject: str, body: str) -> Dict[str, Any]:
+    message = EmailMessage()
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    return client.call("POST", _messages_path(client, "/send"), None, {"raw": raw})
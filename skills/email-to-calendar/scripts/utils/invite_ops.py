@@ -11,7 +11,8 @@ from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
-from json_store import load_json, save_json
+from state_store import open_state_store
+from pending_index import load_pending, save_pending
 
 PENDING_FILE = os.path.expanduser(
     "~/.openclaw/workspace/memory/email-to-calendar/pending_invites.json"
@@ -26,25 +27,46 @@ def update_invite_status(
     calendar_event_id: str = ""
 ) -> None:
     """Update the status of a pending invite event."""
-    data = load_json(PENDING_FILE, {"invites": []})
+    store = open_state_store(PENDING_FILE)
+    if store is not None:
+        event_name = store.update_invite_event_status(
+            invite_id, email_id, event_title, new_status, calendar_event_id,
+            datetime.now().isoformat()
+        )
+        if event_name is None:
+            print(f"Warning: No matching event found for '{event_title}'", file=sys.stderr)
+            sys.exit(1)
+        print(f"Updated '{event_name}' to status: {new_status}")
+        return
+
+    data, index = load_pending(PENDING_FILE)
+    invites = data["invites"]
+
+    # An email_id names at most one invite; otherwise scan in order
+    if email_id:
+        position = index.by_email_id.get(email_id)
+        positions = [] if position is None else [position]
+    else:
+        positions = range(len(invites))
 
     updated = False
-    for invite in data.get("invites", []):
+    for position in positions:
+        invite = invites[position]
         # Match by invite_id or email_id
         if invite_id and invite.get("id") != invite_id:
             continue
-        if email_id and invite.get("email_id") != email_id:
-            continue
 
         # Find and update the event
-        for event in invite.get("events", []):
+        for event_position, event in enumerate(invite.get("events", [])):
             # Match by exact title or partial match
             event_name = event.get("title", "")
             if event_name == event_title or event_title.lower() in event_name.lower():
+                old_status = event.get("status")
                 event["status"] = new_status
                 if calendar_event_id:
                     event["event_id"] = calendar_event_id
                 event["updated_at"] = datetime.now().isoformat()
+                index.reindex_status(event, position, event_position, old_status)
                 updated = True
                 print(f"Updated '{event_name}' to status: {new_status}")
                 break
@@ -56,7 +78,7 @@ def update_invite_status(
         print(f"Warning: No matching event found for '{event_title}'", file=sys.stderr)
         sys.exit(1)
 
-    save_json(PENDING_FILE, data)
+    save_pending(PENDING_FILE, data, index)
 
 
 def main():
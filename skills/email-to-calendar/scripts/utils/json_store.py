@@ -7,6 +7,7 @@ Provides consistent file handling with atomic writes and error handling.
 
 import json
 import os
+import tempfile
 from pathlib import Path
 from typing import Any, Optional
 
@@ -38,11 +39,24 @@ def load_json(filepath: str, default: Optional[Any] = None) -> Any:
         return default
 
 
+def _file_mode(filepath: str) -> int:
+    """Permissions for a rewritten file: keep the existing ones, else honour umask."""
+    try:
+        return os.stat(filepath).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
 def save_json(filepath: str, data: Any, indent: int = 2) -> None:
     """
     Save data as JSON to a file.
 
-    Creates parent directories if they don't exist.
+    Creates parent directories if they don't exist. The data is written to
+    a temporary file in the same directory, fsync'd and renamed over the
+    target, so a crash mid-write leaves either the old or the new file,
+    never a truncated one.
 
     Args:
         filepath: Path to the JSON file
@@ -52,5 +66,21 @@ def save_json(filepath: str, data: Any, indent: int = 2) -> None:
     filepath = os.path.expanduser(filepath)
     ensure_dir(filepath)
 
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=indent)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(filepath) or ".",
+        prefix=f".{os.path.basename(filepath)}.",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(filepath))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
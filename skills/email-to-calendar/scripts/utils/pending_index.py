@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Pending-invite index and archive for email-to-calendar skill.
+
+pending_invites.json only keeps invites that may still need a reminder.
+Invites whose events all have a date in the past are moved to
+pending_invites.archive.jsonl (one invite per line, never rewritten);
+an invite with an undated event, or no events, is never archived.
+
+The index persisted next to the file (pending_invites.index.json) holds
+the pending events sorted by date and each invite's last event date, so
+listing upcoming invites and finding invites to archive bisect into
+sorted lists instead of walking every invite and event. It is stamped
+with the file's mtime and size and rebuilt when they no longer match.
+"""
+
+import json
+import os
+import sys
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import load_json, save_json, ensure_dir
+
+INDEX_VERSION = 2
+
+
+def index_path_for(pending_file: str) -> str:
+    """Index next to the pending file (pending_invites.json -> pending_invites.index.json)."""
+    root, ext = os.path.splitext(os.path.expanduser(pending_file))
+    return f"{root}.index{ext or '.json'}"
+
+
+def file_signature(filepath: str) -> Optional[List[int]]:
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(os.path.expanduser(filepath))
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def archive_path_for(pending_file: str) -> str:
+    """Archive next to the pending file (pending_invites.json -> pending_invites.archive.jsonl)."""
+    root, _ = os.path.splitext(os.path.expanduser(pending_file))
+    return f"{root}.archive.jsonl"
+
+
+def _event_date(event: Dict[str, Any]) -> str:
+    return event.get("date") or ""
+
+
+def _last_date(invite: Dict[str, Any]) -> Optional[str]:
+    """Latest event date, or None if the invite can't be archived by date."""
+    dates = [_event_date(event) for event in invite.get("events", [])]
+    if not dates or not all(dates):
+        return None
+    return max(dates)
+
+
+def _discard(entries: List[List], entry: List) -> None:
+    """Remove entry from a sorted list if present."""
+    i = bisect_left(entries, entry)
+    if i < len(entries) and entries[i] == entry:
+        del entries[i]
+
+
+class PendingIndex:
+    """
+    Invite positions in the invites list, keyed for the reminder path:
+    email_id -> position, pending events as sorted [date, position,
+    event position] and archivable invites as sorted [last event date,
+    position].
+    """
+
+    def __init__(self):
+        self.by_email_id: Dict[str, int] = {}
+        self.pending: List[List] = []
+        self.last_dates: List[List] = []
+        self.count = 0
+
+    @classmethod
+    def build(cls, invites: List[Dict[str, Any]]) -> "PendingIndex":
+        index = cls()
+        index.count = len(invites)
+        for position, invite in enumerate(invites):
+            if invite.get("email_id"):
+                index.by_email_id[invite["email_id"]] = position
+            last_date = _last_date(invite)
+            if last_date is not None:
+                index.last_dates.append([last_date, position])
+            for event_position, event in enumerate(invite.get("events", [])):
+                if event.get("status") == "pending":
+                    index.pending.append([_event_date(event), position, event_position])
+        index.pending.sort()
+        index.last_dates.sort()
+        return index
+
+    def add(self, invite: Dict[str, Any], position: int) -> None:
+        """Index a new invite, or re-index one after its events were replaced."""
+        if invite.get("email_id"):
+            self.by_email_id[invite["email_id"]] = position
+        self.count = max(self.count, position + 1)
+        last_date = _last_date(invite)
+        if last_date is not None:
+            insort(self.last_dates, [last_date, position])
+        for event_position, event in enumerate(invite.get("events", [])):
+            if event.get("status") == "pending":
+                insort(self.pending, [_event_date(event), position, event_position])
+
+    def remove(self, invite: Dict[str, Any], position: int) -> None:
+        """Drop an invite's entries (positions of other invites are unchanged)."""
+        last_date = _last_date(invite)
+        if last_date is not None:
+            _discard(self.last_dates, [last_date, position])
+        for event_position, event in enumerate(invite.get("events", [])):
+            _discard(self.pending, [_event_date(event), position, event_position])
+
+    def reindex_status(self, event: Dict[str, Any], position: int, event_position: int,
+                       old_status: str) -> None:
+        """Update the pending list after an event's status changed from old_status."""
+        entry = [_event_date(event), position, event_position]
+        if old_status == "pending":
+            _discard(self.pending, entry)
+        if event.get("status") == "pending":
+            insort(self.pending, entry)
+
+    def upcoming(self, today: str) -> List[Tuple[int, int]]:
+        """(position, event position) of pending events dated today or later, in invite/event order."""
+        start = bisect_left(self.pending, [today])
+        return sorted((position, event_position) for _, position, event_position in self.pending[start:])
+
+    def expired(self, today: str) -> List[int]:
+        """Positions of archivable invites with no event dated today or later."""
+        end = bisect_left(self.last_dates, [today])
+        return sorted(position for _, position in self.last_dates[:end])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "by_email_id": self.by_email_id,
+            "pending": self.pending,
+            "last_dates": self.last_dates,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PendingIndex":
+        index = cls()
+        index.by_email_id = data.get("by_email_id", {})
+        index.pending = data.get("pending", [])
+        index.last_dates = data.get("last_dates", [])
+        index.count = data.get("count", 0)
+        return index
+
+
+def load_pending(pending_file: str) -> Tuple[Dict[str, Any], PendingIndex]:
+    """Load pending_invites.json and its (persisted or rebuilt) index."""
+    data = load_json(pending_file, {"invites": []})
+    data.setdefault("invites", [])
+    signature = file_signature(pending_file)
+    saved = load_json(index_path_for(pending_file), {})
+    if (saved.get("version") == INDEX_VERSION and signature is not None
+            and saved.get("source") == signature
+            and saved.get("count") == len(data["invites"])):
+        return data, PendingIndex.from_dict(saved)
+
+    index = PendingIndex.build(data["invites"])
+    if signature is not None:
+        _save_index(pending_file, index)
+    return data, index
+
+
+def save_pending(pending_file: str, data: Dict[str, Any], index: PendingIndex) -> None:
+    """Save pending_invites.json, then the index stamped with the new file's signature."""
+    save_json(pending_file, data)
+    _save_index(pending_file, index)
+
+
+def _save_index(pending_file: str, index: PendingIndex) -> None:
+    save_json(index_path_for(pending_file), {
+        "version": INDEX_VERSION,
+        "source": file_signature(pending_file),
+        **index.to_dict(),
+    }, indent=None)
+
+
+def archive_past(pending_file: str, data: Dict[str, Any], index: PendingIndex, today: str) -> PendingIndex:
+    """
+    Move invites whose events are all dated before today from data to the
+    archive. today must be the real current date, not a preview date.
+    The caller saves data with the returned index; an invite may be
+    archived twice if the process dies before that save.
+
+    Returns:
+        The index for the remaining invites (the given one if nothing moved)
+    """
+    expired = index.expired(today)
+    if not expired:
+        return index
+
+    archived_at = datetime.now().isoformat()
+    archive_file = archive_path_for(pending_file)
+    ensure_dir(archive_file)
+    with open(archive_file, "a") as f:
+        for position in expired:
+            f.write(json.dumps({**data["invites"][position], "archived_at": archived_at}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    expired_set = set(expired)
+    data["invites"] = [
+        invite for position, invite in enumerate(data["invites"]) if position not in expired_set
+    ]
+    return PendingIndex.build(data["invites"])
+
+
+def read_archive(pending_file: str) -> List[Dict[str, Any]]:
+    """Archived invites, oldest archive first (skips torn lines)."""
+    try:
+        f = open(archive_path_for(pending_file))
+    except FileNotFoundError:
+        return []
+    invites = []
+    with f:
+        for line in f:
+            try:
+                invites.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return invites
@@ -2,19 +2,22 @@
 """
 Pending invites operations for email-to-calendar skill.
 
-Manages pending calendar invites that need user action.
+Manages pending calendar invites that need user action. Invites whose
+events are all in the past are archived when pending invites are listed
+for the current date (see pending_index.py).
 """
 
 import json
 import sys
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
-from json_store import load_json, save_json
 from common import get_day_of_week
+from state_store import open_state_store
+from pending_index import load_pending, save_pending, archive_past
 
 PENDING_FILE = os.path.expanduser(
     "~/.openclaw/workspace/memory/email-to-calendar/pending_invites.json"
@@ -33,18 +36,22 @@ def add_pending_invite(email_id: str, email_subject: str, events: List[Dict]) ->
     Returns:
         The invite ID (new or existing)
     """
-    data = load_json(PENDING_FILE, {"invites": []})
+    store = open_state_store(PENDING_FILE)
+    if store is not None:
+        return store.upsert_invite(email_id, email_subject, events, datetime.now().isoformat())
+
+    data, index = load_pending(PENDING_FILE)
 
     # Check if invite already exists for this email
-    existing = next(
-        (inv for inv in data["invites"] if inv.get("email_id") == email_id),
-        None
-    )
+    position = index.by_email_id.get(email_id)
 
-    if existing:
+    if position is not None:
         # Update existing invite
+        existing = data["invites"][position]
+        index.remove(existing, position)
         existing["events"] = events
         existing["updated_at"] = datetime.now().isoformat()
+        index.add(existing, position)
         invite_id = existing["id"]
     else:
         # Create new invite
@@ -58,68 +65,116 @@ def add_pending_invite(email_id: str, email_subject: str, events: List[Dict]) ->
             "reminder_count": 0,
             "last_reminded": None
         })
+        index.add(data["invites"][-1], len(data["invites"]) - 1)
 
-    save_json(PENDING_FILE, data)
+    save_pending(PENDING_FILE, data, index)
     return invite_id
 
 
-def list_pending_summary(
-    today: str,
-    update_reminded: bool = False,
-    auto_dismiss: bool = False
-) -> None:
-    """Print human-readable summary of pending invites."""
-    data = load_json(PENDING_FILE, {"invites": []})
+def _pending_rows(
+    today: Optional[str],
+    update_reminded: bool,
+    auto_dismiss: bool
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Pending events dated today (default: the current date) or later. Rows
+    are shaped like StateStore.pending_events. Invites whose events are
+    all past are archived first, but only when today is the real date: a
+    --today preview never moves invites.
 
-    pending_events = []
-    auto_dismissed_count = 0
+    With auto_dismiss, every pending event (past, upcoming or undated) of
+    invites reminded MAX_REMINDERS times is marked auto_dismissed. With
+    update_reminded, each invite with a listed event is bumped once.
+
+    Returns:
+        (rows, auto_dismissed_count)
+    """
+    now_iso = datetime.now().isoformat()
+    archive = today is None
+    today = today or datetime.now().strftime("%Y-%m-%d")
+
+    store = open_state_store(PENDING_FILE)
+    if store is not None:
+        if archive:
+            store.archive_invites(today, now_iso)
+        return store.pending_events(today, update_reminded, auto_dismiss, MAX_REMINDERS)
+
+    data, index = load_pending(PENDING_FILE)
     modified = False
+    if archive:
+        archived_index = archive_past(PENDING_FILE, data, index, today)
+        modified = archived_index is not index
+        index = archived_index
+    invites = data["invites"]
+
+    upcoming = index.upcoming(today)
+    auto_dismissed_count = 0
+    if auto_dismiss:
+        dismissed = {
+            position for _, position, _ in index.pending
+            if invites[position].get("reminder_count", 0) >= MAX_REMINDERS
+        }
+        for position, event_position in sorted(
+            (position, event_position) for _, position, event_position in index.pending
+            if position in dismissed
+        ):
+            event = invites[position]["events"][event_position]
+            event["status"] = "auto_dismissed"
+            event["auto_dismissed_at"] = now_iso
+            index.reindex_status(event, position, event_position, "pending")
+            auto_dismissed_count += 1
+        if dismissed:
+            upcoming = [entry for entry in upcoming if entry[0] not in dismissed]
+            modified = True
+
+    rows = [
+        {
+            "id": invites[position].get("id"),
+            "email_id": invites[position].get("email_id"),
+            "email_subject": invites[position].get("email_subject"),
+            "reminder_count": invites[position].get("reminder_count", 0),
+            "last_reminded": invites[position].get("last_reminded"),
+            "event": invites[position]["events"][event_position]
+        }
+        for position, event_position in upcoming
+    ]
+
+    # Update reminder tracking once per listed invite
+    if update_reminded and upcoming:
+        for position in {position for position, _ in upcoming}:
+            invites[position]["last_reminded"] = now_iso
+            invites[position]["reminder_count"] = invites[position].get("reminder_count", 0) + 1
+        modified = True
 
-    for invite in data.get("invites", []):
-        email_subject = invite.get("email_subject", "Unknown source")
-        email_id = invite.get("email_id", "")
-        reminder_count = invite.get("reminder_count", 0)
-
-        # Check if this invite should be auto-dismissed
-        if auto_dismiss and reminder_count >= MAX_REMINDERS:
-            for event in invite.get("events", []):
-                if event.get("status") == "pending":
-                    event["status"] = "auto_dismissed"
-                    event["auto_dismissed_at"] = datetime.now().isoformat()
-                    auto_dismissed_count += 1
-                    modified = True
-            continue
-
-        for event in invite.get("events", []):
-            event_date = event.get("date", "")
-            if event.get("status") == "pending" and event_date >= today:
-                day_of_week = get_day_of_week(event_date)
-                pending_events.append({
-                    "title": event.get("title", "Untitled"),
-                    "date": event_date,
-                    "day": day_of_week,
-                    "time": event.get("time", ""),
-                    "source": email_subject,
-                    "email_id": email_id,
-                    "reminder_count": reminder_count
-                })
-
-    # Update reminder tracking if requested
-    if update_reminded and pending_events:
-        now_iso = datetime.now().isoformat()
-        seen_invites = set()
-        for invite in data.get("invites", []):
-            email_id = invite.get("email_id", "")
-            if email_id in [e["email_id"] for e in pending_events] and email_id not in seen_invites:
-                invite["last_reminded"] = now_iso
-                invite["reminder_count"] = invite.get("reminder_count", 0) + 1
-                seen_invites.add(email_id)
-                modified = True
-
-    # Save if modified
     if modified:
-        save_json(PENDING_FILE, data)
+        save_pending(PENDING_FILE, data, index)
+    return rows, auto_dismissed_count
 
+
+def list_pending_summary(
+    today: Optional[str] = None,
+    update_reminded: bool = False,
+    auto_dismiss: bool = False
+) -> None:
+    """Print human-readable summary of pending invites."""
+    rows, auto_dismissed_count = _pending_rows(today, update_reminded, auto_dismiss)
+    pending_events = [
+        {
+            "title": row["event"].get("title", "Untitled"),
+            "date": row["event"].get("date", ""),
+            "day": get_day_of_week(row["event"].get("date", "")),
+            "time": row["event"].get("time", ""),
+            "source": row["email_subject"] if row["email_subject"] is not None else "Unknown source",
+            "email_id": row["email_id"] or "",
+            "reminder_count": row["reminder_count"]
+        }
+        for row in rows
+    ]
+    _print_pending_summary(pending_events, auto_dismissed_count)
+
+
+def _print_pending_summary(pending_events: List[Dict[str, Any]], auto_dismissed_count: int) -> None:
+    """Print the summary lines for list_pending_summary."""
     if auto_dismissed_count > 0:
         print(f"({auto_dismissed_count} event(s) auto-dismissed after {MAX_REMINDERS} ignored reminders)\n")
 
@@ -139,69 +194,32 @@ def list_pending_summary(
 
 
 def list_pending_json(
-    today: str,
+    today: Optional[str] = None,
     update_reminded: bool = False,
     auto_dismiss: bool = False
 ) -> None:
     """Print JSON array of pending invites."""
-    data = load_json(PENDING_FILE, {"invites": []})
-
-    pending_events = []
-    modified = False
-
-    for invite in data.get("invites", []):
-        invite_id = invite.get("id", "")
-        email_subject = invite.get("email_subject", "")
-        email_id = invite.get("email_id", "")
-        reminder_count = invite.get("reminder_count", 0)
-        last_reminded = invite.get("last_reminded")
-
-        # Check if this invite should be auto-dismissed
-        if auto_dismiss and reminder_count >= MAX_REMINDERS:
-            for event in invite.get("events", []):
-                if event.get("status") == "pending":
-                    event["status"] = "auto_dismissed"
-                    event["auto_dismissed_at"] = datetime.now().isoformat()
-                    modified = True
-            continue
-
-        for event in invite.get("events", []):
-            event_date = event.get("date", "")
-            if event.get("status") == "pending" and event_date >= today:
-                pending_events.append({
-                    "invite_id": invite_id,
-                    "email_id": email_id,
-                    "email_subject": email_subject,
-                    "title": event.get("title", ""),
-                    "date": event_date,
-                    "day_of_week": get_day_of_week(event_date),
-                    "time": event.get("time", ""),
-                    "reminder_count": reminder_count,
-                    "last_reminded": last_reminded
-                })
-
-    # Update reminder tracking if requested
-    if update_reminded and pending_events:
-        now_iso = datetime.now().isoformat()
-        seen_invites = set()
-        for invite in data.get("invites", []):
-            email_id = invite.get("email_id", "")
-            if email_id in [e["email_id"] for e in pending_events] and email_id not in seen_invites:
-                invite["last_reminded"] = now_iso
-                invite["reminder_count"] = invite.get("reminder_count", 0) + 1
-                seen_invites.add(email_id)
-                modified = True
-
-    # Save if modified
-    if modified:
-        save_json(PENDING_FILE, data)
-
+    rows, _ = _pending_rows(today, update_reminded, auto_dismiss)
+    pending_events = [
+        {
+            "invite_id": row["id"] or "",
+            "email_id": row["email_id"] or "",
+            "email_subject": row["email_subject"] or "",
+            "title": row["event"].get("title", ""),
+            "date": row["event"].get("date", ""),
+            "day_of_week": get_day_of_week(row["event"].get("date", "")),
+            "time": row["event"].get("time", ""),
+            "reminder_count": row["reminder_count"],
+            "last_reminded": row["last_reminded"]
+        }
+        for row in rows
+    ]
     print(json.dumps(pending_events, indent=2))
 
 
 def main():
     # Parse arguments
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = None  # the current date; --today previews without archiving
     summary_mode = False
     update_reminded = False
     auto_dismiss = False
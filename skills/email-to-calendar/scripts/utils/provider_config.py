@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Provider configuration and capability registry for email-to-calendar skill.
+
+config.json is parsed once per process and re-read only when its mtime or
+size changes. Provider capabilities (optional flags that only some gog
+builds support) are probed once and cached on disk, keyed by the gog
+binary's path and mtime, so upgrading gog invalidates them.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Optional, Dict, Any, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import load_json, save_json
+
+CAPABILITIES_FILE = os.path.expanduser("~/.cache/email-to-calendar/capabilities.json")
+CAPABILITY_TTL = 7 * 24 * 3600  # seconds
+
+# capability -> (gog args whose help output is searched, flag to look for)
+GOG_PROBES: Dict[str, Tuple[List[str], str]] = {
+    "send_updates": (["calendar", "create", "--help"], "--send-updates"),
+}
+
+_configs: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_capabilities: Optional[Dict[str, Any]] = None
+
+
+def _signature(filepath: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_config(config_file: str) -> Dict[str, Any]:
+    """
+    Load a config file, reusing the parsed copy while the file is unchanged.
+
+    Args:
+        config_file: Path to config.json
+
+    Returns:
+        Config dict (empty if the file doesn't exist). Treat as read-only.
+    """
+    config_file = os.path.expanduser(config_file)
+    signature = _signature(config_file)
+    if signature is None:
+        _configs.pop(config_file, None)
+        return {}
+    cached = _configs.get(config_file)
+    if cached is None or cached[0] != signature:
+        cached = (signature, load_json(config_file, {}))
+        _configs[config_file] = cached
+    return cached[1]
+
+
+def _load_capabilities() -> Dict[str, Any]:
+    global _capabilities
+    if _capabilities is None:
+        _capabilities = load_json(CAPABILITIES_FILE, {})
+    return _capabilities
+
+
+def gog_supports(capability: str) -> bool:
+    """
+    Check whether the installed gog supports an optional capability.
+
+    The answer is cached in CAPABILITIES_FILE for CAPABILITY_TTL seconds
+    and is discarded early if the gog binary moves or changes.
+
+    Args:
+        capability: A key of GOG_PROBES (e.g. 'send_updates')
+
+    Returns:
+        True if supported; False if not, unknown, or gog isn't installed
+    """
+    binary = shutil.which("gog")
+    if binary is None or capability not in GOG_PROBES:
+        return False
+    try:
+        binary_key = f"{binary}:{os.stat(binary).st_mtime_ns}"
+    except OSError:
+        return False
+
+    cache = _load_capabilities()
+    entry = cache.get(capability)
+    if (entry and entry.get("binary") == binary_key
+            and time.time() - entry.get("checked_at", 0) < CAPABILITY_TTL):
+        return entry["supported"]
+
+    args, flag = GOG_PROBES[capability]
+    try:
+        result = subprocess.run(
+            [binary] + args,
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except Exception:
+        return False  # not cached; probe again next time
+    supported = flag in result.stdout or flag in result.stderr
+
+    cache[capability] = {"binary": binary_key, "supported": supported, "checked_at": time.time()}
+    try:
+        save_json(CAPABILITIES_FILE, cache)
+    except OSError:
+        pass  # read-only home: still cached for this process
+    return supported
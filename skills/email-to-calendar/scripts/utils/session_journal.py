@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Session journal for email-to-calendar skill.
+
+The current processing session is kept as an append-only JSONL file: a
+"start" line followed by one "skip" or "event" line per logged entry.
+Logging appends lines without reading the file, and the session dict
+(counters included) is built in a single pass when it is folded into
+the activity log.
+"""
+
+import json
+import os
+import sys
+from typing import Optional, Dict, Any, List, Iterable
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import ensure_dir, load_json
+
+ENTRY_KINDS = ("skip", "event")
+
+
+class SessionFolder:
+    """Builds a session dict from journal records with O(1) work per record."""
+
+    def __init__(self, timestamp: Optional[str] = None):
+        self.session = {
+            "timestamp": timestamp,
+            "emails_scanned": 0,
+            "emails_with_events": 0,
+            "skipped": [],
+            "events_extracted": []
+        }
+        self._event_emails = set()
+
+    def add(self, kind: str, entry: Dict[str, Any]) -> None:
+        if kind == "skip":
+            self.session["emails_scanned"] += 1
+            self.session["skipped"].append(entry)
+        elif kind == "event":
+            # Only count emails_with_events once per email
+            if entry.get("email_id") not in self._event_emails:
+                self._event_emails.add(entry.get("email_id"))
+                self.session["emails_with_events"] += 1
+            self.session["events_extracted"].append(entry)
+
+
+class SessionJournal:
+    """The current session's journal file."""
+
+    def __init__(self, filepath: str):
+        self.filepath = os.path.expanduser(filepath)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.filepath)
+
+    def start(self, timestamp: str) -> None:
+        """Begin a new journal, discarding any unfinished one."""
+        ensure_dir(self.filepath)
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"kind": "start", "timestamp": timestamp}) + "\n")
+        os.replace(tmp_path, self.filepath)
+
+    def adopt_legacy(self, legacy_path: str) -> None:
+        """
+        Convert a session file written before the journal existed
+        (.current_session.json) into the journal, once, then remove it.
+        A journal that already exists wins.
+        """
+        legacy_path = os.path.expanduser(legacy_path)
+        if not os.path.exists(legacy_path):
+            return
+        session = load_json(legacy_path, None)
+        if isinstance(session, dict) and not self.exists():
+            records = [{"kind": "start", "timestamp": session.get("timestamp")}]
+            records += [{"kind": "skip", **entry} for entry in session.get("skipped", [])]
+            records += [{"kind": "event", **entry} for entry in session.get("events_extracted", [])]
+            ensure_dir(self.filepath)
+            tmp_path = self.filepath + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+            os.replace(tmp_path, self.filepath)
+        os.remove(legacy_path)
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Append (kind, entry) records in one write.
+
+        Returns:
+            False if no session has been started
+        """
+        data = "".join(
+            json.dumps({"kind": kind, **entry}) + "\n" for kind, entry in records
+        )
+        try:
+            fd = os.open(self.filepath, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        return True
+
+    def fold(self) -> Optional[Dict[str, Any]]:
+        """The session dict the journal describes, or None if there is none."""
+        try:
+            f = open(self.filepath)
+        except FileNotFoundError:
+            return None
+        folder = SessionFolder()
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                kind = record.pop("kind", None)
+                if kind == "start":
+                    folder.session["timestamp"] = record.get("timestamp")
+                else:
+                    folder.add(kind, record)
+        return folder.session
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.filepath)
+        except OSError:
+            pass
+
+
+def parse_entries(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Parse JSON lines like {"type": "skip", "email_id": ..., "reason": ...}
+    or {"type": "event", "email_id": ..., "title": ..., "action": ...}
+    into (kind, entry) records.
+
+    Raises:
+        ValueError: naming the first invalid line
+    """
+    records = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {number}: invalid JSON ({e})")
+        kind = item.get("type") if isinstance(item, dict) else None
+        if kind == "skip":
+            if not item.get("email_id") or not item.get("reason"):
+                raise ValueError(f"line {number}: skip needs email_id and reason")
+            entry = {
+                "email_id": item["email_id"],
+                "subject": item.get("subject", ""),
+                "reason": item["reason"]
+            }
+        elif kind == "event":
+            if not item.get("email_id") or not item.get("title"):
+                raise ValueError(f"line {number}: event needs email_id and title")
+            entry = {
+                "email_id": item["email_id"],
+                "title": item["title"],
+                "action": item.get("action", "pending")
+            }
+            if item.get("reason"):
+                entry["reason"] = item["reason"]
+        else:
+            raise ValueError(f"line {number}: type must be one of {', '.join(ENTRY_KINDS)}")
+        records.append((kind, entry))
+    return records
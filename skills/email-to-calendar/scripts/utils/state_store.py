@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+"""
+SQLite state store for email-to-calendar skill.
+
+Keeps tracked events, pending invites, the changelog and activity sessions
+in a single SQLite database (WAL mode) next to the JSON files it replaces,
+so each operation touches a few indexed rows instead of parsing and
+rewriting a whole file.
+
+The store is opt-in: the *_ops modules use it once state.db exists in the
+memory directory and fall back to the JSON files otherwise. Create it with
+the one-shot migrator:
+
+    python3 state_store.py migrate [--dir ~/.openclaw/workspace/memory/email-to-calendar]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import load_json
+from common import generate_indexed_id
+from changelog_segments import read_changes
+from session_journal import SessionJournal
+from pending_index import read_archive
+
+STATE_DIR = os.path.expanduser("~/.openclaw/workspace/memory/email-to-calendar")
+STATE_DB_NAME = "state.db"
+SCHEMA_VERSION = 3
+
+# JSON files the migrator imports, relative to the state directory
+EVENTS_JSON = "events.json"
+PENDING_JSON = "pending_invites.json"
+CHANGELOG_JSON = "changelog.json"
+ACTIVITY_JSON = "activity.json"
+SESSION_JSON = ".current_session.json"
+SESSION_JOURNAL = ".current_session.jsonl"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    calendar_id TEXT,
+    email_id TEXT,
+    summary TEXT,
+    start TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_email ON events(email_id);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start);
+
+CREATE TABLE IF NOT EXISTS invites (
+    id TEXT PRIMARY KEY,
+    email_id TEXT UNIQUE,
+    email_subject TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    reminder_count INTEGER NOT NULL DEFAULT 0,
+    last_reminded TEXT
+);
+
+CREATE TABLE IF NOT EXISTS invite_events (
+    invite_id TEXT NOT NULL REFERENCES invites(id),
+    position INTEGER NOT NULL,
+    title TEXT,
+    date TEXT,
+    status TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (invite_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_invite_events_status ON invite_events(status, date);
+
+CREATE TABLE IF NOT EXISTS invite_archive (
+    id TEXT PRIMARY KEY,
+    email_id TEXT,
+    archived_at TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    timestamp TEXT,
+    event_id TEXT,
+    can_undo INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_undo ON changes(can_undo, seq);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    emails_scanned INTEGER NOT NULL DEFAULT 0,
+    emails_with_events INTEGER NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(active);
+
+CREATE TABLE IF NOT EXISTS session_entries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_seq INTEGER NOT NULL REFERENCES sessions(seq),
+    kind TEXT NOT NULL,
+    email_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_session_entries ON session_entries(session_seq, kind, email_id);
+"""
+
+# Trigram full-text index over event summaries (SQLite >= 3.34). Kept in
+# sync by triggers; optional, find_events scans when it's missing.
+SUMMARY_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    summary, content='events', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, summary) VALUES (new.rowid, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, summary) VALUES ('delete', old.rowid, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF summary ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, summary) VALUES ('delete', old.rowid, old.summary);
+    INSERT INTO events_fts(rowid, summary) VALUES (new.rowid, new.summary);
+END;
+"""
+
+EVENT_COLUMNS = ("event_id", "calendar_id", "email_id", "summary", "start", "created_at", "updated_at")
+
+_stores: Dict[str, "StateStore"] = {}
+
+
+def state_db_path(json_path: str) -> str:
+    """Path of the state database that replaces a JSON file in the same directory."""
+    return os.path.join(os.path.dirname(os.path.expanduser(json_path)), STATE_DB_NAME)
+
+
+def open_state_store(json_path: str) -> Optional["StateStore"]:
+    """
+    Return the SQLite store backing a JSON state file, or None when that
+    directory has not been migrated (callers then use the JSON file).
+
+    Args:
+        json_path: Path of the JSON file the caller would otherwise use
+
+    Returns:
+        A StateStore instance or None
+    """
+    db_path = state_db_path(json_path)
+    if not os.path.exists(db_path):
+        return None
+    if db_path not in _stores:
+        _stores[db_path] = StateStore(db_path)
+    return _stores[db_path]
+
+
+class StateStore:
+    """SQLite-backed storage for events, invites, changes and sessions."""
+
+    def __init__(self, db_path: str):
+        self.db_path = os.path.expanduser(db_path)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with self.conn:
+                self.conn.executescript(SCHEMA)
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._create_summary_index()
+        self.has_summary_index = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'events_fts'"
+        ).fetchone() is not None
+
+    def _create_summary_index(self) -> None:
+        """Create and fill events_fts; skipped if FTS5/trigram isn't available."""
+        try:
+            with self.conn:
+                exists = self.conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'events_fts'"
+                ).fetchone()
+                self.conn.executescript(SUMMARY_FTS)
+                if not exists:
+                    self.conn.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            pass
+
+    def close(self) -> None:
+        self.conn.close()
+        _stores.pop(self.db_path, None)
+
+    # -- tracked events --------------------------------------------------
+
+    def upsert_event(
+        self,
+        event_id: str,
+        calendar_id: str,
+        email_id: str,
+        summary: str,
+        start: str,
+        now: str
+    ) -> None:
+        """Track a new event, or refresh summary/start/email of a tracked one."""
+        with self.conn:
+            updated = self.conn.execute(
+                "UPDATE events SET summary = ?, start = ?, updated_at = ?,"
+                " email_id = COALESCE(NULLIF(?, ''), email_id) WHERE event_id = ?",
+                (summary, start, now, email_id, event_id)
+            ).rowcount
+            if not updated:
+                self.conn.execute(
+                    "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                    (event_id, calendar_id, email_id or None, summary, start, now)
+                )
+
+    def update_event(self, event_id: str, summary: str, start: str, now: str) -> bool:
+        """Update a tracked event's summary/start (empty values are left alone)."""
+        with self.conn:
+            return self.conn.execute(
+                "UPDATE events SET summary = COALESCE(NULLIF(?, ''), summary),"
+                " start = COALESCE(NULLIF(?, ''), start), updated_at = ? WHERE event_id = ?",
+                (summary, start, now, event_id)
+            ).rowcount > 0
+
+    def delete_event(self, event_id: str) -> bool:
+        with self.conn:
+            return self.conn.execute(
+                "DELETE FROM events WHERE event_id = ?", (event_id,)
+            ).rowcount > 0
+
+    def delete_events(self, event_ids: List[str]) -> int:
+        """Delete several tracked events in one transaction."""
+        with self.conn:
+            return self.conn.executemany(
+                "DELETE FROM events WHERE event_id = ?", [(e,) for e in event_ids]
+            ).rowcount
+
+    def find_events(self, search_type: str, search_value: str = "") -> List[Dict[str, Any]]:
+        """
+        Look up tracked events in tracking order.
+
+        Args:
+            search_type: 'list', 'email_id', 'event_id' or 'summary' (substring)
+            search_value: Value to match
+
+        Returns:
+            List of event dicts shaped like the entries of events.json
+        """
+        select = f"SELECT {', '.join(EVENT_COLUMNS)} FROM events"
+        if search_type == "list":
+            rows = self.conn.execute(f"{select} ORDER BY rowid")
+        elif search_type == "email_id":
+            rows = self.conn.execute(f"{select} WHERE email_id = ? ORDER BY rowid", (search_value,))
+        elif search_type == "event_id":
+            rows = self.conn.execute(f"{select} WHERE event_id = ?", (search_value,))
+        elif search_type == "summary":
+            search_lower = search_value.lower()
+            if self.has_summary_index and len(search_value) >= 3:
+                # Trigram match narrows the candidates; the substring check
+                # below keeps results identical to a plain scan
+                phrase = '"' + search_value.replace('"', '""') + '"'
+                candidates = self.conn.execute(
+                    f"{select} WHERE rowid IN"
+                    " (SELECT rowid FROM events_fts WHERE events_fts MATCH ?) ORDER BY rowid",
+                    (phrase,)
+                )
+            else:
+                candidates = self.conn.execute(f"{select} ORDER BY rowid")
+            rows = (
+                row for row in candidates
+                if search_lower in (row["summary"] or "").lower()
+            )
+        else:
+            return []
+        return [dict(row) for row in rows]
+
+    # -- pending invites -------------------------------------------------
+
+    def upsert_invite(self, email_id: str, email_subject: str, events: List[Dict], now: str) -> str:
+        """Add an invite for an email, or replace the events of the existing one."""
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM invites WHERE email_id = ?", (email_id,)
+            ).fetchone()
+            if row:
+                invite_id = row["id"]
+                self.conn.execute("UPDATE invites SET updated_at = ? WHERE id = ?", (now, invite_id))
+                self.conn.execute("DELETE FROM invite_events WHERE invite_id = ?", (invite_id,))
+            else:
+                count = self.conn.execute("SELECT COUNT(*) FROM invites").fetchone()[0]
+                invite_id = f"inv_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{count + 1:03d}"
+                self.conn.execute(
+                    "INSERT INTO invites (id, email_id, email_subject, created_at, reminder_count)"
+                    " VALUES (?, ?, ?, ?, 0)",
+                    (invite_id, email_id, email_subject, now)
+                )
+            self._insert_invite_events(invite_id, events)
+        return invite_id
+
+    def _insert_invite_events(self, invite_id: str, events: List[Dict]) -> None:
+        self.conn.executemany(
+            "INSERT INTO invite_events (invite_id, position, title, date, status, data)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (invite_id, position, event.get("title", ""), event.get("date", ""),
+                 event.get("status"), json.dumps(event))
+                for position, event in enumerate(events)
+            ]
+        )
+
+    def pending_events(
+        self,
+        today: str,
+        update_reminded: bool = False,
+        auto_dismiss: bool = False,
+        max_reminders: int = 3
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Pending invite events dated today or later, in invite/event order.
+
+        With auto_dismiss, every pending event (past, upcoming or undated)
+        of invites reminded max_reminders times is marked auto_dismissed. With
+        update_reminded, every invite that has a listed event gets its
+        reminder counter bumped once (the returned rows carry the counts
+        from before the bump). Both are single set-based UPDATEs over the
+        (status, date) index.
+
+        Returns:
+            (rows, auto_dismissed_count); each row has the invite's id,
+            email_id, email_subject, reminder_count, last_reminded plus the
+            event dict under 'event'
+        """
+        now_iso = datetime.now().isoformat()
+        with self.conn:
+            auto_dismissed = 0
+            if auto_dismiss:
+                auto_dismissed = self.conn.execute(
+                    "UPDATE invite_events SET status = 'auto_dismissed',"
+                    " data = json_set(data, '$.status', 'auto_dismissed', '$.auto_dismissed_at', ?)"
+                    " WHERE status = 'pending' AND invite_id IN"
+                    " (SELECT id FROM invites WHERE reminder_count >= ?)",
+                    (now_iso, max_reminders)
+                ).rowcount
+
+            rows = self.conn.execute(
+                "SELECT i.id, i.email_id, i.email_subject, i.reminder_count, i.last_reminded, e.data"
+                " FROM invite_events e JOIN invites i ON i.id = e.invite_id"
+                " WHERE e.status = 'pending' AND e.date >= ?"
+                " ORDER BY i.rowid, e.position",
+                (today,)
+            ).fetchall()
+
+            if update_reminded and rows:
+                self.conn.execute(
+                    "UPDATE invites SET last_reminded = ?, reminder_count = reminder_count + 1"
+                    " WHERE id IN (SELECT invite_id FROM invite_events"
+                    " WHERE status = 'pending' AND date >= ?)",
+                    (now_iso, today)
+                )
+
+        results = []
+        for row in rows:
+            result = {key: row[key] for key in
+                      ("id", "email_id", "email_subject", "reminder_count", "last_reminded")}
+            result["event"] = json.loads(row["data"])
+            results.append(result)
+        return results, auto_dismissed
+
+    def archive_invites(self, today: str, now: str) -> int:
+        """
+        Move invites whose events are all dated before today to
+        invite_archive (invites with an undated event, or none, stay).
+
+        Returns:
+            Number of invites archived
+        """
+        with self.conn:
+            ids = [row["id"] for row in self.conn.execute(
+                "SELECT id FROM invites WHERE EXISTS"
+                " (SELECT 1 FROM invite_events e WHERE e.invite_id = invites.id)"
+                " AND NOT EXISTS (SELECT 1 FROM invite_events e WHERE e.invite_id = invites.id"
+                " AND (e.date >= ? OR e.date IS NULL OR e.date = ''))",
+                (today,)
+            )]
+            if not ids:
+                return 0
+            # Chunked to stay under SQLite's bound-parameter limit
+            chunks = [ids[i:i + 500] for i in range(0, len(ids), 500)]
+            for invite in (invite for chunk in chunks for invite in self._invite_dicts(chunk)):
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO invite_archive (id, email_id, archived_at, data)"
+                    " VALUES (?, ?, ?, ?)",
+                    (invite["id"], invite["email_id"], now, json.dumps({**invite, "archived_at": now}))
+                )
+            self.conn.executemany("DELETE FROM invite_events WHERE invite_id = ?", [(i,) for i in ids])
+            self.conn.executemany("DELETE FROM invites WHERE id = ?", [(i,) for i in ids])
+        return len(ids)
+
+    def archived_invites(self) -> List[Dict[str, Any]]:
+        """Archived invites, in the order they were archived."""
+        return [json.loads(row["data"]) for row in
+                self.conn.execute("SELECT data FROM invite_archive ORDER BY rowid")]
+
+    def update_invite_event_status(
+        self,
+        invite_id: str,
+        email_id: str,
+        event_title: str,
+        new_status: str,
+        calendar_event_id: str,
+        now: str
+    ) -> Optional[str]:
+        """
+        Set the status of the first event matching event_title (exact or
+        case-insensitive substring) in the first matching invite.
+
+        Returns:
+            The matched event's title, or None if nothing matched
+        """
+        clauses, params = [], []
+        if invite_id:
+            clauses.append("i.id = ?")
+            params.append(invite_id)
+        if email_id:
+            clauses.append("i.email_id = ?")
+            params.append(email_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT e.invite_id, e.position, e.data FROM invite_events e"
+                f" JOIN invites i ON i.id = e.invite_id {where}"
+                " ORDER BY i.rowid, e.position",
+                params
+            )
+            for row in rows:
+                event = json.loads(row["data"])
+                event_name = event.get("title", "")
+                if event_name == event_title or event_title.lower() in event_name.lower():
+                    event["status"] = new_status
+                    if calendar_event_id:
+                        event["event_id"] = calendar_event_id
+                    event["updated_at"] = now
+                    self.conn.execute(
+                        "UPDATE invite_events SET status = ?, data = ?"
+                        " WHERE invite_id = ? AND position = ?",
+                        (new_status, json.dumps(event), row["invite_id"], row["position"])
+                    )
+                    return event_name
+        return None
+
+    def list_invites(self) -> List[Dict[str, Any]]:
+        """All invites shaped like the entries of pending_invites.json."""
+        return self._invite_dicts()
+
+    def _invite_dicts(self, ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Invites (all, or those with the given ids) as pending_invites.json entries."""
+        params: List[str] = []
+        event_where = invite_where = ""
+        if ids is not None:
+            placeholders = ", ".join("?" * len(ids))
+            event_where = f" WHERE invite_id IN ({placeholders})"
+            invite_where = f" WHERE id IN ({placeholders})"
+            params = list(ids)
+
+        events: Dict[str, List[Dict]] = {}
+        for row in self.conn.execute(
+            f"SELECT invite_id, data FROM invite_events{event_where} ORDER BY invite_id, position",
+            params
+        ):
+            events.setdefault(row["invite_id"], []).append(json.loads(row["data"]))
+
+        invites = []
+        for row in self.conn.execute(f"SELECT * FROM invites{invite_where} ORDER BY rowid", params):
+            invite = {
+                "id": row["id"],
+                "email_id": row["email_id"],
+                "email_subject": row["email_subject"],
+                "events": events.get(row["id"], []),
+                "created_at": row["created_at"],
+                "reminder_count": row["reminder_count"],
+                "last_reminded": row["last_reminded"],
+            }
+            if row["updated_at"]:
+                invite["updated_at"] = row["updated_at"]
+            invites.append(invite)
+        return invites
+
+    # -- changelog -------------------------------------------------------
+
+    def add_change(self, change: Dict[str, Any], keep_since: str) -> str:
+        """
+        Append a change (without 'id'), dropping changes timestamped before keep_since.
+
+        Returns:
+            The generated change ID
+        """
+        with self.conn:
+            next_seq = self.conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM changes"
+            ).fetchone()[0]
+            change_id = generate_indexed_id("chg", next_seq)
+            change = {"id": change_id, **change}
+            self.conn.execute(
+                "INSERT INTO changes (seq, id, timestamp, event_id, can_undo, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (next_seq, change_id, change.get("timestamp"), change.get("event_id"),
+                 1 if change.get("can_undo") else 0, json.dumps(change))
+            )
+            self.conn.execute("DELETE FROM changes WHERE timestamp < ?", (keep_since,))
+        return change_id
+
+    def recent_changes(self, last_n: int) -> List[Dict[str, Any]]:
+        """The newest last_n changes, oldest first."""
+        rows = self.conn.execute(
+            "SELECT data FROM changes ORDER BY seq DESC LIMIT ?", (last_n,)
+        ).fetchall()
+        return [json.loads(row["data"]) for row in reversed(rows)]
+
+    def undoable_changes(self, since: str):
+        """Changes still flagged can_undo and timestamped at or after since, newest first (lazy)."""
+        for row in self.conn.execute(
+            "SELECT data FROM changes WHERE can_undo = 1 AND timestamp >= ? ORDER BY seq DESC",
+            (since,)
+        ):
+            yield json.loads(row["data"])
+
+    def get_change(self, change_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT data FROM changes WHERE id = ?", (change_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def mark_undone(self, change_id: str, now: str) -> bool:
+        with self.conn:
+            return self.conn.execute(
+                "UPDATE changes SET can_undo = 0,"
+                " data = json_set(data, '$.can_undo', json('false'), '$.undone_at', ?)"
+                " WHERE id = ?",
+                (now, change_id)
+            ).rowcount > 0
+
+    # -- activity sessions -----------------------------------------------
+
+    def start_session(self, now: str) -> None:
+        """Start a new session, discarding any unfinished one."""
+        with self.conn:
+            self._discard_active()
+            self.conn.execute("INSERT INTO sessions (timestamp, active) VALUES (?, 1)", (now,))
+
+    def _discard_active(self) -> None:
+        self.conn.execute(
+            "DELETE FROM session_entries WHERE session_seq IN (SELECT seq FROM sessions WHERE active = 1)"
+        )
+        self.conn.execute("DELETE FROM sessions WHERE active = 1")
+
+    def _active_session(self) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT seq FROM sessions WHERE active = 1 ORDER BY seq DESC LIMIT 1"
+        ).fetchone()
+        return row["seq"] if row else None
+
+    def log_entries(self, records: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """
+        Record ("skip" | "event", entry) pairs in the active session in one
+        transaction; False if there is none.
+        """
+        with self.conn:
+            session = self._active_session()
+            if session is None:
+                return False
+            scanned = 0
+            new_emails = set()
+            for kind, entry in records:
+                email_id = entry.get("email_id")
+                if kind == "skip":
+                    scanned += 1
+                elif email_id not in new_emails and not self.conn.execute(
+                    "SELECT 1 FROM session_entries WHERE session_seq = ? AND kind = 'event' AND email_id = ?",
+                    (session, email_id)
+                ).fetchone():
+                    new_emails.add(email_id)
+                self._add_entry(session, kind, email_id, entry)
+            self.conn.execute(
+                "UPDATE sessions SET emails_scanned = emails_scanned + ?,"
+                " emails_with_events = emails_with_events + ? WHERE seq = ?",
+                (scanned, len(new_emails), session)
+            )
+        return True
+
+    def _add_entry(self, session: int, kind: str, email_id: str, entry: Dict[str, Any]) -> None:
+        self.conn.execute(
+            "INSERT INTO session_entries (session_seq, kind, email_id, data) VALUES (?, ?, ?, ?)",
+            (session, kind, email_id, json.dumps(entry))
+        )
+
+    def end_session(self, max_sessions: int) -> Optional[Dict[str, Any]]:
+        """
+        Finish the active session, keeping only the newest max_sessions.
+
+        Returns:
+            The finished session dict, or None if no session was active
+        """
+        with self.conn:
+            session = self._active_session()
+            if session is None:
+                return None
+            self.conn.execute("UPDATE sessions SET active = 0 WHERE seq = ?", (session,))
+            stale = "SELECT seq FROM sessions WHERE active = 0 ORDER BY seq DESC LIMIT -1 OFFSET ?"
+            self.conn.execute(
+                f"DELETE FROM session_entries WHERE session_seq IN ({stale})", (max_sessions,)
+            )
+            self.conn.execute(f"DELETE FROM sessions WHERE seq IN ({stale})", (max_sessions,))
+        return self._session_dicts([session])[0]
+
+    def recent_sessions(self, last_n: int) -> List[Dict[str, Any]]:
+        """The newest last_n finished sessions, oldest first."""
+        seqs = [row["seq"] for row in self.conn.execute(
+            "SELECT seq FROM sessions WHERE active = 0 ORDER BY seq DESC LIMIT ?", (last_n,)
+        )]
+        return self._session_dicts(list(reversed(seqs)))
+
+    def _session_dicts(self, seqs: List[int]) -> List[Dict[str, Any]]:
+        sessions = {}
+        marks = ",".join("?" * len(seqs))
+        for row in self.conn.execute(f"SELECT * FROM sessions WHERE seq IN ({marks})", seqs):
+            sessions[row["seq"]] = {
+                "timestamp": row["timestamp"],
+                "emails_scanned": row["emails_scanned"],
+                "emails_with_events": row["emails_with_events"],
+                "skipped": [],
+                "events_extracted": [],
+            }
+        for row in self.conn.execute(
+            f"SELECT session_seq, kind, data FROM session_entries WHERE session_seq IN ({marks})"
+            " ORDER BY seq", seqs
+        ):
+            key = "skipped" if row["kind"] == "skip" else "events_extracted"
+            sessions[row["session_seq"]][key].append(json.loads(row["data"]))
+        return [sessions[seq] for seq in seqs if seq in sessions]
+
+    def _import_session(self, session: Dict[str, Any], active: bool) -> None:
+        seq = self.conn.execute(
+            "INSERT INTO sessions (timestamp, emails_scanned, emails_with_events, active)"
+            " VALUES (?, ?, ?, ?)",
+            (session.get("timestamp"), session.get("emails_scanned", 0),
+             session.get("emails_with_events", 0), 1 if active else 0)
+        ).lastrowid
+        for entry in session.get("skipped", []):
+            self._add_entry(seq, "skip", entry.get("email_id"), entry)
+        for entry in session.get("events_extracted", []):
+            self._add_entry(seq, "event", entry.get("email_id"), entry)
+
+
+def migrate(state_dir: str = STATE_DIR) -> Dict[str, int]:
+    """
+    One-shot import of the JSON state files in state_dir into state.db.
+
+    The JSON files are left untouched as a backup; once state.db exists the
+    *_ops modules read and write it instead.
+
+    Args:
+        state_dir: Directory holding events.json, pending_invites.json, etc.
+
+    Returns:
+        Counts of imported events, invites, changes and sessions
+    """
+    state_dir = os.path.expanduser(state_dir)
+    db_path = os.path.join(state_dir, STATE_DB_NAME)
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+
+    path = lambda name: os.path.join(state_dir, name)
+    events = load_json(path(EVENTS_JSON), {"events": []}).get("events", [])
+    invites = load_json(path(PENDING_JSON), {"invites": []}).get("invites", [])
+    archived = read_archive(path(PENDING_JSON))
+    changes = read_changes(path(CHANGELOG_JSON))
+    sessions = load_json(path(ACTIVITY_JSON), {"sessions": []}).get("sessions", [])
+    current = SessionJournal(path(SESSION_JOURNAL)).fold() or load_json(path(SESSION_JSON), None)
+
+    # Build under a temporary name so a failed import leaves no state.db behind
+    tmp_path = db_path + ".migrating"
+    for leftover in (tmp_path, tmp_path + "-wal", tmp_path + "-shm"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    store = StateStore(tmp_path)
+    try:
+        with store.conn:
+            for event in events:
+                store.conn.execute(
+                    "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    tuple(event.get(column) for column in EVENT_COLUMNS)
+                )
+            for invite in invites:
+                store.conn.execute(
+                    "INSERT OR REPLACE INTO invites"
+                    " (id, email_id, email_subject, created_at, updated_at, reminder_count, last_reminded)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (invite.get("id"), invite.get("email_id"), invite.get("email_subject"),
+                     invite.get("created_at"), invite.get("updated_at"),
+                     invite.get("reminder_count", 0), invite.get("last_reminded"))
+                )
+                store.conn.execute("DELETE FROM invite_events WHERE invite_id = ?", (invite.get("id"),))
+                store._insert_invite_events(invite.get("id"), invite.get("events", []))
+            for invite in archived:
+                store.conn.execute(
+                    "INSERT OR REPLACE INTO invite_archive (id, email_id, archived_at, data)"
+                    " VALUES (?, ?, ?, ?)",
+                    (invite.get("id"), invite.get("email_id"), invite.get("archived_at"), json.dumps(invite))
+                )
+            seen_ids = set()
+            for seq, change in enumerate(changes, 1):
+                # Old changelogs repeat ids once full (every new id was chg_..._101)
+                if not change.get("id") or change["id"] in seen_ids:
+                    change = {**change, "id": f"{change.get('id') or 'chg'}-{seq}"}
+                seen_ids.add(change["id"])
+                store.conn.execute(
+                    "INSERT INTO changes (seq, id, timestamp, event_id, can_undo, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (seq, change["id"], change.get("timestamp"), change.get("event_id"),
+                     1 if change.get("can_undo") else 0, json.dumps(change))
+                )
+            for session in sessions:
+                store._import_session(session, active=False)
+            if current:
+                store._import_session(current, active=True)
+        store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        store.close()
+    os.replace(tmp_path, db_path)
+
+    return {
+        "events": len(events),
+        "invites": len(invites),
+        "changes": len(changes),
+        "sessions": len(sessions) + (1 if current else 0),
+    }
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        print("Usage: state_store.py migrate [--dir <state dir>]", file=sys.stderr)
+        sys.exit(1)
+
+    state_dir = STATE_DIR
+    if "--dir" in sys.argv:
+        index = sys.argv.index("--dir")
+        if index + 1 < len(sys.argv):
+            state_dir = sys.argv[index + 1]
+
+    try:
+        counts = migrate(state_dir)
+    except FileExistsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"Error: migration failed, state.db not created: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps({"success": True, "db": os.path.join(os.path.expanduser(state_dir), STATE_DB_NAME),
+                      **counts}))
+
+
+if __name__ == "__main__":
+    main()
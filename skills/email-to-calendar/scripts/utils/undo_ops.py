@@ -5,15 +5,15 @@ Undo operations for email-to-calendar skill.
 Provides helper functions for undo functionality.
 """
 
-import json
 import sys
 import os
 from datetime import datetime, timedelta
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
-from json_store import load_json, save_json
 from common import format_timestamp, time_ago
+from state_store import open_state_store
+from changelog_segments import open_changelog
 
 CHANGELOG_FILE = os.path.expanduser(
     "~/.openclaw/workspace/memory/email-to-calendar/changelog.json"
@@ -21,46 +21,36 @@ CHANGELOG_FILE = os.path.expanduser(
 UNDO_WINDOW_HOURS = 24
 
 
-def find_last_undoable() -> None:
-    """Find and print the most recent undoable change ID."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-    undo_window = timedelta(hours=UNDO_WINDOW_HOURS)
-    now = datetime.now()
+def _undoable_newest_first():
+    """
+    Changes still undoable and inside the undo window, newest first (lazy).
 
-    changes = list(reversed(changelog.get("changes", [])))
+    Both backends stop at the window boundary instead of scanning history.
+    """
+    since = (datetime.now() - timedelta(hours=UNDO_WINDOW_HOURS)).isoformat()
+    store = open_state_store(CHANGELOG_FILE)
+    if store is not None:
+        yield from store.undoable_changes(since)
+        return
 
-    for change in changes:
-        if not change.get("can_undo", False):
-            continue
-        try:
-            change_time = datetime.fromisoformat(change.get("timestamp", ""))
-            if (now - change_time) < undo_window:
-                print(change.get("id"))
-                return
-        except (ValueError, TypeError):
-            continue
+    changelog = open_changelog(CHANGELOG_FILE)
+    for entry in changelog.undoable(since):
+        change = changelog.read(entry)
+        if change is not None:
+            yield change
 
-    sys.exit(1)
+
+def find_last_undoable() -> None:
+    """Find and print the most recent undoable change ID."""
+    change = next(_undoable_newest_first(), None)
+    if change is None:
+        sys.exit(1)
+    print(change.get("id"))
 
 
 def list_undoable() -> None:
     """Print all undoable changes."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-    undo_window = timedelta(hours=UNDO_WINDOW_HOURS)
-    now = datetime.now()
-
-    changes = list(reversed(changelog.get("changes", [])))
-    undoable = []
-
-    for change in changes:
-        if not change.get("can_undo", False):
-            continue
-        try:
-            change_time = datetime.fromisoformat(change.get("timestamp", ""))
-            if (now - change_time) < undo_window:
-                undoable.append(change)
-        except (ValueError, TypeError):
-            continue
+    undoable = list(_undoable_newest_first())
 
     if not undoable:
         print("No undoable changes (all changes are older than 24 hours or already undone).")
@@ -100,15 +90,12 @@ def list_undoable() -> None:
 
 def mark_undone(change_id: str) -> None:
     """Mark a change as undone."""
-    changelog = load_json(CHANGELOG_FILE, {"changes": []})
-
-    for change in changelog.get("changes", []):
-        if change.get("id") == change_id:
-            change["can_undo"] = False
-            change["undone_at"] = datetime.now().isoformat()
-            break
+    store = open_state_store(CHANGELOG_FILE)
+    if store is not None:
+        store.mark_undone(change_id, datetime.now().isoformat())
+        return
 
-    save_json(CHANGELOG_FILE, changelog)
+    open_changelog(CHANGELOG_FILE).mark_undone(change_id, datetime.now().isoformat())
 
 
 def main():
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Resident worker for email-to-calendar skill.
+
+Runs the utils modules' command lines inside one long-lived interpreter,
+so config, SQLite connections, the calendar mirror, provider capability
+probes and HTTP keep-alive connections stay in memory between commands
+instead of being rebuilt by a fresh python3 for every shell script call.
+
+Usage:
+    python3 worker.py serve [--socket <path>] [--idle-timeout <seconds>]
+    python3 worker.py stdin
+    python3 worker.py status|stop [--socket <path>]
+
+`stdin` and socket clients that send JSON speak JSON lines, one command
+per line and one reply per line:
+
+    {"id": 1, "cmd": "track", "args": {"event_id": "abc", "summary": "Fair"}}
+    {"id": 2, "module": "changelog_ops", "argv": ["list", "--last", "5"]}
+    -> {"id": 1, "exit": 0, "stdout": "...", "stderr": ""}
+
+An optional "stdin" string is fed to commands that read stdin. The shell
+scripts (through worker_client.sh) instead send one NUL-separated command
+per connection: argc, module, args, then the command's stdin until EOF.
+They get back "+" as soon as the command is accepted, then
+"<exit>\\0<stderr>\\0<stdout>" once it has run. A client that got the "+"
+must not re-run the command itself, even if the reply never arrives.
+
+Commands run one at a time; the worker exits after --idle-timeout seconds
+without a connection and removes its socket.
+"""
+
+import importlib
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from typing import Optional, Dict, Any, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from json_store import ensure_dir
+
+SOCKET_FILE = os.path.expanduser("~/.cache/email-to-calendar/worker.sock")
+IDLE_TIMEOUT = 1800  # seconds
+
+# Modules whose main() the worker may run
+MODULES = (
+    "activity_ops", "calendar_mirror", "calendar_ops", "changelog_ops",
+    "date_parser", "disposition_ops", "email_ops", "event_tracking",
+    "invite_ops", "pending_ops", "undo_ops",
+)
+
+# cmd -> (module, leading argv); "args" become --key value flags
+COMMANDS: Dict[str, Tuple[str, List[str]]] = {
+    "track": ("event_tracking", ["track"]),
+    "lookup": ("event_tracking", ["lookup"]),
+    "update-tracked": ("event_tracking", ["update"]),
+    "delete-tracked": ("event_tracking", ["delete"]),
+    "add-pending": ("pending_ops", ["add"]),
+    "list-pending": ("pending_ops", []),
+    "update-invite": ("invite_ops", []),
+    "log-create": ("changelog_ops", ["log-create"]),
+    "log-update": ("changelog_ops", ["log-update"]),
+    "log-delete": ("changelog_ops", ["log-delete"]),
+    "start-session": ("activity_ops", ["start-session"]),
+    "log-skip": ("activity_ops", ["log-skip"]),
+    "log-event": ("activity_ops", ["log-event"]),
+    "log-batch": ("activity_ops", ["log-batch"]),
+    "end-session": ("activity_ops", ["end-session"]),
+    "check-duplicate": ("calendar_mirror", ["check"]),
+    "disposition": ("disposition_ops", ["disposition"]),
+}
+
+
+def args_to_argv(args: Dict[str, Any]) -> List[str]:
+    """{"event_id": "x", "summary_only": True} -> ["--event-id", "x", "--summary-only"]."""
+    argv = []
+    for key, value in args.items():
+        if value is None or value is False:
+            continue
+        argv.append("--" + key.replace("_", "-"))
+        if value is True:
+            continue
+        argv.append(json.dumps(value) if isinstance(value, (dict, list)) else str(value))
+    return argv
+
+
+def run_module(module_name: str, argv: List[str], stdin: str = "") -> Tuple[int, str, str]:
+    """
+    Run a utils module's main() as if invoked from the command line.
+
+    Returns:
+        (exit code, stdout, stderr)
+    """
+    if module_name not in MODULES:
+        return 2, "", f"Unknown module: {module_name}\n"
+
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    try:
+        module = importlib.import_module(module_name)
+        sys.argv = [module.__file__, *argv]
+        sys.stdin = io.StringIO(stdin)
+        with redirect_stdout(out), redirect_stderr(err):
+            module.main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            err.write(f"{e.code}\n")
+            code = 1
+    except Exception:
+        traceback.print_exc(file=err)
+        code = 1
+    finally:
+        sys.argv, sys.stdin = saved_argv, saved_stdin
+    return code, out.getvalue(), err.getvalue()
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one JSON command and build its reply."""
+    reply = {"id": request.get("id")}
+    if request.get("cmd") == "ping":
+        reply.update({"exit": 0, "stdout": "pong\n", "stderr": ""})
+        return reply
+
+    if "module" in request:
+        module_name, argv = request["module"], list(request.get("argv", []))
+    elif request.get("cmd") in COMMANDS:
+        module_name, leading = COMMANDS[request["cmd"]]
+        argv = leading + args_to_argv(request.get("args", {}))
+    else:
+        reply.update({"exit": 2, "stdout": "", "stderr": f"Unknown command: {request.get('cmd')}\n"})
+        return reply
+
+    code, out, err = run_module(module_name, [str(arg) for arg in argv], request.get("stdin", ""))
+    reply.update({"exit": code, "stdout": out, "stderr": err})
+    return reply
+
+
+def handle_line(line: str) -> Optional[Dict[str, Any]]:
+    """Reply to one JSON-lines request; None for a shutdown request."""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"id": None, "exit": 2, "stdout": "", "stderr": f"Invalid JSON: {e}\n"}
+    if not isinstance(request, dict):
+        return {"id": None, "exit": 2, "stdout": "", "stderr": "Request must be a JSON object\n"}
+    if request.get("cmd") == "shutdown":
+        return None
+    return handle_request(request)
+
+
+def serve_stdin() -> None:
+    """JSON-lines commands on stdin, replies on stdout, until EOF."""
+    stdout = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        reply = handle_line(line)
+        if reply is None:
+            break
+        stdout.write(json.dumps(reply) + "\n")
+        stdout.flush()
+
+
+def _handle_argv_frame(data: bytes) -> bytes:
+    """Run a NUL-framed shell command: argc, module, args..., stdin."""
+    try:
+        count, rest = data.split(b"\0", 1)
+        fields = rest.split(b"\0", int(count) + 1)
+        module_name = fields[0].decode()
+        argv = [field.decode() for field in fields[1:int(count) + 1]]
+        stdin = fields[int(count) + 1].decode() if len(fields) > int(count) + 1 else ""
+    except (ValueError, IndexError, UnicodeDecodeError):
+        return b"2\0Malformed request\n\0"
+    code, out, err = run_module(module_name, argv, stdin)
+    return f"{code}\0{err}\0{out}".encode()
+
+
+def _handle_connection(conn: socket.socket) -> bool:
+    """Serve one client connection. Returns False when asked to shut down."""
+    with conn.makefile("rb") as reader, conn.makefile("wb") as writer:
+        first = reader.read(1)
+        if not first:
+            return True
+        if first != b"{":
+            data = first + reader.read()
+            writer.write(b"+")  # accepted: from here on the client won't fall back
+            writer.flush()
+            writer.write(_handle_argv_frame(data))
+            return True
+        line = first + reader.readline()
+        while line:
+            if line.strip():
+                reply = handle_line(line.decode())
+                if reply is None:
+                    return False
+                writer.write((json.dumps(reply) + "\n").encode())
+                writer.flush()
+            line = reader.readline()
+    return True
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def send_request(request: Dict[str, Any], socket_path: str = SOCKET_FILE) -> Optional[Dict[str, Any]]:
+    """Send one JSON command to a running worker; None if none is listening."""
+    client = _connect(socket_path)
+    if client is None:
+        return None
+    with client, client.makefile("rb") as reader:
+        client.sendall((json.dumps(request) + "\n").encode())
+        client.shutdown(socket.SHUT_WR)
+        line = reader.readline()
+    return json.loads(line) if line else {}
+
+
+def serve(socket_path: str = SOCKET_FILE, idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """Listen on a Unix socket until idle for idle_timeout seconds or shut down."""
+    ensure_dir(socket_path)
+    existing = _connect(socket_path)
+    if existing is not None:
+        existing.close()
+        print(f"Worker already running on {socket_path}", file=sys.stderr)
+        sys.exit(1)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)  # stale socket from a worker that died
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(umask)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+    inode = os.stat(socket_path).st_ino
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            conn.settimeout(None)
+            with conn:
+                if not _handle_connection(conn):
+                    break
+    finally:
+        server.close()
+        try:
+            if os.stat(socket_path).st_ino == inode:
+                os.remove(socket_path)
+        except OSError:
+            pass
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: worker.py <serve|stdin|status|stop> [--socket <path>] [--idle-timeout <seconds>]",
+              file=sys.stderr)
+        sys.exit(1)
+
+    action = sys.argv[1]
+
+    # Parse keyword arguments
+    args = {}
+    i = 2
+    while i < len(sys.argv):
+        if sys.argv[i].startswith("--") and i + 1 < len(sys.argv):
+            args[sys.argv[i][2:].replace("-", "_")] = sys.argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    socket_path = os.path.expanduser(args.get("socket", SOCKET_FILE))
+
+    if action == "serve":
+        serve(socket_path, float(args.get("idle_timeout", IDLE_TIMEOUT)))
+    elif action == "stdin":
+        serve_stdin()
+    elif action == "status":
+        reply = send_request({"cmd": "ping"}, socket_path)
+        print(f"Worker running on {socket_path}" if reply else "Worker not running")
+        sys.exit(0 if reply else 1)
+    elif action == "stop":
+        if send_request({"cmd": "shutdown"}, socket_path) is None:
+            print("Worker not running")
+        else:
+            print("Worker stopped")
+    else:
+        print(f"Unknown action: {action}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/bin/bash
+# Thin client for the resident worker (utils/worker.py), sourced by the scripts.
+#
+#   run_util <module> [args...]        Run utils/<module>.py with args
+#   run_util_stdin <module> [args...]  Same, forwarding this shell's stdin
+#
+# When a worker is listening on $EMAIL_TO_CALENDAR_WORKER_SOCKET (default
+# ~/.cache/email-to-calendar/worker.sock) and socat is installed, the command
+# runs inside the worker; otherwise it falls back to a fresh python3. Output
+# and exit status are the same either way.
+#
+# The fallback only happens when no worker accepted the command. Once the
+# worker has acknowledged it, a lost reply is reported as an error instead
+# of running a possibly non-idempotent command (e.g. creating an event) twice.
+
+WORKER_UTILS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+WORKER_SOCKET="${EMAIL_TO_CALENDAR_WORKER_SOCKET:-$HOME/.cache/email-to-calendar/worker.sock}"
+
+# Send one command. Sets WORKER_ACCEPTED=1 once the worker acknowledged it;
+# the return status is only meaningful then.
+_worker_call() {
+    local forward_stdin="$1"
+    shift
+    local ack="" status="" err=""
+    WORKER_ACCEPTED=0
+    {
+        IFS= read -r -n 1 -d '' ack
+        [ "$ack" = "+" ] || return 1
+        WORKER_ACCEPTED=1
+        if ! IFS= read -r -d '' status; then
+            echo "Error: worker stopped while running $1; not retried" >&2
+            return 1
+        fi
+        IFS= read -r -d '' err
+        [ -n "$err" ] && printf '%s' "$err" >&2
+        cat
+    } < <(
+        {
+            printf '%s\0' "$(($# - 1))" "$@"
+            if [ "$forward_stdin" = 1 ]; then cat; fi
+        } | socat -t 3600 - "UNIX-CONNECT:$WORKER_SOCKET" 2>/dev/null
+    )
+    return "$status"
+}
+
+_worker_available() {
+    [ -S "$WORKER_SOCKET" ] && command -v socat >/dev/null 2>&1
+}
+
+run_util() {
+    if _worker_available; then
+        _worker_call 0 "$@" < /dev/null
+        local status=$?
+        [ "$WORKER_ACCEPTED" = 1 ] && return "$status"
+    fi
+    local module="$1"
+    shift
+    python3 "$WORKER_UTILS_DIR/$module.py" "$@"
+}
+
+run_util_stdin() {
+    if _worker_available; then
+        # Buffer stdin so it can be replayed if no worker answers
+        local input
+        input=$(cat; printf x)
+        input="${input%x}"
+        _worker_call 1 "$@" < <(printf '%s' "$input")
+        local status=$?
+        [ "$WORKER_ACCEPTED" = 1 ] && return "$status"
+        local module="$1"
+        shift
+        printf '%s' "$input" | python3 "$WORKER_UTILS_DIR/$module.py" "$@"
+        return
+    fi
+    local module="$1"
+    shift
+    python3 "$WORKER_UTILS_DIR/$module.py" "$@"
+}
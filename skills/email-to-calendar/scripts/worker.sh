@@ -0,0 +1,61 @@
+#!/bin/bash
+# Start, stop or check the resident worker that the other scripts run their
+# Python commands in (see utils/worker.py and utils/worker_client.sh)
+# Usage: worker.sh <start|stop|status> [--idle-timeout <seconds>]
+#
+# While the worker is running (and socat is installed) the scripts send their
+# commands to it over a Unix socket instead of starting python3 each time.
+# The worker exits on its own after 30 idle minutes by default.
+
+SCRIPT_DIR="$(dirname "$0")"
+UTILS_DIR="$SCRIPT_DIR/utils"
+source "$UTILS_DIR/worker_client.sh"
+
+ACTION="${1:-}"
+shift 2>/dev/null || true
+
+IDLE_TIMEOUT=""
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --idle-timeout)
+            IDLE_TIMEOUT="$2"
+            shift 2
+            ;;
+        *)
+            shift
+            ;;
+    esac
+done
+
+case "$ACTION" in
+    start)
+        if python3 "$UTILS_DIR/worker.py" status --socket "$WORKER_SOCKET" > /dev/null; then
+            echo "Worker already running"
+            exit 0
+        fi
+        if ! command -v socat > /dev/null 2>&1; then
+            echo "Warning: socat not found; scripts will keep starting python3 per call" >&2
+        fi
+        SERVE_ARGS=(serve --socket "$WORKER_SOCKET")
+        if [ -n "$IDLE_TIMEOUT" ]; then
+            SERVE_ARGS+=(--idle-timeout "$IDLE_TIMEOUT")
+        fi
+        nohup python3 "$UTILS_DIR/worker.py" "${SERVE_ARGS[@]}" > /dev/null 2>&1 &
+        for _ in $(seq 50); do
+            if [ -S "$WORKER_SOCKET" ]; then
+                echo "Worker started"
+                exit 0
+            fi
+            sleep 0.1
+        done
+        echo "Error: worker did not start" >&2
+        exit 1
+        ;;
+    stop|status)
+        python3 "$UTILS_DIR/worker.py" "$ACTION" --socket "$WORKER_SOCKET"
+        ;;
+    *)
+        echo "Usage: worker.sh <start|stop|status> [--idle-timeout <seconds>]"
+        exit 1
+        ;;
+esac
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Resident ontology server: keeps a GraphStore (and its indexes) in memory
+and answers read requests over a Unix socket, so a query costs one round
+trip instead of interpreter startup plus a graph load.
+
+Protocol: one JSON object per line in each direction.
+    -> {"command": "get_entity", "params": {"entity_id": "p_001", ...}}
+    <- {"ok": true, "result": {...}}
+    <- {"ok": false, "error": "..."}
+
+Before every request the server tails graph.jsonl, so writes made by other
+processes (CLI create/relate/apply) are visible to the next read.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+
+from graph_store import COMPACT_EVERY, GraphStore
+
+# Set to any non-empty value to make clients skip the server
+DISABLE_ENV = "ONTOLOGY_NO_SERVER"
+CLIENT_TIMEOUT = 5.0
+
+
+def socket_path_for(graph_path: str) -> Path:
+    """Server socket stored next to the graph log."""
+    path = Path(graph_path)
+    return path.with_name(path.stem + ".sock")
+
+
+def request(graph_path: str, command: str, params: dict) -> dict | None:
+    """
+    Send one request to the server for graph_path. Returns the reply, or
+    None when no server is running (callers then work locally).
+    """
+    if os.environ.get(DISABLE_ENV):
+        return None
+    sock_path = socket_path_for(graph_path)
+    if not sock_path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(str(sock_path))
+            sock.sendall(json.dumps({"command": command, "params": params}).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+    except OSError:
+        return None  # stale socket or server going away
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class GraphServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server over one graph. `handlers` maps command names to
+    callables taking the request params plus store=<GraphStore>. Requests
+    are answered one at a time under a lock; each takes well under a
+    millisecond once the store is warm.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, graph_path: str, handlers: dict, index_defs=None,
+                 socket_path: str | None = None):
+        self.graph_path = Path(graph_path)
+        self.handlers = handlers
+        self.index_defs = index_defs
+        self.sock_path = Path(socket_path) if socket_path else socket_path_for(graph_path)
+        self.lock = threading.Lock()
+        self.store = GraphStore.open(str(self.graph_path), index_defs=index_defs)
+
+        if self.sock_path.exists():
+            if request_alive(self.sock_path):
+                raise SystemExit(f"Server already running on {self.sock_path}")
+            self.sock_path.unlink()  # left behind by a server that died
+        self.sock_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.sock_path), RequestHandler)
+
+    def refresh(self):
+        """Pick up ops appended by other processes since the last request."""
+        try:
+            size = self.graph_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self.store.offset:
+            # Log was rewritten underneath us; start over
+            self.store = GraphStore.open(str(self.graph_path), index_defs=self.index_defs)
+        elif size > self.store.offset:
+            self.store.catch_up()
+            if self.store.tail_ops >= COMPACT_EVERY:
+                self.store.write_snapshot()
+
+    def handle_request_line(self, line: bytes) -> bytes:
+        """Answer one request line with one encoded reply line."""
+        try:
+            message = json.loads(line)
+            command = message.get("command")
+            handler = self.handlers.get(command)
+            if command != "ping" and handler is None:
+                return encode({"ok": False, "error": f"unknown command '{command}'"})
+            with self.lock:
+                self.refresh()
+                if command == "ping":
+                    result = {"offset": self.store.offset}
+                else:
+                    result = handler(**message.get("params", {}), store=self.store)
+                # Encode under the lock: results share objects with the store
+                return encode({"ok": True, "result": result})
+        except Exception as exc:  # reported to the client, server keeps running
+            return encode({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.sock_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # A client may send several requests on one connection
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            self.wfile.write(self.server.handle_request_line(line))
+            self.wfile.flush()
+
+
+def encode(reply: dict) -> bytes:
+    return json.dumps(reply).encode() + b"\n"
+
+
+def request_alive(sock_path: Path) -> bool:
+    """True if something answers on the socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(str(sock_path))
+            sock.sendall(b'{"command": "ping"}\n')
+            return bool(sock.makefile("rb").readline())
+    except OSError:
+        return False
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Snapshot + log-tail storage engine for the ontology graph.
+
+graph.jsonl stays the append-only source of truth. Its replayed state is
+periodically compacted into a snapshot file that records the byte offset
+of the log it covers, so opening the graph costs one snapshot read plus a
+replay of the ops appended since (the tail) instead of the whole history.
+"""
+
+import bisect
+import fcntl
+import json
+import os
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+SNAPSHOT_VERSION = 3
+# Re-snapshot once this many ops have accumulated past the last snapshot
+COMPACT_EVERY = 500
+
+
+def snapshot_path_for(graph_path: str) -> Path:
+    """Snapshot file stored next to the graph log."""
+    path = Path(graph_path)
+    return path.with_name(path.stem + ".snapshot.json")
+
+
+@contextmanager
+def locked_log(graph_path: str):
+    """
+    Hold an exclusive lock on the graph log for the duration of a
+    read-check-append cycle. Yields a binary append-mode handle.
+    """
+    path = Path(graph_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab+") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def append_records(f, records: list):
+    """
+    Append records to a locked log handle as one write, then fsync.
+    Several records go on a single {"op": "batch", "records": [...]} line,
+    so a crash mid-write leaves one torn line rather than part of a batch:
+    readers stop at a line without its newline, and the torn last line is
+    cut off here before the next append so nothing gets glued onto it.
+    """
+    size = f.seek(0, os.SEEK_END)
+    if size:
+        f.seek(size - 1)
+        if f.read(1) != b"\n":
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+    if len(records) > 1:
+        records = [{"op": "batch", "records": records}]
+    payload = "".join(json.dumps(record) + "\n" for record in records).encode()
+    f.write(payload)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def relation_key(record: dict) -> tuple:
+    return (record["from"], record["rel"], record["to"])
+
+
+def hash_key(value) -> str:
+    """Hashable, type-preserving key for equality lookups (lists/dicts included)."""
+    return json.dumps(value, sort_keys=True)
+
+
+def sort_key(value):
+    """Order numbers before strings; None for values a range index can't hold."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return None
+
+
+class HashIndex:
+    """Equality index: value -> ids."""
+
+    kind = "hash"
+
+    def __init__(self):
+        self.entries = {}
+
+    def add(self, value, entity_id: str):
+        self.entries.setdefault(hash_key(value), {})[entity_id] = None
+
+    def remove(self, value, entity_id: str):
+        key = hash_key(value)
+        ids = self.entries.get(key, {})
+        ids.pop(entity_id, None)
+        if not ids:
+            self.entries.pop(key, None)
+
+    def lookup(self, values) -> set | None:
+        ids = set()
+        for value in values:
+            ids.update(self.entries.get(hash_key(value), ()))
+        return ids
+
+    def range(self, op: str, value) -> set | None:
+        return None  # not supported; caller falls back
+
+    def build(self, pairs):
+        """Replace the entries with (value, id) pairs."""
+        self.entries = {}
+        for value, entity_id in pairs:
+            self.add(value, entity_id)
+
+    def dump(self):
+        return {key: list(ids) for key, ids in self.entries.items()}
+
+    def load(self, data):
+        self.entries = {key: dict.fromkeys(ids) for key, ids in data.items()}
+
+
+class SortedIndex:
+    """Range index: sorted list of (sort_key, id) searched with bisect."""
+
+    kind = "sorted"
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, value, entity_id: str):
+        key = sort_key(value)
+        if key is not None:
+            bisect.insort(self.entries, (key, entity_id))
+
+    def remove(self, value, entity_id: str):
+        key = sort_key(value)
+        if key is None:
+            return
+        i = bisect.bisect_left(self.entries, (key, entity_id))
+        if i < len(self.entries) and self.entries[i] == (key, entity_id):
+            del self.entries[i]
+
+    def lookup(self, values) -> set | None:
+        ids = set()
+        for value in values:
+            key = sort_key(value)
+            if key is None:
+                return None
+            lo = bisect.bisect_left(self.entries, (key,))
+            hi = bisect.bisect_right(self.entries, (key, "\uffff"))
+            ids.update(entity_id for _, entity_id in self.entries[lo:hi])
+        return ids
+
+    def range(self, op: str, value) -> set | None:
+        key = sort_key(value)
+        if key is None:
+            return None
+        # Only compare within the same kind (numbers vs strings)
+        kind_lo = bisect.bisect_left(self.entries, ((key[0],),))
+        kind_hi = bisect.bisect_left(self.entries, ((key[0] + 1,),))
+        if op == ">":
+            lo, hi = bisect.bisect_right(self.entries, (key, "\uffff")), kind_hi
+        elif op == ">=":
+            lo, hi = bisect.bisect_left(self.entries, (key,)), kind_hi
+        elif op == "<":
+            lo, hi = kind_lo, bisect.bisect_left(self.entries, (key,))
+        elif op == "<=":
+            lo, hi = kind_lo, bisect.bisect_right(self.entries, (key, "\uffff"))
+        else:
+            return None
+        return {entity_id for _, entity_id in self.entries[lo:hi]}
+
+    def build(self, pairs):
+        """Replace the entries with (value, id) pairs, sorting once."""
+        keyed = ((sort_key(value), entity_id) for value, entity_id in pairs)
+        self.entries = sorted(entry for entry in keyed if entry[0] is not None)
+
+    def dump(self):
+        return [[key[1], entity_id] for key, entity_id in self.entries]
+
+    def load(self, data):
+        self.entries = [(sort_key(value), entity_id) for value, entity_id in data]
+
+
+INDEX_KINDS = {"hash": HashIndex, "sorted": SortedIndex}
+
+
+class GraphStore:
+    """
+    In-memory graph state with hash indexes by id, type and relation, plus
+    forward/reverse adjacency keyed by entity then relation type so a
+    neighborhood lookup only touches that entity's edges.
+    """
+
+    def __init__(self, graph_path: str, index_defs: dict | None = None):
+        self.graph_path = Path(graph_path)
+        self.snapshot_path = snapshot_path_for(graph_path)
+        self.offset = 0          # log bytes already applied
+        self.tail_ops = 0        # ops applied since the last snapshot
+        self.entities = {}       # id -> entity
+        self.by_type = {}        # type -> {id: None} (insertion-ordered set)
+        self.relation_props = {} # (from, rel, to) -> [properties, ...] (one per relate)
+        self.relation_seq = {}   # (from, rel, to) -> [log sequence, ...] (parallel to props)
+        self.next_seq = 0
+        self.by_rel = {}         # rel -> {(from, rel, to): None}
+        self.out_adj = {}        # from -> rel -> {to: None}
+        self.in_adj = {}         # to -> rel -> {from: None}
+        self.out_degree = {}     # (from, rel) -> relation records (cardinality counters)
+        self.in_degree = {}      # (to, rel) -> relation records
+        # Secondary property indexes: type -> prop -> HashIndex | SortedIndex
+        self.index_defs = index_defs
+        self.indexes = {}
+        self.indexes_rebuilt = bool(index_defs)  # until a matching snapshot says otherwise
+        self.defer_index = False  # while replaying into indexes rebuilt afterwards
+        self._init_indexes()
+
+    # -- loading ---------------------------------------------------------
+
+    @classmethod
+    def open(cls, graph_path: str, compact: bool = True,
+             index_defs: dict | None = None) -> "GraphStore":
+        """
+        Load snapshot + tail; re-snapshot if the tail has grown long.
+        index_defs ({type: {prop: "hash"|"sorted"}}, from schema.yaml) are
+        only needed when they may have changed; otherwise the definitions
+        persisted in the snapshot are reused.
+        """
+        store = cls(graph_path, index_defs)
+        store._load_snapshot()
+        # Indexes not restored from the snapshot are built once after the
+        # replay instead of entry by entry
+        store.defer_index = store.indexes_rebuilt
+        store.catch_up()
+        if store.defer_index:
+            store.defer_index = False
+            store._rebuild_indexes()
+        if compact and (store.tail_ops >= COMPACT_EVERY or store.indexes_rebuilt):
+            store.write_snapshot()
+        return store
+
+    def _load_snapshot(self):
+        if not self.snapshot_path.exists() or not self.graph_path.exists():
+            return
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return  # unreadable snapshot: fall back to a full replay
+
+        # A log that shrank was rewritten; the snapshot no longer applies
+        if (snapshot.get("version") != SNAPSHOT_VERSION
+                or snapshot.get("offset", 0) > self.graph_path.stat().st_size):
+            return
+
+        saved = snapshot.get("indexes", {})
+        saved_defs = {
+            type_name: {prop: idx["kind"] for prop, idx in props.items()}
+            for type_name, props in saved.items()
+        }
+        if self.index_defs is None:
+            self.index_defs = saved_defs
+            self._init_indexes()
+        reuse = self.index_defs == saved_defs
+        self.indexes_rebuilt = not reuse
+
+        # Restore persisted indexes as-is; if defs changed, open() rebuilds them
+        if reuse:
+            for type_name, props in saved.items():
+                for prop, idx in props.items():
+                    self.indexes[type_name][prop].load(idx["entries"])
+
+        for entity in snapshot.get("entities", []):
+            self._put_entity(entity, index=False)
+        for rel in snapshot.get("relations", []):
+            self._add_relation(rel)
+        self.offset = snapshot["offset"]
+
+    def catch_up(self) -> int:
+        """Apply complete lines appended to the log since `offset`."""
+        if not self.graph_path.exists():
+            return 0
+
+        applied = 0
+        with open(self.graph_path, "rb") as f:
+            f.seek(self.offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # partial line from an in-flight writer
+                self.offset += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                self.apply(record)
+                applied += len(record["records"]) if record.get("op") == "batch" else 1
+
+        self.tail_ops += applied
+        return applied
+
+    def write_snapshot(self):
+        """Compact current state into the snapshot file (atomic replace)."""
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "offset": self.offset,
+            "entities": list(self.entities.values()),
+            "relations": self.relations(),
+            "indexes": {
+                type_name: {
+                    prop: {"kind": idx.kind, "entries": idx.dump()}
+                    for prop, idx in props.items()
+                }
+                for type_name, props in self.indexes.items()
+            },
+        }
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.snapshot_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.snapshot_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.tail_ops = 0
+        self.indexes_rebuilt = False
+
+    # -- applying ops ----------------------------------------------------
+
+    def apply(self, record: dict):
+        """Apply one log record to the in-memory state."""
+        op = record.get("op")
+
+        if op == "batch":
+            for inner in record.get("records", []):
+                self.apply(inner)
+        elif op == "create":
+            self._put_entity(record["entity"])
+        elif op == "update":
+            entity = self.entities.get(record["id"])
+            if entity is not None:
+                self._unindex(entity)
+                entity["properties"].update(record.get("properties", {}))
+                entity["updated"] = record.get("timestamp")
+                self._index(entity)
+        elif op == "delete":
+            self._drop_entity(record["id"])
+        elif op == "relate":
+            self._add_relation(record)
+        elif op == "unrelate":
+            self._remove_relation(relation_key(record))
+
+    def _put_entity(self, entity: dict, index: bool = True):
+        old = self.entities.get(entity["id"])
+        if old is not None:
+            self.by_type.get(old["type"], {}).pop(entity["id"], None)
+            self._unindex(old)
+        self.entities[entity["id"]] = entity
+        self.by_type.setdefault(entity["type"], {})[entity["id"]] = None
+        if index:
+            self._index(entity)
+
+    def _drop_entity(self, entity_id: str):
+        entity = self.entities.pop(entity_id, None)
+        if entity is not None:
+            self.by_type.get(entity["type"], {}).pop(entity_id, None)
+            self._unindex(entity)
+
+    def _init_indexes(self):
+        self.indexes = {
+            type_name: {prop: INDEX_KINDS[kind]() for prop, kind in props.items()}
+            for type_name, props in (self.index_defs or {}).items()
+        }
+
+    def _rebuild_indexes(self):
+        for type_name, props in self.indexes.items():
+            entities = self.entities_of_type(type_name)
+            for prop, idx in props.items():
+                idx.build(
+                    (entity["properties"][prop], entity["id"])
+                    for entity in entities if prop in entity["properties"]
+                )
+
+    def _index(self, entity: dict):
+        if self.defer_index:
+            return
+        for prop, idx in self.indexes.get(entity["type"], {}).items():
+            if prop in entity["properties"]:
+                idx.add(entity["properties"][prop], entity["id"])
+
+    def _unindex(self, entity: dict):
+        if self.defer_index:
+            return
+        for prop, idx in self.indexes.get(entity["type"], {}).items():
+            if prop in entity["properties"]:
+                idx.remove(entity["properties"][prop], entity["id"])
+
+    def _add_relation(self, record: dict):
+        key = relation_key(record)
+        self.relation_props.setdefault(key, []).append(record.get("properties", {}))
+        self.relation_seq.setdefault(key, []).append(self.next_seq)
+        self.next_seq += 1
+        self.by_rel.setdefault(key[1], {})[key] = None
+        from_id, rel, to_id = key
+        self.out_adj.setdefault(from_id, {}).setdefault(rel, {})[to_id] = None
+        self.in_adj.setdefault(to_id, {}).setdefault(rel, {})[from_id] = None
+        self.out_degree[(from_id, rel)] = self.out_degree.get((from_id, rel), 0) + 1
+        self.in_degree[(to_id, rel)] = self.in_degree.get((to_id, rel), 0) + 1
+
+    def _remove_relation(self, key: tuple):
+        props = self.relation_props.pop(key, None)
+        if props is None:
+            return
+        self.relation_seq.pop(key, None)
+        self.by_rel.get(key[1], {}).pop(key, None)
+        from_id, rel, to_id = key
+        self._decrement(self.out_degree, (from_id, rel), len(props))
+        self._decrement(self.in_degree, (to_id, rel), len(props))
+        self._unlink(self.out_adj, from_id, rel, to_id)
+        self._unlink(self.in_adj, to_id, rel, from_id)
+
+    @staticmethod
+    def _decrement(counter: dict, key: tuple, amount: int):
+        remaining = counter.get(key, 0) - amount
+        if remaining > 0:
+            counter[key] = remaining
+        else:
+            counter.pop(key, None)
+
+    @staticmethod
+    def _unlink(adj: dict, node: str, rel: str, other: str):
+        rels = adj.get(node, {})
+        others = rels.get(rel, {})
+        others.pop(other, None)
+        if not others:
+            rels.pop(rel, None)
+        if not rels:
+            adj.pop(node, None)
+
+    # -- reading ---------------------------------------------------------
+
+    def entities_of_type(self, type_name: str | None) -> list:
+        if not type_name:
+            return list(self.entities.values())
+        return [self.entities[i] for i in self.by_type.get(type_name, ())]
+
+    def relations(self, rel_type: str | None = None) -> list:
+        """Relations as {from, rel, to, properties} dicts, in log order."""
+        keys = self.by_rel.get(rel_type, ()) if rel_type else self.relation_props
+        records = [
+            (seq, {"from": key[0], "rel": key[1], "to": key[2], "properties": props})
+            for key in keys
+            for seq, props in zip(self.relation_seq[key], self.relation_props[key])
+        ]
+        records.sort(key=lambda r: r[0])
+        return [record for _, record in records]
+
+    def neighbors(self, entity_id: str, rel_types=None, direction: str = "outgoing"):
+        """
+        Yield (rel, direction, other_id, properties) for each relation record
+        touching entity_id, in log order. rel_types is None (any) or a
+        collection of types.
+        """
+        found = []
+        sides = []
+        if direction in ("outgoing", "both"):
+            sides.append(("outgoing", self.out_adj.get(entity_id, {})))
+        if direction in ("incoming", "both"):
+            sides.append(("incoming", self.in_adj.get(entity_id, {})))
+
+        for side, rels in sides:
+            names = rels if rel_types is None else [r for r in rel_types if r in rels]
+            for rel in names:
+                for other in rels[rel]:
+                    if side == "incoming" and direction == "both" and other == entity_id:
+                        continue  # self-loop already reported as outgoing
+                    key = (entity_id, rel, other) if side == "outgoing" else (other, rel, entity_id)
+                    for seq, props in zip(self.relation_seq.get(key, ()),
+                                          self.relation_props.get(key, ())):
+                        found.append((seq, rel, side, other, props))
+
+        found.sort(key=lambda r: r[0])
+        for _, rel, side, other, props in found:
+            yield rel, side, other, props
+
+    def traverse(self, start_id: str, rel_types=None, direction: str = "outgoing",
+                 max_depth: int = 1, limit: int | None = None, strategy: str = "bfs",
+                 type_name: str | None = None) -> list:
+        """
+        Walk out from start_id up to max_depth hops, visiting each entity
+        once. Returns [{depth, relation, direction, parent, entity}] in
+        visit order; type_name filters what is returned, not what is walked.
+        """
+        if start_id not in self.entities:
+            return []
+
+        results = []
+        seen = {start_id}
+        frontier = deque([(start_id, 0)])
+        pop = frontier.popleft if strategy == "bfs" else frontier.pop
+
+        while frontier:
+            node, depth = pop()
+            if depth >= max_depth:
+                continue
+            for rel, side, other, _ in self.neighbors(node, rel_types, direction):
+                if other in seen or other not in self.entities:
+                    continue
+                seen.add(other)
+                entity = self.entities[other]
+                if not type_name or entity["type"] == type_name:
+                    results.append({
+                        "depth": depth + 1,
+                        "relation": rel,
+                        "direction": side,
+                        "parent": node,
+                        "entity": entity,
+                    })
+                    if limit and len(results) >= limit:
+                        return results
+                frontier.append((other, depth + 1))
+
+        return results
+
+    def follow_path(self, start_id: str, hops: list, limit: int | None = None) -> list:
+        """
+        Follow a fixed sequence of (rel, direction) hops, e.g.
+        [("has_owner", "incoming"), ("has_task", "outgoing")] from a Person
+        yields the tasks of every project that person owns.
+        """
+        current = {start_id: None} if start_id in self.entities else {}
+        for rel, direction in hops:
+            step = {}
+            for node in current:
+                for _, _, other, _ in self.neighbors(node, (rel,), direction):
+                    if other in self.entities:
+                        step[other] = None
+            current = step
+
+        results = [self.entities[i] for i in current]
+        return results[:limit] if limit else results
+
+    def cycles(self, rel: str) -> list:
+        """
+        Every cycle over one relation type, as the members of each strongly
+        connected component with more than one entity (or a self-loop).
+        Iterative Tarjan, so it is linear in edges and never recurses.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        found = []
+
+        for root in self.by_rel.get(rel, {}):
+            if root[0] in index:
+                continue
+            work = [(root[0], iter(self.out_adj.get(root[0], {}).get(rel, ())))]
+            index[root[0]] = lowlink[root[0]] = len(index)
+            stack.append(root[0])
+            on_stack.add(root[0])
+
+            while work:
+                node, edges = work[-1]
+                for nxt in edges:
+                    if nxt not in index:
+                        index[nxt] = lowlink[nxt] = len(index)
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(self.out_adj.get(nxt, {}).get(rel, ()))))
+                        break
+                    if nxt in on_stack:
+                        lowlink[node] = min(lowlink[node], index[nxt])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.out_adj.get(node, {}).get(rel, ()):
+                            found.append(component[::-1])
+
+        return found
+
+    def candidates(self, type_name: str, prop: str, op: str, value) -> set | None:
+        """Ids that may satisfy one predicate via an index, or None if unindexed."""
+        idx = self.indexes.get(type_name, {}).get(prop)
+        if idx is None:
+            return None
+        if op == "=":
+            return idx.lookup([value])
+        if op == "in":
+            return idx.lookup(value)
+        return idx.range(op, value)
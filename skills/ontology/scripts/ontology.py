@@ -8,17 +8,32 @@ Usage:
     python ontology.py query --type Task --where '{"status":"open"}'
     python ontology.py relate --from proj_001 --rel has_task --to task_001
     python ontology.py related --id proj_001 --rel has_task
+    python ontology.py traverse --id proj_001 --depth 3 --rel has_task,blocks
+    python ontology.py traverse --id p_001 --path '^has_owner,has_task'
     python ontology.py list --type Person
     python ontology.py delete --id p_001
-    python ontology.py validate
+    python ontology.py validate [--full]
+    python ontology.py compact
+    python ontology.py apply --input ops.ndjson
+    python ontology.py serve
 """
 
 import argparse
+import functools
+import hashlib
+import inspect
 import json
+import os
+import signal
+import sys
+import tempfile
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
+import graph_server
+from graph_store import GraphStore, append_records, locked_log
+
 DEFAULT_GRAPH_PATH = "memory/ontology/graph.jsonl"
 DEFAULT_SCHEMA_PATH = "memory/ontology/schema.yaml"
 
@@ -64,57 +79,160 @@ def generate_id(type_name: str) -> str:
     return f"{prefix}_{suffix}"
 
 
+# Read functions a resident server can answer (see `serve`)
+READ_HANDLERS = {}
+
+
+def served(func):
+    """
+    Route a read function through the graph's server when one is running.
+    Called with store=<GraphStore> (as the server does), it runs locally
+    against that store; otherwise it asks the server and falls back to
+    loading the graph itself.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, store: GraphStore | None = None, **kwargs):
+        if store is None:
+            params = signature.bind(*args, **kwargs).arguments
+            reply = graph_server.request(params["graph_path"], func.__name__, params)
+            if reply is not None and reply.get("ok"):
+                return reply["result"]
+        return func(*args, store=store, **kwargs)
+
+    READ_HANDLERS[func.__name__] = func
+    return wrapper
+
+
 def load_graph(path: str) -> tuple[dict, list]:
     """Load entities and relations from graph file."""
-    entities = {}
-    relations = []
-    
-    graph_path = Path(path)
-    if not graph_path.exists():
-        return entities, relations
-    
-    with open(graph_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            record = json.loads(line)
-            op = record.get("op")
-            
-            if op == "create":
-                entity = record["entity"]
-                entities[entity["id"]] = entity
-            elif op == "update":
-                entity_id = record["id"]
-                if entity_id in entities:
-                    entities[entity_id]["properties"].update(record.get("properties", {}))
-                    entities[entity_id]["updated"] = record.get("timestamp")
-            elif op == "delete":
-                entity_id = record["id"]
-                entities.pop(entity_id, None)
-            elif op == "relate":
-                relations.append({
-                    "from": record["from"],
-                    "rel": record["rel"],
-                    "to": record["to"],
-                    "properties": record.get("properties", {})
-                })
-            elif op == "unrelate":
-                relations = [r for r in relations 
-                           if not (r["from"] == record["from"] 
-                                  and r["rel"] == record["rel"] 
-                                  and r["to"] == record["to"])]
-    
-    return entities, relations
+    store = GraphStore.open(path)
+    return store.entities, store.relations()
 
 
 def append_op(path: str, record: dict):
     """Append an operation to the graph file."""
-    graph_path = Path(path)
-    graph_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(graph_path, "a") as f:
-        f.write(json.dumps(record) + "\n")
+    with locked_log(path) as f:
+        append_records(f, [record])
+
+
+class BatchError(ValueError):
+    """An op in an apply batch failed validation; nothing was written."""
+
+    def __init__(self, message: str, line: int | None = None):
+        super().__init__(f"line {line}: {message}" if line else message)
+        self.line = line
+
+
+def normalize_op(op: dict, timestamp: str) -> dict:
+    """
+    Turn an apply-stream op into a log record. Creates may be given in log
+    form ({"op":"create","entity":{...}}) or flat, like the CLI
+    ({"op":"create","type":"Person","properties":{...},"id":"p_001"}).
+    """
+    kind = op.get("op")
+    if kind == "create":
+        entity = dict(op.get("entity") or {
+            "id": op.get("id"),
+            "type": op.get("type"),
+            "properties": op.get("properties", {}),
+        })
+        if not entity.get("type"):
+            raise ValueError("create requires a type")
+        entity["id"] = entity.get("id") or generate_id(entity["type"])
+        entity.setdefault("properties", {})
+        entity.setdefault("created", timestamp)
+        entity.setdefault("updated", timestamp)
+        return {"op": "create", "entity": entity, "timestamp": timestamp}
+    if kind in ("update", "delete"):
+        if not op.get("id"):
+            raise ValueError(f"{kind} requires an id")
+        record = {"op": kind, "id": op["id"], "timestamp": timestamp}
+        if kind == "update":
+            record["properties"] = op.get("properties", {})
+        return record
+    if kind in ("relate", "unrelate"):
+        if not (op.get("from") and op.get("rel") and op.get("to")):
+            raise ValueError(f"{kind} requires from, rel and to")
+        record = {"op": kind, "from": op["from"], "rel": op["rel"], "to": op["to"],
+                  "timestamp": timestamp}
+        if kind == "relate":
+            record["properties"] = op.get("properties", {})
+        return record
+    raise ValueError(f"unknown op '{kind}'")
+
+
+def check_op(store: GraphStore, record: dict):
+    """Reject an op that does not make sense against the current state."""
+    kind = record["op"]
+    if kind == "create" and record["entity"]["id"] in store.entities:
+        raise ValueError(f"entity {record['entity']['id']} already exists")
+    if kind in ("update", "delete") and record["id"] not in store.entities:
+        raise ValueError(f"entity {record['id']} not found")
+    if kind == "relate":
+        for side in ("from", "to"):
+            if record[side] not in store.entities:
+                raise ValueError(f"relation {side} entity {record[side]} not found")
+    if kind == "unrelate" and (record["from"], record["rel"], record["to"]) not in store.relation_props:
+        raise ValueError(f"relation {record['from']} -{record['rel']}-> {record['to']} not found")
+
+
+def apply_ops(lines, graph_path: str, schema_path: str | None = None) -> dict:
+    """
+    Apply an NDJSON stream of ops as one transaction.
+
+    The log stays locked while every op is checked against the in-memory
+    graph (with earlier ops of the batch already applied). If any op
+    fails, BatchError is raised and nothing is written; otherwise the
+    whole batch is appended as one log line with a single write and
+    fsync. With a schema, the entities and relations the batch touches
+    must also pass validation.
+    """
+    timestamp = datetime.now(timezone.utc).isoformat()
+    with locked_log(graph_path) as f:
+        store = GraphStore.open(graph_path, compact=False)
+        records = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = normalize_op(json.loads(line), timestamp)
+                check_op(store, record)
+            except ValueError as exc:  # includes JSON decode errors
+                raise BatchError(str(exc), number) from exc
+            except (KeyError, TypeError, AttributeError) as exc:
+                raise BatchError(f"malformed op ({exc})", number) from exc
+            store.apply(record)
+            records.append(record)
+
+        if schema_path and Path(schema_path).exists() and records:
+            errors = batch_errors(store, load_schema(schema_path), records)
+            if errors:
+                raise BatchError("schema validation failed: " + "; ".join(errors))
+
+        if records:
+            append_records(f, records)
+
+    return {"applied": len(records), "graph": str(graph_path)}
+
+
+def batch_errors(store: GraphStore, schema: dict, records: list) -> list:
+    """Validation errors on the entities and relations a batch touched."""
+    entity_ids, rel_keys = set(), set()
+    for record in records:
+        if record["op"] == "create":
+            entity_ids.add(record["entity"]["id"])
+        elif record["op"] in ("update", "delete"):
+            entity_ids.add(record["id"])
+        else:
+            rel_keys.add((record["from"], record["rel"], record["to"]))
+    state = GraphValidator(store, schema).run(
+        {"entities": {}, "relations": {}, "cardinality": {}, "cycles": {}},
+        entity_ids, rel_keys,
+    )
+    return [error for section in state.values() for errors in section.values()
+            for error in ([errors] if isinstance(errors, str) else errors)]
 
 
 def create_entity(type_name: str, properties: dict, graph_path: str, entity_id: str = None) -> dict:
@@ -136,44 +254,105 @@ def create_entity(type_name: str, properties: dict, graph_path: str, entity_id:
     return entity
 
 
-def get_entity(entity_id: str, graph_path: str) -> dict | None:
+@served
+def get_entity(entity_id: str, graph_path: str, store: GraphStore | None = None) -> dict | None:
     """Get entity by ID."""
-    entities, _ = load_graph(graph_path)
-    return entities.get(entity_id)
+    store = store or GraphStore.open(graph_path)
+    return store.entities.get(entity_id)
+
+
+RANGE_OPS = {
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+}
+
+
+def parse_where(where: dict) -> list:
+    """
+    Turn a where clause into (prop, op, value) predicates. A plain value
+    means equality; an object maps operators to values, e.g.
+    {"start": {">=": "2026-01-01"}, "status": {"in": ["open", "blocked"]}}.
+    """
+    predicates = []
+    for key, value in where.items():
+        if isinstance(value, dict) and value and all(op in RANGE_OPS or op in ("=", "!=", "in") for op in value):
+            for op, operand in value.items():
+                predicates.append((key, op, operand))
+        else:
+            predicates.append((key, "=", value))
+    return predicates
 
 
-def query_entities(type_name: str, where: dict, graph_path: str) -> list:
-    """Query entities by type and properties."""
-    entities, _ = load_graph(graph_path)
-    results = []
+def matches(entity: dict, predicates: list) -> bool:
+    """Check every predicate against an entity's properties."""
+    props = entity["properties"]
+    for key, op, value in predicates:
+        actual = props.get(key)
+        if op == "=":
+            if actual != value:
+                return False
+        elif op == "!=":
+            if actual == value:
+                return False
+        elif op == "in":
+            if actual not in value:
+                return False
+        else:
+            try:
+                if actual is None or isinstance(actual, bool) or not RANGE_OPS[op](actual, value):
+                    return False
+            except TypeError:
+                return False  # e.g. comparing a number with a string
+    return True
+
+
+def load_index_defs(schema_path: str | None) -> dict | None:
+    """Secondary index declarations from schema.yaml ('indexes' section)."""
+    if not schema_path or not Path(schema_path).exists():
+        return None
+    return load_schema(schema_path).get("indexes") or {}
+
+
+@served
+def query_entities(type_name: str, where: dict, graph_path: str, schema_path: str | None = None,
+                   store: GraphStore | None = None) -> list:
+    """
+    Query entities by type and properties.
+    Predicates covered by a declared index narrow the candidates first;
+    every predicate is still checked on what remains.
+    """
+    store = store or GraphStore.open(graph_path, index_defs=load_index_defs(schema_path))
+    predicates = parse_where(where)
     
-    for entity in entities.values():
-        if type_name and entity["type"] != type_name:
-            continue
-        
-        match = True
-        for key, value in where.items():
-            if entity["properties"].get(key) != value:
-                match = False
-                break
-        
-        if match:
-            results.append(entity)
+    candidate_ids = None
+    if type_name:
+        for key, op, value in predicates:
+            ids = store.candidates(type_name, key, op, value)
+            if ids is not None:
+                candidate_ids = ids if candidate_ids is None else candidate_ids & ids
     
-    return results
+    if candidate_ids is None:
+        pool = store.entities_of_type(type_name)
+    else:
+        # Creation order, matching what a full scan would return
+        pool = sorted((store.entities[i] for i in candidate_ids),
+                      key=lambda e: (e.get("created") or "", e["id"]))
+    
+    return [entity for entity in pool if matches(entity, predicates)]
 
 
-def list_entities(type_name: str, graph_path: str) -> list:
+@served
+def list_entities(type_name: str, graph_path: str, store: GraphStore | None = None) -> list:
     """List all entities of a type."""
-    entities, _ = load_graph(graph_path)
-    if type_name:
-        return [e for e in entities.values() if e["type"] == type_name]
-    return list(entities.values())
+    store = store or GraphStore.open(graph_path)
+    return store.entities_of_type(type_name)
 
 
 def update_entity(entity_id: str, properties: dict, graph_path: str) -> dict | None:
     """Update entity properties."""
-    entities, _ = load_graph(graph_path)
+    entities = GraphStore.open(graph_path).entities
     if entity_id not in entities:
         return None
     
@@ -188,8 +367,7 @@ def update_entity(entity_id: str, properties: dict, graph_path: str) -> dict | N
 
 def delete_entity(entity_id: str, graph_path: str) -> bool:
     """Delete an entity."""
-    entities, _ = load_graph(graph_path)
-    if entity_id not in entities:
+    if entity_id not in GraphStore.open(graph_path).entities:
         return False
     
     timestamp = datetime.now(timezone.utc).isoformat()
@@ -213,171 +391,294 @@ def create_relation(from_id: str, rel_type: str, to_id: str, properties: dict, g
     return record
 
 
-def get_related(entity_id: str, rel_type: str, graph_path: str, direction: str = "outgoing") -> list:
+@served
+def get_related(entity_id: str, rel_type: str, graph_path: str, direction: str = "outgoing",
+                store: GraphStore | None = None) -> list:
     """Get related entities."""
-    entities, relations = load_graph(graph_path)
+    store = store or GraphStore.open(graph_path)
     results = []
     
-    for rel in relations:
-        if direction == "outgoing" and rel["from"] == entity_id:
-            if not rel_type or rel["rel"] == rel_type:
-                if rel["to"] in entities:
-                    results.append({
-                        "relation": rel["rel"],
-                        "entity": entities[rel["to"]]
-                    })
-        elif direction == "incoming" and rel["to"] == entity_id:
-            if not rel_type or rel["rel"] == rel_type:
-                if rel["from"] in entities:
-                    results.append({
-                        "relation": rel["rel"],
-                        "entity": entities[rel["from"]]
-                    })
-        elif direction == "both":
-            if rel["from"] == entity_id or rel["to"] == entity_id:
-                if not rel_type or rel["rel"] == rel_type:
-                    other_id = rel["to"] if rel["from"] == entity_id else rel["from"]
-                    if other_id in entities:
-                        results.append({
-                            "relation": rel["rel"],
-                            "direction": "outgoing" if rel["from"] == entity_id else "incoming",
-                            "entity": entities[other_id]
-                        })
+    rel_types = (rel_type,) if rel_type else None
+    for rel, side, other_id, _ in store.neighbors(entity_id, rel_types, direction):
+        if other_id not in store.entities:
+            continue
+        result = {"relation": rel, "entity": store.entities[other_id]}
+        if direction == "both":
+            result = {"relation": rel, "direction": side, "entity": store.entities[other_id]}
+        results.append(result)
     
     return results
 
 
-def validate_graph(graph_path: str, schema_path: str) -> list:
-    """Validate graph against schema constraints."""
-    entities, relations = load_graph(graph_path)
-    errors = []
-    
-    # Load schema if exists
-    schema = load_schema(schema_path)
-    
-    type_schemas = schema.get("types", {})
-    relation_schemas = schema.get("relations", {})
-    global_constraints = schema.get("constraints", [])
-    
-    for entity_id, entity in entities.items():
-        type_name = entity["type"]
-        type_schema = type_schemas.get(type_name, {})
-        
-        # Check required properties
-        required = type_schema.get("required", [])
-        for prop in required:
-            if prop not in entity["properties"]:
+def parse_path(spec: str) -> list:
+    """Parse 'rel,^rel,...' into (rel, direction) hops; '^' follows a relation backwards."""
+    hops = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if part.startswith("^"):
+            hops.append((part[1:], "incoming"))
+        else:
+            hops.append((part, "outgoing"))
+    return hops
+
+
+@served
+def traverse_graph(entity_id: str, graph_path: str, rel_types: list | None = None,
+                   direction: str = "outgoing", depth: int = 2, limit: int | None = None,
+                   strategy: str = "bfs", type_name: str | None = None,
+                   path: str | None = None, store: GraphStore | None = None) -> list:
+    """Multi-hop traversal (BFS/DFS to a depth) or a fixed relation path."""
+    store = store or GraphStore.open(graph_path)
+    if path:
+        results = store.follow_path(entity_id, parse_path(path))
+        if type_name:
+            results = [e for e in results if e["type"] == type_name]
+        return results[:limit] if limit else results
+    return store.traverse(entity_id, rel_types, direction, depth, limit, strategy, type_name)
+
+
+VALIDATION_VERSION = 1
+
+
+def validation_path_for(graph_path: str) -> Path:
+    """Validation state stored next to the graph log."""
+    path = Path(graph_path)
+    return path.with_name(path.stem + ".validation.json")
+
+
+def schema_fingerprint(schema: dict) -> str:
+    """Hash of the constraint sections; any change forces a full validation."""
+    parts = {k: schema.get(k) for k in ("types", "relations", "constraints")}
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def touched_since(graph_path: str, start: int, end: int) -> tuple[set, set]:
+    """Entity ids and relation keys named by the log records in [start, end)."""
+    entity_ids, rel_keys = set(), set()
+    with open(graph_path, "rb") as f:
+        f.seek(start)
+        for line in f.read(end - start).splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            batch = record["records"] if record.get("op") == "batch" else [record]
+            for record in batch:
+                if record.get("op") in ("relate", "unrelate"):
+                    rel_keys.add((record["from"], record["rel"], record["to"]))
+                elif record.get("op") == "create":
+                    entity_ids.add(record["entity"]["id"])
+                elif "id" in record:
+                    entity_ids.add(record["id"])
+    return entity_ids, rel_keys
+
+
+class GraphValidator:
+    """
+    Schema checks split by what each error depends on, so a run only
+    re-checks what the log tail touched: entity rules per entity, type
+    rules per relation key, cardinality per (entity, relation) counter and
+    acyclicity per relation type.
+    """
+
+    def __init__(self, store: GraphStore, schema: dict):
+        self.store = store
+        self.type_schemas = schema.get("types", {})
+        self.relation_schemas = schema.get("relations", {})
+        self.check_event_range = any(
+            c.get("type") == "Event"
+            and "end" in (c.get("rule") or "").lower()
+            and "start" in (c.get("rule") or "").lower()
+            for c in schema.get("constraints", [])
+        )
+
+    def entity_errors(self, entity_id: str) -> list:
+        entity = self.store.entities.get(entity_id)
+        if entity is None:
+            return []
+        errors = []
+        type_schema = self.type_schemas.get(entity["type"], {})
+        props = entity["properties"]
+
+        for prop in type_schema.get("required", []):
+            if prop not in props:
                 errors.append(f"{entity_id}: missing required property '{prop}'")
-        
-        # Check forbidden properties
-        forbidden = type_schema.get("forbidden_properties", [])
-        for prop in forbidden:
-            if prop in entity["properties"]:
+        for prop in type_schema.get("forbidden_properties", []):
+            if prop in props:
                 errors.append(f"{entity_id}: contains forbidden property '{prop}'")
-        
-        # Check enum values
         for prop, allowed in type_schema.items():
             if prop.endswith("_enum"):
                 field = prop.replace("_enum", "")
-                value = entity["properties"].get(field)
+                value = props.get(field)
                 if value and value not in allowed:
                     errors.append(f"{entity_id}: '{field}' must be one of {allowed}, got '{value}'")
-    
-    # Relation constraints (type + cardinality + acyclicity)
-    rel_index = {}
-    for rel in relations:
-        rel_index.setdefault(rel["rel"], []).append(rel)
-    
-    for rel_type, rel_schema in relation_schemas.items():
-        rels = rel_index.get(rel_type, [])
+
+        if self.check_event_range and entity["type"] == "Event":
+            start, end = props.get("start"), props.get("end")
+            if start and end:
+                try:
+                    if datetime.fromisoformat(end) < datetime.fromisoformat(start):
+                        errors.append(f"{entity_id}: end must be >= start")
+                except ValueError:
+                    errors.append(f"{entity_id}: invalid datetime format in start/end")
+        return errors
+
+    def relation_errors(self, key: tuple) -> list:
+        from_id, rel_type, to_id = key
+        rel_schema = self.relation_schemas.get(rel_type)
+        if rel_schema is None or key not in self.store.relation_props:
+            return []
+        from_entity = self.store.entities.get(from_id)
+        to_entity = self.store.entities.get(to_id)
+        if not from_entity or not to_entity:
+            return [f"{rel_type}: relation references missing entity ({from_id} -> {to_id})"]
+        errors = []
         from_types = rel_schema.get("from_types", [])
         to_types = rel_schema.get("to_types", [])
-        cardinality = rel_schema.get("cardinality")
-        acyclic = rel_schema.get("acyclic", False)
-        
-        # Type checks
-        for rel in rels:
-            from_entity = entities.get(rel["from"])
-            to_entity = entities.get(rel["to"])
-            if not from_entity or not to_entity:
-                errors.append(f"{rel_type}: relation references missing entity ({rel['from']} -> {rel['to']})")
-                continue
-            if from_types and from_entity["type"] not in from_types:
-                errors.append(
-                    f"{rel_type}: from entity {rel['from']} type {from_entity['type']} not in {from_types}"
-                )
-            if to_types and to_entity["type"] not in to_types:
-                errors.append(
-                    f"{rel_type}: to entity {rel['to']} type {to_entity['type']} not in {to_types}"
-                )
-        
-        # Cardinality checks
-        if cardinality in ("one_to_one", "one_to_many", "many_to_one"):
-            from_counts = {}
-            to_counts = {}
-            for rel in rels:
-                from_counts[rel["from"]] = from_counts.get(rel["from"], 0) + 1
-                to_counts[rel["to"]] = to_counts.get(rel["to"], 0) + 1
-            
-            if cardinality in ("one_to_one", "many_to_one"):
-                for from_id, count in from_counts.items():
-                    if count > 1:
-                        errors.append(f"{rel_type}: from entity {from_id} violates cardinality {cardinality}")
-            if cardinality in ("one_to_one", "one_to_many"):
-                for to_id, count in to_counts.items():
-                    if count > 1:
-                        errors.append(f"{rel_type}: to entity {to_id} violates cardinality {cardinality}")
-        
-        # Acyclic checks
-        if acyclic:
-            graph = {}
-            for rel in rels:
-                graph.setdefault(rel["from"], []).append(rel["to"])
-            
-            visited = {}
-            
-            def dfs(node, stack):
-                visited[node] = True
-                stack.add(node)
-                for nxt in graph.get(node, []):
-                    if nxt in stack:
-                        return True
-                    if not visited.get(nxt, False):
-                        if dfs(nxt, stack):
-                            return True
-                stack.remove(node)
-                return False
-            
-            for node in graph:
-                if not visited.get(node, False):
-                    if dfs(node, set()):
-                        errors.append(f"{rel_type}: cyclic dependency detected")
-                        break
-    
-    # Global constraints (limited enforcement)
-    for constraint in global_constraints:
-        ctype = constraint.get("type")
-        relation = constraint.get("relation")
-        rule = (constraint.get("rule") or "").strip().lower()
-        if ctype == "Event" and "end" in rule and "start" in rule:
-            for entity_id, entity in entities.items():
-                if entity["type"] != "Event":
-                    continue
-                start = entity["properties"].get("start")
-                end = entity["properties"].get("end")
-                if start and end:
-                    try:
-                        start_dt = datetime.fromisoformat(start)
-                        end_dt = datetime.fromisoformat(end)
-                        if end_dt < start_dt:
-                            errors.append(f"{entity_id}: end must be >= start")
-                    except ValueError:
-                        errors.append(f"{entity_id}: invalid datetime format in start/end")
-        if relation and rule == "acyclic":
-            # Already enforced above via relations schema
-            continue
-    
-    return errors
+        if from_types and from_entity["type"] not in from_types:
+            errors.append(f"{rel_type}: from entity {from_id} type {from_entity['type']} not in {from_types}")
+        if to_types and to_entity["type"] not in to_types:
+            errors.append(f"{rel_type}: to entity {to_id} type {to_entity['type']} not in {to_types}")
+        return errors
+
+    def cardinality_error(self, rel_type: str, side: str, entity_id: str) -> str | None:
+        cardinality = self.relation_schemas.get(rel_type, {}).get("cardinality")
+        if side == "from" and cardinality in ("one_to_one", "many_to_one"):
+            count = self.store.out_degree.get((entity_id, rel_type), 0)
+        elif side == "to" and cardinality in ("one_to_one", "one_to_many"):
+            count = self.store.in_degree.get((entity_id, rel_type), 0)
+        else:
+            return None
+        if count > 1:
+            return f"{rel_type}: {side} entity {entity_id} violates cardinality {cardinality}"
+        return None
+
+    def cycle_errors(self, rel_type: str) -> list:
+        if not self.relation_schemas.get(rel_type, {}).get("acyclic", False):
+            return []
+        return [
+            f"{rel_type}: cyclic dependency detected among {component}"
+            for component in self.store.cycles(rel_type)
+        ]
+
+    def incident_keys(self, entity_id: str) -> set:
+        keys = set()
+        for rel, others in self.store.out_adj.get(entity_id, {}).items():
+            keys.update((entity_id, rel, other) for other in others)
+        for rel, others in self.store.in_adj.get(entity_id, {}).items():
+            keys.update((other, rel, entity_id) for other in others)
+        return keys
+
+    def run(self, state: dict | None, entity_ids: set, rel_keys: set) -> dict:
+        """
+        Refresh `state` for the touched ids/keys, or build it from scratch
+        when state is None. Returns the new state.
+        """
+        if state is None:
+            state = {"entities": {}, "relations": {}, "cardinality": {}, "cycles": {}}
+            entity_ids = set(self.store.entities)
+            rel_keys = set(self.store.relation_props)
+            cycle_rels = set(self.relation_schemas)
+        else:
+            cycle_rels = {key[1] for key in rel_keys}
+
+        for entity_id in entity_ids:
+            rel_keys |= self.incident_keys(entity_id)
+            errors = self.entity_errors(entity_id)
+            if errors:
+                state["entities"][entity_id] = errors
+            else:
+                state["entities"].pop(entity_id, None)
+
+        counters = set()
+        for key in rel_keys:
+            counters.add((key[1], "from", key[0]))
+            counters.add((key[1], "to", key[2]))
+            errors = self.relation_errors(key)
+            if errors:
+                state["relations"][json.dumps(key)] = errors
+            else:
+                state["relations"].pop(json.dumps(key), None)
+
+        for counter in counters:
+            error = self.cardinality_error(*counter)
+            if error:
+                state["cardinality"][json.dumps(counter)] = error
+            else:
+                state["cardinality"].pop(json.dumps(counter), None)
+
+        for rel_type in cycle_rels:
+            errors = self.cycle_errors(rel_type)
+            if errors:
+                state["cycles"][rel_type] = errors
+            else:
+                state["cycles"].pop(rel_type, None)
+
+        return state
+
+    def report(self, state: dict) -> list:
+        """Flatten state into the error list, in graph and schema order."""
+        errors = []
+        for entity_id in self.store.entities:
+            errors.extend(state["entities"].get(entity_id, []))
+        for rel_type in self.relation_schemas:
+            for key in self.store.by_rel.get(rel_type, {}):
+                # One report per relation record, as duplicates are separate records
+                records = len(self.store.relation_props[key])
+                errors.extend(state["relations"].get(json.dumps(key), []) * records)
+            errors.extend(sorted(
+                error for counter, error in state["cardinality"].items()
+                if json.loads(counter)[0] == rel_type
+            ))
+            errors.extend(state["cycles"].get(rel_type, []))
+        return errors
+
+
+def validate_graph(graph_path: str, schema_path: str, full: bool = False) -> list:
+    """
+    Validate graph against schema constraints.
+
+    Results are kept in graph.validation.json with the log offset they
+    cover; later calls only re-check what was appended since, unless
+    `full` is set or the schema changed.
+    """
+    store = GraphStore.open(graph_path)
+    schema = load_schema(schema_path)
+    validator = GraphValidator(store, schema)
+    fingerprint = schema_fingerprint(schema)
+    state_path = validation_path_for(graph_path)
+
+    state = None
+    if not full and state_path.exists():
+        try:
+            with open(state_path) as f:
+                saved = json.load(f)
+            if (saved.get("version") == VALIDATION_VERSION
+                    and saved.get("schema") == fingerprint
+                    and saved.get("offset", 0) <= store.offset):
+                state = saved
+        except (OSError, ValueError):
+            state = None
+
+    if state is None:
+        state = validator.run(None, set(), set())
+    elif state["offset"] < store.offset:
+        entity_ids, rel_keys = touched_since(graph_path, state["offset"], store.offset)
+        state = validator.run(state, entity_ids, rel_keys)
+
+    state.update(version=VALIDATION_VERSION, schema=fingerprint, offset=store.offset)
+    if store.graph_path.exists():
+        fd, tmp = tempfile.mkstemp(dir=state_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, state_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    return validator.report(state)
 
 
 def load_schema(schema_path: str) -> dict:
@@ -439,8 +740,10 @@ def main():
     # Query
     query_p = subparsers.add_parser("query", help="Query entities")
     query_p.add_argument("--type", "-t", help="Entity type")
-    query_p.add_argument("--where", "-w", default="{}", help="Filter JSON")
+    query_p.add_argument("--where", "-w", default="{}",
+                         help='Filter JSON; values may be operators, e.g. {"start":{">=":"2026-01-01"},"status":{"in":["open","blocked"]}}')
     query_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
+    query_p.add_argument("--schema", "-s", default=DEFAULT_SCHEMA_PATH)
     
     # List
     list_p = subparsers.add_parser("list", help="List entities")
@@ -473,10 +776,39 @@ def main():
     related_p.add_argument("--dir", "-d", choices=["outgoing", "incoming", "both"], default="outgoing")
     related_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
+    # Traverse
+    traverse_p = subparsers.add_parser("traverse", help="Multi-hop traversal")
+    traverse_p.add_argument("--id", required=True, help="Start entity ID")
+    traverse_p.add_argument("--rel", "-r", help="Comma-separated relation types to follow")
+    traverse_p.add_argument("--dir", "-d", choices=["outgoing", "incoming", "both"], default="outgoing")
+    traverse_p.add_argument("--depth", type=int, default=2, help="Maximum hops")
+    traverse_p.add_argument("--limit", "-n", type=int, help="Maximum results")
+    traverse_p.add_argument("--strategy", choices=["bfs", "dfs"], default="bfs")
+    traverse_p.add_argument("--type", "-t", help="Only return entities of this type")
+    traverse_p.add_argument("--path", help="Fixed hop sequence, e.g. '^has_owner,has_task' (^ = incoming)")
+    traverse_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
+    
     # Validate
     validate_p = subparsers.add_parser("validate", help="Validate graph")
     validate_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     validate_p.add_argument("--schema", "-s", default=DEFAULT_SCHEMA_PATH)
+    validate_p.add_argument("--full", action="store_true",
+                            help="Re-check everything instead of only ops since the last run")
+
+    # Compact
+    compact_p = subparsers.add_parser("compact", help="Snapshot graph state so loads only replay the log tail")
+    compact_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
+
+    # Apply (batched, transactional)
+    apply_p = subparsers.add_parser("apply", help="Apply an NDJSON stream of ops as one locked batch")
+    apply_p.add_argument("--input", "-i", default="-", help="NDJSON ops file ('-' for stdin)")
+    apply_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
+    apply_p.add_argument("--schema", "-s", help="Also reject the batch if it breaks schema constraints")
+
+    # Serve
+    serve_p = subparsers.add_parser("serve", help="Keep the graph in memory and answer reads over a Unix socket")
+    serve_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
+    serve_p.add_argument("--schema", "-s", default=DEFAULT_SCHEMA_PATH, help="Schema whose indexes to keep")
 
     # Schema append
     schema_p = subparsers.add_parser("schema-append", help="Append/merge schema fragment")
@@ -491,7 +823,7 @@ def main():
         args.graph = str(
             resolve_safe_path(args.graph, root=workspace_root, label="graph path")
         )
-    if hasattr(args, "schema"):
+    if getattr(args, "schema", None):
         args.schema = str(
             resolve_safe_path(args.schema, root=workspace_root, label="schema path")
         )
@@ -502,6 +834,11 @@ def main():
             )
         )
     
+    if hasattr(args, "input") and args.input != "-":
+        args.input = str(
+            resolve_safe_path(args.input, root=workspace_root, must_exist=True, label="input file")
+        )
+    
     if args.command == "create":
         props = json.loads(args.props)
         entity = create_entity(args.type, props, args.graph, args.id)
@@ -516,7 +853,7 @@ def main():
     
     elif args.command == "query":
         where = json.loads(args.where)
-        results = query_entities(args.type, where, args.graph)
+        results = query_entities(args.type, where, args.graph, args.schema)
         print(json.dumps(results, indent=2))
     
     elif args.command == "list":
@@ -546,8 +883,14 @@ def main():
         results = get_related(args.id, args.rel, args.graph, args.dir)
         print(json.dumps(results, indent=2))
     
+    elif args.command == "traverse":
+        rel_types = [r.strip() for r in args.rel.split(",") if r.strip()] if args.rel else None
+        results = traverse_graph(args.id, args.graph, rel_types, args.dir, args.depth,
+                                 args.limit, args.strategy, args.type, args.path)
+        print(json.dumps(results, indent=2))
+    
     elif args.command == "validate":
-        errors = validate_graph(args.graph, args.schema)
+        errors = validate_graph(args.graph, args.schema, full=args.full)
         if errors:
             print("Validation errors:")
             for err in errors:
@@ -555,6 +898,40 @@ def main():
         else:
             print("Graph is valid.")
     
+    elif args.command == "compact":
+        store = GraphStore.open(args.graph, compact=False)
+        store.write_snapshot()
+        print(json.dumps({
+            "snapshot": str(store.snapshot_path),
+            "offset": store.offset,
+            "entities": len(store.entities),
+            "relations": len(store.relation_props),
+        }, indent=2))
+    
+    elif args.command == "apply":
+        try:
+            if args.input == "-":
+                result = apply_ops(sys.stdin, args.graph, args.schema)
+            else:
+                with open(args.input) as f:
+                    result = apply_ops(f, args.graph, args.schema)
+        except BatchError as exc:
+            print(json.dumps({"applied": 0, "error": str(exc)}, indent=2))
+            raise SystemExit(1)
+        print(json.dumps(result, indent=2))
+    
+    elif args.command == "serve":
+        server = graph_server.GraphServer(args.graph, READ_HANDLERS,
+                                          index_defs=load_index_defs(args.schema))
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"Serving {args.graph} on {server.sock_path} (Ctrl-C to stop)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    
     elif args.command == "schema-append":
         if not args.data and not args.file:
             raise SystemExit("schema-append requires --data or --file")
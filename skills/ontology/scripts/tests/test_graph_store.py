@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Tests for graph_store.py"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import graph_store
+from graph_store import GraphStore, SortedIndex, append_records, locked_log
+
+
+def create(entity_id, type_name="Task", **properties):
+    return {"op": "create", "entity": {"id": entity_id, "type": type_name, "properties": properties}}
+
+
+def relate(from_id, rel, to_id):
+    return {"op": "relate", "from": from_id, "rel": rel, "to": to_id}
+
+
+class GraphTestCase(unittest.TestCase):
+    """Temp directory holding a graph log."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = os.path.join(self.temp_dir, "graph.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def append(self, *records):
+        with locked_log(self.graph_path) as f:
+            append_records(f, list(records))
+
+
+class TestSnapshot(GraphTestCase):
+    """Tests for snapshot compaction and log-tail replay."""
+
+    def test_snapshot_plus_tail_matches_full_replay(self):
+        """Test that a snapshot plus the ops appended since give the full state."""
+        for i in range(5):
+            self.append(create(f"t{i}", priority=i))
+        self.append(relate("t0", "blocks", "t1"))
+        GraphStore.open(self.graph_path).write_snapshot()
+
+        self.append({"op": "update", "id": "t1", "properties": {"priority": 9}})
+        self.append({"op": "delete", "id": "t4"}, relate("t2", "blocks", "t3"))
+
+        store = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual(store.tail_ops, 3)
+        with patch.object(graph_store, 'snapshot_path_for', return_value=graph_store.Path(self.temp_dir, "none")):
+            replayed = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual(replayed.tail_ops, 9)
+        self.assertEqual(store.entities, replayed.entities)
+        self.assertEqual(store.relations(), replayed.relations())
+        self.assertEqual(store.entities["t1"]["properties"]["priority"], 9)
+
+    def test_compacts_after_long_tail(self):
+        """Test that opening re-snapshots once the tail reaches COMPACT_EVERY."""
+        with patch.object(graph_store, 'COMPACT_EVERY', 3):
+            for i in range(3):
+                self.append(create(f"t{i}"))
+            GraphStore.open(self.graph_path)
+            store = GraphStore.open(self.graph_path)
+        self.assertEqual(store.tail_ops, 0)
+        self.assertEqual(len(store.entities), 3)
+
+    def test_rewritten_log_ignores_snapshot(self):
+        """Test that a snapshot covering more than the log is not used."""
+        self.append(create("t0"), create("t1"))
+        GraphStore.open(self.graph_path).write_snapshot()
+        with open(self.graph_path, "w") as f:
+            f.write(json.dumps(create("t9")) + "\n")
+        self.assertEqual(list(GraphStore.open(self.graph_path).entities), ["t9"])
+
+
+class TestBatches(GraphTestCase):
+    """Tests for batch records and torn lines."""
+
+    def test_batch_written_as_one_line(self):
+        """Test that several records are appended as a single batch line."""
+        self.append(create("t0"), create("t1"), relate("t0", "blocks", "t1"))
+        with open(self.graph_path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["op"], "batch")
+
+        store = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual(store.tail_ops, 3)
+        self.assertEqual(store.out_degree[("t0", "blocks")], 1)
+
+    def test_torn_batch_ignored_then_cut(self):
+        """Test that a batch line without its newline is not applied, and is cut before the next append."""
+        self.append(create("t0"))
+        torn = json.dumps({"op": "batch", "records": [create("t1"), create("t2")]})
+        with open(self.graph_path, "a") as f:
+            f.write(torn[:len(torn) // 2])
+
+        self.assertEqual(list(GraphStore.open(self.graph_path, compact=False).entities), ["t0"])
+
+        self.append(create("t3"))
+        store = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual(list(store.entities), ["t0", "t3"])
+
+
+class TestTraversal(GraphTestCase):
+    """Tests for neighbors, BFS/DFS traversal and fixed paths."""
+
+    def setUp(self):
+        super().setUp()
+        # p1 owns proj1 and proj2; proj1 has t1 -> t2 -> t3 chained by blocks
+        self.append(
+            create("p1", "Person"), create("proj1", "Project"), create("proj2", "Project"),
+            create("t1"), create("t2"), create("t3"), create("t4"),
+            relate("proj1", "has_owner", "p1"), relate("proj2", "has_owner", "p1"),
+            relate("proj1", "has_task", "t1"), relate("proj2", "has_task", "t4"),
+            relate("t1", "blocks", "t2"), relate("t2", "blocks", "t3"),
+        )
+        self.store = GraphStore.open(self.graph_path, compact=False)
+
+    def test_bfs_respects_depth(self):
+        """Test that traversal stops at max_depth and reports each entity once."""
+        results = self.store.traverse("proj1", max_depth=2)
+        self.assertEqual([(r["entity"]["id"], r["depth"]) for r in results],
+                         [("p1", 1), ("t1", 1), ("t2", 2)])
+
+        results = self.store.traverse("t1", ["blocks"], max_depth=5)
+        self.assertEqual([r["entity"]["id"] for r in results], ["t2", "t3"])
+        self.assertEqual(self.store.traverse("t1", ["blocks"], max_depth=5, limit=1)[0]["entity"]["id"], "t2")
+
+    def test_incoming_and_type_filter(self):
+        """Test walking relations backwards with a result type filter."""
+        results = self.store.traverse("p1", direction="incoming", max_depth=2, type_name="Project")
+        self.assertEqual([r["entity"]["id"] for r in results], ["proj1", "proj2"])
+        self.assertTrue(all(r["direction"] == "incoming" for r in results))
+
+    def test_follow_path(self):
+        """Test a fixed hop sequence: the tasks of projects a person owns."""
+        tasks = self.store.follow_path("p1", [("has_owner", "incoming"), ("has_task", "outgoing")])
+        self.assertEqual([e["id"] for e in tasks], ["t1", "t4"])
+        self.assertEqual(self.store.follow_path("missing", [("has_task", "outgoing")]), [])
+
+    def test_neighbors_in_log_order(self):
+        """Test that neighbors come back in the order relations were written."""
+        self.append(relate("t1", "has_task", "t4"), relate("t1", "blocks", "t4"))
+        store = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual([(rel, other) for rel, _, other, _ in store.neighbors("t1")],
+                         [("blocks", "t2"), ("has_task", "t4"), ("blocks", "t4")])
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Tests for range queries on SortedIndex."""
+
+    def setUp(self):
+        self.index = SortedIndex()
+        self.index.build([(5, "a"), (1, "b"), (5, "c"), (9, "d"), ("x", "e"), (None, "f"), (True, "g")])
+
+    def test_ranges(self):
+        """Test each comparison, keeping numbers and strings apart."""
+        self.assertEqual(self.index.range(">", 5), {"d"})
+        self.assertEqual(self.index.range(">=", 5), {"a", "c", "d"})
+        self.assertEqual(self.index.range("<", 5), {"b"})
+        self.assertEqual(self.index.range("<=", 1), {"b"})
+        self.assertEqual(self.index.range(">", "a"), {"e"})
+        self.assertIsNone(self.index.range("!=", 5))
+        self.assertEqual(self.index.lookup([5, 9]), {"a", "c", "d"})
+
+    def test_build_matches_incremental_adds(self):
+        """Test that a one-sort build equals inserting entries one by one."""
+        incremental = SortedIndex()
+        for value, entity_id in [(5, "a"), (1, "b"), (5, "c"), (9, "d"), ("x", "e"), (None, "f"), (True, "g")]:
+            incremental.add(value, entity_id)
+        self.assertEqual(self.index.entries, incremental.entries)
+
+        self.index.remove(5, "a")
+        self.assertEqual(self.index.range(">=", 5), {"c", "d"})
+
+
+class TestPropertyIndexes(GraphTestCase):
+    """Tests for indexes kept by GraphStore."""
+
+    def test_rebuilt_indexes_follow_updates(self):
+        """Test that indexes built after a replay reflect updates and deletes."""
+        self.append(create("t0", priority=1), create("t1", priority=5), create("t2", priority=7))
+        self.append({"op": "update", "id": "t0", "properties": {"priority": 8}}, {"op": "delete", "id": "t2"})
+        store = GraphStore.open(self.graph_path, index_defs={"Task": {"priority": "sorted"}})
+        self.assertEqual(store.candidates("Task", "priority", ">", 4), {"t0", "t1"})
+
+        reopened = GraphStore.open(self.graph_path)
+        self.assertFalse(reopened.indexes_rebuilt)
+        self.assertEqual(reopened.candidates("Task", "priority", "=", 8), {"t0"})
+
+
+class TestCycles(GraphTestCase):
+    """Tests for strongly connected components over one relation."""
+
+    def test_cycle_and_self_loop_found(self):
+        """Test that cycles and self-loops are reported, acyclic chains are not."""
+        self.append(
+            create("a"), create("b"), create("c"), create("d"), create("e"),
+            relate("a", "depends_on", "b"), relate("b", "depends_on", "c"),
+            relate("c", "depends_on", "a"), relate("c", "depends_on", "d"),
+            relate("e", "depends_on", "e"), relate("d", "blocks", "a"),
+        )
+        store = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual(sorted(sorted(c) for c in store.cycles("depends_on")), [["a", "b", "c"], ["e"]])
+        self.assertEqual(store.cycles("blocks"), [])
+
+    def test_long_chain_does_not_recurse(self):
+        """Test that a chain longer than the recursion limit is handled."""
+        n = sys.getrecursionlimit() + 100
+        records = [create(f"n{i}") for i in range(n)]
+        records += [relate(f"n{i}", "next", f"n{i + 1}") for i in range(n - 1)]
+        records.append(relate(f"n{n - 1}", "next", "n0"))
+        self.append(*records)
+        store = GraphStore.open(self.graph_path, compact=False)
+        self.assertEqual([len(c) for c in store.cycles("next")], [n])
+
+
+if __name__ == '__main__':
+    unittest.main()
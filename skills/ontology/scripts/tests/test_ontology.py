@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Tests for ontology.py"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import ontology
+from ontology import BatchError, apply_ops
+
+
+def ops(*records):
+    return [json.dumps(record) for record in records]
+
+
+class OntologyTestCase(unittest.TestCase):
+    """Temp graph and schema, with the graph server client disabled."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = os.path.join(self.temp_dir, "graph.jsonl")
+        self.schema_path = os.path.join(self.temp_dir, "schema.yaml")
+        self.env = patch.dict(os.environ, {"ONTOLOGY_NO_SERVER": "1"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_schema(self, schema: dict):
+        ontology.write_schema(self.schema_path, schema)
+
+
+class TestApplyOps(OntologyTestCase):
+    """Tests for apply_ops transactions."""
+
+    def test_batch_applied_as_one_line(self):
+        """Test that a good batch lands as a single log line."""
+        result = apply_ops(ops(
+            {"op": "create", "type": "Person", "id": "p1", "properties": {"name": "Ada"}},
+            {"op": "create", "type": "Task", "id": "t1", "properties": {"title": "Ship"}},
+            {"op": "relate", "from": "t1", "rel": "assigned_to", "to": "p1"},
+        ), self.graph_path)
+
+        self.assertEqual(result["applied"], 3)
+        with open(self.graph_path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        related = ontology.get_related("t1", "assigned_to", self.graph_path)
+        self.assertEqual([r["entity"]["id"] for r in related], ["p1"])
+
+    def test_failing_op_writes_nothing(self):
+        """Test that one bad op rejects the whole batch and reports its line."""
+        with self.assertRaises(BatchError) as ctx:
+            apply_ops(ops(
+                {"op": "create", "type": "Person", "id": "p1"},
+                {"op": "relate", "from": "p1", "rel": "knows", "to": "p2"},
+            ), self.graph_path)
+
+        self.assertEqual(ctx.exception.line, 2)
+        self.assertFalse(os.path.exists(self.graph_path) and os.path.getsize(self.graph_path))
+
+    def test_schema_failure_writes_nothing(self):
+        """Test that a batch breaking the schema is rejected as a whole."""
+        self.write_schema({"types": {"Task": {"required": ["title"]}}})
+        apply_ops(ops({"op": "create", "type": "Task", "id": "t0", "properties": {"title": "Old"}}),
+                  self.graph_path, self.schema_path)
+        size = os.path.getsize(self.graph_path)
+
+        with self.assertRaises(BatchError):
+            apply_ops(ops(
+                {"op": "create", "type": "Task", "id": "t1", "properties": {"title": "Ok"}},
+                {"op": "create", "type": "Task", "id": "t2", "properties": {}},
+            ), self.graph_path, self.schema_path)
+        self.assertEqual(os.path.getsize(self.graph_path), size)
+
+
+class TestQueries(OntologyTestCase):
+    """Tests for indexed queries and relation lookups."""
+
+    def setUp(self):
+        super().setUp()
+        self.write_schema({"indexes": {"Task": {"priority": "sorted", "status": "hash"}}})
+        apply_ops(ops(*[
+            {"op": "create", "type": "Task", "id": f"t{i}",
+             "properties": {"priority": i, "status": "open" if i % 2 else "done"}}
+            for i in range(6)
+        ]), self.graph_path)
+
+    def test_range_query_uses_index(self):
+        """Test that a range predicate returns the same rows as a full scan, in creation order."""
+        where = {"priority": {">=": 2}, "status": "open"}
+        indexed = ontology.query_entities("Task", where, self.graph_path, self.schema_path)
+        scanned = ontology.query_entities("Task", where, self.graph_path)
+        self.assertEqual([e["id"] for e in indexed], ["t3", "t5"])
+        self.assertEqual(indexed, scanned)
+
+    def test_get_related_in_log_order(self):
+        """Test that related entities come back in the order they were related."""
+        for task in ("t4", "t1", "t3"):
+            ontology.create_relation("t0", "blocks", task, {}, self.graph_path)
+        related = ontology.get_related("t0", "blocks", self.graph_path)
+        self.assertEqual([r["entity"]["id"] for r in related], ["t4", "t1", "t3"])
+
+    def test_traverse_path(self):
+        """Test a '^rel' path walking a relation backwards."""
+        ontology.create_relation("t0", "blocks", "t1", {}, self.graph_path)
+        ontology.create_relation("t2", "blocks", "t1", {}, self.graph_path)
+        results = ontology.traverse_graph("t0", self.graph_path, path="blocks,^blocks")
+        self.assertEqual([e["id"] for e in results], ["t0", "t2"])
+
+
+class TestValidateGraph(OntologyTestCase):
+    """Tests for validate_graph."""
+
+    def test_acyclic_relation_reports_cycle(self):
+        """Test that a cycle on an acyclic relation is reported, and cleared once broken."""
+        self.write_schema({"relations": {"depends_on": {"acyclic": True}}})
+        apply_ops(ops(
+            {"op": "create", "type": "Task", "id": "a"},
+            {"op": "create", "type": "Task", "id": "b"},
+            {"op": "create", "type": "Task", "id": "c"},
+            {"op": "relate", "from": "a", "rel": "depends_on", "to": "b"},
+            {"op": "relate", "from": "b", "rel": "depends_on", "to": "c"},
+        ), self.graph_path)
+        self.assertEqual(ontology.validate_graph(self.graph_path, self.schema_path), [])
+
+        ontology.create_relation("c", "depends_on", "a", {}, self.graph_path)
+        errors = ontology.validate_graph(self.graph_path, self.schema_path)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("cyclic dependency", errors[0])
+
+        apply_ops(ops({"op": "unrelate", "from": "c", "rel": "depends_on", "to": "a"}), self.graph_path)
+        self.assertEqual(ontology.validate_graph(self.graph_path, self.schema_path), [])
+        self.assertEqual(ontology.validate_graph(self.graph_path, self.schema_path, full=True), [])
+
+
+if __name__ == '__main__':
+    unittest.main()